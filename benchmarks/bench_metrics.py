@@ -0,0 +1,55 @@
+"""
+Benchmark: Kosten eines Metrik-Events
+
+Misst die Zeit pro Counter.inc, Histogram.observe und getimtem Block mit
+vorab geholten Metrik-Objekten (so wie sie in heißen Pfaden genutzt werden)
+sowie den Prometheus-Export einer realistisch gefüllten Registry.
+
+Aufruf:
+    python -m benchmarks.bench_metrics [--events 1000000]
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict
+
+from cogs.metrics import MetricsRegistry
+
+
+def measure(label: str, events: int, func: Callable[[], None]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    for _ in range(events):
+        func()
+    elapsed = time.perf_counter() - started
+    return {"operation": label, "events": events, "ns_per_event": round(elapsed / events * 1e9, 1)}
+
+
+def main(args: argparse.Namespace) -> None:
+    registry = MetricsRegistry()
+    counter = registry.counter("bench_total", route="/cards/{id}")
+    histogram = registry.histogram("bench_seconds", route="/cards/{id}")
+
+    def timed_block() -> None:
+        with histogram.time():
+            pass
+
+    results = [
+        measure("counter.inc", args.events, counter.inc),
+        measure("histogram.observe", args.events, lambda: histogram.observe(0.003)),
+        measure("histogram.time", args.events, timed_block),
+        measure("registry.counter lookup", args.events // 10,
+                lambda: registry.counter("bench_total", route="/cards/{id}")),
+    ]
+
+    for index in range(200):
+        registry.histogram("bench_view_seconds", view=f"View{index % 20}", item=f"item{index}").observe(0.01)
+    results.append(measure("render_prometheus (200 Histogramme)", 100, registry.render_prometheus))
+
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    main(parser.parse_args())
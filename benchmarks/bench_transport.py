@@ -0,0 +1,122 @@
+"""
+Benchmark: TCGdexService mit und ohne Transport-Tuning
+
+Startet einen lokalen aiohttp-Server, der Set-Details (mit Kartenliste)
+ausliefert, und misst die Latenz pro Request für das untuned-Profil
+(aiohttp-Standard, stdlib json) und das getunte Profil.
+
+Aufruf:
+    python -m benchmarks.bench_transport [--requests 300] [--concurrency 10] [--latency-ms 2]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+from cogs.tcgdex_service import TCGdexService, TransportProfile
+
+
+def build_set_payload(card_count: int = 200) -> Dict[str, Any]:
+    """Set-Details in der Größe eines typischen /sets/{id} Responses"""
+    return {
+        "id": "sv4",
+        "name": "Paradox Rift",
+        "releaseDate": "2023-11-03",
+        "serie": {"id": "sv", "name": "Karmesin & Purpur"},
+        "cardCount": {"official": card_count, "total": card_count},
+        "cards": [
+            {
+                "id": f"sv4-{i:03d}",
+                "localId": f"{i:03d}",
+                "name": f"Karte {i}",
+                "image": f"https://assets.tcgdex.net/de/sv/sv4/{i:03d}"
+            }
+            for i in range(1, card_count + 1)
+        ]
+    }
+
+
+async def start_server(latency_ms: float, payload: Dict[str, Any]) -> web.AppRunner:
+    body = json.dumps(payload).encode("utf-8")
+    
+    async def handle_set(request: web.Request) -> web.Response:
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        response = web.Response(body=body, content_type="application/json")
+        response.enable_compression()
+        return response
+    
+    app = web.Application()
+    app.router.add_get("/v2/de/sets/{set_id}", handle_set)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_profile(name: str, profile: TransportProfile, base_url: str,
+                      requests: int, concurrency: int) -> Dict[str, Any]:
+    service = TCGdexService(transport_profile=profile, base_url=base_url)
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            data = await service._request("/sets/sv4")
+            latencies.append((time.perf_counter() - start) * 1000)
+            assert data is not None
+    
+    try:
+        await one_request()  # Verbindungsaufbau nicht mitmessen
+        latencies.clear()
+        started = time.perf_counter()
+        await asyncio.gather(*(one_request() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+    finally:
+        await service.close()
+    
+    return {
+        "profile": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "throughput_rps": round(requests / elapsed, 1),
+        "latency_ms_mean": round(statistics.mean(latencies), 3),
+        "latency_ms_p50": round(_percentile(latencies, 50), 3),
+        "latency_ms_p95": round(_percentile(latencies, 95), 3),
+        "transport": service.transport_stats.as_dict()
+    }
+
+
+async def main(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    runner = await start_server(args.latency_ms, build_set_payload(args.cards))
+    port = runner.addresses[0][1]
+    base_url = f"http://127.0.0.1:{port}/v2/de"
+    try:
+        results = []
+        for name, profile in (("untuned", TransportProfile.untuned()), ("tuned", TransportProfile())):
+            results.append(await run_profile(name, profile, base_url, args.requests, args.concurrency))
+        return results
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=2.0)
+    parser.add_argument("--cards", type=int, default=200)
+    for result in asyncio.run(main(parser.parse_args())):
+        print(json.dumps(result))
@@ -0,0 +1,127 @@
+"""
+Importzeit-Bericht für den Kaltstart (python -X importtime)
+
+Startet einen frischen Interpreter, importiert bot.py und alle Extensions aus
+bot.EXTENSIONS wie beim Start vor der Gateway-Verbindung und fasst die
+Ausgabe von -X importtime zusammen: Gesamtzeit, teuerste Module und Zeit pro
+Paket. Module aus LAZY_MODULES werden erst bei Bedarf geladen und dürfen dabei
+nicht auftauchen.
+
+Gemessen wird der beste von mehreren Läufen, damit einzelne Ausreißer das
+Budget nicht reißen. Über dem Budget oder bei eager geladenen Lazy-Modulen
+endet der Aufruf mit Exit-Code 1.
+
+Aufruf:
+    python -m benchmarks.importtime [--budget-ms 800] [--runs 3] [--top 15] [--output report.json]
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Wird beim Start geladen: bot.py und die Extensions aus bot.EXTENSIONS
+STARTUP_SCRIPT = "import bot, importlib\nfor extension in bot.EXTENSIONS:\n    importlib.import_module(extension)\n"
+
+# Dürfen erst bei der ersten Nutzung importiert werden
+LAZY_MODULES = ("cogs.pokemon_wizard", "cogs.pokemon_tcg", "cogs.tcg_bulk", "cogs.pokemon_feedback", "aiohttp.web")
+
+DEFAULT_BUDGET_MS = 800.0
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportEntry:
+    """Eine Zeile aus -X importtime"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(lines: Iterable[str]) -> List[ImportEntry]:
+    """Liest die Zeilen von -X importtime; andere Ausgaben (z.B. Logs) werden übersprungen"""
+    entries = []
+    for line in lines:
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(ImportEntry(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def measure(script: str = STARTUP_SCRIPT, python: str = sys.executable) -> List[ImportEntry]:
+    """Führt das Skript in einem frischen Interpreter mit -X importtime aus"""
+    result = subprocess.run([python, "-X", "importtime", "-c", script], cwd=ROOT,
+                            capture_output=True, text=True, check=False)
+    if result.returncode != 0:
+        raise RuntimeError(f"Import fehlgeschlagen:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr.splitlines())
+
+
+def summarize(entries: List[ImportEntry], top: int = 15,
+              lazy_modules: Iterable[str] = LAZY_MODULES) -> Dict[str, Any]:
+    """Gesamtzeit, teuerste Module (nach Eigenzeit), Zeit pro Paket und eager geladene Lazy-Module"""
+    packages: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        packages[entry.module.split(".")[0]] += entry.self_us
+    loaded = {entry.module for entry in entries}
+    slowest = sorted(entries, key=lambda entry: entry.self_us, reverse=True)[:top]
+    return {
+        "total_ms": round(sum(entry.self_us for entry in entries) / 1000, 2),
+        "modules": len(entries),
+        "top_modules": [
+            {"module": entry.module, "self_ms": round(entry.self_us / 1000, 2),
+             "cumulative_ms": round(entry.cumulative_us / 1000, 2)}
+            for entry in slowest
+        ],
+        "packages_ms": {name: round(us / 1000, 2)
+                        for name, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]},
+        "eager_lazy_modules": sorted(module for module in lazy_modules if module in loaded)
+    }
+
+
+def check_budget(report: Dict[str, Any], budget_ms: float) -> List[str]:
+    """Gibt die Verstöße gegen Budget und Lazy-Loading zurück"""
+    problems = []
+    if report["total_ms"] > budget_ms:
+        problems.append(f"Importzeit {report['total_ms']:.1f} ms über dem Budget von {budget_ms:.0f} ms")
+    for module in report["eager_lazy_modules"]:
+        problems.append(f"{module} wird beim Start importiert, sollte aber erst bei Bedarf geladen werden")
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Importzeit-Bericht für den Kaltstart")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Budget für die Gesamtzeit")
+    parser.add_argument("--runs", type=int, default=3, help="Anzahl Läufe, gewertet wird der schnellste")
+    parser.add_argument("--top", type=int, default=15, help="Anzahl der aufgeführten Module und Pakete")
+    parser.add_argument("--output", help="Bericht zusätzlich als JSON-Datei schreiben")
+    args = parser.parse_args(argv)
+
+    runs = [summarize(measure(), top=args.top) for _ in range(max(1, args.runs))]
+    report = min(runs, key=lambda run: run["total_ms"])
+    report["runs_ms"] = [run["total_ms"] for run in runs]
+    report["budget_ms"] = args.budget_ms
+    problems = check_budget(report, args.budget_ms)
+    report["problems"] = problems
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    for problem in problems:
+        print(f"FEHLER: {problem}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,381 @@
+"""
+Synthetischer Lastgenerator für den Pokemon-Cog (ohne Discord)
+
+Simuliert viele gleichzeitige Nutzer auf mehreren Servern. Jeder Nutzer führt
+zufällig gewichtete Aktionen gegen den echten Cog-Code aus: Angebote und
+Wünsche erstellen, Listen öffnen und aktualisieren, Gegenangebote abgeben und
+erhaltene Gegenangebote annehmen. Discord wird durch die Ersatzobjekte aus
+tests/discord_fakes.py ersetzt; --api-latency-ms bildet die Round-Trips zu
+Discord nach.
+
+Ausgegeben wird ein JSON-Bericht mit Durchsatz, p50/p99 pro Aktion,
+Event-Loop-Verzögerung und Speicherzuwachs.
+
+Aufruf:
+    python -m benchmarks.load [--users 2000] [--actions 10] [--guilds 3] [--trace-memory]
+"""
+import argparse
+import asyncio
+import contextlib
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import discord
+
+from cogs.card_collection import CardCollection
+from cogs.market_views import CounterOfferResponseView, OfferSelect
+from cogs.metrics import open_view_count
+from cogs.pokemon import Pokemon
+from cogs.pokemon_wizard import PokemonSequentialView
+from cogs.trade_ledger import TradeLedger
+from tests.discord_fakes import FakeChannel, FakeClient, FakeContext, FakeGuild, FakeInteraction, FakeMember
+
+# Gewichtung der Aktionen (entspricht grob einem Tausch-Event: viel Stöbern, wenig Abschlüsse)
+DEFAULT_MIX = {
+    "list_offers": 25,
+    "list_wishes": 10,
+    "refresh": 15,
+    "create_offer": 15,
+    "create_wish": 10,
+    "counter_offer": 15,
+    "accept": 10
+}
+
+POKEMON_NAMES = ["Pikachu", "Glumanda", "Schiggy", "Bisasam", "Evoli", "Relaxo", "Mewtu", "Garados"]
+
+
+class Skipped(Exception):
+    """Aktion war im aktuellen Zustand nicht möglich (z.B. keine fremden Angebote)"""
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Perzentil einer sortierten Liste (nächster Rang)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize_ms(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round((values[-1] if values else 0.0) * 1000, 3)
+    }
+
+
+def rss_bytes() -> Optional[int]:
+    """Aktueller Resident Set Size des Prozesses (nur Linux), sonst None"""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class LoopLagMonitor:
+    """Misst, wie stark sich ein periodischer Timer auf dem Event-Loop verspätet"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+
+
+class LoadSimulation:
+    """Nutzer, Server und Messwerte eines Lastlaufs"""
+
+    def __init__(self, users: int, guilds: int = 1, api_latency: float = 0.0,
+                 mix: Optional[Dict[str, int]] = None, seed: int = 1):
+        self.random = random.Random(seed)
+        self.api_latency = api_latency
+        self.client = FakeClient()
+        self.cog = Pokemon(MagicMock())
+        # Tauschbuch im Speicher, damit Annahmen wie im Betrieb eingetragen werden
+        self.cog.ledger = TradeLedger(":memory:", poll_interval=0)
+        self.cog.ledger.open()
+        self.cog.collection = CardCollection(":memory:")
+        self.cog.collection.open()
+        self.client.add_cog(self.cog)
+
+        self.channels = []
+        for g in range(guilds):
+            guild = FakeGuild(f"Server {g + 1}")
+            self.channels.append(FakeChannel(guild, latency=api_latency))
+        self.members: List[FakeMember] = []
+        self.member_channel: Dict[int, FakeChannel] = {}
+        for u in range(users):
+            member = FakeMember(f"Trainer{u + 1}", latency=api_latency)
+            channel = self.channels[u % guilds]
+            channel.guild.add_member(member)
+            self.members.append(member)
+            self.member_channel[member.id] = channel
+        # Zuletzt gesehene Angebotsliste pro Nutzer (für Aktualisieren und Gegenangebote)
+        self.list_views: Dict[int, discord.ui.View] = {}
+
+        self.mix = mix or DEFAULT_MIX
+        self.actions: Dict[str, Callable[[FakeMember], Awaitable[None]]] = {
+            "list_offers": self.list_offers,
+            "list_wishes": self.list_wishes,
+            "refresh": self.refresh,
+            "create_offer": self.create_offer,
+            "create_wish": self.create_wish,
+            "counter_offer": self.counter_offer,
+            "accept": self.accept
+        }
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+        self.skipped: Dict[str, int] = defaultdict(int)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.error_samples: List[str] = []
+        self.trades = 0
+
+    # ---------- Hilfen ----------
+
+    def interaction(self, member: FakeMember, values: Optional[List[str]] = None) -> FakeInteraction:
+        return FakeInteraction(self.client, member, self.member_channel[member.id], values, self.api_latency)
+
+    async def press(self, view: discord.ui.View, item: discord.ui.Item, interaction: FakeInteraction) -> None:
+        """Löst ein View-Item wie Discord aus; Fehler im Callback werden weitergereicht"""
+        failures: List[Exception] = []
+
+        async def on_error(_interaction, error, _item):
+            failures.append(error)
+
+        view.on_error = on_error
+        await view._scheduled_task(item, interaction)
+        if failures:
+            raise failures[0]
+
+    def pokemon(self, member: FakeMember) -> Dict[str, Any]:
+        return {
+            "name": self.random.choice(POKEMON_NAMES),
+            "hp": self.random.randrange(30, 340, 10),
+            "type": self.random.choice(list(self.cog.pokemon_types.values())),
+            "phase": self.random.choice(list(self.cog.pokemon_phases.values())),
+            "rarity": self.random.choice(list(self.cog.rarity_levels.values())),
+            "user": member
+        }
+
+    # ---------- Aktionen ----------
+
+    async def create_offer(self, member: FakeMember) -> None:
+        view = PokemonSequentialView(self.cog)
+        view.pokemon_data = self.pokemon(member)
+        await view.create_final_offer(self.interaction(member))
+
+    async def create_wish(self, member: FakeMember) -> None:
+        wish = self.pokemon(member)
+        if self.random.random() < 0.5:
+            wish["offer_included"] = True
+            wish["offer_data"] = self.pokemon(member)
+        await self.cog.create_final_wish(self.interaction(member), wish)
+
+    async def list_offers(self, member: FakeMember) -> None:
+        interaction = self.interaction(member)
+        await self.cog.show_offers_list(interaction)
+        self._remember_list(member, interaction)
+
+    async def list_wishes(self, member: FakeMember) -> None:
+        # Die Wunschliste wird über den Präfix-Befehl !wünsche geöffnet
+        ctx = FakeContext(self.client, member, self.member_channel[member.id], "!wünsche")
+        await self.cog.list_wishes.callback(self.cog, ctx)
+
+    async def refresh(self, member: FakeMember) -> None:
+        view = self.list_views.get(member.id)
+        if view is None:
+            raise Skipped()
+        interaction = self.interaction(member)
+        await self.press(view, view.refresh_offers, interaction)
+        self._remember_list(member, interaction)
+
+    async def counter_offer(self, member: FakeMember) -> None:
+        """Angebot aus der Liste wählen, Gegenangebot erstellen und an den Anbieter senden"""
+        view = self.list_views.get(member.id)
+        select = next((child for child in view.children if isinstance(child, OfferSelect)), None) if view else None
+        if select is None:
+            raise Skipped()
+        candidates = [
+            option.value for option in select.options
+            if int(option.value) in select.offers and select.offers[int(option.value)]["user"] is not member
+        ]
+        if not candidates:
+            raise Skipped()
+
+        interaction = self.interaction(member, values=[self.random.choice(candidates)])
+        await self.press(view, select, interaction)
+        reaction_view = interaction.response.view
+        if reaction_view is None:
+            # Angebot ist seit dem Öffnen der Liste für ein anderes Gegenangebot reserviert
+            raise Skipped()
+
+        interaction = self.interaction(member)
+        await self.press(reaction_view, reaction_view.create_counter_offer, interaction)
+        sequential_view = interaction.response.view
+
+        sequential_view.pokemon_data = self.pokemon(member)
+        await sequential_view.create_counter_offer_message(self.interaction(member))
+
+    async def accept(self, member: FakeMember) -> None:
+        """Ältestes offenes Gegenangebot aus den Direktnachrichten annehmen"""
+        while member.inbox:
+            message = member.inbox.popleft()
+            if isinstance(message.view, CounterOfferResponseView):
+                interaction = self.interaction(member)
+                await self.press(message.view, message.view.accept_counter_offer, interaction)
+                if interaction.response.kind != "edit_message":
+                    # Eintrag war schon vergeben (früheres Gegenangebot angenommen)
+                    raise Skipped()
+                self.trades += 1
+                return
+        raise Skipped()
+
+    def _remember_list(self, member: FakeMember, interaction: FakeInteraction) -> None:
+        if interaction.response.view is not None:
+            self.list_views[member.id] = interaction.response.view
+        else:
+            self.list_views.pop(member.id, None)
+
+    # ---------- Ablauf ----------
+
+    async def run_action(self, name: str, member: FakeMember) -> None:
+        started = time.perf_counter()
+        try:
+            await self.actions[name](member)
+        except Skipped:
+            self.skipped[name] += 1
+            return
+        except Exception as e:  # Lastlauf soll weiterlaufen und Fehler zählen
+            self.errors[name] += 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append(f"{name}: {type(e).__name__}: {e}")
+            return
+        self.timings[name].append(time.perf_counter() - started)
+
+    async def user_session(self, member: FakeMember, actions: int, think_time: float) -> None:
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        for _ in range(actions):
+            # Auch ohne Denkpause abgeben, damit sich die Nutzer abwechseln
+            await asyncio.sleep(self.random.uniform(0, 2 * think_time) if think_time else 0)
+            await self.run_action(self.random.choices(names, weights)[0], member)
+
+    async def run(self, actions: int, think_time: float = 0.0, trace_memory: bool = False) -> Dict[str, Any]:
+        gc.collect()
+        if trace_memory:
+            tracemalloc.start()
+        rss_before = rss_bytes()
+        monitor = LoopLagMonitor()
+        monitor.start()
+
+        started = time.perf_counter()
+        # Der Cog meldet erfolgreiche Tausche per print; die Ausgabe wäre hier nur Rauschen
+        with contextlib.redirect_stdout(open(os.devnull, "w", encoding="utf-8")) as devnull:
+            await asyncio.gather(*(self.user_session(m, actions, think_time) for m in self.members))
+            devnull.close()
+        elapsed = time.perf_counter() - started
+
+        await monitor.stop()
+        memory: Dict[str, Any] = {}
+        if trace_memory:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            memory.update(traced_current_bytes=current, traced_peak_bytes=peak)
+        gc.collect()
+        rss_after = rss_bytes()
+        if rss_before is not None and rss_after is not None:
+            memory.update(rss_before_bytes=rss_before, rss_after_bytes=rss_after,
+                          rss_growth_bytes=rss_after - rss_before)
+
+        completed = sum(len(values) for values in self.timings.values())
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "throughput_ops_per_s": round(completed / elapsed, 1) if elapsed else None,
+            "completed": completed,
+            "operations": {
+                name: {
+                    "count": len(self.timings.get(name, [])),
+                    "skipped": self.skipped.get(name, 0),
+                    "errors": self.errors.get(name, 0),
+                    **summarize_ms(self.timings.get(name, []))
+                }
+                for name in self.actions
+            },
+            "event_loop_lag": {"samples": len(monitor.samples), **summarize_ms(monitor.samples)},
+            "memory": memory,
+            "market": {
+                "active_offers": len(self.cog.market.offers),
+                "active_wishes": len(self.cog.market.wishes),
+                "trades": self.trades,
+                "open_views": open_view_count()
+            },
+            "error_samples": self.error_samples
+        }
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    simulation = LoadSimulation(args.users, args.guilds, args.api_latency_ms / 1000, seed=args.seed)
+    report = await simulation.run(args.actions, args.think_ms / 1000, args.trace_memory)
+    report["meta"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "users": args.users,
+        "guilds": args.guilds,
+        "actions_per_user": args.actions,
+        "api_latency_ms": args.api_latency_ms,
+        "think_ms": args.think_ms,
+        "mix": simulation.mix
+    }
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=2000, help="Gleichzeitige simulierte Nutzer")
+    parser.add_argument("--actions", type=int, default=10, help="Aktionen pro Nutzer")
+    parser.add_argument("--guilds", type=int, default=3, help="Anzahl der Server")
+    parser.add_argument("--api-latency-ms", type=float, default=50.0, help="Simulierte Discord-API-Latenz")
+    parser.add_argument("--think-ms", type=float, default=500.0, help="Mittlere Pause zwischen zwei Aktionen")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Speicher mit tracemalloc messen (verlangsamt den Lauf deutlich)")
+    parser.add_argument("--output", help="Bericht zusätzlich in diese Datei schreiben")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    return 1 if any(op["errors"] for op in report["operations"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
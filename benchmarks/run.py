@@ -0,0 +1,410 @@
+"""
+Offline-Benchmark-Suite für die heißen Pfade von TCGdexService und Markt
+
+Alle Benchmarks laufen ohne Netzwerk: API-Aufrufe gehen an den lokalen
+Ersatzserver aus tests/fake_tcgdex_server.py, Kartendaten stammen aus dessen
+deterministischem Korpus.
+
+Neue heiße Pfade (z.B. Matching und Suche) werden mit @benchmark registriert.
+
+Ergebnisse werden als JSON ausgegeben. Mit --save-baseline wird das Ergebnis
+unter benchmarks/baselines/ abgelegt; existiert eine Baseline, werden die
+Werte verglichen und Verschlechterungen über der Toleranz gemeldet
+(Exit-Code 1).
+
+Aufruf:
+    python -m benchmarks.run [--quick] [--only extract_card_info] [--save-baseline]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from unittest.mock import MagicMock
+
+from discord.ext import commands
+from discord.state import ChunkRequest
+
+from cogs.gateway import gateway_options
+from cogs.market_journal import OP_ADD, OP_REMOVE, JournaledMarketState, MarketJournal
+from cogs.market_state import encode_entry
+from cogs.pokemon import Pokemon
+from cogs.tcgdex_service import TCGdexService, TransportProfile, TransportStats
+from cogs.tcgdex_transport import ArchiveReader, ArchiveWriter, LiveTransport, RecordingTransport, ReplayTransport
+from tests.fake_tcgdex_server import FakeTCGdexServer, build_corpus
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+BenchmarkFunc = Callable[[argparse.Namespace], Awaitable[List[Dict[str, Any]]]]
+BENCHMARKS: Dict[str, BenchmarkFunc] = {}
+
+
+def benchmark(name: str) -> Callable[[BenchmarkFunc], BenchmarkFunc]:
+    """Registriert eine Benchmark-Funktion unter ``name``"""
+    def decorator(func: BenchmarkFunc) -> BenchmarkFunc:
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def result(name: str, params: Dict[str, Any], per_op_seconds: List[float]) -> Dict[str, Any]:
+    """Fasst die Runden eines Benchmarks zusammen (Median ist der Vergleichswert)"""
+    median = statistics.median(per_op_seconds)
+    return {
+        "name": name,
+        "params": params,
+        "unit": "us_per_op",
+        "value": round(median * 1e6, 3),
+        "min": round(min(per_op_seconds) * 1e6, 3),
+        "max": round(max(per_op_seconds) * 1e6, 3),
+        "ops_per_sec": round(1 / median, 1) if median else None,
+        "rounds": len(per_op_seconds)
+    }
+
+
+def time_rounds(func: Callable[[], Any], ops: int, rounds: int) -> List[float]:
+    """Führt ``func`` pro Runde einmal aus und liefert die Zeit pro Operation"""
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) / ops)
+    return timings
+
+
+# ============= Benchmarks =============
+
+@benchmark("extract_card_info")
+async def bench_extract_card_info(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    cards = list(build_corpus()["cards"].values())
+    service = TCGdexService()
+
+    def run():
+        for card in cards:
+            service.extract_card_info(card)
+
+    return [result("extract_card_info", {"cards": len(cards)}, time_rounds(run, len(cards), args.rounds))]
+
+
+@benchmark("get_sets_by_year")
+async def bench_get_sets_by_year(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    async with FakeTCGdexServer(latency=args.latency_ms / 1000) as server:
+        for mode, cache_ttl in (("cold", {}), ("warm", None)):
+            service = TCGdexService(cache_ttl=cache_ttl, base_url=server.base_url)
+            timings = []
+            try:
+                if mode == "warm":
+                    await service.get_sets_by_year(2023)
+                for _ in range(args.rounds):
+                    started = time.perf_counter()
+                    sets, error = await service.get_sets_by_year(2023)
+                    timings.append(time.perf_counter() - started)
+                    assert sets and error is None, error
+            finally:
+                await service.close()
+            results.append(result(
+                "get_sets_by_year",
+                {"mode": mode, "sets": len(server.corpus["sets"]), "latency_ms": args.latency_ms},
+                timings
+            ))
+
+        # Einmal aufzeichnen, danach ohne Server in voller Geschwindigkeit abspielen
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sets.tcga")
+            recorder = RecordingTransport(LiveTransport(TransportProfile(), TransportStats()), path)
+            service = TCGdexService(cache_ttl={}, base_url=server.base_url, transport=recorder)
+            await service.get_sets_by_year(2023)
+            await service.close()
+
+            timings = []
+            for _ in range(args.rounds):
+                service = TCGdexService(cache_ttl={}, transport=ReplayTransport(path))
+                started = time.perf_counter()
+                sets, error = await service.get_sets_by_year(2023)
+                timings.append(time.perf_counter() - started)
+                await service.close()
+                assert sets and error is None, error
+            results.append(result(
+                "get_sets_by_year",
+                {"mode": "replay", "sets": len(server.corpus["sets"])},
+                timings
+            ))
+    return results
+
+
+@benchmark("archive_replay")
+async def bench_archive_replay(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    cards = list(build_corpus()["cards"].values())
+    entries = 10_000 if args.quick else 100_000
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cards.tcga")
+        writer = ArchiveWriter(path)
+        for i in range(entries):
+            card = cards[i % len(cards)]
+            writer.append(f"/cards/{card['id']}-{i}", 200, json.dumps(card).encode("utf-8"))
+        writer.close()
+        keys = [f"/cards/{cards[i % len(cards)]['id']}-{i}" for i in range(0, entries, entries // 1000)]
+
+        def open_archive():
+            ArchiveReader(path).close()
+
+        reader = ArchiveReader(path)
+
+        def read_entries():
+            for key in keys:
+                reader.read(key)
+
+        results.append(result("archive_replay", {"op": "open", "entries": entries},
+                              time_rounds(open_archive, 1, args.rounds)))
+        results.append(result("archive_replay", {"op": "read", "entries": entries},
+                              time_rounds(read_entries, len(keys), args.rounds)))
+        reader.close()
+    return results
+
+
+def _populate_market(cog: Pokemon, entries: int, guild_id: int) -> None:
+    types = list(cog.pokemon_types.values())
+    rarities = list(cog.rarity_levels.values())
+    user = MagicMock(name="user")
+    for i in range(1, entries + 1):
+        entry = {
+            "name": f"Pokemon {i}",
+            "hp": 30 + (i % 30) * 10,
+            "type": types[i % len(types)],
+            "phase": "Basis",
+            "rarity": rarities[i % len(rarities)],
+            "user": user,
+            "guild_id": guild_id,
+            "created_at": None
+        }
+        cog.market.offers.add(entry)
+        cog.market.wishes.add({**entry, "offer_included": i % 2 == 0})
+
+
+@benchmark("market_list_render")
+async def bench_market_list_render(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    results = []
+    sizes = (10, 1_000) if args.quick else (10, 1_000, 100_000)
+    for size in sizes:
+        cog = Pokemon(MagicMock())
+        _populate_market(cog, size, guild_id=1)
+        rounds = max(3, args.rounds if size < 100_000 else args.rounds // 4)
+        for list_name, build in (("offers", cog.build_offers_list), ("wishes", cog.build_wishes_list)):
+            results.append(result(
+                "market_list_render",
+                {"list": list_name, "entries": size},
+                time_rounds(lambda: build(1), 1, rounds)
+            ))
+    return results
+
+
+@benchmark("journal_replay")
+async def bench_journal_replay(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    events = 100_000 if args.quick else 1_000_000
+    payload = encode_entry({
+        "name": "Pikachu", "hp": 60, "type": "Elektro", "phase": "Basis", "rarity": "Häufig",
+        "user": {"__user__": {"id": 1, "name": "trainer", "display_name": "Trainer", "avatar_url": ""}},
+        "guild_id": 1, "channel_id": 2, "created_at": {"__datetime__": "2025-01-01T00:00:00+00:00"}
+    }).encode("utf-8")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Wie im Betrieb: die meisten Angebote werden wieder entfernt (getauscht oder zurückgezogen)
+        journal = MarketJournal(tmp)
+        added = removed = 0
+        for i in range(events):
+            if i % 5 < 3:
+                added += 1
+                journal.append(OP_ADD, 1, 1 + added % 50, added, payload)
+            else:
+                removed += 1
+                journal.append(OP_REMOVE, 1, 1 + removed % 50, removed)
+        journal.close()
+
+        def replay():
+            JournaledMarketState(tmp).journal.close()
+
+        rounds = max(3, args.rounds // 3)
+        return [result("journal_replay", {"events": events}, time_rounds(replay, events, rounds))]
+
+
+def _member_payload(i: int) -> Dict[str, Any]:
+    return {
+        "user": {"id": str(10**17 + i), "username": f"trainer{i}", "discriminator": "0",
+                 "global_name": f"Trainer {i}", "avatar": None},
+        "nick": None, "roles": [], "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False, "mute": False, "flags": 0
+    }
+
+
+def _presence_payload(i: int) -> Dict[str, Any]:
+    return {"user": {"id": str(10**17 + i)}, "status": ("online", "idle", "offline")[i % 3],
+            "activities": [], "client_status": {"desktop": "online"}}
+
+
+def _guild_payload(guild_id: int, members: int) -> Dict[str, Any]:
+    return {
+        "id": str(guild_id), "name": "Tauschbörse", "owner_id": "1", "roles": [], "emojis": [],
+        "stickers": [], "features": [], "member_count": members, "members": [], "channels": [],
+        "presences": [], "large": True, "premium_tier": 0, "preferred_locale": "de",
+        "verification_level": 0, "default_message_notifications": 0, "explicit_content_filter": 0,
+        "mfa_level": 0, "nsfw_level": 0, "system_channel_flags": 0
+    }
+
+
+def _feed_chunks(state: Any, guild_id: int, members: int, presences: bool, cache: bool) -> ChunkRequest:
+    """Spielt Discords GUILD_MEMBERS_CHUNK-Antworten (je 1000 Mitglieder) in den State ein"""
+    request = ChunkRequest(guild_id, 0, asyncio.get_running_loop(), state._get_guild, cache=cache)
+    state._chunk_requests[request.nonce] = request
+    chunk_count = (members + 999) // 1000
+    for index in range(chunk_count):
+        ids = range(index * 1000, min(members, (index + 1) * 1000))
+        state.parse_guild_members_chunk({
+            "guild_id": str(guild_id), "nonce": request.nonce,
+            "chunk_index": index, "chunk_count": chunk_count,
+            "members": [_member_payload(i) for i in ids],
+            "presences": [_presence_payload(i) for i in ids] if presences else []
+        })
+    return request
+
+
+@benchmark("gateway_memory")
+async def bench_gateway_memory(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Dauerhaft gehaltener Speicher pro 10k Mitglieder im vollen und im Lean-Modus
+
+    Voll: Chunking beim Start mit Presences, Mitglieder bleiben im Cache.
+    Lean: beim Start nichts; !user lädt einmal ohne Cache (Spitze wird separat gemeldet).
+    Gemessen mit tracemalloc, d.h. Python-Objekte ohne Interpreter-Grundlast.
+    """
+    members = 10_000
+    guild_id = 900
+    results = []
+    for mode in ("full", "lean"):
+        lean = mode == "lean"
+        bot = commands.Bot(command_prefix="!", **gateway_options(lean))
+        state = bot._connection
+        tracemalloc.start()
+        guild = state._add_guild_from_data(_guild_payload(guild_id, members))
+        if not lean:
+            _feed_chunks(state, guild_id, members, presences=True, cache=True)
+        retained, _ = tracemalloc.get_traced_memory()
+
+        peak = retained
+        if lean:
+            # !user im Lean-Modus: einmalige Abfrage ohne Cache
+            tracemalloc.reset_peak()
+            request = _feed_chunks(state, guild_id, members, presences=False, cache=False)
+            _, peak = tracemalloc.get_traced_memory()
+            del request
+        tracemalloc.stop()
+
+        cached = len(guild.members)
+        results.append({
+            "name": "gateway_memory",
+            "params": {"mode": mode, "members": members},
+            "unit": "bytes_retained",
+            "value": retained,
+            "peak_bytes": peak,
+            "cached_members": cached
+        })
+
+        if not lean:
+            # Presence-Updates treffen nur den vollen Modus
+            updates = [{**_presence_payload(i + 1), "guild_id": str(guild_id)} for i in range(members)]
+
+            def apply_presences():
+                for update in updates:
+                    state.parse_presence_update(update)
+
+            results.append(result("presence_update", {"members": members},
+                                  time_rounds(apply_presences, members, max(3, args.rounds // 3))))
+        bot._connection.clear()
+    return results
+
+
+# ============= Ausführung und Baselines =============
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Liefert eine Meldung pro Ergebnis, das langsamer als Baseline * (1 + tolerance) ist"""
+    baseline_values = {
+        (entry["name"], json.dumps(entry["params"], sort_keys=True)): entry["value"]
+        for entry in baseline.get("results", [])
+    }
+    regressions = []
+    for entry in results:
+        previous = baseline_values.get((entry["name"], json.dumps(entry["params"], sort_keys=True)))
+        if previous is None:
+            continue
+        entry["baseline"] = previous
+        entry["change"] = round(entry["value"] / previous - 1, 3) if previous else None
+        if previous and entry["value"] > previous * (1 + tolerance):
+            regressions.append(
+                f"{entry['name']} {entry['params']}: {entry['value']}us statt {previous}us "
+                f"({entry['change']:+.0%})"
+            )
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    selected = args.only or list(BENCHMARKS)
+    results: List[Dict[str, Any]] = []
+    for name in selected:
+        results.extend(await BENCHMARKS[name](args))
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "quick": args.quick
+        },
+        "results": results
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS), help="Nur diese Benchmarks ausführen")
+    parser.add_argument("--rounds", type=int, default=9)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Latenz des Ersatzservers")
+    parser.add_argument("--quick", action="store_true", help="Große Varianten (100k Einträge) überspringen")
+    parser.add_argument("--baseline", default="default", help="Name der Baseline-Datei")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte Verschlechterung (0.25 = 25%%)")
+    parser.add_argument("--output", help="Ergebnis zusätzlich in diese Datei schreiben")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    baseline_path = os.path.join(BASELINE_DIR, f"{args.baseline}.json")
+
+    regressions: List[str] = []
+    if args.save_baseline:
+        os.makedirs(BASELINE_DIR, exist_ok=True)
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    elif os.path.exists(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            regressions = compare(report["results"], json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    print(output)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+
+    for message in regressions:
+        print(f"REGRESSION: {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
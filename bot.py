@@ -1,8 +1,19 @@
+import time
+# Vor den übrigen Imports, damit die Startzeit bis zum Gateway sie mit erfasst
+STARTED_AT = time.monotonic()
+
 import discord
 from discord.ext import commands
+import io
 import os
+from datetime import datetime, timezone
 from dotenv import load_dotenv
 import logging
+from config import Config
+from cogs.command_sync import CommandSyncState, sync_command_tree
+from cogs.gateway import MemberSnapshotCache, gateway_options
+from cogs.metrics import REGISTRY, InstrumentedCommandTree, MetricsServer, install_command_hooks
+from cogs.tracing import TRACER
 
 # Load environment variables
 load_dotenv()
@@ -17,35 +28,90 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Bot configuration
-intents = discord.Intents.default()
-intents.message_content = True
-intents.members = True
-intents.presences = True  # Für Online/Offline-Status
+def create_bot():
+    """Erstellt den Bot; mit SHARD_COUNT/SHARD_IDS als AutoShardedBot"""
+    options = dict(
+        command_prefix='!', help_command=None,
+        tree_cls=InstrumentedCommandTree,
+        # Der Status wird beim Identify jeder (neuen) Gateway-Verbindung mitgesendet
+        activity=discord.Game(name="Pokemon Trading | !help | !bieten"),
+        # Intents und Member-Cache (LEAN_GATEWAY=1 verzichtet auf Presences und Member-Cache)
+        **gateway_options(Config.LEAN_GATEWAY)
+    )
+    try:
+        Config.validate_sharding()
+    except ValueError as e:
+        # Ohne Sharding erstellen, damit der Import gelingt; main() beendet mit derselben Meldung
+        logger.error(f"Invalid configuration: {e}")
+        return commands.Bot(**options)
+    if Config.sharded():
+        return commands.AutoShardedBot(shard_count=Config.shard_count(), shard_ids=Config.shard_ids(), **options)
+    return commands.Bot(**options)
 
 # Create bot instance (without default help command)
-bot = commands.Bot(command_prefix='!', intents=intents, help_command=None)
+bot = create_bot()
+install_command_hooks(bot)
+member_snapshots = MemberSnapshotCache(bot, lean=Config.LEAN_GATEWAY)
+
+# Bereitschaft pro Shard (shard_id -> Zeitpunkt); nur im Sharding-Modus befüllt
+shard_ready_since = {}
+# Anzahl der on_ready-Events seit dem Start (ab dem zweiten: neue Gateway-Sitzung)
+ready_count = 0
+
+@bot.event
+async def setup_hook():
+    """Läuft einmal nach dem Login, vor der ersten Gateway-Verbindung"""
+    # TCGdex-Daten im Hintergrund vorwärmen; die Gateway-Verbindung wartet nicht darauf
+    pokemon = bot.get_cog('Pokemon')
+    if pokemon is not None:
+        pokemon.warmup.start()
+    
+    # Slash-Commands nur synchronisieren, wenn sich ihre Signaturen seit dem letzten Sync geändert haben
+    try:
+        outcome = await sync_command_tree(
+            bot.tree, bot.application_id, CommandSyncState(Config.COMMAND_SYNC_STATE),
+            force=Config.FORCE_COMMAND_SYNC
+        )
+        logger.info(f'🔁 Slash command sync: {outcome}')
+    except Exception as e:
+        logger.error(f'❌ Failed to sync slash commands: {e}')
 
 @bot.event
 async def on_ready():
-    """Event that runs when the bot is ready"""
-    logger.info(f'✅ {bot.user} has connected to Discord!')
+    """Event that runs when the bot is ready (nach Reconnects ggf. erneut)"""
+    global ready_count
+    ready_count += 1
+    if ready_count > 1:
+        # Neue Sitzung nach Verbindungsabbruch: Status und Commands sind bereits gesetzt
+        logger.info(f'🔄 Gateway session re-established (on_ready #{ready_count})')
+        return
+    
+    startup_seconds = time.monotonic() - STARTED_AT
+    REGISTRY.gauge("bot_startup_seconds", "Zeit vom Start von bot.py bis zum ersten on_ready").set(startup_seconds)
+    logger.info(f'✅ {bot.user} has connected to Discord! (nach {startup_seconds:.2f}s)')
     logger.info(f'📊 Bot is in {len(bot.guilds)} guilds')
     logger.info(f'👥 Serving {len(bot.users)} users')
-    
-    # Set bot status
-    activity = discord.Game(name="Pokemon Trading | !help | !bieten")
-    await bot.change_presence(activity=activity)
+    if bot.shard_count:
+        logger.info(f'🧩 Shards: {_format_shard_ids(bot)} von {bot.shard_count}')
     
     # Log loaded cogs
     logger.info(f'🔧 Loaded cogs: {list(bot.cogs.keys())}')
-    
-    # Sync slash commands
-    try:
-        synced = await bot.tree.sync()
-        logger.info(f'✅ Synced {len(synced)} slash command(s)')
-    except Exception as e:
-        logger.error(f'❌ Failed to sync slash commands: {e}')
+
+@bot.event
+async def on_shard_ready(shard_id):
+    shard_ready_since[shard_id] = datetime.now(timezone.utc)
+    guilds = sum(1 for guild in bot.guilds if guild.shard_id == shard_id)
+    logger.info(f'🧩 Shard {shard_id} ready ({guilds} guilds)')
+
+@bot.event
+async def on_shard_resumed(shard_id):
+    shard_ready_since.setdefault(shard_id, datetime.now(timezone.utc))
+    logger.info(f'🧩 Shard {shard_id} resumed')
+
+@bot.event
+async def on_shard_disconnect(shard_id):
+    shard_ready_since.pop(shard_id, None)
+    logger.warning(f'🧩 Shard {shard_id} disconnected')
 
 @bot.event
 async def on_command_error(ctx, error):
@@ -92,7 +158,11 @@ async def help_command(ctx):
         name="🎴 TCG-Karten Trading (Slash Commands)",
         value=(
             "`/anbieten-tcg` - Biete eine Pokemon TCG-Karte zum Tausch an\n"
+            "`/anbieten-tcg-liste` - Biete viele TCG-Karten auf einmal an (Liste oder CSV)\n"
+            "`/sammlung` - Deine TCG-Sammlung und fehlende Karten pro Set\n"
+            "`/sammeln` - Welche fehlenden Karten eines Sets gerade angeboten werden\n"
             "`/wünschen-tcg` - Erstelle einen Wunsch für eine Pokemon TCG-Karte\n"
+            "`/trends` - Meistgesuchte und meistangebotene Pokemon (24h/7d/30d)\n"
             "\n*TCG-Commands nutzen echte Kartendaten aus der TCGdx API*"
         ),
         inline=False
@@ -137,6 +207,8 @@ async def admin_help_command(ctx):
         name="ℹ️ Bot Information",
         value=(
             "`!info` - Zeige Bot-Statistiken\n"
+            "`!metriken` - Zeige Latenz-Metriken\n"
+            "`!traces [trace_id]` - Zeige aufgezeichnete Traces\n"
             "`!ping` - Prüfe Bot-Latenz\n"
             "`!admin_help` - Zeige diese Admin-Hilfe"
         ),
@@ -148,7 +220,7 @@ async def admin_help_command(ctx):
         name="🔧 Admin-Befehle",
         value=(
             "`!test_fehler_kanal` - Teste Fehler-Kanal Konfiguration\n"
-            "`!user` - Zeige alle User auf dem Server"
+            "`!user [seite]` - Zeige alle User auf dem Server (seitenweise)"
         ),
         inline=False
     )
@@ -187,62 +259,91 @@ async def admin_help_command(ctx):
     except:
         pass
 
+# Mitgliederverzeichnis für !user aktuell halten (nur im vollen Gateway-Modus aufgebaut)
+@bot.listen()
+async def on_member_join(member):
+    member_snapshots.directory.add(member.guild.id, member)
+
+@bot.listen()
+async def on_member_remove(member):
+    member_snapshots.directory.remove(member.guild.id, member.id)
+
+@bot.listen()
+async def on_member_update(before, after):
+    member_snapshots.directory.update(after.guild.id, after)
+
+@bot.listen()
+async def on_presence_update(before, after):
+    member_snapshots.directory.update(after.guild.id, after)
+
+@bot.listen()
+async def on_user_update(before, after):
+    if before.name != after.name:
+        member_snapshots.directory.update_user(after)
+
+@bot.listen()
+async def on_guild_remove(guild):
+    member_snapshots.directory.drop_guild(guild.id)
+
 @bot.command(name='user')
 @commands.has_permissions(administrator=True)
-async def list_users(ctx):
-    """Zeige alle User auf dem Server (nur für Admins)"""
+async def list_users(ctx, seite: int = 1):
+    """Zeige alle User auf dem Server seitenweise (nur für Admins)"""
     guild = ctx.guild
     
     if not guild:
         await ctx.send("Dieser Befehl kann nur auf einem Server verwendet werden!")
         return
     
-    # Sortiere User nach Namen
-    members = sorted(guild.members, key=lambda m: m.name.lower())
-    
-    # Filtere Bots aus (nur Menschen zeigen)
-    humans = [m for m in members if not m.bot]
-    bots = [m for m in members if m.bot]
+    snapshot = await member_snapshots.get(guild, page=seite)
     
     embed = discord.Embed(
         title=f"👥 User-Liste - {guild.name}",
-        description=f"Insgesamt **{len(humans)}** Menschen auf diesem Server",
+        description=f"Insgesamt **{snapshot.humans}** Menschen auf diesem Server",
         color=0x3498db
     )
     
-    # Statistiken über Menschen
-    online_humans = [m for m in humans if m.status != discord.Status.offline]
-    offline_humans = [m for m in humans if m.status == discord.Status.offline]
-    
-    # Statistiken
+    # Statistiken (im Lean-Modus ohne Presences nur ungefähre Online-Anzahl)
+    if snapshot.online_humans is not None:
+        status_lines = (
+            f"🟢 Online: **{snapshot.online_humans}**\n"
+            f"⚫ Offline: **{snapshot.humans - snapshot.online_humans}**"
+        )
+    elif snapshot.approximate_online is not None:
+        status_lines = f"🟢 Online (ca., inkl. Bots): **{snapshot.approximate_online}**"
+    else:
+        status_lines = "🟢 Online: unbekannt"
     embed.add_field(
         name="📊 Statistiken",
         value=(
-            f"👤 Menschen: **{len(humans)}**\n"
-            f"🤖 Bots: **{len(bots)}** (versteckt)\n"
-            f"🟢 Online: **{len(online_humans)}**\n"
-            f"⚫ Offline: **{len(offline_humans)}**"
+            f"👤 Menschen: **{snapshot.humans}**\n"
+            f"🤖 Bots: **{snapshot.bots}** (versteckt)\n"
+            f"{status_lines}"
         ),
         inline=False
     )
     
-    # Zeige nur Menschen in der User-Liste (maximal 15 pro Nachricht)
+    # Zeige nur Menschen in der User-Liste (eine Seite pro Nachricht)
     user_list = []
-    for i, member in enumerate(humans[:15], 1):
-        status_emoji = "🟢" if member.status != discord.Status.offline else "⚫"
-        user_list.append(f"{status_emoji} {member.name} ({member.mention})")
+    for name, mention, status in snapshot.page_humans:
+        if status is None:
+            status_emoji = "👤"
+        else:
+            status_emoji = "🟢" if status != discord.Status.offline else "⚫"
+        user_list.append(f"{status_emoji} {name} ({mention})")
     
     if user_list:
+        first = (snapshot.page - 1) * snapshot.page_size + 1
         embed.add_field(
-            name=f"👥 Echte User (Zeige {min(15, len(humans))} von {len(humans)})",
+            name=f"👥 Echte User (Zeige {first}-{first + len(user_list) - 1} von {snapshot.humans})",
             value="\n".join(user_list),
             inline=False
         )
     
-    if len(humans) > 15:
+    if snapshot.pages > 1:
         embed.add_field(
             name="ℹ️ Hinweis",
-            value=f"Es werden nur die ersten 15 User angezeigt. Insgesamt gibt es {len(humans)} Menschen.",
+            value=f"Seite {snapshot.page} von {snapshot.pages}. Weitere Seiten mit `!user <seite>`.",
             inline=False
         )
     
@@ -271,6 +372,13 @@ async def info(ctx):
     embed.add_field(name="Server Count", value=len(bot.guilds), inline=True)
     embed.add_field(name="User Count", value=len(bot.users), inline=True)
     embed.add_field(name="Latency", value=f"{round(bot.latency * 1000)}ms", inline=True)
+    
+    if bot.shard_count:
+        embed.add_field(
+            name=f"🧩 Shards ({_format_shard_ids(bot)} von {bot.shard_count})",
+            value=_format_shard_status(bot, ctx.guild),
+            inline=False
+        )
     embed.set_footer(text=f"Bot ID: {bot.user.id}")
     
     await ctx.send(embed=embed)
@@ -279,22 +387,171 @@ async def info(ctx):
     except:
         pass
 
-# Load cogs
-async def load_cogs():
-    """Load all cogs from the cogs directory"""
-    cogs_dir = os.path.join(os.path.dirname(__file__), 'cogs')
+def _format_shard_ids(bot):
+    """Shard-IDs dieses Prozesses als kompakte Bereiche, z.B. 0-3, 8"""
+    shard_ids = sorted(getattr(bot, 'shard_ids', None) or range(bot.shard_count or 1))
+    ranges = []
+    for shard_id in shard_ids:
+        if ranges and shard_id == ranges[-1][1] + 1:
+            ranges[-1][1] = shard_id
+        else:
+            ranges.append([shard_id, shard_id])
+    return ", ".join(str(a) if a == b else f"{a}-{b}" for a, b in ranges)
+
+def _format_shard_status(bot, current_guild=None, limit=15):
+    """Eine Zeile pro Shard mit Bereitschaft, Latenz, Servern und Markteinträgen"""
+    guild_ids = {}
+    for guild in bot.guilds:
+        guild_ids.setdefault(guild.shard_id, []).append(guild.id)
     
-    if not os.path.exists(cogs_dir):
-        logger.warning("Cogs directory not found, skipping cog loading")
+    pokemon = bot.get_cog('Pokemon')
+    lines = []
+    for shard_id, latency in sorted(bot.latencies)[:limit]:
+        shard = bot.get_shard(shard_id)
+        ready = shard_id in shard_ready_since and shard is not None and not shard.is_closed()
+        line = (
+            f"{'🟢' if ready else '🔴'} **#{shard_id}** {round(latency * 1000)}ms | "
+            f"{len(guild_ids.get(shard_id, []))} Server"
+        )
+        if pokemon:
+            counts = pokemon.market.count_for_guilds(guild_ids.get(shard_id, []))
+            line += f" | {counts['offers']} Angebote, {counts['wishes']} Wünsche"
+        if current_guild and current_guild.shard_id == shard_id:
+            line += " ⬅️"
+        lines.append(line)
+    if len(bot.latencies) > limit:
+        lines.append(f"… und {len(bot.latencies) - limit} weitere")
+    return "\n".join(lines) or "Keine Shards verbunden"
+
+def _format_latencies(histograms, label, limit=8):
+    """Formatiert die langsamsten Histogramme als Zeilen mit Anzahl, p50 und p95"""
+    active = [h for h in histograms if h.count]
+    active.sort(key=lambda h: h.quantile(0.95), reverse=True)
+    lines = []
+    for histogram in active[:limit]:
+        name = dict(histogram.labels).get(label, "?")
+        lines.append(
+            f"`{name}` – {histogram.count}× | p50 {histogram.quantile(0.5) * 1000:.0f}ms"
+            f" | p95 {histogram.quantile(0.95) * 1000:.0f}ms"
+        )
+    return "\n".join(lines) or "Noch keine Daten"
+
+@bot.command(name='metriken')
+@commands.has_permissions(administrator=True)
+async def show_metrics(ctx):
+    """Zeige Latenz-Metriken für Befehle, Views und die TCGdex API (nur für Admins)"""
+    embed = discord.Embed(
+        title="📈 Metriken",
+        description="Latenzen seit dem letzten Neustart (p50/p95 aus Histogrammen geschätzt)",
+        color=0x9b59b6
+    )
+    embed.add_field(
+        name="⌨️ Befehle",
+        value=_format_latencies(REGISTRY.histograms("discord_command_seconds"), "command"),
+        inline=False
+    )
+    embed.add_field(
+        name="🖱️ View-Callbacks",
+        value=_format_latencies(REGISTRY.histograms("discord_view_callback_seconds"), "item"),
+        inline=False
+    )
+    embed.add_field(
+        name="🎴 TCGdex API",
+        value=_format_latencies(REGISTRY.histograms("tcgdex_api_request_seconds"), "route"),
+        inline=False
+    )
+    
+    gauges = []
+    for name, title, is_ratio in (
+        ("market_active_offers", "Angebote", False),
+        ("market_active_wishes", "Wünsche", False),
+        ("discord_open_views", "Offene Views", False),
+        ("tcgdex_cache_hit_ratio", "Cache-Trefferquote", True),
+        ("tcgdex_connection_reuse_ratio", "Verbindungs-Wiederverwendung", True),
+    ):
+        for gauge in REGISTRY.gauges(name):
+            value = gauge.read()
+            gauges.append(f"**{title}:** {value:.0%}" if is_ratio else f"**{title}:** {value:.0f}")
+    embed.add_field(name="📊 Zustand", value="\n".join(gauges) or "Keine Daten", inline=False)
+    
+    embed.set_footer(
+        text=f"Prometheus: http://{Config.METRICS_HOST}:{Config.METRICS_PORT}/metrics"
+        if Config.METRICS_PORT else "Prometheus-Endpunkt deaktiviert"
+    )
+    
+    await ctx.send(embed=embed)
+    try:
+        await ctx.message.delete()
+    except:
+        pass
+
+def _format_trace_tree(spans):
+    """Formatiert die Spans eines Traces als eingerückten Baum"""
+    children = {}
+    span_ids = {span["span_id"] for span in spans}
+    for span in spans:
+        parent = span["parent_id"] if span["parent_id"] in span_ids else None
+        children.setdefault(parent, []).append(span)
+    
+    lines = []
+    def walk(parent, depth):
+        for span in children.get(parent, []):
+            marker = " ❌" if span["error"] else ""
+            lines.append(f"{'  ' * depth}{span['name']} {span['duration_ms']:.1f}ms{marker}")
+            walk(span["span_id"], depth + 1)
+    walk(None, 0)
+    return "\n".join(lines)
+
+@bot.command(name='traces')
+@commands.has_permissions(administrator=True)
+async def show_traces(ctx, trace_id: str = None):
+    """Zeige aufgezeichnete Traces oder den Span-Baum eines Traces (nur für Admins)"""
+    if trace_id:
+        spans = TRACER.buffer.trace(trace_id)
+        if not spans:
+            await ctx.send(f"Kein Trace mit ID `{trace_id}` im Puffer gefunden.")
+            return
+        tree = _format_trace_tree(spans)
+        if len(tree) > 1900:
+            tree = tree[:1900] + "\n…"
+        await ctx.send(f"🧵 Trace `{trace_id}` ({len(spans)} Spans)\n```\n{tree}\n```")
         return
     
-    for filename in os.listdir(cogs_dir):
-        if filename.endswith('.py') and not filename.startswith('__'):
-            try:
-                await bot.load_extension(f'cogs.{filename[:-3]}')
-                logger.info(f'Loaded cog: {filename}')
-            except Exception as e:
-                logger.error(f'Failed to load cog {filename}: {e}')
+    embed = discord.Embed(
+        title="🧵 Traces",
+        description=(
+            f"Sampling-Rate: **{TRACER.sample_rate:.0%}** | "
+            f"Gepufferte Spans: **{len(TRACER.buffer.spans)}**"
+        ),
+        color=0x9b59b6
+    )
+    roots = TRACER.buffer.recent_roots(10)
+    embed.add_field(
+        name="🕒 Letzte Interaktionen",
+        value="\n".join(
+            f"`{root['trace_id']}` {root['name']} – {root['duration_ms']:.0f}ms" + (" ❌" if root["error"] else "")
+            for root in roots
+        ) or "Noch keine Traces aufgezeichnet",
+        inline=False
+    )
+    embed.set_footer(text="Details: !traces <trace_id> | Alle Spans im Anhang (JSONL)")
+    
+    dump = io.BytesIO(TRACER.buffer.dump().encode("utf-8"))
+    await ctx.send(embed=embed, file=discord.File(dump, filename="traces.jsonl"))
+
+# Load cogs
+# Explizite Liste statt os.listdir: Hilfsmodule (Markt, Views, TCGdex) werden
+# nicht beim Start durchprobiert, sondern von den Cogs importiert, teils erst bei Bedarf
+EXTENSIONS = ['cogs.pokemon']
+
+async def load_cogs():
+    """Load all cogs listed in EXTENSIONS"""
+    for extension in EXTENSIONS:
+        try:
+            await bot.load_extension(extension)
+            logger.info(f'Loaded cog: {extension}')
+        except Exception as e:
+            logger.error(f'Failed to load cog {extension}: {e}')
 
 # Main function
 async def main():
@@ -307,9 +564,25 @@ async def main():
         logger.error("Example: DISCORD_TOKEN=your_token_here")
         return
     
+    try:
+        Config.validate()
+    except ValueError as e:
+        logger.error(f"Invalid configuration: {e}")
+        return
+    
     # Load cogs
     await load_cogs()
     
+    # Start metrics endpoint
+    metrics_server = None
+    if Config.METRICS_PORT:
+        metrics_server = MetricsServer(REGISTRY, Config.METRICS_HOST, Config.METRICS_PORT)
+        try:
+            await metrics_server.start()
+        except OSError as e:
+            logger.error(f"Failed to start metrics endpoint: {e}")
+            metrics_server = None
+    
     # Start the bot
     try:
         await bot.start(token)
@@ -317,6 +590,9 @@ async def main():
         logger.error("Invalid Discord token! Please check your .env file")
     except Exception as e:
         logger.error(f"Failed to start bot: {e}")
+    finally:
+        if metrics_server:
+            await metrics_server.stop()
 
 if __name__ == "__main__":
     import asyncio
@@ -0,0 +1,246 @@
+"""
+Sammlungen: welche TCG-Karten ein Nutzer besitzt
+
+Pro Nutzer und Set ein Bitset (Python-int) über die Kartenliste des Sets
+(``SetCards``: Bit i = i-te Karte im Set). Vollständigkeit, fehlende Karten
+und "Karten, die du hast und X sucht" sind damit Bitoperationen statt
+Schleifen über Einträge; der Speicher liegt bei einem Bit pro Karte und Set
+plus einem Eintrag pro Set des Nutzers.
+
+In SQLite liegt je (Nutzer, Set) eine Zeile mit dem Bitset als BLOB (Little
+Endian). Schreibzugriffe lesen das Bitset innerhalb der Transaktion neu, damit
+sich gleichzeitige Änderungen mehrerer Prozesse nicht überschreiben; Lesen
+geht an den Speicher. Jede Änderung landet zusätzlich im Änderungsprotokoll
+``collection_changes``: erkennt ``refresh()`` über ``PRAGMA data_version``,
+dass ein anderer Prozess geschrieben hat, liest es nur die dort genannten
+(Nutzer, Set)-Zeilen neu. Komplett neu geladen wird nur, wenn das Protokoll
+gekürzt wurde, bevor es gelesen war.
+
+Die Sammlung liegt in einer eigenen Datei, damit Schreibzugriffe auf Markt
+und Tauschbuch anderer Prozesse ``data_version`` hier nicht verändern.
+
+Konfiguration über Umgebungsvariablen:
+    COLLECTION_DB=collection.db   Datei der Sammlungen
+"""
+import logging
+import os
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+from .tcgdex_service import SetCards
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS collections (
+    user_id INTEGER NOT NULL,
+    set_id TEXT NOT NULL,
+    bits BLOB NOT NULL,
+    PRIMARY KEY (user_id, set_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS collection_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    set_id TEXT NOT NULL,
+    origin TEXT NOT NULL
+);
+"""
+
+# Änderungsprotokoll: so viele Einträge bleiben mindestens erhalten
+CHANGE_LOG_KEEP = 10_000
+
+
+def _to_blob(bits: int) -> bytes:
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def _from_blob(blob: bytes) -> int:
+    return int.from_bytes(blob, "little")
+
+
+class CardCollection:
+    """Besitz aller Nutzer als Bitsets pro Set, gespeichert in SQLite"""
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.db: Optional[sqlite3.Connection] = None
+        self.origin = uuid.uuid4().hex
+        # user_id -> set_id -> Bitset
+        self._owned: Dict[int, Dict[str, int]] = {}
+        self._data_version = 0
+        self._last_seq = 0
+
+    # ---------- Lebenszyklus ----------
+
+    def open(self) -> None:
+        """Öffnet die Datei, legt das Schema an und lädt alle Bitsets"""
+        if self.db is not None:
+            return
+        self.db = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction() as db:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+        self._reload()
+
+    async def start(self) -> None:
+        self.open()
+
+    async def close(self) -> None:
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Schreibtransaktion mit sofortiger Sperre (wartet bis busy_timeout)"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def _reload(self) -> None:
+        owned: Dict[int, Dict[str, int]] = {}
+        self.db.execute("BEGIN")
+        try:
+            for user_id, set_id, blob in self.db.execute("SELECT user_id, set_id, bits FROM collections"):
+                owned.setdefault(user_id, {})[set_id] = _from_blob(blob)
+            self._last_seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM collection_changes").fetchone()[0]
+        finally:
+            self.db.execute("COMMIT")
+        self._owned = owned
+        self._data_version = self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> int:
+        """Liest die von anderen Prozessen geänderten Bitsets neu und gibt ihre Anzahl zurück"""
+        if self.db is None:
+            return 0
+        version = self.db.execute("PRAGMA data_version").fetchone()[0]
+        if version == self._data_version:
+            return 0
+        self._data_version = version
+
+        oldest = self.db.execute("SELECT MIN(seq) FROM collection_changes").fetchone()[0]
+        if oldest is not None and oldest > self._last_seq + 1:
+            # Protokoll wurde gekürzt, bevor wir es gelesen haben
+            logger.info("Änderungsprotokoll der Sammlung %s gekürzt, lade komplett neu", self.path)
+            self._reload()
+            return len(self._owned)
+
+        rows = self.db.execute(
+            "SELECT seq, user_id, set_id, origin FROM collection_changes WHERE seq > ? ORDER BY seq",
+            (self._last_seq,)
+        ).fetchall()
+        changed = set()
+        for seq, user_id, set_id, origin in rows:
+            self._last_seq = seq
+            if origin != self.origin:
+                changed.add((user_id, set_id))
+        for user_id, set_id in changed:
+            row = self.db.execute(
+                "SELECT bits FROM collections WHERE user_id = ? AND set_id = ?", (user_id, set_id)
+            ).fetchone()
+            self._remember(user_id, {set_id: _from_blob(row[0]) if row else 0})
+        return len(changed)
+
+    def _log_change(self, db: sqlite3.Connection, user_id: int, set_id: str) -> None:
+        seq = db.execute(
+            "INSERT INTO collection_changes (user_id, set_id, origin) VALUES (?, ?, ?)",
+            (user_id, set_id, self.origin)
+        ).lastrowid
+        if seq % 1000 == 0:
+            db.execute("DELETE FROM collection_changes WHERE seq <= ?", (seq - CHANGE_LOG_KEEP,))
+
+    # ---------- Schreiben ----------
+
+    def update(self, user_id: int, set_id: str, add: int = 0, remove: int = 0) -> int:
+        """Setzt bzw. löscht Bits im Bitset eines Sets und gibt das neue Bitset zurück"""
+        if self.db is None:
+            raise RuntimeError("Sammlung nicht geöffnet")
+        with self.transaction() as db:
+            bits = self._apply(db, user_id, set_id, add, remove)
+        self._remember(user_id, {set_id: bits})
+        return bits
+
+    def add_many(self, user_id: int, bits_by_set: Dict[str, int]) -> None:
+        """Setzt Bits in mehreren Sets in einer Transaktion (z.B. aus einer importierten Liste)"""
+        if self.db is None:
+            raise RuntimeError("Sammlung nicht geöffnet")
+        with self.transaction() as db:
+            stored = {set_id: self._apply(db, user_id, set_id, bits, 0) for set_id, bits in bits_by_set.items() if bits}
+        self._remember(user_id, stored)
+
+    def _apply(self, db: sqlite3.Connection, user_id: int, set_id: str, add: int, remove: int) -> int:
+        row = db.execute(
+            "SELECT bits FROM collections WHERE user_id = ? AND set_id = ?", (user_id, set_id)
+        ).fetchone()
+        before = _from_blob(row[0]) if row else 0
+        bits = (before | add) & ~remove
+        if bits == before:
+            return bits
+        self._log_change(db, user_id, set_id)
+        if bits:
+            db.execute(
+                "INSERT INTO collections (user_id, set_id, bits) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id, set_id) DO UPDATE SET bits = excluded.bits",
+                (user_id, set_id, _to_blob(bits))
+            )
+        elif row:
+            db.execute("DELETE FROM collections WHERE user_id = ? AND set_id = ?", (user_id, set_id))
+        return bits
+
+    def _remember(self, user_id: int, stored: Dict[str, int]) -> None:
+        # Erst nach dem Commit in den Speicher übernehmen
+        sets = self._owned.setdefault(user_id, {})
+        for set_id, bits in stored.items():
+            if bits:
+                sets[set_id] = bits
+            else:
+                sets.pop(set_id, None)
+
+    # ---------- Lesen ----------
+
+    def owned(self, user_id: int, set_id: str) -> int:
+        """Bitset der Karten, die ``user_id`` im Set besitzt"""
+        self.refresh()
+        return self._owned.get(user_id, {}).get(set_id, 0)
+
+    def sets(self, user_id: int) -> Dict[str, int]:
+        """Alle Sets eines Nutzers mit ihrem Bitset (nicht verändern)"""
+        self.refresh()
+        return self._owned.get(user_id, {})
+
+    def completion(self, user_id: int, cards: SetCards) -> Tuple[int, int]:
+        """(besessene Karten, Karten im Set)"""
+        return (self.owned(user_id, cards.set_id) & cards.mask).bit_count(), len(cards)
+
+    def missing(self, user_id: int, cards: SetCards) -> int:
+        """Bitset der Karten, die ``user_id`` im Set noch fehlen"""
+        return cards.mask & ~self.owned(user_id, cards.set_id)
+
+    def wanted_from(self, user_id: int, other_id: int) -> Dict[str, int]:
+        """
+        Karten, die ``user_id`` hat und ``other_id`` sucht, pro Set
+
+        Gesucht sind die fehlenden Karten der Sets, die ``other_id`` sammelt
+        (also mindestens eine Karte daraus besitzt).
+        """
+        mine = self.sets(user_id)
+        return {
+            set_id: bits
+            for set_id, theirs in self.sets(other_id).items()
+            if (bits := mine.get(set_id, 0) & ~theirs)
+        }
+
+
+def card_collection_from_env() -> CardCollection:
+    """Erstellt die Sammlung aus den Umgebungsvariablen (siehe Moduldocstring)"""
+    return CardCollection(os.getenv("COLLECTION_DB", "collection.db"))
@@ -0,0 +1,96 @@
+"""
+Slash-Command-Sync nur bei Änderungen
+
+Der Sync-Endpunkt von Discord ist stark rate-limitiert. Statt bei jedem Start
+(oder gar jedem on_ready) zu synchronisieren, wird pro Bereich (global bzw.
+pro Guild) ein stabiler Hash der Command-Signaturen gebildet und lokal
+gespeichert. Synchronisiert wird nur, wenn sich der Hash geändert hat.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Iterable, List, Optional
+
+import discord
+from discord import app_commands
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = "global"
+
+
+def command_tree_hash(tree: app_commands.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """Hash über die Payloads aller Commands eines Bereichs (unabhängig von der Reihenfolge)"""
+    payloads = [command.to_dict(tree) for command in tree.get_commands(guild=guild)]
+    payloads.sort(key=lambda payload: (payload.get("type", 1), payload["name"]))
+    encoded = json.dumps(payloads, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CommandSyncState:
+    """Zuletzt synchronisierte Hashes pro Anwendung und Bereich (JSON-Datei)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._data: Dict[str, Dict[str, str]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning("Sync-Zustand %s unlesbar, synchronisiere neu: %s", self.path, e)
+            return {}
+
+    def get(self, application_id: int, scope: str) -> Optional[str]:
+        return self._data.get(str(application_id), {}).get(scope)
+
+    def set(self, application_id: int, scope: str, digest: str) -> None:
+        self._data.setdefault(str(application_id), {})[scope] = digest
+        # Atomar schreiben, damit ein Abbruch keinen halben Zustand hinterlässt
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def _guild_scopes(tree: app_commands.CommandTree) -> List[int]:
+    # discord.py bietet keine öffentliche Liste der Guilds mit eigenen Commands
+    return sorted(getattr(tree, "_guild_commands", {}))
+
+
+async def sync_command_tree(tree: app_commands.CommandTree, application_id: int, state: CommandSyncState,
+                            guild_ids: Optional[Iterable[int]] = None, force: bool = False) -> Dict[str, str]:
+    """
+    Synchronisiert global und pro Guild nur die Bereiche, deren Hash sich geändert hat
+
+    Returns:
+        Dict Bereich -> "synced", "skipped" oder "failed"
+    """
+    scopes: List[Optional[int]] = [None, *(guild_ids if guild_ids is not None else _guild_scopes(tree))]
+    outcome: Dict[str, str] = {}
+    for guild_id in scopes:
+        guild = discord.Object(id=guild_id) if guild_id is not None else None
+        scope = GLOBAL_SCOPE if guild_id is None else str(guild_id)
+        digest = command_tree_hash(tree, guild)
+        if not force and state.get(application_id, scope) == digest:
+            outcome[scope] = "skipped"
+        else:
+            try:
+                synced = await tree.sync(guild=guild)
+            except discord.HTTPException as e:
+                logger.error("Sync der Slash-Commands (%s) fehlgeschlagen: %s", scope, e)
+                outcome[scope] = "failed"
+            else:
+                state.set(application_id, scope, digest)
+                logger.info("%d Slash-Command(s) synchronisiert (%s)", len(synced), scope)
+                outcome[scope] = "synced"
+        REGISTRY.counter("discord_command_sync_total", "Slash-Command-Syncs nach Ergebnis",
+                         result=outcome[scope]).inc()
+    return outcome
@@ -0,0 +1,33 @@
+"""
+Sperren pro Angebot/Wunsch über ``await``-Punkte hinweg
+
+Eine feste Anzahl asyncio.Locks, auf die Schlüssel (z.B. ``("offers", 17)``)
+per Hash verteilt werden. Der Speicher bleibt damit unabhängig von der Zahl
+der Einträge begrenzt; zwei Schlüssel auf demselben Streifen warten
+gelegentlich unnötig aufeinander, was bei kurzen kritischen Abschnitten
+nicht ins Gewicht fällt.
+
+Es darf immer nur eine Sperre gleichzeitig gehalten werden (verschachtelt
+könnten zwei Schlüssel auf demselben Streifen sich selbst blockieren).
+"""
+import asyncio
+from typing import Hashable, List
+
+from .metrics import REGISTRY
+
+
+class StripedLocks:
+    """Feste Menge von Sperren, Schlüssel werden per Hash verteilt"""
+
+    def __init__(self, stripes: int = 256):
+        self._locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock(self, key: Hashable) -> asyncio.Lock:
+        """Sperre für ``key``; gleiche Schlüssel erhalten immer dieselbe Sperre"""
+        lock = self._locks[hash(key) % len(self._locks)]
+        if lock.locked():
+            REGISTRY.counter("market_entry_lock_waits_total", "Zugriffe, die auf die Sperre eines Eintrags warten mussten").inc()
+        return lock
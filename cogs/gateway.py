@@ -0,0 +1,167 @@
+"""
+Gateway-Einstellungen (Intents, Member-Cache) und Mitglieder-Snapshots für !user
+
+Voller Modus: members- und presences-Intent, alle Mitglieder werden beim Start
+per Chunking geladen und dauerhaft mit ihrem Status im Speicher gehalten.
+
+Lean-Modus (LEAN_GATEWAY=1): kein presences-Intent (keine Presence-Updates),
+kein Member-Cache und kein Chunking beim Start. Das members-Intent bleibt
+aktiv, weil Discord Mitgliederlisten nur damit ausliefert; !user lädt die
+Mitglieder bei Bedarf ohne Cache und hält pro Guild nur eine sortierte
+Namensliste für kurze Zeit, aus der alle Seiten geschnitten werden. Den
+Online-Status gibt es dann nur als ungefähre Anzahl der Guild.
+
+Im vollen Modus liest !user aus dem laufend gepflegten Mitgliederverzeichnis
+(cogs/member_directory.py) statt bei jedem Aufruf alle Mitglieder zu sortieren.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import discord
+
+from .member_directory import GuildDirectory, MemberDirectory
+
+logger = logging.getLogger(__name__)
+
+
+def build_intents(lean: bool = False) -> discord.Intents:
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    intents.presences = not lean  # Für Online/Offline-Status
+    return intents
+
+
+def gateway_options(lean: bool = False) -> Dict[str, Any]:
+    """Keyword-Argumente für ``commands.Bot`` je nach Modus"""
+    intents = build_intents(lean)
+    return {
+        'intents': intents,
+        'member_cache_flags': discord.MemberCacheFlags.none() if lean else discord.MemberCacheFlags.from_intents(intents),
+        'chunk_guilds_at_startup': not lean
+    }
+
+
+@dataclass
+class MemberSnapshot:
+    """Zusammenfassung der Mitglieder einer Guild für !user"""
+    humans: int
+    bots: int
+    # Menschen der Seite nach Namen: (Name, Erwähnung, Status oder None im Lean-Modus)
+    page_humans: List[Tuple[str, str, Optional[discord.Status]]]
+    # Voller Modus: Menschen online; Lean-Modus: None
+    online_humans: Optional[int] = None
+    # Lean-Modus: ungefähre Anzahl online laut Discord (inkl. Bots)
+    approximate_online: Optional[int] = None
+    page: int = 1
+    page_size: int = 15
+    taken_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def pages(self) -> int:
+        return max(1, math.ceil(self.humans / self.page_size))
+
+
+@dataclass
+class GuildSummary:
+    """Lean-Modus: sortierte Menschen einer Guild, gemeinsam für alle Seiten von !user"""
+    humans: List[Tuple[str, str]]
+    bots: int
+    approximate_online: Optional[int] = None
+    taken_at: float = field(default_factory=time.monotonic)
+
+
+class MemberSnapshotCache:
+    """Liefert Mitglieder-Snapshots seitenweise, im vollen Modus aus dem Verzeichnis,
+    im Lean-Modus per Chunking und kurz gecacht"""
+
+    def __init__(self, client: Any, lean: bool = False, ttl: float = 60.0, listed: int = 15):
+        self.client = client
+        self.lean = lean
+        self.ttl = ttl
+        self.listed = listed
+        # Wird im Lean-Modus nie aufgebaut, Events laufen dann ins Leere
+        self.directory = MemberDirectory()
+        # Lean-Modus: Guild-ID -> Zusammenfassung; abgelaufene werden beim nächsten Abruf verworfen
+        self._summaries: Dict[int, GuildSummary] = {}
+        self._locks: Dict[int, asyncio.Lock] = {}
+
+    async def get(self, guild: Any, page: int = 1) -> MemberSnapshot:
+        page = max(1, page)
+        if not self.lean:
+            directory = self.directory.get(guild)
+            if directory is not None:
+                return self._from_directory(directory, page)
+            # Member-Cache noch unvollständig (Chunking läuft): einmalig aus dem Cache zusammenfassen
+            return self._summarize(guild.members, with_status=True, page=page)
+
+        self._evict_expired()
+        summary = self._summaries.get(guild.id)
+        if summary is None:
+            # Gleichzeitige Aufrufe (auch für verschiedene Seiten) teilen sich eine Abfrage
+            lock = self._locks.setdefault(guild.id, asyncio.Lock())
+            async with lock:
+                summary = self._summaries.get(guild.id)
+                if summary is None:
+                    summary = self._summaries[guild.id] = await self._fetch_summary(guild)
+            if not lock.locked():
+                self._locks.pop(guild.id, None)
+        return self._from_summary(summary, page)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        for guild_id in [g for g, summary in self._summaries.items() if now - summary.taken_at >= self.ttl]:
+            del self._summaries[guild_id]
+
+    async def _fetch_summary(self, guild: Any) -> GuildSummary:
+        members = await guild.chunk(cache=False)
+        humans = sorted((m for m in members if not m.bot), key=lambda m: (m.name.lower(), m.id))
+        summary = GuildSummary([(m.name, m.mention) for m in humans], len(members) - len(humans))
+        try:
+            counted = await self.client.fetch_guild(guild.id, with_counts=True)
+            summary.approximate_online = counted.approximate_presence_count
+        except discord.HTTPException as e:
+            logger.warning("Online-Anzahl für Guild %s nicht abrufbar: %s", guild.id, e)
+        return summary
+
+    def _from_summary(self, summary: GuildSummary, page: int) -> MemberSnapshot:
+        start = (page - 1) * self.listed
+        return MemberSnapshot(
+            humans=len(summary.humans),
+            bots=summary.bots,
+            page_humans=[(name, mention, None) for name, mention in summary.humans[start:start + self.listed]],
+            approximate_online=summary.approximate_online,
+            page=page,
+            page_size=self.listed,
+            taken_at=summary.taken_at
+        )
+
+    def _from_directory(self, directory: GuildDirectory, page: int) -> MemberSnapshot:
+        entries = directory.page((page - 1) * self.listed, self.listed)
+        return MemberSnapshot(
+            humans=directory.humans,
+            bots=directory.bots,
+            page_humans=[(e.name, e.mention, discord.Status.online if e.online else discord.Status.offline)
+                         for e in entries],
+            online_humans=directory.online_humans,
+            page=page,
+            page_size=self.listed
+        )
+
+    def _summarize(self, members: List[Any], with_status: bool, page: int = 1) -> MemberSnapshot:
+        humans = [m for m in members if not m.bot]
+        first = heapq.nsmallest(self.listed * page, humans, key=lambda m: (m.name.lower(), m.id))
+        return MemberSnapshot(
+            humans=len(humans),
+            bots=len(members) - len(humans),
+            page_humans=[(m.name, m.mention, m.status if with_status else None)
+                         for m in first[(page - 1) * self.listed:]],
+            online_humans=sum(1 for m in humans if m.status != discord.Status.offline) if with_status else None,
+            page=page,
+            page_size=self.listed
+        )
@@ -0,0 +1,148 @@
+"""
+Reservierungen von Angeboten und Wünschen während einer Verhandlung
+
+Solange ein Gegenangebot beim Ersteller auf Antwort wartet, ist der Eintrag
+reserviert: ``held_until`` (Unix-Zeit) und ``held_by`` (Nutzer-ID) stehen im
+Eintrag selbst und werden wie jede andere Änderung versioniert gespeichert
+(``MarketBook.update``). Listen und Indizes überspringen reservierte Einträge
+mit ``is_held``, statt sie zu löschen.
+
+Freigegeben wird durch Ablehnen des Gegenangebots oder nach Ablauf durch
+einen gemeinsamen HoldScheduler: ein Heap nach Ablaufzeit und eine einzige
+Aufgabe, die bis zum frühesten Ablauf schläft, statt eines Timeouts pro View.
+Veraltete Heap-Einträge (schon freigegeben, angenommen, neu reserviert)
+scheitern beim Freigeben am Compare-and-Swap auf die Version und werden
+übersprungen. Ein abgelaufener, noch nicht freigegebener Eintrag gilt für
+``is_held`` bereits als frei.
+
+Konfiguration über Umgebungsvariablen:
+    MARKET_HOLD_MINUTES=60   Dauer einer Reservierung
+"""
+import asyncio
+import heapq
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# Felder, die eine Reservierung aufheben
+RELEASED = {'held_until': None, 'held_by': None}
+
+
+def is_held(entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """True, solange der Eintrag für eine Verhandlung reserviert ist"""
+    held_until = entry.get('held_until')
+    return held_until is not None and held_until > (time.time() if now is None else now)
+
+
+class HoldScheduler:
+    """Setzt Reservierungen und gibt abgelaufene gemeinsam frei"""
+
+    def __init__(self, market: Any, hold_seconds: float = 3600.0):
+        self.market = market
+        self.hold_seconds = hold_seconds
+        # (Ablaufzeit, kind, entry_id, Version nach dem Reservieren)
+        self._heap: List[Tuple[float, str, int, int]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def hold(self, kind: str, entry_id: int, holder_id: int) -> Optional[int]:
+        """
+        Reserviert einen Eintrag für ``holder_id``
+
+        Returns:
+            Version nach dem Reservieren oder None, falls der Eintrag fehlt oder
+            schon für jemand anderen reserviert ist
+        """
+        book = getattr(self.market, kind)
+        entry = book.get(entry_id)
+        if entry is None or (is_held(entry) and entry.get('held_by') != holder_id):
+            return None
+        held_until = time.time() + self.hold_seconds
+        version = book.update(entry_id, {'held_until': held_until, 'held_by': holder_id}, entry.get('version'))
+        if version is not None:
+            self.schedule(held_until, kind, entry_id, version)
+        return version
+
+    def release(self, kind: str, entry_id: int, holder_id: Optional[int] = None) -> bool:
+        """Hebt eine Reservierung auf (mit ``holder_id`` nur die dieses Nutzers)"""
+        book = getattr(self.market, kind)
+        entry = book.get(entry_id)
+        if entry is None or entry.get('held_until') is None:
+            return False
+        if holder_id is not None and entry.get('held_by') != holder_id:
+            return False
+        return book.update(entry_id, RELEASED, entry.get('version')) is not None
+
+    def schedule(self, held_until: float, kind: str, entry_id: int, version: int) -> None:
+        """Merkt eine Reservierung zur Freigabe vor; weckt die Aufgabe, wenn sie nun als erste abläuft"""
+        heapq.heappush(self._heap, (held_until, kind, entry_id, version))
+        if self._heap[0][0] == held_until:
+            self._wakeup.set()
+
+    def release_expired(self, now: Optional[float] = None) -> int:
+        """Gibt alle bis ``now`` abgelaufenen Reservierungen frei und gibt ihre Anzahl zurück"""
+        now = time.time() if now is None else now
+        released = 0
+        while self._heap and self._heap[0][0] <= now:
+            _, kind, entry_id, version = self._heap[0]
+            # Erst nach dem Freigeben entnehmen: scheitert es (Datei gesperrt), bleibt der Eintrag vorgemerkt
+            freed = getattr(self.market, kind).update(entry_id, RELEASED, version) is not None
+            heapq.heappop(self._heap)
+            if freed:
+                released += 1
+        if released:
+            REGISTRY.counter("market_holds_expired_total", "Abgelaufene Reservierungen").inc(released)
+            logger.debug("%d abgelaufene Reservierungen freigegeben", released)
+        return released
+
+    def reschedule(self) -> int:
+        """Plant gespeicherte Reservierungen neu ein (nach einem Neustart)"""
+        scheduled = 0
+        for kind in ('offers', 'wishes'):
+            book = getattr(self.market, kind)
+            for entry in book:
+                if entry.get('held_until') is not None:
+                    self.schedule(entry['held_until'], kind, entry[book.id_key], entry.get('version'))
+                    scheduled += 1
+        return scheduled
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.market.call(self.release_expired)
+            except Exception:
+                logger.exception("Freigabe abgelaufener Reservierungen fehlgeschlagen")
+            self._wakeup.clear()
+            timeout = max(0.0, self._heap[0][0] - time.time()) if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        """Plant gespeicherte Reservierungen ein und startet die Freigabe im Hintergrund"""
+        if self._task is None:
+            self.reschedule()
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+def hold_scheduler_from_env(market: Any) -> HoldScheduler:
+    """HoldScheduler mit der Dauer aus MARKET_HOLD_MINUTES (Standard 60)"""
+    return HoldScheduler(market, float(os.getenv("MARKET_HOLD_MINUTES", "60")) * 60)
@@ -0,0 +1,474 @@
+"""
+Ereignisjournal für den Marktzustand (MARKET_BACKEND=journal)
+
+Jede Änderung an Angeboten und Wünschen (Anlegen, Ändern, Entfernen, Verwerfen
+einer Guild) wird als Ereignis an das Journal angehängt, bevor die Listener aus
+``MarketState.subscribe`` (z.B. die Trends) davon erfahren. Beim Start wird
+der Zustand aus dem letzten Snapshot und den danach geschriebenen Ereignissen
+wiederhergestellt.
+
+- Schreiben: gepuffert, fsync gesammelt alle ``fsync_interval`` Sekunden und
+  beim Schließen. Bei einem Absturz gehen höchstens die Ereignisse dieses
+  Intervalls verloren. Im Hintergrund läuft nur der Flush in den Seitencache
+  auf dem Event-Loop; ``fsync`` und das Schreiben von Snapshots laufen in
+  einem Worker-Thread (auf eigenen Kopien der Dateideskriptoren), damit eine
+  langsame Platte Heartbeats und Interaktionen nicht aufhält.
+- Segmente: ab ``segment_bytes`` beginnt ein neues Segment, benannt nach
+  seiner ersten Sequenznummer.
+- Snapshots: nach ``snapshot_every`` Ereignissen wird der Zustand kompakt
+  (nur lebende Einträge) geschrieben; ältere Segmente und Snapshots entfallen.
+- Wiederherstellung: Einträge bleiben während des Replays rohe Bytes, dekodiert
+  werden nur die, die am Ende noch leben. Ein abgerissener Datensatz am Ende
+  des letzten Segments (Absturz beim Schreiben) wird abgeschnitten.
+
+Format (Big Endian):
+    Segment:   b"MKTJ" + Version (1 Byte), danach Datensätze
+    Snapshot:  b"MKTS" + Version (1 Byte), seq (Q), Zähler Angebote (Q),
+               Zähler Wünsche (Q), danach Datensätze (nur op=add)
+    Datensatz: crc32 über den Rest (I), seq (Q), op (B), kind (B),
+               guild_id (q, INT64_MIN = keine), entry_id (Q), payload_len (I),
+               payload (Eintrag als JSON, UTF-8; leer außer bei op=add/update)
+
+Konfiguration über Umgebungsvariablen:
+    MARKET_JOURNAL=<verzeichnis>         (Standard: market_journal)
+    MARKET_JOURNAL_FSYNC_MS=50           Abstand der gesammelten fsyncs
+    MARKET_JOURNAL_SNAPSHOT_EVERY=100000 Ereignisse zwischen zwei Snapshots
+"""
+import asyncio
+import logging
+import os
+import re
+import struct
+import time
+import zlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .market_state import MarketState, UserResolver, encode_entry, entry_decoder, user_resolver
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_MAGIC = b"MKTJ"
+SNAPSHOT_MAGIC = b"MKTS"
+JOURNAL_VERSION = 1
+_RECORD = struct.Struct(">IQBBqQI")
+_SNAPSHOT_HEADER = struct.Struct(">QQQ")
+_CRC = struct.Struct(">I")
+_HEADER_SIZE = len(SEGMENT_MAGIC) + 1
+_NO_GUILD = -(1 << 63)
+
+OP_ADD = 1
+OP_REMOVE = 2
+OP_DROP = 3
+OP_UPDATE = 4
+_OPS = {'add': OP_ADD, 'remove': OP_REMOVE, 'drop': OP_DROP, 'update': OP_UPDATE}
+_KINDS = {'offers': 1, 'wishes': 2}
+
+_SEGMENT_NAME = re.compile(r"^market-(\d{16})\.journal$")
+_SNAPSHOT_NAME = re.compile(r"^market-(\d{16})\.snapshot$")
+
+# (seq, op, kind, guild_id, entry_id, payload)
+Event = Tuple[int, int, int, Optional[int], int, bytes]
+
+
+def pack_event(seq: int, op: int, kind: int, guild_id: Optional[int], entry_id: int, payload: bytes = b"") -> bytes:
+    """Kodiert ein Ereignis als Datensatz"""
+    body = _RECORD.pack(0, seq, op, kind, _NO_GUILD if guild_id is None else guild_id,
+                        entry_id, len(payload))[_CRC.size:] + payload
+    return _CRC.pack(zlib.crc32(body)) + body
+
+
+def unpack_events(data: bytes, offset: int = 0) -> Tuple[List[Event], int]:
+    """
+    Liest Datensätze ab ``offset``
+
+    Returns:
+        Tuple von (Ereignissen, Ende des letzten vollständigen und gültigen Datensatzes)
+    """
+    events = []
+    view = memoryview(data)
+    size = len(data)
+    header = _RECORD.size
+    unpack = _RECORD.unpack_from
+    crc32 = zlib.crc32
+    while offset + header <= size:
+        crc, seq, op, kind, guild_id, entry_id, length = unpack(data, offset)
+        end = offset + header + length
+        if end > size or crc32(view[offset + _CRC.size:end]) != crc:
+            break
+        events.append((seq, op, kind, None if guild_id == _NO_GUILD else guild_id, entry_id,
+                       data[offset + header:end]))
+        offset = end
+    return events, offset
+
+
+def _fsync_and_close(fd: int) -> None:
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Macht Umbenennungen und neue Dateien dauerhaft (nicht auf allen Systemen möglich)"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class MarketJournal:
+    """Segmentierte Ereignisdateien und Snapshots in einem Verzeichnis"""
+
+    def __init__(self, directory: str, segment_bytes: int = 16 * 1024 * 1024):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.seq = 0
+        self._file = None
+        self._segment_first: Optional[int] = None
+        self._dirty = False
+        os.makedirs(directory, exist_ok=True)
+
+    def _list(self, pattern: "re.Pattern[str]") -> List[Tuple[int, str]]:
+        found = []
+        for name in os.listdir(self.directory):
+            match = pattern.match(name)
+            if match:
+                found.append((int(match.group(1)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def segments(self) -> List[Tuple[int, str]]:
+        """(erste Sequenznummer, Pfad) aller Segmente, aufsteigend"""
+        return self._list(_SEGMENT_NAME)
+
+    def snapshots(self) -> List[Tuple[int, str]]:
+        return self._list(_SNAPSHOT_NAME)
+
+    # ---------- Lesen ----------
+
+    def read_snapshot(self) -> Optional[Tuple[int, Tuple[int, int], List[Event]]]:
+        """Neuester Snapshot als (seq, (Zähler Angebote, Zähler Wünsche), Einträge) oder None"""
+        snapshots = self.snapshots()
+        if not snapshots:
+            return None
+        _, path = snapshots[-1]
+        with open(path, "rb") as f:
+            data = f.read()
+        start = _HEADER_SIZE + _SNAPSHOT_HEADER.size
+        if data[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC or len(data) < start:
+            raise ValueError(f"Kein gültiger Markt-Snapshot: {path}")
+        seq, offers, wishes = _SNAPSHOT_HEADER.unpack_from(data, _HEADER_SIZE)
+        events, end = unpack_events(data, start)
+        if end != len(data):
+            raise ValueError(f"Markt-Snapshot beschädigt bei Byte {end}: {path}")
+        self.seq = max(self.seq, seq)
+        return seq, (offers, wishes), events
+
+    def read_events(self, after_seq: int = 0) -> Iterator[Event]:
+        """
+        Liefert alle Ereignisse nach ``after_seq`` in Reihenfolge
+
+        Ein unvollständiger Datensatz am Ende des letzten Segments wird
+        abgeschnitten; Schäden in früheren Segmenten sind ein Fehler.
+        """
+        self.seq = max(self.seq, after_seq)
+        segments = self.segments()
+        for position, (_, path) in enumerate(segments):
+            last = position == len(segments) - 1
+            with open(path, "rb") as f:
+                data = f.read()
+            if data[:len(SEGMENT_MAGIC)] != SEGMENT_MAGIC or len(data) < _HEADER_SIZE:
+                if last and len(data) < _HEADER_SIZE:
+                    # Absturz direkt nach dem Anlegen
+                    os.remove(path)
+                    continue
+                raise ValueError(f"Kein gültiges Markt-Journal: {path}")
+            events, end = unpack_events(data, _HEADER_SIZE)
+            if end != len(data):
+                if not last:
+                    raise ValueError(f"Markt-Journal beschädigt bei Byte {end}: {path}")
+                logger.warning("Markt-Journal %s: unvollständigen Datensatz ab Byte %d abgeschnitten", path, end)
+                with open(path, "r+b") as f:
+                    f.truncate(end)
+            for event in events:
+                if event[0] > after_seq:
+                    self.seq = event[0]
+                    yield event
+
+    # ---------- Schreiben ----------
+
+    def append(self, op: int, kind: int, guild_id: Optional[int], entry_id: int, payload: bytes = b"") -> int:
+        """Hängt ein Ereignis an (gepuffert, dauerhaft erst nach ``sync``) und gibt seine Sequenznummer zurück"""
+        if self._file is None:
+            self._open_for_append()
+        elif self._file.tell() >= self.segment_bytes:
+            self.rotate()
+        self.seq += 1
+        self._file.write(pack_event(self.seq, op, kind, guild_id, entry_id, payload))
+        self._dirty = True
+        return self.seq
+
+    def _open_for_append(self) -> None:
+        segments = self.segments()
+        if segments:
+            self._segment_first, path = segments[-1]
+            self._file = open(path, "ab")
+        else:
+            self._new_segment()
+
+    def _new_segment(self) -> None:
+        self._segment_first = self.seq + 1
+        path = os.path.join(self.directory, f"market-{self._segment_first:016d}.journal")
+        self._file = open(path, "wb")
+        self._file.write(SEGMENT_MAGIC + bytes([JOURNAL_VERSION]))
+        self._dirty = True
+
+    def rotate(self) -> None:
+        """Schließt das aktuelle Segment und beginnt ein neues (ein noch leeres bleibt aktuell)"""
+        self.sync_rotation(self.begin_rotation())
+
+    def begin_rotation(self) -> Optional[List[int]]:
+        """
+        Wie ``rotate``, aber ohne fsync: gibt die Dateideskriptoren zurück, die
+        ``sync_rotation`` (auch in einem anderen Thread) noch dauerhaft schreibt;
+        None, wenn das aktuelle Segment noch leer ist
+        """
+        if self._file is not None and self._segment_first == self.seq + 1:
+            return None
+        fds = []
+        if self._file is not None:
+            fd = self.flush()
+            if fd is not None:
+                fds.append(fd)
+            self._file.close()
+            self._file = None
+        self._new_segment()
+        fds.append(self.flush())
+        return fds
+
+    def sync_rotation(self, fds: Optional[List[int]]) -> None:
+        if fds is None:
+            return
+        for fd in fds:
+            _fsync_and_close(fd)
+        _fsync_directory(self.directory)
+
+    def flush(self) -> Optional[int]:
+        """
+        Übergibt gepufferte Ereignisse dem Betriebssystem und gibt eine eigene
+        Kopie des Dateideskriptors für ``fsync`` zurück (gültig, auch wenn das
+        Segment inzwischen geschlossen wird); None, wenn nichts anstand
+        """
+        if not self._dirty or self._file is None:
+            return None
+        # Vor dem Flush zurücksetzen: ein gleichzeitiges append bleibt für den nächsten Durchlauf vorgemerkt
+        self._dirty = False
+        self._file.flush()
+        return os.dup(self._file.fileno())
+
+    def sync(self) -> bool:
+        """Schreibt gepufferte Ereignisse dauerhaft; False, wenn nichts anstand"""
+        fd = self.flush()
+        if fd is None:
+            return False
+        _fsync_and_close(fd)
+        return True
+
+    def write_snapshot(self, seq: int, counters: Tuple[int, int], events: List[Event]) -> str:
+        """
+        Schreibt einen Snapshot atomar und entfernt ältere Snapshots sowie Segmente,
+        die er vollständig abdeckt (das aktuelle Segment bleibt)
+        """
+        path = os.path.join(self.directory, f"market-{seq:016d}.snapshot")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC + bytes([JOURNAL_VERSION]))
+            f.write(_SNAPSHOT_HEADER.pack(seq, *counters))
+            for event in events:
+                f.write(pack_event(*event))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        _fsync_directory(self.directory)
+
+        for snapshot_seq, old_path in self.snapshots():
+            if snapshot_seq < seq:
+                os.remove(old_path)
+        for first_seq, segment_path in self.segments():
+            if first_seq <= seq and first_seq != self._segment_first:
+                os.remove(segment_path)
+        return path
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        self.sync()
+        self._file.close()
+        self._file = None
+
+
+class JournaledMarketState(MarketState):
+    """Eingebetteter Marktzustand, der jede Änderung im Journal festhält und daraus wiederhergestellt wird"""
+
+    def __init__(self, directory: str, resolve_user: Optional[UserResolver] = None,
+                 fsync_interval: float = 0.05, snapshot_every: int = 100_000,
+                 segment_bytes: int = 16 * 1024 * 1024):
+        super().__init__()
+        self.journal = MarketJournal(directory, segment_bytes)
+        self.fsync_interval = fsync_interval
+        self.snapshot_every = snapshot_every
+        self._resolve_user = resolve_user or user_resolver()
+        self._books = {'offers': self.offers, 'wishes': self.wishes}
+        self._since_snapshot = 0
+        self._flush_task: Optional[asyncio.Task] = None
+        # Gerade laufender fsync bzw. Snapshot im Worker-Thread
+        self._pending: Optional[asyncio.Future] = None
+        self.recover()
+
+    def recover(self) -> int:
+        """Stellt den Zustand aus Snapshot und Journal wieder her und gibt die Anzahl nachgespielter Ereignisse zurück"""
+        started = time.perf_counter()
+        # kind -> entry_id -> (guild_id, payload); dekodiert wird erst am Ende
+        live: Dict[int, Dict[int, Tuple[Optional[int], bytes]]] = {code: {} for code in _KINDS.values()}
+        counters = {code: 0 for code in _KINDS.values()}
+        after_seq = 0
+
+        snapshot = self.journal.read_snapshot()
+        if snapshot is not None:
+            after_seq, (counters[_KINDS['offers']], counters[_KINDS['wishes']]), entries = snapshot
+            for _, _, kind, guild_id, entry_id, payload in entries:
+                live[kind][entry_id] = (guild_id, payload)
+
+        replayed = 0
+        for _, op, kind, guild_id, entry_id, payload in self.journal.read_events(after_seq):
+            replayed += 1
+            entries = live[kind]
+            if op == OP_ADD:
+                entries[entry_id] = (guild_id, payload)
+                if entry_id > counters[kind]:
+                    counters[kind] = entry_id
+            elif op == OP_UPDATE:
+                # Der vollständige neue Eintrag ersetzt den alten
+                if entry_id in entries:
+                    entries[entry_id] = (guild_id, payload)
+            elif op == OP_REMOVE:
+                entries.pop(entry_id, None)
+            elif op == OP_DROP:
+                for dropped in [e for e, (g, _) in entries.items() if g == guild_id]:
+                    del entries[dropped]
+
+        # Ein Nutzerobjekt pro Nutzer statt pro Eintrag
+        users: Dict[int, Any] = {}
+
+        def resolve(snapshot: Dict[str, Any]) -> Any:
+            user = users.get(snapshot['id'])
+            if user is None:
+                user = users[snapshot['id']] = self._resolve_user(snapshot)
+            return user
+
+        decode = entry_decoder(resolve)
+        for kind, code in _KINDS.items():
+            book = self._books[kind]
+            book.counter = counters[code]
+            entries = live[code]
+            for entry_id in sorted(entries):
+                book.restore(entry_id, decode(entries[entry_id][1].decode("utf-8")))
+
+        self._since_snapshot = replayed
+        duration = time.perf_counter() - started
+        REGISTRY.gauge("market_journal_replay_seconds", "Dauer der Wiederherstellung aus dem Markt-Journal").set(duration)
+        logger.info("Markt aus Journal %s wiederhergestellt: %d Angebote, %d Wünsche, %d Ereignisse in %.2fs",
+                    self.journal.directory, len(self.offers), len(self.wishes), replayed, duration)
+        return replayed
+
+    def _notify(self, kind: str, guild_id: Optional[int], entry_id: int, op: str) -> None:
+        # Erst ins Journal, dann an die Listener: alle Abnehmer sehen nur festgehaltene Ereignisse
+        payload = b""
+        if op in ('add', 'update'):
+            book = self._books[kind]
+            data = {k: v for k, v in book.get(entry_id).items() if k != book.id_key}
+            payload = encode_entry(data).encode("utf-8")
+        try:
+            self.journal.append(_OPS[op], _KINDS[kind], guild_id, entry_id, payload)
+            self._since_snapshot += 1
+        except OSError as e:
+            logger.error("Markt-Ereignis %s %s #%s nicht ins Journal geschrieben: %s", op, kind, entry_id, e)
+        super()._notify(kind, guild_id, entry_id, op)
+
+    def _prepare_snapshot(self) -> Tuple[Optional[List[int]], int, Tuple[int, int], List[Event], int]:
+        # Auf dem Event-Loop: Segment wechseln und die lebenden Einträge kodieren (liest veränderlichen Zustand)
+        fds = self.journal.begin_rotation()
+        seq = self.journal.seq
+        entries = []
+        for kind, book in self._books.items():
+            code = _KINDS[kind]
+            for data in book:
+                payload = encode_entry({k: v for k, v in data.items() if k != book.id_key}).encode("utf-8")
+                entries.append((seq, OP_ADD, code, data.get('guild_id'), data[book.id_key], payload))
+        return fds, seq, (self.offers.counter, self.wishes.counter), entries, self._since_snapshot
+
+    def _write_snapshot(self, fds: Optional[List[int]], seq: int, counters: Tuple[int, int],
+                        entries: List[Event]) -> str:
+        # Nur Dateizugriffe, daher auch im Worker-Thread möglich
+        self.journal.sync_rotation(fds)
+        return self.journal.write_snapshot(seq, counters, entries)
+
+    def snapshot(self) -> str:
+        """Schreibt den aktuellen Zustand als Snapshot; ältere Segmente entfallen"""
+        fds, seq, counters, entries, covered = self._prepare_snapshot()
+        path = self._write_snapshot(fds, seq, counters, entries)
+        self._since_snapshot -= covered
+        logger.info("Markt-Snapshot bei Ereignis %d geschrieben (%d Einträge)", seq, len(entries))
+        return path
+
+    async def snapshot_in_thread(self) -> str:
+        """Wie ``snapshot``, aber fsync und Schreiben der Datei laufen im Worker-Thread"""
+        fds, seq, counters, entries, covered = self._prepare_snapshot()
+        path = await asyncio.to_thread(self._write_snapshot, fds, seq, counters, entries)
+        self._since_snapshot -= covered
+        logger.info("Markt-Snapshot bei Ereignis %d geschrieben (%d Einträge)", seq, len(entries))
+        return path
+
+    async def _shielded(self, awaitable: Any) -> Any:
+        # Abgeschirmt: close() wartet auf das Ende, statt den Thread mitten im Schreiben zurückzulassen
+        self._pending = asyncio.ensure_future(awaitable)
+        return await asyncio.shield(self._pending)
+
+    async def _flush(self) -> None:
+        while True:
+            await asyncio.sleep(self.fsync_interval)
+            try:
+                fd = self.journal.flush()
+                if fd is not None:
+                    await self._shielded(asyncio.to_thread(_fsync_and_close, fd))
+                if self._since_snapshot >= self.snapshot_every:
+                    await self._shielded(self.snapshot_in_thread())
+            except OSError as e:
+                logger.warning("Markt-Journal %s: fsync/Snapshot fehlgeschlagen: %s", self.journal.directory, e)
+
+    async def start(self) -> None:
+        """Startet die gesammelten fsyncs und Snapshots im Hintergrund"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def close(self) -> None:
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self._pending is not None and not self._pending.done():
+            await asyncio.wait([self._pending])
+            if not self._pending.cancelled() and self._pending.exception() is not None:
+                logger.warning("Markt-Journal %s: fsync/Snapshot fehlgeschlagen: %s",
+                               self.journal.directory, self._pending.exception())
+        self._pending = None
+        self.journal.close()
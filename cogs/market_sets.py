@@ -0,0 +1,138 @@
+"""
+Angebotene TCG-Kartennummern pro Guild und Set
+
+Wird über ``MarketState.subscribe`` mit jeder Änderung an Angeboten gefüttert
+(beim SQLite-Backend auch mit denen anderer Prozesse) und liest dafür nur den
+geänderten Eintrag. Pro (Guild, Set) liegen die offenen Angebots-IDs je
+Kartennummer sowie ein Bitset über die Kartenliste des Sets (``SetCards``,
+dieselben Bits wie in der Sammlung). "Welche meiner fehlenden Karten werden
+gerade angeboten?" ist damit ein Wörterbuchzugriff und ein bitweises UND.
+
+Meldet der Markt 'reset' (Änderungen anderer Prozesse verpasst), wird der
+Index aus allen Angeboten neu aufgebaut.
+
+Reservierte Angebote (``is_held``) zählen nicht; ihre Freigabe kommt als
+Änderung ('update') und nimmt sie wieder auf. Kennt der Index die
+Kartenliste eines Sets noch nicht, merkt er sich nur die Nummern und baut das
+Bitset beim ersten ``offered`` mit der Kartenliste nach.
+"""
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .market_holds import is_held
+from .tcgdex_service import SetCards, card_number_key
+
+SetKey = Tuple[Optional[int], str]
+
+
+class OfferedCards:
+    """Offene TCG-Angebote pro Guild, Set und Kartennummer"""
+
+    def __init__(self):
+        # (Guild, Set) -> Kartennummer (card_number_key) -> Angebots-IDs
+        self._offers: Dict[SetKey, Dict[str, Set[int]]] = {}
+        # (Guild, Set) -> Bitset über SetCards; nur für Sets mit bekannter Kartenliste
+        self._bits: Dict[SetKey, int] = {}
+        self._layouts: Dict[str, SetCards] = {}
+        # Angebots-ID -> (Guild, Set, Kartennummer) der aufgenommenen Angebote
+        self._indexed: Dict[int, Tuple[Optional[int], str, str]] = {}
+        self._market: Any = None
+
+    def attach(self, market: Any) -> None:
+        """Nimmt alle vorhandenen Angebote auf und meldet sich für Änderungen an"""
+        self._market = market
+        for offer in market.offers:
+            self.index(offer)
+        market.subscribe(self.on_market_change)
+
+    def on_market_change(self, kind: str, guild_id: Optional[int], entry_id: int, op: str) -> None:
+        """Listener für ``MarketState.subscribe``: liest nur das geänderte Angebot"""
+        if kind != 'offers':
+            return
+        if op == 'reset':
+            self.rebuild()
+        elif op == 'drop':
+            self.drop_guild(guild_id)
+        elif op == 'remove':
+            self.unindex(entry_id)
+        else:
+            offer = self._market.offers.get(entry_id)
+            if offer is None:
+                self.unindex(entry_id)
+            else:
+                self.index(offer)
+
+    def index(self, offer: Dict[str, Any]) -> None:
+        """Nimmt ein Angebot auf bzw. nimmt es heraus, solange es reserviert ist"""
+        offer_id = offer['offer_id']
+        if not offer.get('is_tcg') or not offer.get('tcg_set_id') or is_held(offer):
+            self.unindex(offer_id)
+            return
+        location = (offer.get('guild_id'), offer['tcg_set_id'], card_number_key(offer.get('tcg_card_number', "")))
+        if self._indexed.get(offer_id) == location:
+            return
+        self.unindex(offer_id)
+        guild_id, set_id, key = location
+        self._indexed[offer_id] = location
+        ids = self._offers.setdefault((guild_id, set_id), {}).setdefault(key, set())
+        ids.add(offer_id)
+        cards = self._layouts.get(set_id)
+        if len(ids) == 1 and cards is not None:
+            position = cards.positions.get(key)
+            if position is not None:
+                self._bits[(guild_id, set_id)] = self._bits.get((guild_id, set_id), 0) | (1 << position)
+
+    def unindex(self, offer_id: int) -> None:
+        location = self._indexed.pop(offer_id, None)
+        if location is None:
+            return
+        guild_id, set_id, key = location
+        numbers = self._offers[(guild_id, set_id)]
+        ids = numbers[key]
+        ids.discard(offer_id)
+        if ids:
+            return
+        del numbers[key]
+        if not numbers:
+            del self._offers[(guild_id, set_id)]
+        cards = self._layouts.get(set_id)
+        position = cards.positions.get(key) if cards is not None else None
+        if position is not None:
+            bits = self._bits.get((guild_id, set_id), 0) & ~(1 << position)
+            if bits:
+                self._bits[(guild_id, set_id)] = bits
+            else:
+                self._bits.pop((guild_id, set_id), None)
+
+    def rebuild(self) -> None:
+        """Verwirft den Index und nimmt alle Angebote neu auf (Kartenlisten bleiben bekannt)"""
+        self._offers.clear()
+        self._bits.clear()
+        self._indexed.clear()
+        for offer in self._market.offers:
+            self.index(offer)
+
+    def drop_guild(self, guild_id: Optional[int]) -> None:
+        for offer_id in [i for i, location in self._indexed.items() if location[0] == guild_id]:
+            self.unindex(offer_id)
+
+    def _use_layout(self, cards: SetCards) -> None:
+        # Neue oder geänderte Kartenliste: Bitsets aller Guilds für das Set neu aufbauen
+        self._layouts[cards.set_id] = cards
+        for (guild_id, set_id), numbers in self._offers.items():
+            if set_id != cards.set_id:
+                continue
+            bits, _ = cards.bits(numbers)
+            if bits:
+                self._bits[(guild_id, set_id)] = bits
+            else:
+                self._bits.pop((guild_id, set_id), None)
+
+    def offered(self, guild_id: Optional[int], cards: SetCards) -> int:
+        """Bitset der Karten des Sets, die in der Guild gerade angeboten werden"""
+        if self._layouts.get(cards.set_id) is not cards:
+            self._use_layout(cards)
+        return self._bits.get((guild_id, cards.set_id), 0)
+
+    def offer_ids(self, guild_id: Optional[int], set_id: str, number: str) -> Set[int]:
+        """IDs der offenen Angebote einer Karte (nicht verändern)"""
+        return self._offers.get((guild_id, set_id), {}).get(card_number_key(number), set())
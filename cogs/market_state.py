@@ -0,0 +1,623 @@
+"""
+Marktzustand (Angebote und Wünsche), nach Guild partitioniert
+
+Jede Guild hat ihre eigene Partition. Listen lesen nur die Partition ihrer
+Guild statt alle Einträge zu filtern, und verlässt der Bot eine Guild (oder
+wandert sie bei Sharding auf einen anderen Prozess), wird ihre Partition als
+Ganzes verworfen. Ein Prozess hält so nur die Guilds seiner Shards im Speicher.
+
+Zwei Backends mit derselben Schnittstelle:
+- MarketState: eingebettet im Prozess (Standard, ein Bot-Prozess)
+- SqliteMarketState: geteilte SQLite-Datei (WAL) für mehrere Shard-Prozesse.
+  IDs vergibt die Datenbank, Änderungen anderer Prozesse werden über ein
+  Änderungsprotokoll erkannt und invalidieren die lokalen Caches.
+  Schreibzugriffe aus dem Event-Loop laufen über ``await state.call(...)``:
+  ist die Datei gesperrt, wird asynchron erneut versucht statt zu blockieren.
+
+- JournaledMarketState (market_journal.py): eingebettet, jede Änderung wird
+  in einem Ereignisjournal festgehalten und beim Start nachgespielt.
+
+Auswahl über MARKET_BACKEND=memory|sqlite|journal, MARKET_DB=<pfad> und
+MARKET_JOURNAL=<verzeichnis>.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+# (kind, guild_id, entry_id, op) mit kind "offers"/"wishes" und op "add"/"update"/"remove"/"drop".
+# op "reset" (guild_id None, entry_id 0): Änderungen sind verloren gegangen, alles neu einlesen
+ChangeListener = Callable[[str, Optional[int], int, str], None]
+UserResolver = Callable[[Dict[str, Any]], Any]
+
+
+class MarketBook:
+    """Einträge einer Art (Angebote oder Wünsche), partitioniert nach ``guild_id``"""
+
+    def __init__(self, kind: str, id_key: str, notify: Optional[ChangeListener] = None):
+        self.kind = kind
+        self.id_key = id_key
+        self.counter = 0
+        self._notify = notify or (lambda *change: None)
+        self._partitions: Dict[Optional[int], Dict[int, Dict[str, Any]]] = {}
+        self._guild_of: Dict[int, Optional[int]] = {}
+
+    def add(self, data: Dict[str, Any]) -> int:
+        """Speichert einen Eintrag in der Partition seiner Guild und vergibt die ID (Version 1)"""
+        self.counter += 1
+        entry_id = self.counter
+        data[self.id_key] = entry_id
+        data['version'] = 1
+        guild_id = data.get('guild_id')
+        self._partitions.setdefault(guild_id, {})[entry_id] = data
+        self._guild_of[entry_id] = guild_id
+        self._notify(self.kind, guild_id, entry_id, 'add')
+        return entry_id
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> List[int]:
+        """Speichert mehrere Einträge auf einmal und gibt ihre IDs in derselben Reihenfolge zurück"""
+        return [self.add(data) for data in entries]
+
+    def restore(self, entry_id: int, data: Dict[str, Any]) -> None:
+        """Übernimmt einen gespeicherten Eintrag mit seiner ID, ohne Listener zu benachrichtigen"""
+        self.counter = max(self.counter, entry_id)
+        data[self.id_key] = entry_id
+        guild_id = data.get('guild_id')
+        self._partitions.setdefault(guild_id, {})[entry_id] = data
+        self._guild_of[entry_id] = guild_id
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        if entry_id not in self._guild_of:
+            return None
+        return self._partitions[self._guild_of[entry_id]][entry_id]
+
+    def remove(self, entry_id: int, version: Optional[int] = None) -> bool:
+        """
+        Entfernt einen Eintrag; False, falls er nicht (mehr) existiert
+
+        Mit ``version`` nur, wenn der Eintrag noch diese Version hat (Compare-and-Swap)
+        """
+        if entry_id not in self._guild_of:
+            return False
+        guild_id = self._guild_of[entry_id]
+        partition = self._partitions[guild_id]
+        if version is not None and partition[entry_id].get('version') != version:
+            return False
+        del self._guild_of[entry_id]
+        del partition[entry_id]
+        if not partition:
+            del self._partitions[guild_id]
+        self._notify(self.kind, guild_id, entry_id, 'remove')
+        return True
+
+    def update(self, entry_id: int, changes: Dict[str, Any], version: Optional[int] = None) -> Optional[int]:
+        """
+        Ändert Felder eines Eintrags und erhöht seine Version
+
+        Mit ``version`` nur, wenn der Eintrag noch diese Version hat (Compare-and-Swap)
+
+        Returns:
+            Neue Version oder None, falls der Eintrag fehlt oder sich geändert hat
+        """
+        data = self.get(entry_id)
+        if data is None or (version is not None and data.get('version') != version):
+            return None
+        data.update(changes)
+        data['version'] = (data.get('version') or 0) + 1
+        self._notify(self.kind, self._guild_of[entry_id], entry_id, 'update')
+        return data['version']
+
+    def for_guild(self, guild_id: Optional[int]) -> Dict[int, Dict[str, Any]]:
+        """Einträge einer Guild in Erstellungsreihenfolge (nicht verändern)"""
+        return self._partitions.get(guild_id, {})
+
+    def drop_guild(self, guild_id: Optional[int]) -> int:
+        """Verwirft die Partition einer Guild und gibt die Anzahl entfernter Einträge zurück"""
+        partition = self._partitions.pop(guild_id, {})
+        for entry_id in partition:
+            del self._guild_of[entry_id]
+        if partition:
+            self._notify(self.kind, guild_id, 0, 'drop')
+        return len(partition)
+
+    def guild_counts(self) -> Dict[Optional[int], int]:
+        return {guild_id: len(partition) for guild_id, partition in self._partitions.items()}
+
+    def __len__(self) -> int:
+        return len(self._guild_of)
+
+    def __contains__(self, entry_id: int) -> bool:
+        return entry_id in self._guild_of
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for partition in self._partitions.values():
+            yield from partition.values()
+
+
+class MarketState:
+    """Angebote und Wünsche aller Guilds dieses Prozesses (eingebettetes Backend)"""
+
+    def __init__(self):
+        self._listeners: List[ChangeListener] = []
+        self.offers = MarketBook('offers', 'offer_id', self._notify)
+        self.wishes = MarketBook('wishes', 'wish_id', self._notify)
+
+    def subscribe(self, listener: ChangeListener) -> None:
+        """Meldet ``listener`` für Änderungen an (eigene und, je nach Backend, fremde)"""
+        self._listeners.append(listener)
+
+    def _notify(self, kind: str, guild_id: Optional[int], entry_id: int, op: str) -> None:
+        for listener in self._listeners:
+            try:
+                listener(kind, guild_id, entry_id, op)
+            except Exception:
+                logger.exception("Markt-Listener fehlgeschlagen")
+
+    async def call(self, write: Callable[..., Any], *args: Any) -> Any:
+        """Führt eine Änderung aus (z.B. ``state.offers.add``); eingebettet direkt"""
+        return write(*args)
+
+    async def start(self) -> None:
+        """Startet Hintergrundaufgaben des Backends (eingebettet: keine)"""
+
+    async def close(self) -> None:
+        """Gibt Ressourcen des Backends frei (eingebettet: keine)"""
+
+    def drop_guild(self, guild_id: int) -> None:
+        """Verwirft alle Einträge einer Guild (Bot entfernt oder Guild auf anderem Shard)"""
+        offers = self.offers.drop_guild(guild_id)
+        wishes = self.wishes.drop_guild(guild_id)
+        if offers or wishes:
+            logger.info("Marktpartition von Guild %s verworfen (%d Angebote, %d Wünsche)",
+                        guild_id, offers, wishes)
+
+    def count_for_guilds(self, guild_ids) -> Dict[str, int]:
+        """Summe der Angebote und Wünsche über die angegebenen Guilds (z.B. eines Shards)"""
+        guild_ids = set(guild_ids)
+        return {
+            'offers': sum(n for g, n in self.offers.guild_counts().items() if g in guild_ids),
+            'wishes': sum(n for g, n in self.wishes.guild_counts().items() if g in guild_ids)
+        }
+
+
+# ============= Geteiltes Backend (SQLite) =============
+
+class StoredUser:
+    """Nutzer aus dem geteilten Speicher, der im lokalen Cache nicht bekannt ist"""
+
+    def __init__(self, snapshot: Dict[str, Any], client: Any = None):
+        self.id = snapshot['id']
+        self.name = snapshot.get('name', str(self.id))
+        self.display_name = snapshot.get('display_name', self.name)
+        self.mention = f"<@{self.id}>"
+        self.display_avatar = SimpleNamespace(url=snapshot.get('avatar_url', ''))
+        self.bot = False
+        self._client = client
+
+    async def send(self, *args, **kwargs):
+        if self._client is None:
+            raise RuntimeError(f"Kein Client, um Nutzer {self.id} zu erreichen")
+        user = self._client.get_user(self.id) or await self._client.fetch_user(self.id)
+        return await user.send(*args, **kwargs)
+
+
+def user_resolver(client: Any = None) -> UserResolver:
+    """Löst gespeicherte Nutzer über den Cache des Clients auf, sonst als StoredUser"""
+    def resolve(snapshot: Dict[str, Any]) -> Any:
+        user = client.get_user(snapshot['id']) if client is not None else None
+        return user or StoredUser(snapshot, client)
+    return resolve
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if hasattr(value, 'id') and hasattr(value, 'mention'):
+        # discord.User/Member: nur die Felder, die der Markt anzeigt
+        return {'__user__': {
+            'id': value.id,
+            'name': str(getattr(value, 'name', value.id)),
+            'display_name': str(getattr(value, 'display_name', value.id)),
+            'avatar_url': str(value.display_avatar.url) if getattr(value, 'display_avatar', None) else ''
+        }}
+    raise TypeError(f"Nicht speicherbar: {type(value).__name__}")
+
+
+def encode_entry(data: Dict[str, Any]) -> str:
+    """Serialisiert einen Eintrag (Nutzer und Zeitstempel als Markierungen)"""
+    return json.dumps(data, default=_encode, ensure_ascii=False, separators=(',', ':'))
+
+
+def entry_decoder(resolve_user: UserResolver) -> Callable[[str], Dict[str, Any]]:
+    """Gegenstück zu encode_entry, wiederverwendbar für viele Einträge; Nutzer löst ``resolve_user`` auf"""
+    def decode_object(obj: Dict[str, Any]) -> Any:
+        if '__datetime__' in obj:
+            return datetime.fromisoformat(obj['__datetime__'])
+        if '__user__' in obj:
+            return resolve_user(obj['__user__'])
+        return obj
+    return json.JSONDecoder(object_hook=decode_object).decode
+
+
+def decode_entry(payload: str, resolve_user: UserResolver) -> Dict[str, Any]:
+    return entry_decoder(resolve_user)(payload)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS offers_guild ON offers (guild_id);
+CREATE TABLE IF NOT EXISTS wishes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS wishes_guild ON wishes (guild_id);
+CREATE TABLE IF NOT EXISTS market_changes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    guild_id INTEGER,
+    entry_id INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    origin TEXT NOT NULL
+);
+"""
+
+# Änderungsprotokoll: so viele Einträge bleiben mindestens erhalten
+CHANGE_LOG_KEEP = 10_000
+
+
+def _is_busy(error: sqlite3.OperationalError) -> bool:
+    """True, wenn die Datei gerade von einem anderen Prozess gesperrt ist"""
+    return getattr(error, 'sqlite_errorcode', None) in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED) \
+        or "locked" in str(error)
+
+
+class SqliteMarketBook:
+    """Einträge einer Art in der geteilten Datenbank, mit lokalem Cache pro Guild"""
+
+    def __init__(self, state: "SqliteMarketState", kind: str, id_key: str):
+        self._state = state
+        self.kind = kind
+        self.id_key = id_key
+        self._cache: Dict[Optional[int], Dict[int, Dict[str, Any]]] = {}
+
+    def _load(self, entry_id: int, payload: str) -> Dict[str, Any]:
+        data = self._state.decode(payload)
+        data[self.id_key] = entry_id
+        return data
+
+    def add(self, data: Dict[str, Any]) -> int:
+        """Speichert einen Eintrag; die ID ist über alle Prozesse eindeutig"""
+        guild_id = data.get('guild_id')
+        data['version'] = 1
+        payload = self._state.encode({k: v for k, v in data.items() if k != self.id_key})
+        with self._state.transaction() as db:
+            entry_id = db.execute(
+                f"INSERT INTO {self.kind} (guild_id, data) VALUES (?, ?)", (guild_id, payload)
+            ).lastrowid
+            self._state.log_change(self.kind, guild_id, entry_id, 'add')
+        data[self.id_key] = entry_id
+        partition = self._cache.get(guild_id)
+        if partition is not None:
+            partition[entry_id] = data
+        self._state._notify(self.kind, guild_id, entry_id, 'add')
+        return entry_id
+
+    def add_many(self, entries: List[Dict[str, Any]]) -> List[int]:
+        """Speichert mehrere Einträge in einer einzigen Schreibtransaktion (z.B. Massenangebote)"""
+        rows = []
+        for data in entries:
+            data['version'] = 1
+            rows.append((data.get('guild_id'), self._state.encode({k: v for k, v in data.items() if k != self.id_key})))
+        ids = []
+        with self._state.transaction() as db:
+            for guild_id, payload in rows:
+                entry_id = db.execute(
+                    f"INSERT INTO {self.kind} (guild_id, data) VALUES (?, ?)", (guild_id, payload)
+                ).lastrowid
+                self._state.log_change(self.kind, guild_id, entry_id, 'add')
+                ids.append(entry_id)
+        for data, entry_id in zip(entries, ids):
+            data[self.id_key] = entry_id
+            partition = self._cache.get(data.get('guild_id'))
+            if partition is not None:
+                partition[entry_id] = data
+            self._state._notify(self.kind, data.get('guild_id'), entry_id, 'add')
+        return ids
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        self._state.refresh_unpolled()
+        for partition in self._cache.values():
+            if entry_id in partition:
+                return partition[entry_id]
+        row = self._state.db.execute(f"SELECT data FROM {self.kind} WHERE id = ?", (entry_id,)).fetchone()
+        return self._load(entry_id, row[0]) if row else None
+
+    def remove(self, entry_id: int, version: Optional[int] = None) -> bool:
+        """
+        Entfernt einen Eintrag; False, falls ihn schon ein Prozess entfernt hat
+
+        Mit ``version`` nur, wenn der Eintrag noch diese Version hat (Compare-and-Swap
+        über alle Prozesse, da in derselben Schreibtransaktion geprüft)
+        """
+        with self._state.transaction() as db:
+            row = db.execute(
+                f"SELECT guild_id, json_extract(data, '$.version') FROM {self.kind} WHERE id = ?", (entry_id,)
+            ).fetchone()
+            if row is None or (version is not None and row[1] != version):
+                return False
+            db.execute(f"DELETE FROM {self.kind} WHERE id = ?", (entry_id,))
+            self._state.log_change(self.kind, row[0], entry_id, 'remove')
+        self._cache.get(row[0], {}).pop(entry_id, None)
+        self._state._notify(self.kind, row[0], entry_id, 'remove')
+        return True
+
+    def update(self, entry_id: int, changes: Dict[str, Any], version: Optional[int] = None) -> Optional[int]:
+        """
+        Ändert Felder eines Eintrags und erhöht seine Version (Compare-and-Swap wie ``remove``)
+
+        ``changes`` darf nur JSON-Werte enthalten (Zahlen, Text, None); die
+        Felder werden per ``json_set`` direkt in der Datenbank geändert.
+        """
+        with self._state.transaction() as db:
+            row = db.execute(
+                f"SELECT guild_id, json_extract(data, '$.version') FROM {self.kind} WHERE id = ?", (entry_id,)
+            ).fetchone()
+            if row is None or (version is not None and row[1] != version):
+                return None
+            changes = {**changes, 'version': (row[1] or 0) + 1}
+            paths = ", ?, json(?)" * len(changes)
+            arguments = [x for key, value in changes.items() for x in (f"$.{key}", json.dumps(value))]
+            db.execute(f"UPDATE {self.kind} SET data = json_set(data{paths}) WHERE id = ?", (*arguments, entry_id))
+            self._state.log_change(self.kind, row[0], entry_id, 'update')
+        cached = self._cache.get(row[0], {}).get(entry_id)
+        if cached is not None:
+            cached.update(changes)
+        self._state._notify(self.kind, row[0], entry_id, 'update')
+        return changes['version']
+
+    def for_guild(self, guild_id: Optional[int]) -> Dict[int, Dict[str, Any]]:
+        """Einträge einer Guild in Erstellungsreihenfolge (nicht verändern)"""
+        self._state.refresh_unpolled()
+        partition = self._cache.get(guild_id)
+        if partition is None:
+            rows = self._state.db.execute(
+                f"SELECT id, data FROM {self.kind} WHERE guild_id IS ? ORDER BY id", (guild_id,)
+            )
+            partition = self._cache[guild_id] = {entry_id: self._load(entry_id, data) for entry_id, data in rows}
+        return partition
+
+    def drop_guild(self, guild_id: Optional[int]) -> int:
+        with self._state.transaction() as db:
+            removed = db.execute(f"DELETE FROM {self.kind} WHERE guild_id IS ?", (guild_id,)).rowcount
+            if removed:
+                self._state.log_change(self.kind, guild_id, 0, 'drop')
+        self._cache.pop(guild_id, None)
+        if removed:
+            self._state._notify(self.kind, guild_id, 0, 'drop')
+        return removed
+
+    def invalidate(self, guild_id: Optional[int] = None, everything: bool = False) -> None:
+        """Verwirft den lokalen Cache einer Guild (oder alle)"""
+        if everything:
+            self._cache.clear()
+        else:
+            self._cache.pop(guild_id, None)
+
+    def guild_counts(self) -> Dict[Optional[int], int]:
+        rows = self._state.db.execute(f"SELECT guild_id, COUNT(*) FROM {self.kind} GROUP BY guild_id")
+        return dict(rows.fetchall())
+
+    def __len__(self) -> int:
+        return self._state.db.execute(f"SELECT COUNT(*) FROM {self.kind}").fetchone()[0]
+
+    def __contains__(self, entry_id: int) -> bool:
+        return self._state.db.execute(f"SELECT 1 FROM {self.kind} WHERE id = ?", (entry_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        rows = self._state.db.execute(f"SELECT id, data FROM {self.kind} ORDER BY id").fetchall()
+        for entry_id, data in rows:
+            yield self._load(entry_id, data)
+
+
+class SqliteMarketState(MarketState):
+    """
+    Geteilter Marktzustand in einer SQLite-Datei für mehrere lokale Prozesse
+
+    Schreibzugriffe laufen in ``BEGIN IMMEDIATE``-Transaktionen, die Datenbank
+    vergibt die IDs. Jede Änderung landet zusätzlich im Änderungsprotokoll;
+    ``refresh()`` erkennt über ``PRAGMA data_version`` billig, ob ein anderer
+    Prozess geschrieben hat, invalidiert dann die betroffenen Guild-Caches und
+    benachrichtigt die Listener (mit 'reset', wenn das Protokoll schon gekürzt
+    war). ``start()`` fragt das im Hintergrund ab;
+    solange das läuft, lesen ``get``/``for_guild`` nur noch den Cache.
+
+    Direkte Aufrufe warten bis ``busy_timeout`` auf die Schreibsperre. Über
+    ``call()`` wartet SQLite gar nicht: ist die Datei gesperrt, schläft die
+    Koroutine kurz und versucht es erneut, bis ``busy_timeout`` verstrichen ist.
+    """
+
+    def __init__(self, path: str, resolve_user: Optional[UserResolver] = None,
+                 poll_interval: float = 1.0, busy_timeout: float = 5.0):
+        self._listeners: List[ChangeListener] = []
+        self.path = path
+        self.poll_interval = poll_interval
+        self.busy_timeout = busy_timeout
+        self.origin = uuid.uuid4().hex
+        self._resolve_user = resolve_user or user_resolver()
+        self._poll_task: Optional[asyncio.Task] = None
+
+        self.db = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction() as db:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+
+        self.offers = SqliteMarketBook(self, 'offers', 'offer_id')
+        self.wishes = SqliteMarketBook(self, 'wishes', 'wish_id')
+        self._books = {'offers': self.offers, 'wishes': self.wishes}
+        self._data_version = self._read_data_version()
+        self._last_seq = self.db.execute("SELECT COALESCE(MAX(seq), 0) FROM market_changes").fetchone()[0]
+
+    # ---------- Kodierung ----------
+
+    def encode(self, data: Dict[str, Any]) -> str:
+        return encode_entry(data)
+
+    def decode(self, payload: str) -> Dict[str, Any]:
+        return decode_entry(payload, self._resolve_user)
+
+    # ---------- Transaktionen und Änderungsprotokoll ----------
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Schreibtransaktion mit sofortiger Sperre (wartet bis busy_timeout)"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def log_change(self, kind: str, guild_id: Optional[int], entry_id: int, op: str) -> None:
+        seq = self.db.execute(
+            "INSERT INTO market_changes (kind, guild_id, entry_id, op, origin) VALUES (?, ?, ?, ?, ?)",
+            (kind, guild_id, entry_id, op, self.origin)
+        ).lastrowid
+        if seq % 1000 == 0:
+            self.db.execute("DELETE FROM market_changes WHERE seq <= ?", (seq - CHANGE_LOG_KEEP,))
+
+    async def call(self, write: Callable[..., Any], *args: Any) -> Any:
+        """
+        Führt eine Änderung aus, ohne im Event-Loop auf die Schreibsperre zu warten
+
+        ``write`` muss bei einer Sperre vor der ersten Änderung scheitern (eine
+        einzelne Transaktion wie ``offers.add``), damit der erneute Versuch sicher ist.
+        """
+        deadline = time.monotonic() + self.busy_timeout
+        delay = 0.005
+        while True:
+            self.db.execute("PRAGMA busy_timeout = 0")
+            try:
+                return write(*args)
+            except sqlite3.OperationalError as e:
+                if not _is_busy(e) or time.monotonic() + delay > deadline:
+                    raise
+            finally:
+                self.db.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout * 1000)}")
+            REGISTRY.counter("market_sqlite_busy_retries_total", "Erneute Schreibversuche wegen gesperrter Datei").inc()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def _read_data_version(self) -> int:
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self) -> List[Tuple[str, Optional[int], int, str]]:
+        """Übernimmt Änderungen anderer Prozesse und gibt sie zurück"""
+        version = self._read_data_version()
+        if version == self._data_version:
+            return []
+        self._data_version = version
+
+        oldest = self.db.execute("SELECT MIN(seq) FROM market_changes").fetchone()[0]
+        rows = self.db.execute(
+            "SELECT seq, kind, guild_id, entry_id, op, origin FROM market_changes WHERE seq > ? ORDER BY seq",
+            (self._last_seq,)
+        ).fetchall()
+        if oldest is not None and oldest > self._last_seq + 1:
+            # Protokoll wurde gekürzt, bevor wir es gelesen haben: einzelne Änderungen fehlen,
+            # also Caches verwerfen und die Listener alles neu einlesen lassen
+            logger.warning("Änderungsprotokoll von %s gekürzt, Markt wird neu eingelesen", self.path)
+            if rows:
+                self._last_seq = rows[-1][0]
+            for book in self._books.values():
+                book.invalidate(everything=True)
+            changes = [(kind, None, 0, 'reset') for kind in self._books]
+            for change in changes:
+                self._notify(*change)
+            return changes
+
+        changes = []
+        for seq, kind, guild_id, entry_id, op, origin in rows:
+            self._last_seq = seq
+            if origin == self.origin:
+                continue
+            self._books[kind].invalidate(guild_id)
+            changes.append((kind, guild_id, entry_id, op))
+            self._notify(kind, guild_id, entry_id, op)
+        return changes
+
+    def refresh_unpolled(self) -> None:
+        """Gleicht vor einem Lesezugriff ab, solange keine Hintergrundabfrage läuft"""
+        if self._poll_task is None:
+            self.refresh()
+
+    # ---------- Lebenszyklus ----------
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                logger.warning("Markt-Abgleich mit %s fehlgeschlagen: %s", self.path, e)
+
+    async def start(self) -> None:
+        """Startet den Abgleich mit anderen Prozessen im Hintergrund"""
+        if self.poll_interval and self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def close(self) -> None:
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        self.db.close()
+
+
+def market_state_from_env(client: Any = None) -> MarketState:
+    """
+    Wählt das Backend über Umgebungsvariablen:
+    MARKET_BACKEND=sqlite nutzt die geteilte Datei MARKET_DB (Standard market.db),
+    MARKET_BACKEND=journal das Ereignisjournal in MARKET_JOURNAL (Standard market_journal),
+    sonst den eingebetteten Zustand.
+    """
+    backend = os.getenv("MARKET_BACKEND", "memory").strip().lower()
+    if backend == "sqlite":
+        return SqliteMarketState(
+            os.getenv("MARKET_DB", "market.db"),
+            user_resolver(client),
+            float(os.getenv("MARKET_POLL_INTERVAL", "1.0"))
+        )
+    if backend == "journal":
+        from .market_journal import JournaledMarketState
+        return JournaledMarketState(
+            os.getenv("MARKET_JOURNAL", "market_journal"),
+            user_resolver(client),
+            fsync_interval=float(os.getenv("MARKET_JOURNAL_FSYNC_MS", "50")) / 1000,
+            snapshot_every=int(os.getenv("MARKET_JOURNAL_SNAPSHOT_EVERY", "100000"))
+        )
+    if backend != "memory":
+        raise ValueError(f"Unbekanntes MARKET_BACKEND: {backend}")
+    return MarketState()
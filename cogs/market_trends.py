@@ -0,0 +1,196 @@
+"""
+Trends: meistgesuchte und meistangebotene Pokemon pro Guild
+
+Wird über ``MarketState.subscribe`` mit jedem neuen Angebot und Wunsch
+gefüttert (beim SQLite-Backend auch mit denen anderer Prozesse) und liest
+dafür nur den neuen Eintrag. Abfragen beantwortet es aus dem Speicher, ohne
+Angebote, Wünsche oder das Tauschbuch erneut zu durchsuchen.
+
+Pro Guild, Richtung ("wanted"/"offered") und Zeitfenster (24h/7d/30d) liegt
+ein Ring aus Zeitscheiben. Jede Scheibe zählt die häufigsten Namen mit dem
+Space-Saving-Verfahren in fester Größe: ist sie voll, verdrängt ein neuer
+Name den seltensten und übernimmt dessen Zählerstand als Fehlerschranke.
+Abgelaufene Scheiben werden beim nächsten Schreiben wiederverwendet, der
+Speicher bleibt damit pro Guild konstant.
+
+Meldet der Markt 'reset' (Änderungen anderer Prozesse verpasst), werden die
+Trends aus den offenen Einträgen und ihrem ``created_at`` neu gezählt; schon
+vergebene Einträge fehlen danach.
+"""
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+WANTED = "wanted"
+OFFERED = "offered"
+
+# Fenster -> (Länge in Sekunden, Anzahl Zeitscheiben)
+WINDOWS: Dict[str, Tuple[int, int]] = {
+    "24h": (24 * 3600, 24),
+    "7d": (7 * 24 * 3600, 28),
+    "30d": (30 * 24 * 3600, 30),
+}
+
+# Namen pro Zeitscheibe; Top-Listen bis etwa ein Drittel davon sind verlässlich
+SLICE_CAPACITY = 32
+
+
+def _normalize(name: str) -> str:
+    return " ".join(name.split())
+
+
+def _created(entry: Dict[str, Any], default: float) -> float:
+    created_at = entry.get('created_at')
+    return created_at.timestamp() if isinstance(created_at, datetime) else default
+
+
+class Trend(NamedTuple):
+    """Ein Name mit geschätzter Anzahl; ``error`` ist die maximale Überschätzung"""
+    name: str
+    count: int
+    error: int
+
+
+class SpaceSaving:
+    """Zählt die häufigsten Schlüssel in höchstens ``capacity`` Zählern"""
+
+    __slots__ = ("capacity", "counters")
+
+    def __init__(self, capacity: int = SLICE_CAPACITY):
+        self.capacity = capacity
+        # Schlüssel -> [Anzahl, Fehler, Anzeigename]
+        self.counters: Dict[str, List[Any]] = {}
+
+    def add(self, name: str, weight: int = 1) -> None:
+        key = name.casefold()
+        counter = self.counters.get(key)
+        if counter is not None:
+            counter[0] += weight
+        elif len(self.counters) < self.capacity:
+            self.counters[key] = [weight, 0, name]
+        else:
+            # Seltensten Zähler verdrängen; seine Anzahl wird zur Fehlerschranke
+            evicted = min(self.counters, key=lambda k: self.counters[k][0])
+            floor = self.counters.pop(evicted)[0]
+            self.counters[key] = [floor + weight, floor, name]
+
+    def clear(self) -> None:
+        self.counters.clear()
+
+    def __len__(self) -> int:
+        return len(self.counters)
+
+
+class SlidingHeavyHitters:
+    """Häufigste Namen in einem gleitenden Zeitfenster aus ``slices`` Space-Saving-Scheiben"""
+
+    __slots__ = ("width", "_slices")
+
+    def __init__(self, window: int, slices: int, capacity: int = SLICE_CAPACITY):
+        self.width = window / slices
+        # Ring: (Nummer der Zeitscheibe, Zähler); die Nummer erkennt abgelaufene Scheiben
+        self._slices: List[Tuple[int, SpaceSaving]] = [(-1, SpaceSaving(capacity)) for _ in range(slices)]
+
+    def _index(self, now: float) -> int:
+        return int(now // self.width)
+
+    def add(self, name: str, now: float) -> None:
+        index = self._index(now)
+        position = index % len(self._slices)
+        slice_index, counter = self._slices[position]
+        if slice_index != index:
+            counter.clear()
+            self._slices[position] = (index, counter)
+        counter.add(name)
+
+    def top(self, limit: int, now: float) -> List[Trend]:
+        """Die ``limit`` häufigsten Namen der noch gültigen Zeitscheiben"""
+        oldest = self._index(now) - len(self._slices)
+        merged: Dict[str, List[Any]] = {}
+        for slice_index, counter in self._slices:
+            if slice_index <= oldest:
+                continue
+            for key, (count, error, name) in counter.counters.items():
+                total = merged.setdefault(key, [0, 0, name])
+                total[0] += count
+                total[1] += error
+        ranked = sorted(merged.values(), key=lambda total: (-total[0], total[2].casefold()))
+        return [Trend(name, count, error) for count, error, name in ranked[:limit]]
+
+
+class MarketTrends:
+    """Heavy Hitters pro Guild, Richtung und Zeitfenster"""
+
+    def __init__(self, windows: Optional[Dict[str, Tuple[int, int]]] = None, capacity: int = SLICE_CAPACITY):
+        self.windows = windows or WINDOWS
+        self.capacity = capacity
+        self._guilds: Dict[Optional[int], Dict[str, Dict[str, SlidingHeavyHitters]]] = {}
+        self._market: Any = None
+
+    def attach(self, market: Any) -> None:
+        """Meldet sich für neue Angebote und Wünsche am Marktzustand an"""
+        self._market = market
+        market.subscribe(self.on_market_change)
+
+    def on_market_change(self, kind: str, guild_id: Optional[int], entry_id: int, op: str) -> None:
+        """Listener für ``MarketState.subscribe``: liest nur den neuen Eintrag"""
+        if op == 'reset':
+            self.rebuild(kind)
+            return
+        if op == 'drop':
+            self.drop_guild(guild_id)
+            return
+        if op != 'add':
+            return
+        entry = getattr(self._market, kind).get(entry_id)
+        if entry is not None:
+            self.record_entry(kind, guild_id, entry)
+
+    def rebuild(self, kind: str) -> None:
+        """Zählt die Trends neu aus den offenen Einträgen (beide Arten, einmal pro Reset genügt)"""
+        if kind != 'offers':
+            return
+        self._guilds.clear()
+        now = time.time()
+        entries = [(kind, entry) for kind in ('offers', 'wishes') for entry in getattr(self._market, kind)]
+        # Aufsteigend nach Zeit, damit neuere Scheiben ältere im Ring ablösen und nicht umgekehrt
+        entries.sort(key=lambda item: _created(item[1], now))
+        for kind, entry in entries:
+            self.record_entry(kind, entry.get('guild_id'), entry, _created(entry, now))
+
+    def record_entry(self, kind: str, guild_id: Optional[int], entry: Dict[str, Any],
+                     now: Optional[float] = None) -> None:
+        """Zählt ein Angebot (angeboten) bzw. einen Wunsch (gesucht, ggf. mit angebotenem Tauschpartner)"""
+        now = time.time() if now is None else now
+        if kind == 'offers':
+            self.record(guild_id, OFFERED, entry.get('name'), now)
+            return
+        self.record(guild_id, WANTED, entry.get('name'), now)
+        if entry.get('offer_included') and entry.get('offer_data'):
+            self.record(guild_id, OFFERED, entry['offer_data'].get('name'), now)
+
+    def record(self, guild_id: Optional[int], direction: str, name: Optional[str],
+               now: Optional[float] = None) -> None:
+        name = _normalize(name or "")
+        if not name:
+            return
+        now = time.time() if now is None else now
+        directions = self._guilds.get(guild_id)
+        if directions is None:
+            directions = self._guilds[guild_id] = {
+                d: {label: SlidingHeavyHitters(length, slices, self.capacity)
+                    for label, (length, slices) in self.windows.items()}
+                for d in (WANTED, OFFERED)
+            }
+        for hitters in directions[direction].values():
+            hitters.add(name, now)
+
+    def top(self, guild_id: Optional[int], direction: str, window: str, limit: int = 10,
+            now: Optional[float] = None) -> List[Trend]:
+        directions = self._guilds.get(guild_id)
+        if directions is None:
+            return []
+        return directions[direction][window].top(limit, time.time() if now is None else now)
+
+    def drop_guild(self, guild_id: Optional[int]) -> None:
+        self._guilds.pop(guild_id, None)
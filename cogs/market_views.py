@@ -0,0 +1,849 @@
+"""
+Views für die Angebots- und Wunschlisten sowie Antworten auf Gegenangebote
+
+Wird mit dem Pokemon-Cog geladen; Eingabe-Assistenten, TCG-Ablauf und
+Feedback-Formulare liegen in eigenen Modulen und werden erst bei Bedarf importiert.
+"""
+import logging
+
+import discord
+
+from .market_holds import is_held
+from .metrics import TimedView
+
+logger = logging.getLogger(__name__)
+
+
+async def respond_entry_taken(interaction: discord.Interaction):
+    """Antwort für alle, die einen schon vergebenen Eintrag annehmen wollen"""
+    await interaction.response.send_message(
+        "❌ Zu spät - dieser Eintrag wurde bereits vergeben oder zurückgezogen.",
+        ephemeral=True
+    )
+
+
+async def respond_entry_held(interaction: discord.Interaction):
+    """Antwort für alle, die einen Eintrag während eines offenen Gegenangebots auswählen"""
+    await interaction.response.send_message(
+        "⏳ Dieser Eintrag ist gerade für ein anderes Gegenangebot reserviert. Versuche es später noch einmal!",
+        ephemeral=True
+    )
+
+
+class OfferSelect(discord.ui.Select):
+    """Dropdown für Pokemon-Angebote Auswahl"""
+    
+    def __init__(self, offers, cog):
+        self.offers = offers
+        self.cog = cog
+        
+        options = []
+        for offer_id, offer_data in offers.items():
+            # Hole Emojis für bessere Darstellung
+            type_emoji = next((emoji for emoji, name in cog.pokemon_types.items() if name == offer_data['type']), "")
+            rarity_emoji = next((emoji for emoji, name in cog.rarity_levels.items() if name == offer_data['rarity']), "")
+            
+            # Erstelle Option-Label (max 100 Zeichen)
+            label = f"#{offer_id} {offer_data['name']} ({offer_data['hp']} KP)"
+            if len(label) > 100:
+                label = label[:97] + "..."
+            
+            # Erstelle Beschreibung (max 100 Zeichen)  
+            description = f"{type_emoji} {offer_data['type']} | {rarity_emoji} {offer_data['rarity']}"
+            if len(description) > 100:
+                description = description[:97] + "..."
+            
+            options.append(discord.SelectOption(
+                label=label,
+                value=str(offer_id),
+                description=description,
+                emoji="🎯"
+            ))
+        
+        # Discord erlaubt maximal 25 Optionen
+        if len(options) > 25:
+            options = options[:25]
+        
+        super().__init__(
+            placeholder="Wähle ein Pokemon-Angebot aus...",
+            options=options,
+            custom_id="offer_select"
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        offer_id = int(self.values[0])
+        selected_offer = self.offers[offer_id]
+        
+        # Überprüfe ob der Benutzer nicht sein eigenes Angebot auswählt
+        if selected_offer['user'].id == interaction.user.id:
+            await interaction.response.send_message(
+                "❌ Du kannst nicht auf dein eigenes Angebot reagieren!", 
+                ephemeral=True
+            )
+            return
+        
+        # Während ein Gegenangebot auf Antwort wartet, nimmt das Angebot keine weiteren an
+        if is_held(selected_offer) and selected_offer.get('held_by') != interaction.user.id:
+            await respond_entry_held(interaction)
+            return
+        
+        # Erstelle Counter-Offer View
+        counter_offer_view = CounterOfferView(selected_offer, interaction.user)
+        
+        # Erstelle Embed für das ausgewählte Angebot
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == selected_offer['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == selected_offer['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == selected_offer['rarity']), "")
+        
+        embed = discord.Embed(
+            title="🎯 Ausgewähltes Angebot",
+            description=f"Du möchtest auf das Angebot von **{selected_offer['user'].display_name}** reagieren:",
+            color=0x3498db
+        )
+        
+        embed.add_field(name="📛 Pokemon", value=f"**{selected_offer['name']}**", inline=True)
+        embed.add_field(name="❤️ KP", value=f"**{selected_offer['hp']}**", inline=True)
+        embed.add_field(name="🏷️ Typ", value=f"{type_emoji} **{selected_offer['type']}**", inline=True)
+        
+        # TCG-spezifische Informationen anzeigen
+        if selected_offer.get('is_tcg', False):
+            embed.add_field(name="🎴 Typ", value="TCG-Karte", inline=True)
+            # Cardmarket-Preis falls verfügbar
+            price = selected_offer.get('cardmarket_price')
+            if price:
+                embed.add_field(name="💰 Cardmarket Preis", value=f"€{price:.2f}", inline=True)
+            # Set-Informationen
+            set_info = f"Set: {selected_offer.get('tcg_set_id', 'Unbekannt')}"
+            card_num = selected_offer.get('tcg_card_number', '')
+            if card_num:
+                set_info += f" | #{card_num}"
+            embed.add_field(name="📦 TCG-Info", value=set_info, inline=True)
+            
+            # Kartenbild hinzufügen
+            image_url = selected_offer.get('tcg_image_url', '')
+            if image_url:
+                embed.set_image(url=image_url)
+            
+            # Set-Symbol als Thumbnail
+            symbol_url = selected_offer.get('tcg_set_symbol', '')
+            if symbol_url:
+                embed.set_thumbnail(url=symbol_url)
+        else:
+            # Normale Pokemon-Info
+            embed.add_field(name="🔄 Phase", value=f"{phase_emoji} **{selected_offer['phase']}**", inline=True)
+            embed.add_field(name="💎 Seltenheit", value=f"{rarity_emoji} **{selected_offer['rarity']}**", inline=True)
+        
+        embed.add_field(name="👤 Anbieter", value=selected_offer['user'].mention, inline=True)
+        embed.add_field(name="⭐ Reputation", value=self.cog.ledger.reputation(selected_offer['user'].id).badge(), inline=True)
+        
+        embed.add_field(
+            name="🔄 Nächster Schritt",
+            value="Wähle eine Option um zu reagieren:",
+            inline=False
+        )
+        
+        await interaction.response.edit_message(embed=embed, view=counter_offer_view)
+
+class OffersListView(TimedView):
+    """View für die Angebote-Liste"""
+    
+    def __init__(self, offers, cog):
+        super().__init__(timeout=300)
+        self.offers = offers
+        self.cog = cog
+        
+        if offers:
+            self.add_item(OfferSelect(offers, cog))
+    
+    @discord.ui.button(label="Aktualisieren", style=discord.ButtonStyle.secondary, emoji="🔄")
+    async def refresh_offers(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Aktualisiere die Angebote-Liste
+        await self.cog.show_offers_list(interaction, is_refresh=True)
+    
+    @discord.ui.button(label="Schließen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def close_offers(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        embed = discord.Embed(
+            title="📋 Angebote-Liste geschlossen",
+            description="Du kannst jederzeit `!angebote` verwenden um die Liste erneut zu öffnen.",
+            color=0xff0000
+        )
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+
+class CounterOfferView(TimedView):
+    """View für Reaktionen auf ein Angebot"""
+    
+    def __init__(self, target_offer, responding_user):
+        super().__init__(timeout=300)
+        self.target_offer = target_offer
+        self.responding_user = responding_user
+    
+    @discord.ui.button(label="Gegenangebot erstellen", style=discord.ButtonStyle.primary, emoji="🎮")
+    async def create_counter_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        embed = discord.Embed(
+            title="🎮 Gegenangebot erstellen",
+            description=f"Erstelle ein Gegenangebot für **{self.target_offer['user'].display_name}**s {self.target_offer['name']}!",
+            color=0x3498db
+        )
+        
+        embed.add_field(
+            name="📋 Anleitung",
+            value="Du wirst jetzt durch die Erstellung deines Gegenangebots geführt.\n"
+                  "Nach der Erstellung wird dein Angebot automatisch an den ursprünglichen Anbieter gesendet!",
+            inline=False
+        )
+        
+        embed.set_footer(text="Klicke 'Gegenangebot starten' um zu beginnen")
+        
+        # Erstelle neue sequenzielle View für das Gegenangebot
+        from .pokemon_wizard import CounterOfferSequentialView
+        cog = interaction.client.get_cog('Pokemon')
+        counter_offer_view = CounterOfferSequentialView(cog, self.target_offer, self.responding_user)
+        
+        await interaction.response.edit_message(embed=embed, view=counter_offer_view)
+    
+    @discord.ui.button(label="💬 Private Nachricht", style=discord.ButtonStyle.secondary, emoji="💬")
+    async def send_private_message(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        # Sende private Nachricht an den Anbieter
+        try:
+            dm_embed = discord.Embed(
+                title="🔔 Jemand ist interessiert an deinem Pokemon!",
+                description=f"**{interaction.user.display_name}** hat Interesse an deinem **{self.target_offer['name']}** gezeigt!",
+                color=0x00ff00
+            )
+            dm_embed.add_field(
+                name="Kontakt",
+                value=f"Schreibe {interaction.user.mention} eine private Nachricht um den Tausch zu besprechen!",
+                inline=False
+            )
+            
+            await self.target_offer['user'].send(embed=dm_embed)
+            
+            await interaction.response.send_message(
+                f"✅ Ich habe {self.target_offer['user'].display_name} über dein Interesse informiert! "
+                f"Sie werden sich bei dir melden.", 
+                ephemeral=True
+            )
+            
+        except discord.Forbidden:
+            await interaction.response.send_message(
+                f"❌ Ich konnte {self.target_offer['user'].display_name} keine private Nachricht senden. "
+                f"Kontaktiere sie direkt: {self.target_offer['user'].mention}",
+                ephemeral=True
+            )
+    
+    @discord.ui.button(label="Zurück zur Liste", style=discord.ButtonStyle.secondary, emoji="↩️")
+    async def back_to_list(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Gehe zurück zur Angebote-Liste
+        cog = interaction.client.get_cog('Pokemon')
+        await cog.show_offers_list(interaction, is_refresh=True)
+
+class CounterOfferResponseView(TimedView):
+    """View für die Annahme/Ablehnung von Gegenangeboten"""
+    
+    def __init__(self, original_offer_data, counter_offer_data, counter_offer_user, entry_version=None):
+        super().__init__(timeout=86400)  # 24 Stunden für Entscheidung
+        self.original_offer_data = original_offer_data
+        self.counter_offer_data = counter_offer_data
+        self.counter_offer_user = counter_offer_user
+        # Version, auf die das Annehmen per Compare-and-Swap prüft (nach dem Reservieren)
+        self.entry_version = entry_version or original_offer_data.get('version')
+        
+        # Erkenne ob es sich um ein Angebot oder einen Wunsch handelt
+        self.is_wish = 'offer_id' not in original_offer_data
+        self.is_offer = 'offer_id' in original_offer_data
+    
+    def build_accepted_embed(self):
+        """Deaktiviert die Buttons und baut die Bestätigung für den Annehmenden"""
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        # Aktualisiere die DM-Nachricht
+        embed = discord.Embed(
+            title="✅ Gegenangebot angenommen!",
+            description=f"Du hast das Gegenangebot von **{self.counter_offer_user.display_name}** angenommen!",
+            color=0x00ff00
+        )
+        
+        embed.add_field(
+            name="🎯 Dein Pokemon",
+            value=f"**{self.original_offer_data['name']}** ({self.original_offer_data['hp']} KP)",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🎮 Erhaltenes Pokemon",
+            value=f"**{self.counter_offer_data['name']}** ({self.counter_offer_data['hp']} KP)",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="💬 Nächster Schritt",
+            value=f"Kontaktiere {self.counter_offer_user.mention} um den Tausch durchzuführen!",
+            inline=False
+        )
+        
+        return embed
+    
+    @discord.ui.button(label="Annehmen", style=discord.ButtonStyle.success, emoji="✅")
+    async def accept_counter_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        # Gleichzeitige Annahmen desselben Eintrags (Doppelklick, mehrere Gegenangebote) laufen
+        # nacheinander; nur die erste nimmt ihn vom Markt, alle weiteren erfahren, dass er vergeben ist
+        cog = interaction.client.get_cog('Pokemon')
+        async with cog.entry_lock(self.original_offer_data):
+            if not await cog.claim_entry(self.original_offer_data, self.counter_offer_user.id, self.entry_version):
+                await respond_entry_taken(interaction)
+                return
+            # Erst eintragen, dann anzeigen: scheitert die Anzeige, ist der Tausch trotzdem gebucht
+            cog.record_trade("wish" if self.is_wish else "offer", self.original_offer_data, interaction.user,
+                             self.counter_offer_user, self.original_offer_data, self.counter_offer_data)
+            try:
+                await interaction.response.edit_message(embed=self.build_accepted_embed(), view=self)
+            except discord.HTTPException as e:
+                logger.warning("Bestätigung des angenommenen Gegenangebots nicht angezeigt: %s", e)
+        
+        # Benachrichtige den Gegenangebot-Ersteller
+        try:
+            success_embed = discord.Embed(
+                title="🎉 Dein Gegenangebot wurde angenommen!",
+                description=f"**{interaction.user.display_name}** hat dein Gegenangebot angenommen!",
+                color=0x00ff00
+            )
+            
+            success_embed.add_field(
+                name="🎯 Du bekommst",
+                value=f"**{self.original_offer_data['name']}** ({self.original_offer_data['hp']} KP)",
+                inline=True
+            )
+            
+            success_embed.add_field(
+                name="🎮 Du gibst",
+                value=f"**{self.counter_offer_data['name']}** ({self.counter_offer_data['hp']} KP)",
+                inline=True
+            )
+            
+            success_embed.add_field(
+                name="💬 Nächster Schritt",
+                value=f"**{interaction.user.display_name}** wird sich bei dir melden um den Tausch durchzuführen!\n"
+                      f"Du kannst auch direkt {interaction.user.mention} kontaktieren.",
+                inline=False
+            )
+            
+            await self.counter_offer_user.send(embed=success_embed)
+            
+        except discord.Forbidden:
+            # Falls DM nicht möglich ist, ignoriere es
+            pass
+    
+    @discord.ui.button(label="Ablehnen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def reject_counter_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        # Aktualisiere die DM-Nachricht
+        embed = discord.Embed(
+            title="❌ Gegenangebot abgelehnt",
+            description=f"Du hast das Gegenangebot von **{self.counter_offer_user.display_name}** abgelehnt.",
+            color=0xff0000
+        )
+        
+        embed.add_field(
+            name="📝 Info",
+            value="Das Gegenangebot wurde abgelehnt. Du kannst weiterhin auf andere Angebote warten oder selbst Gegenangebote erstellen.",
+            inline=False
+        )
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+        
+        # Der Eintrag ist wieder für alle gelistet
+        await interaction.client.get_cog('Pokemon').release_entry(self.original_offer_data, self.counter_offer_user.id)
+        
+        # Benachrichtige den Gegenangebot-Ersteller
+        try:
+            rejection_embed = discord.Embed(
+                title="😔 Dein Gegenangebot wurde abgelehnt",
+                description=f"**{interaction.user.display_name}** hat dein Gegenangebot leider abgelehnt.",
+                color=0xff9900
+            )
+            
+            rejection_embed.add_field(
+                name="💡 Nächste Schritte",
+                value="• Versuche ein anderes Gegenangebot zu erstellen\n"
+                      "• Schaue dir andere verfügbare Angebote an (`!angebote`)\n"
+                      "• Erstelle dein eigenes Angebot (`!bieten`)",
+                inline=False
+            )
+            
+            await self.counter_offer_user.send(embed=rejection_embed)
+            
+        except discord.Forbidden:
+            # Falls DM nicht möglich ist, ignoriere es
+            pass
+    
+    @discord.ui.button(label="💬 Nachricht senden", style=discord.ButtonStyle.secondary, emoji="💬")
+    async def send_message(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        await interaction.response.send_message(
+            f"Du kannst {self.counter_offer_user.mention} direkt kontaktieren um über das Gegenangebot zu sprechen!",
+            ephemeral=True
+        )
+
+class WishSelect(discord.ui.Select):
+    """Dropdown für Pokemon-Wünsche Auswahl"""
+    
+    def __init__(self, wishes, cog):
+        self.wishes = wishes
+        self.cog = cog
+        
+        options = []
+        for wish_id, wish_data in wishes.items():
+            # Hole Emojis für bessere Darstellung
+            type_emoji = next((emoji for emoji, name in cog.pokemon_types.items() if name == wish_data['type']), "")
+            rarity_emoji = next((emoji for emoji, name in cog.rarity_levels.items() if name == wish_data['rarity']), "")
+            
+            # Erstelle Option-Label (max 100 Zeichen)
+            label = f"#{wish_id} {wish_data['name']} ({wish_data['hp']} KP)"
+            if len(label) > 100:
+                label = label[:97] + "..."
+            
+            # Erstelle Beschreibung mit Tauschangebot-Info (max 100 Zeichen)  
+            if wish_data.get('offer_included', False):
+                description = f"{type_emoji} {wish_data['type']} | {rarity_emoji} {wish_data['rarity']} | 🎮 Mit Angebot"
+            else:
+                description = f"{type_emoji} {wish_data['type']} | {rarity_emoji} {wish_data['rarity']}"
+            
+            if len(description) > 100:
+                description = description[:97] + "..."
+            
+            # Wähle Emoji basierend auf Tauschangebot
+            emoji = "🎮" if wish_data.get('offer_included', False) else "🌟"
+            
+            options.append(discord.SelectOption(
+                label=label,
+                value=str(wish_id),
+                description=description,
+                emoji=emoji
+            ))
+        
+        # Discord erlaubt maximal 25 Optionen
+        if len(options) > 25:
+            options = options[:25]
+        
+        super().__init__(
+            placeholder="Wähle einen Pokemon-Wunsch aus...",
+            options=options,
+            custom_id="wish_select"
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        wish_id = int(self.values[0])
+        selected_wish = self.wishes[wish_id]
+        
+        # Überprüfe ob der Benutzer nicht seinen eigenen Wunsch auswählt
+        if selected_wish['user'].id == interaction.user.id:
+            await interaction.response.send_message(
+                "❌ Du kannst nicht auf deinen eigenen Wunsch reagieren!", 
+                ephemeral=True
+            )
+            return
+        
+        if is_held(selected_wish) and selected_wish.get('held_by') != interaction.user.id:
+            await respond_entry_held(interaction)
+            return
+        
+        # Erstelle Response View basierend auf Wunsch-Typ
+        if selected_wish.get('offer_included', False):
+            # Wunsch mit Tauschangebot
+            wish_response_view = WishWithOfferResponseView(selected_wish, interaction.user)
+        else:
+            # Nur Wunsch ohne Tauschangebot
+            wish_response_view = WishOnlyResponseView(selected_wish, interaction.user)
+        
+        # Erstelle Embed für den ausgewählten Wunsch
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == selected_wish['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == selected_wish['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == selected_wish['rarity']), "")
+        
+        embed = discord.Embed(
+            title="🌟 Ausgewählter Wunsch",
+            description=f"Du möchtest auf den Wunsch von **{selected_wish['user'].display_name}** reagieren:",
+            color=0xffd700
+        )
+        
+        embed.add_field(name="📛 Gesuchtes Pokemon", value=f"**{selected_wish['name']}**", inline=True)
+        embed.add_field(name="❤️ KP", value=f"**{selected_wish['hp']}**", inline=True)
+        embed.add_field(name="🏷️ Typ", value=f"{type_emoji} **{selected_wish['type']}**", inline=True)
+        
+        # TCG-spezifische Informationen anzeigen
+        if selected_wish.get('is_tcg', False):
+            embed.add_field(name="🎴 Typ", value="TCG-Karte", inline=True)
+            # Cardmarket-Preis falls verfügbar
+            price = selected_wish.get('cardmarket_price')
+            if price:
+                embed.add_field(name="💰 Cardmarket Preis", value=f"€{price:.2f}", inline=True)
+            # Set-Informationen
+            set_info = f"Set: {selected_wish.get('tcg_set_id', 'Unbekannt')}"
+            card_num = selected_wish.get('tcg_card_number', '')
+            if card_num:
+                set_info += f" | #{card_num}"
+            embed.add_field(name="📦 TCG-Info", value=set_info, inline=True)
+            
+            # Kartenbild hinzufügen
+            image_url = selected_wish.get('tcg_image_url', '')
+            if image_url:
+                embed.set_image(url=image_url)
+            
+            # Set-Symbol als Thumbnail
+            symbol_url = selected_wish.get('tcg_set_symbol', '')
+            if symbol_url:
+                embed.set_thumbnail(url=symbol_url)
+        else:
+            # Normale Pokemon-Info
+            embed.add_field(name="🔄 Phase", value=f"{phase_emoji} **{selected_wish['phase']}**", inline=True)
+            embed.add_field(name="💎 Seltenheit", value=f"{rarity_emoji} **{selected_wish['rarity']}**", inline=True)
+        
+        embed.add_field(name="👤 Wünschender", value=selected_wish['user'].mention, inline=True)
+        embed.add_field(name="⭐ Reputation", value=self.cog.ledger.reputation(selected_wish['user'].id).badge(), inline=True)
+        
+        # Zeige Tauschangebot-Info falls vorhanden
+        if selected_wish.get('offer_included', False) and selected_wish.get('offer_data'):
+            offer_data = selected_wish['offer_data']
+            
+            # Prüfe ob Angebot auch TCG ist
+            if offer_data.get('is_tcg', False):
+                offer_price = offer_data.get('cardmarket_price')
+                offer_info = f"**{offer_data['name']}**"
+                if offer_data.get('hp'):
+                    offer_info += f" ({offer_data['hp']} KP)"
+                if offer_price:
+                    offer_info += f" | €{offer_price:.2f}"
+                embed.add_field(
+                    name="🎮 Angebotene TCG-Karte",
+                    value=offer_info,
+                    inline=False
+                )
+            else:
+                offer_type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == offer_data['type']), "")
+                offer_phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == offer_data['phase']), "")
+                offer_rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == offer_data['rarity']), "")
+                
+                embed.add_field(
+                    name="🎮 Angebotenes Pokemon",
+                    value=f"**{offer_data['name']}** ({offer_data['hp']} KP)\n"
+                          f"{offer_type_emoji} {offer_data['type']} | "
+                          f"{offer_phase_emoji} {offer_data['phase']} | "
+                          f"{offer_rarity_emoji} {offer_data['rarity']}",
+                    inline=False
+                )
+        
+        embed.add_field(
+            name="🔄 Nächster Schritt",
+            value="Wähle eine Option um zu reagieren:",
+            inline=False
+        )
+        
+        await interaction.response.edit_message(embed=embed, view=wish_response_view)
+
+class WishesListView(TimedView):
+    """View für die Wünsche-Liste"""
+    
+    def __init__(self, wishes, cog):
+        super().__init__(timeout=300)
+        self.wishes = wishes
+        self.cog = cog
+        
+        if wishes:
+            self.add_item(WishSelect(wishes, cog))
+    
+    @discord.ui.button(label="Aktualisieren", style=discord.ButtonStyle.secondary, emoji="🔄")
+    async def refresh_wishes(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Aktualisiere die Wünsche-Liste
+        await self.cog.show_wishes_list(interaction, is_refresh=True)
+    
+    @discord.ui.button(label="Schließen", style=discord.ButtonStyle.danger, emoji="❌")
+    async def close_wishes(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        embed = discord.Embed(
+            title="📋 Wünsche-Liste geschlossen",
+            description="Du kannst jederzeit `!wünsche` verwenden um die Liste erneut zu öffnen.",
+            color=0xff0000
+        )
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+
+class WishOnlyResponseView(TimedView):
+    """View für Reaktionen auf einen reinen Wunsch (ohne Tauschangebot)"""
+    
+    def __init__(self, target_wish, responding_user):
+        super().__init__(timeout=300)
+        self.target_wish = target_wish
+        self.responding_user = responding_user
+    
+    @discord.ui.button(label="Gegenangebot erstellen", style=discord.ButtonStyle.primary, emoji="🎮")
+    async def create_counter_offer_for_wish(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        embed = discord.Embed(
+            title="🎮 Gegenangebot für Wunsch erstellen",
+            description=f"Erstelle ein Angebot für **{self.target_wish['user'].display_name}**s Wunsch!",
+            color=0x3498db
+        )
+        
+        embed.add_field(
+            name="🎯 Gesuchtes Pokemon",
+            value=f"**{self.target_wish['name']}** ({self.target_wish['hp']} KP)",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="📋 Anleitung",
+            value="Du wirst jetzt durch die Erstellung deines Angebots geführt.\n"
+                  "Nach der Erstellung wird dein Angebot automatisch an den Wünschenden gesendet!",
+            inline=False
+        )
+        
+        embed.set_footer(text="Klicke 'Angebot starten' um zu beginnen")
+        
+        # Erstelle neue sequenzielle View für das Angebot
+        cog = interaction.client.get_cog('Pokemon')
+        offer_view = cog.create_wish_counter_offer_view(self.target_wish, self.responding_user)
+        
+        await interaction.response.edit_message(embed=embed, view=offer_view)
+    
+    @discord.ui.button(label="💬 Kontakt aufnehmen", style=discord.ButtonStyle.secondary, emoji="💬")
+    async def contact_wisher(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        # Sende private Nachricht an den Wünschenden
+        try:
+            dm_embed = discord.Embed(
+                title="🔔 Jemand ist interessiert an deinem Wunsch!",
+                description=f"**{interaction.user.display_name}** hat Interesse an deinem Pokemon-Wunsch gezeigt!",
+                color=0x00ff00
+            )
+            
+            dm_embed.add_field(
+                name="🎯 Dein Wunsch",
+                value=f"**{self.target_wish['name']}** ({self.target_wish['hp']} KP)",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name="Kontakt",
+                value=f"Schreibe {interaction.user.mention} eine private Nachricht um den Tausch zu besprechen!",
+                inline=False
+            )
+            
+            await self.target_wish['user'].send(embed=dm_embed)
+            
+            await interaction.response.send_message(
+                f"✅ Ich habe {self.target_wish['user'].display_name} über dein Interesse informiert! "
+                f"Sie werden sich bei dir melden.", 
+                ephemeral=True
+            )
+            
+        except discord.Forbidden:
+            await interaction.response.send_message(
+                f"❌ Ich konnte {self.target_wish['user'].display_name} keine private Nachricht senden. "
+                f"Kontaktiere sie direkt: {self.target_wish['user'].mention}",
+                ephemeral=True
+            )
+    
+    @discord.ui.button(label="Zurück zur Liste", style=discord.ButtonStyle.secondary, emoji="↩️")
+    async def back_to_list(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Gehe zurück zur Wünsche-Liste  
+        cog = interaction.client.get_cog('Pokemon')
+        await cog.show_wishes_list(interaction, is_refresh=True)
+
+class WishWithOfferResponseView(TimedView):
+    """View für Reaktionen auf einen Wunsch mit Tauschangebot"""
+    
+    def __init__(self, target_wish, responding_user):
+        super().__init__(timeout=300)
+        self.target_wish = target_wish
+        self.responding_user = responding_user
+        # Version des Wunsches, wie ihn der Antwortende ausgewählt hat (Compare-and-Swap beim Annehmen)
+        self.entry_version = target_wish.get('version')
+    
+    def build_accepted_embed(self):
+        """Deaktiviert die Buttons und baut die Bestätigung für den Annehmenden"""
+        offer_data = self.target_wish['offer_data']
+        
+        # Erstelle Annahme-Embed
+        embed = discord.Embed(
+            title="✅ Tauschangebot angenommen!",
+            description=f"Du hast das Tauschangebot von **{self.target_wish['user'].display_name}** angenommen!",
+            color=0x00ff00
+        )
+        
+        embed.add_field(
+            name="🎯 Du gibst",
+            value=f"**{self.target_wish['name']}** ({self.target_wish['hp']} KP)",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🎮 Du bekommst",
+            value=f"**{offer_data['name']}** ({offer_data['hp']} KP)",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="💬 Nächster Schritt",
+            value=f"Kontaktiere {self.target_wish['user'].mention} um den Tausch durchzuführen!",
+            inline=False
+        )
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        return embed
+    
+    @discord.ui.button(label="Tauschangebot annehmen", style=discord.ButtonStyle.success, emoji="✅")
+    async def accept_trade_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        offer_data = self.target_wish['offer_data']
+        
+        # Nur die erste von gleichzeitigen Annahmen nimmt den Wunsch vom Markt
+        cog = interaction.client.get_cog('Pokemon')
+        async with cog.entry_lock(self.target_wish):
+            if not await cog.claim_entry(self.target_wish, self.responding_user.id, self.entry_version):
+                await respond_entry_taken(interaction)
+                return
+            # Erst eintragen, dann anzeigen: scheitert die Anzeige, ist der Tausch trotzdem gebucht
+            cog.record_trade("wish_offer", self.target_wish, self.target_wish['user'], interaction.user,
+                             offer_data, self.target_wish)
+            try:
+                await interaction.response.edit_message(embed=self.build_accepted_embed(), view=self)
+            except discord.HTTPException as e:
+                logger.warning("Bestätigung des angenommenen Tauschangebots nicht angezeigt: %s", e)
+        
+        # Benachrichtige den Wünschenden
+        try:
+            success_embed = discord.Embed(
+                title="🎉 Dein Tauschangebot wurde angenommen!",
+                description=f"**{interaction.user.display_name}** hat dein Tauschangebot angenommen!",
+                color=0x00ff00
+            )
+            
+            success_embed.add_field(
+                name="🎯 Du bekommst",
+                value=f"**{self.target_wish['name']}** ({self.target_wish['hp']} KP)",
+                inline=True
+            )
+            
+            success_embed.add_field(
+                name="🎮 Du gibst",
+                value=f"**{offer_data['name']}** ({offer_data['hp']} KP)",
+                inline=True
+            )
+            
+            success_embed.add_field(
+                name="💬 Nächster Schritt",
+                value=f"**{interaction.user.display_name}** wird sich bei dir melden um den Tausch durchzuführen!\n"
+                      f"Du kannst auch direkt {interaction.user.mention} kontaktieren.",
+                inline=False
+            )
+            
+            await self.target_wish['user'].send(embed=success_embed)
+            
+        except discord.Forbidden:
+            # Falls DM nicht möglich ist, ignoriere es
+            pass
+    
+    @discord.ui.button(label="Gegenangebot erstellen", style=discord.ButtonStyle.primary, emoji="🎮")
+    async def create_counter_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        embed = discord.Embed(
+            title="🎮 Gegenangebot erstellen",
+            description=f"Erstelle ein alternatives Angebot für **{self.target_wish['user'].display_name}**!",
+            color=0x3498db
+        )
+        
+        embed.add_field(
+            name="📋 Info",
+            value="Du kannst ein anderes Pokemon anbieten als das bereits vorgeschlagene.\n"
+                  "Nach der Erstellung wird dein Gegenangebot an den Wünschenden gesendet!",
+            inline=False
+        )
+        
+        # Erstelle neue sequenzielle View für das Gegenangebot
+        cog = interaction.client.get_cog('Pokemon')
+        offer_view = cog.create_wish_counter_offer_view(self.target_wish, self.responding_user)
+        
+        await interaction.response.edit_message(embed=embed, view=offer_view)
+    
+    @discord.ui.button(label="💬 Kontakt aufnehmen", style=discord.ButtonStyle.secondary, emoji="💬")
+    async def contact_wisher(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        # Sende private Nachricht an den Wünschenden
+        try:
+            dm_embed = discord.Embed(
+                title="🔔 Jemand ist interessiert an deinem Wunsch!",
+                description=f"**{interaction.user.display_name}** hat Interesse an deinem Pokemon-Wunsch gezeigt!",
+                color=0x00ff00
+            )
+            
+            dm_embed.add_field(
+                name="🎯 Dein Wunsch mit Angebot",
+                value=f"**{self.target_wish['name']}** für **{self.target_wish['offer_data']['name']}**",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name="Kontakt",
+                value=f"Schreibe {interaction.user.mention} eine private Nachricht um zu besprechen!",
+                inline=False
+            )
+            
+            await self.target_wish['user'].send(embed=dm_embed)
+            
+            await interaction.response.send_message(
+                f"✅ Ich habe {self.target_wish['user'].display_name} über dein Interesse informiert! "
+                f"Sie werden sich bei dir melden.", 
+                ephemeral=True
+            )
+            
+        except discord.Forbidden:
+            await interaction.response.send_message(
+                f"❌ Ich konnte {self.target_wish['user'].display_name} keine private Nachricht senden. "
+                f"Kontaktiere sie direkt: {self.target_wish['user'].mention}",
+                ephemeral=True
+            )
+    
+    @discord.ui.button(label="Zurück zur Liste", style=discord.ButtonStyle.secondary, emoji="↩️")
+    async def back_to_list(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Gehe zurück zur Wünsche-Liste  
+        cog = interaction.client.get_cog('Pokemon')
+        await cog.show_wishes_list(interaction, is_refresh=True)
+
+# ============= TCG Views und Modals =============
@@ -0,0 +1,140 @@
+"""
+Sortiertes Mitgliederverzeichnis pro Guild für !user
+
+Statt bei jedem Aufruf alle Mitglieder zu sortieren und mehrfach zu filtern,
+hält das Verzeichnis die Menschen einer Guild nach Namen sortiert und zählt
+Menschen, Bots und Online-Status mit. Aufgebaut wird es beim ersten !user
+einer Guild (ein Sortierlauf über den Member-Cache), danach halten die
+Gateway-Events (Beitritt, Austritt, Namens- und Statusänderungen) es aktuell.
+Eine Seite kostet damit O(Seite), Änderungen O(log n) plus das Verschieben
+der sortierten Liste.
+
+Nur im vollen Gateway-Modus sinnvoll: ohne Member-Cache und Presences
+(LEAN_GATEWAY) wird kein Verzeichnis aufgebaut und Events werden ignoriert.
+"""
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import discord
+
+SortKey = Tuple[str, int]
+
+
+class DirectoryEntry:
+    """Ein Mitglied im Verzeichnis"""
+
+    __slots__ = ("key", "name", "mention", "bot", "online")
+
+    def __init__(self, member: Any, online: Optional[bool] = None):
+        self.name = member.name
+        self.key: SortKey = (member.name.lower(), member.id)
+        self.mention = member.mention
+        self.bot = member.bot
+        self.online = member.status != discord.Status.offline if online is None else online
+
+
+class GuildDirectory:
+    """Menschen einer Guild nach Namen sortiert, mit laufenden Zählern"""
+
+    def __init__(self, members: Iterable[Any] = ()):
+        self._entries: Dict[int, DirectoryEntry] = {member.id: DirectoryEntry(member) for member in members}
+        humans = [entry for entry in self._entries.values() if not entry.bot]
+        self.humans = len(humans)
+        self.bots = len(self._entries) - self.humans
+        self.online_humans = sum(1 for entry in humans if entry.online)
+        # Einmaliger Sortierlauf beim Aufbau, danach nur noch Einfügen per Bisektion
+        self._sorted: List[SortKey] = sorted(entry.key for entry in humans)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, member_id: int) -> bool:
+        return member_id in self._entries
+
+    def _count(self, entry: DirectoryEntry, delta: int) -> None:
+        if entry.bot:
+            self.bots += delta
+        else:
+            self.humans += delta
+            if entry.online:
+                self.online_humans += delta
+
+    def add(self, member: Any) -> None:
+        if member.id in self._entries:
+            self.update(member)
+        else:
+            self._insert(DirectoryEntry(member))
+
+    def _insert(self, entry: DirectoryEntry) -> None:
+        self._entries[entry.key[1]] = entry
+        self._count(entry, 1)
+        if not entry.bot:
+            insort(self._sorted, entry.key)
+
+    def remove(self, member_id: int) -> None:
+        entry = self._entries.pop(member_id, None)
+        if entry is None:
+            return
+        self._count(entry, -1)
+        if not entry.bot:
+            index = bisect_left(self._sorted, entry.key)
+            if index < len(self._sorted) and self._sorted[index] == entry.key:
+                del self._sorted[index]
+
+    def update(self, member: Any) -> None:
+        """Übernimmt Namen und Status (Users ohne Status behalten ihren); Unbekannte werden hinzugefügt"""
+        entry = self._entries.get(member.id)
+        if entry is None:
+            self._insert(DirectoryEntry(member))
+            return
+        status = getattr(member, "status", None)
+        online = entry.online if status is None else status != discord.Status.offline
+        if member.name != entry.name:
+            self.remove(member.id)
+            self._insert(DirectoryEntry(member, online))
+        elif online != entry.online:
+            self._count(entry, -1)
+            entry.online = online
+            self._count(entry, 1)
+
+    def page(self, offset: int, limit: int) -> List[DirectoryEntry]:
+        """Menschen ``offset`` bis ``offset + limit`` in Namensreihenfolge"""
+        return [self._entries[member_id] for _, member_id in self._sorted[offset:offset + limit]]
+
+
+class MemberDirectory:
+    """Verzeichnisse aller Guilds, aufgebaut beim ersten Zugriff"""
+
+    def __init__(self):
+        self._guilds: Dict[int, GuildDirectory] = {}
+
+    def get(self, guild: Any) -> Optional[GuildDirectory]:
+        """Verzeichnis der Guild; None, solange ihr Member-Cache noch nicht vollständig ist"""
+        directory = self._guilds.get(guild.id)
+        if directory is None and getattr(guild, "chunked", True):
+            directory = self._guilds[guild.id] = GuildDirectory(guild.members)
+        return directory
+
+    def add(self, guild_id: int, member: Any) -> None:
+        directory = self._guilds.get(guild_id)
+        if directory is not None:
+            directory.add(member)
+
+    def remove(self, guild_id: int, member_id: int) -> None:
+        directory = self._guilds.get(guild_id)
+        if directory is not None:
+            directory.remove(member_id)
+
+    def update(self, guild_id: int, member: Any) -> None:
+        directory = self._guilds.get(guild_id)
+        if directory is not None:
+            directory.update(member)
+
+    def update_user(self, user: Any) -> None:
+        """Namensänderung eines Users in allen Guilds, in denen er verzeichnet ist"""
+        for directory in self._guilds.values():
+            if user.id in directory:
+                directory.update(user)
+
+    def drop_guild(self, guild_id: int) -> None:
+        self._guilds.pop(guild_id, None)
@@ -0,0 +1,455 @@
+"""
+Metriken
+Counter, Histogramme und Gauges mit Prometheus-Textformat
+
+Das Aufzeichnen eines Events ist bewusst minimal gehalten (ein Listen-Index,
+zwei Additionen), damit Messpunkte auch in heißen Pfaden bleiben können.
+Metrik-Objekte sollten einmal geholt und wiederverwendet werden; die
+Registry-Lookups sind nur für seltene oder dynamische Label-Kombinationen.
+"""
+import logging
+import time
+import weakref
+from bisect import bisect_left
+from functools import wraps
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import discord
+from discord import app_commands
+
+from .tracing import TRACER, current_span
+
+if TYPE_CHECKING:
+    from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+# Sekunden; deckt Cache-Treffer (<1 ms) bis langsame API-Fan-outs (>10 s) ab
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels)
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """Monoton steigender Zähler"""
+
+    __slots__ = ("labels", "value")
+
+    def __init__(self, labels: LabelKey):
+        self.labels = labels
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Histogram:
+    """Histogramm mit festen Buckets (obere Grenzen, exklusive +Inf)"""
+
+    __slots__ = ("labels", "buckets", "counts", "sum", "count")
+
+    def __init__(self, labels: LabelKey, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.labels = labels
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def time(self) -> "_Timer":
+        """Kontextmanager, der die Dauer des Blocks beobachtet"""
+        return _Timer(self)
+
+    def quantile(self, q: float) -> float:
+        """Schätzt ein Quantil durch lineare Interpolation innerhalb des Buckets"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.buckets[-1]
+            if bucket_count and seen + bucket_count >= rank:
+                return lower + (upper - lower) * ((rank - seen) / bucket_count)
+            seen += bucket_count
+            lower = upper
+        return self.buckets[-1]
+
+
+class _Timer:
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+        self.started = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+class Gauge:
+    """Momentanwert, entweder gesetzt oder bei jedem Export über eine Funktion gelesen"""
+
+    __slots__ = ("labels", "value", "function")
+
+    def __init__(self, labels: LabelKey, function: Optional[Callable[[], float]] = None):
+        self.labels = labels
+        self.value = 0.0
+        self.function = function
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def read(self) -> float:
+        if self.function is None:
+            return self.value
+        try:
+            return float(self.function())
+        except Exception as e:  # pylint: disable=broad-except
+            logger.debug("Gauge-Funktion fehlgeschlagen: %s", e)
+            return float("nan")
+
+
+class _Family:
+    __slots__ = ("name", "help", "kind", "children")
+
+    def __init__(self, name: str, help_text: str, kind: str):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.children: Dict[LabelKey, Any] = {}
+
+
+class MetricsRegistry:
+    """Sammlung aller Metriken eines Prozesses"""
+
+    def __init__(self):
+        self._families: Dict[str, _Family] = {}
+
+    def _family(self, name: str, help_text: str, kind: str) -> _Family:
+        family = self._families.get(name)
+        if family is None:
+            family = _Family(name, help_text, kind)
+            self._families[name] = family
+        elif family.kind != kind:
+            raise ValueError(f"Metrik {name} ist bereits als {family.kind} registriert")
+        return family
+
+    def counter(self, name: str, help_text: str = "", **labels: Any) -> Counter:
+        family = self._family(name, help_text, "counter")
+        key = _label_key(labels)
+        metric = family.children.get(key)
+        if metric is None:
+            metric = family.children[key] = Counter(key)
+        return metric
+
+    def histogram(self, name: str, help_text: str = "",
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS, **labels: Any) -> Histogram:
+        family = self._family(name, help_text, "histogram")
+        key = _label_key(labels)
+        metric = family.children.get(key)
+        if metric is None:
+            metric = family.children[key] = Histogram(key, buckets)
+        return metric
+
+    def gauge(self, name: str, help_text: str = "",
+              function: Optional[Callable[[], float]] = None, **labels: Any) -> Gauge:
+        """Holt oder erstellt einen Gauge; eine übergebene Funktion ersetzt die bisherige"""
+        family = self._family(name, help_text, "gauge")
+        key = _label_key(labels)
+        metric = family.children.get(key)
+        if metric is None:
+            metric = family.children[key] = Gauge(key, function)
+        elif function is not None:
+            metric.function = function
+        return metric
+
+    def histograms(self, name: str) -> Iterable[Histogram]:
+        family = self._families.get(name)
+        return list(family.children.values()) if family and family.kind == "histogram" else []
+
+    def counters(self, name: str) -> Iterable[Counter]:
+        family = self._families.get(name)
+        return list(family.children.values()) if family and family.kind == "counter" else []
+
+    def gauges(self, name: str) -> Iterable[Gauge]:
+        family = self._families.get(name)
+        return list(family.children.values()) if family and family.kind == "gauge" else []
+
+    def timed(self, name: str, help_text: str = "", **labels: Any) -> Callable:
+        """Decorator, der die Laufzeit einer Coroutine-Funktion misst"""
+        histogram = self.histogram(name, help_text, **labels)
+
+        def decorator(func: Callable) -> Callable:
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+            return wrapper
+        return decorator
+
+    def render_prometheus(self) -> str:
+        """Exportiert alle Metriken im Prometheus-Textformat (Version 0.0.4)"""
+        lines: List[str] = []
+        for family in self._families.values():
+            if family.help:
+                lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for metric in list(family.children.values()):
+                if family.kind == "histogram":
+                    cumulative = 0
+                    for index, upper in enumerate(metric.buckets + (float("inf"),)):
+                        cumulative += metric.counts[index]
+                        le = ("le", _format_value(upper))
+                        lines.append(f"{family.name}_bucket{_format_labels(metric.labels, le)} {cumulative}")
+                    lines.append(f"{family.name}_sum{_format_labels(metric.labels)} {_format_value(metric.sum)}")
+                    lines.append(f"{family.name}_count{_format_labels(metric.labels)} {metric.count}")
+                elif family.kind == "gauge":
+                    lines.append(f"{family.name}{_format_labels(metric.labels)} {_format_value(metric.read())}")
+                else:
+                    lines.append(f"{family.name}{_format_labels(metric.labels)} {_format_value(metric.value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Prozessweite Standard-Registry
+REGISTRY = MetricsRegistry()
+
+# Textformat 0.0.4 des Prometheus-Exports
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class MetricsServer:
+    """Lokaler HTTP-Endpunkt für /metrics"""
+
+    def __init__(self, registry: MetricsRegistry, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional["web.AppRunner"] = None
+
+    async def _handle_metrics(self, request: "web.Request") -> "web.Response":
+        from aiohttp import web
+
+        return web.Response(
+            body=self.registry.render_prometheus().encode("utf-8"),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE, "X-Content-Type-Options": "nosniff"}
+        )
+
+    async def start(self) -> None:
+        # aiohttp.web erst hier importieren, es kostet beim Start sonst ~30 ms
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        logger.info("📈 Metriken verfügbar unter http://%s:%d/metrics", self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+# ============= Discord-Instrumentierung =============
+
+_open_views: "weakref.WeakSet[discord.ui.View]" = weakref.WeakSet()
+
+
+def open_view_count() -> int:
+    """Anzahl instrumentierter Views, die noch auf Interaktionen warten"""
+    return sum(1 for view in list(_open_views) if not view.is_finished())
+
+
+REGISTRY.gauge("discord_open_views", "Offene (nicht beendete) Views", function=open_view_count)
+
+
+def _item_name(item: discord.ui.Item) -> str:
+    callback = getattr(item.callback, "callback", None)
+    name = getattr(callback, "__name__", None)
+    if name and name != "callback":
+        return name
+    return getattr(item, "custom_id", None) or type(item).__name__
+
+
+def _trace_origin() -> Tuple[Optional[str], Optional[str]]:
+    """Trace und Span, in dem eine View/ein Modal erstellt wird"""
+    span = current_span()
+    if span is None:
+        return None, None
+    return span.trace_id, span.span_id or None
+
+
+class TimedView(discord.ui.View):
+    """View, die Dauer und Fehler aller Item-Callbacks misst und als Spans aufzeichnet"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        _open_views.add(self)
+        self._callback_histograms: Dict[str, Histogram] = {}
+        self._trace_id, self._trace_parent = _trace_origin()
+
+    def _callback_histogram(self, item: discord.ui.Item) -> Histogram:
+        name = _item_name(item)
+        histogram = self._callback_histograms.get(name)
+        if histogram is None:
+            histogram = self._callback_histograms[name] = REGISTRY.histogram(
+                "discord_view_callback_seconds", "Dauer von View-Callbacks",
+                view=type(self).__name__, item=name
+            )
+        return histogram
+
+    async def _scheduled_task(self, item: discord.ui.Item, interaction: discord.Interaction):
+        started = time.perf_counter()
+        span_name = f"{type(self).__name__}.{_item_name(item)}"
+        try:
+            with TRACER.span(span_name, trace_id=self._trace_id or interaction.id,
+                             parent_id=self._trace_parent, interaction_id=interaction.id):
+                return await super()._scheduled_task(item, interaction)
+        finally:
+            self._callback_histogram(item).observe(time.perf_counter() - started)
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception, item: discord.ui.Item) -> None:
+        _mark_span_error(error)
+        REGISTRY.counter(
+            "discord_view_callback_errors_total", "Fehlgeschlagene View-Callbacks",
+            view=type(self).__name__, item=_item_name(item)
+        ).inc()
+        await super().on_error(interaction, error, item)
+
+
+class TimedModal(discord.ui.Modal):
+    """Modal, das die Dauer von on_submit misst und als Spans aufzeichnet"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._trace_id, self._trace_parent = _trace_origin()
+
+    async def _scheduled_task(self, interaction: discord.Interaction, components):
+        started = time.perf_counter()
+        try:
+            with TRACER.span(f"{type(self).__name__}.on_submit", trace_id=self._trace_id or interaction.id,
+                             parent_id=self._trace_parent, interaction_id=interaction.id):
+                return await super()._scheduled_task(interaction, components)
+        finally:
+            REGISTRY.histogram(
+                "discord_modal_submit_seconds", "Dauer von Modal-Submits",
+                modal=type(self).__name__
+            ).observe(time.perf_counter() - started)
+
+    async def on_error(self, interaction: discord.Interaction, error: Exception) -> None:
+        _mark_span_error(error)
+        REGISTRY.counter(
+            "discord_modal_errors_total", "Fehlgeschlagene Modal-Submits",
+            modal=type(self).__name__
+        ).inc()
+        await super().on_error(interaction, error)
+
+
+def _mark_span_error(error: BaseException) -> None:
+    """Hängt einen abgefangenen Fehler an den aktiven Span"""
+    span = current_span()
+    if span is not None and span.sampled:
+        span.error = f"{type(error).__name__}: {error}"
+
+
+def _observe_command(kind: str, name: str, started: Optional[float], failed: bool) -> None:
+    if started is not None:
+        REGISTRY.histogram(
+            "discord_command_seconds", "Dauer von Befehlen", kind=kind, command=name
+        ).observe(time.perf_counter() - started)
+    REGISTRY.counter(
+        "discord_commands_total", "Ausgeführte Befehle",
+        kind=kind, command=name, result="error" if failed else "ok"
+    ).inc()
+
+
+class InstrumentedCommandTree(app_commands.CommandTree):
+    """CommandTree, der Slash-Commands misst (Start in interaction_check)"""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["metrics_started"] = time.perf_counter()
+        command = interaction.command
+        interaction.extras["trace_span"] = TRACER.begin(
+            f"/{command.qualified_name if command else 'unknown'}",
+            trace_id=interaction.id, interaction_id=interaction.id
+        )
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError) -> None:
+        command = interaction.command
+        _observe_command("slash", command.qualified_name if command else "unknown",
+                         interaction.extras.get("metrics_started"), failed=True)
+        span = interaction.extras.pop("trace_span", None)
+        if span is not None:
+            TRACER.end(span, error)
+        await super().on_error(interaction, error)
+
+
+def install_command_hooks(bot) -> None:
+    """Registriert Hooks, die Prefix- und Slash-Commands messen und tracen"""
+
+    async def start_command_timer(ctx) -> None:
+        ctx.metrics_started = time.perf_counter()
+        ctx.trace_span = TRACER.begin(f"!{ctx.command.qualified_name}", trace_id=ctx.message.id)
+
+    async def record_command(ctx) -> None:
+        _observe_command("prefix", ctx.command.qualified_name,
+                         getattr(ctx, "metrics_started", None), ctx.command_failed)
+        span = getattr(ctx, "trace_span", None)
+        if span is not None:
+            if ctx.command_failed:
+                span.error = span.error or "command failed"
+            TRACER.end(span)
+
+    async def on_app_command_completion(interaction: discord.Interaction, command) -> None:
+        _observe_command("slash", command.qualified_name,
+                         interaction.extras.get("metrics_started"), failed=False)
+        span = interaction.extras.pop("trace_span", None)
+        if span is not None:
+            TRACER.end(span)
+
+    bot.before_invoke(start_command_timer)
+    bot.after_invoke(record_command)
+    bot.add_listener(on_app_command_completion)
@@ -0,0 +1,293 @@
+"""
+Fehlermeldungen und Ideenvorschläge (!fehler, !ideen)
+
+Wird beim ersten Aufruf eines der beiden Befehle importiert.
+"""
+import discord
+
+from .metrics import TimedModal, TimedView
+
+class ErrorReportModal(TimedModal):
+    """Modal für Fehler-Meldungen"""
+    
+    def __init__(self, cog):
+        super().__init__(title="🐛 Fehler melden")
+        self.cog = cog
+        
+        self.error_title = discord.ui.TextInput(
+            label="Fehler-Titel",
+            placeholder="Kurze Beschreibung des Fehlers...",
+            required=True,
+            max_length=100
+        )
+        self.add_item(self.error_title)
+        
+        self.error_description = discord.ui.TextInput(
+            label="Detaillierte Beschreibung",
+            placeholder="Beschreibe den Fehler so genau wie möglich...",
+            style=discord.TextStyle.paragraph,
+            required=True,
+            max_length=1000
+        )
+        self.add_item(self.error_description)
+        
+        self.steps_to_reproduce = discord.ui.TextInput(
+            label="Was hast du gemacht?",
+            placeholder="Welchen Befehl oder welche Aktion hast du ausgeführt?",
+            style=discord.TextStyle.paragraph,
+            required=False,
+            max_length=500
+        )
+        self.add_item(self.steps_to_reproduce)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        """Verarbeite die Fehler-Meldung"""
+        
+        # Erstelle ein Embed für die Fehler-Meldung
+        embed = discord.Embed(
+            title="🐛 Neue Fehler-Meldung",
+            description=self.error_description.value,
+            color=0xe74c3c,
+            timestamp=discord.utils.utcnow()
+        )
+        
+        embed.add_field(
+            name="Fehler-Titel",
+            value=self.error_title.value,
+            inline=False
+        )
+        
+        if self.steps_to_reproduce.value:
+            embed.add_field(
+                name="Schritte zum Reproduzieren",
+                value=self.steps_to_reproduce.value,
+                inline=False
+            )
+        
+        embed.add_field(
+            name="Gemeldet von",
+            value=f"{interaction.user.mention} ({interaction.user.name})",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="User ID",
+            value=interaction.user.id,
+            inline=True
+        )
+        
+        embed.add_field(
+            name="Server",
+            value=interaction.guild.name if interaction.guild else "DM",
+            inline=True
+        )
+        
+        embed.set_footer(text=f"Fehler-ID: {interaction.id}")
+        
+        # Versuche, die Meldung an einen designierten Kanal zu senden
+        # Falls ein ERROR_REPORT_CHANNEL_ID in der Umgebung gesetzt ist
+        import os
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        error_channel_id = os.getenv('ERROR_REPORT_CHANNEL_ID')
+        sent_to_channel = False
+        
+        logger.info(f"ERROR_REPORT_CHANNEL_ID aus .env: {error_channel_id}")
+        
+        if error_channel_id:
+            try:
+                error_channel = self.cog.bot.get_channel(int(error_channel_id))
+                logger.info(f"Kanal gefunden: {error_channel}")
+                
+                if error_channel:
+                    await error_channel.send(embed=embed)
+                    sent_to_channel = True
+                    logger.info(f"✅ Fehler-Meldung erfolgreich an Kanal {error_channel.name} gesendet")
+                else:
+                    logger.warning(f"⚠️ Kanal mit ID {error_channel_id} wurde nicht gefunden!")
+            except ValueError as e:
+                logger.error(f"❌ Ungültige Channel-ID: {e}")
+            except discord.Forbidden as e:
+                logger.error(f"❌ Keine Berechtigung zum Schreiben in Kanal: {e}")
+            except discord.HTTPException as e:
+                logger.error(f"❌ Discord API Fehler: {e}")
+        else:
+            logger.warning("⚠️ ERROR_REPORT_CHANNEL_ID nicht in .env gesetzt")
+        
+        # Sende eine Bestätigung an den User
+        confirmation_embed = discord.Embed(
+            title="✅ Fehler gemeldet",
+            description="Vielen Dank für deine Fehler-Meldung!" + 
+                       (" Das Entwickler-Team wurde benachrichtigt." if sent_to_channel else ""),
+            color=0x2ecc71
+        )
+        
+        confirmation_embed.add_field(
+            name="Deine Meldung",
+            value=self.error_title.value,
+            inline=False
+        )
+        
+        confirmation_embed.set_footer(text="Wir werden uns so schnell wie möglich darum kümmern!")
+        
+        await interaction.response.send_message(embed=confirmation_embed, ephemeral=True)
+
+class IdeaSuggestionModal(TimedModal):
+    """Modal für Ideen-Vorschläge"""
+    
+    def __init__(self, cog):
+        super().__init__(title="💡 Idee vorschlagen")
+        self.cog = cog
+        
+        self.idea_title = discord.ui.TextInput(
+            label="Ideen-Titel",
+            placeholder="Kurze Beschreibung deiner Idee...",
+            required=True,
+            max_length=100
+        )
+        self.add_item(self.idea_title)
+        
+        self.idea_description = discord.ui.TextInput(
+            label="Detaillierte Beschreibung",
+            placeholder="Beschreibe deine Idee so genau wie möglich...",
+            style=discord.TextStyle.paragraph,
+            required=True,
+            max_length=1000
+        )
+        self.add_item(self.idea_description)
+        
+        self.idea_benefit = discord.ui.TextInput(
+            label="Warum wäre das nützlich?",
+            placeholder="Welchen Nutzen hätte diese Funktion?",
+            style=discord.TextStyle.paragraph,
+            required=False,
+            max_length=500
+        )
+        self.add_item(self.idea_benefit)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        """Verarbeite den Ideen-Vorschlag"""
+        
+        # Erstelle ein Embed für den Ideen-Vorschlag
+        embed = discord.Embed(
+            title="💡 Neuer Ideen-Vorschlag",
+            description=self.idea_description.value,
+            color=0xf39c12,
+            timestamp=discord.utils.utcnow()
+        )
+        
+        embed.add_field(
+            name="Ideen-Titel",
+            value=self.idea_title.value,
+            inline=False
+        )
+        
+        if self.idea_benefit.value:
+            embed.add_field(
+                name="Nutzen",
+                value=self.idea_benefit.value,
+                inline=False
+            )
+        
+        embed.add_field(
+            name="Vorgeschlagen von",
+            value=f"{interaction.user.mention} ({interaction.user.name})",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="User ID",
+            value=interaction.user.id,
+            inline=True
+        )
+        
+        embed.add_field(
+            name="Server",
+            value=interaction.guild.name if interaction.guild else "DM",
+            inline=True
+        )
+        
+        embed.set_footer(text=f"Ideen-ID: {interaction.id}")
+        
+        # Versuche, die Idee an einen designierten Kanal zu senden
+        # Falls ein IDEA_CHANNEL_ID in der Umgebung gesetzt ist
+        import os
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        idea_channel_id = os.getenv('IDEA_CHANNEL_ID')
+        sent_to_channel = False
+        
+        # Fallback zum ERROR_REPORT_CHANNEL_ID falls IDEA_CHANNEL_ID nicht gesetzt
+        if not idea_channel_id:
+            idea_channel_id = os.getenv('ERROR_REPORT_CHANNEL_ID')
+            logger.info("IDEA_CHANNEL_ID nicht gesetzt, verwende ERROR_REPORT_CHANNEL_ID")
+        
+        logger.info(f"Ideen-Kanal-ID aus .env: {idea_channel_id}")
+        
+        if idea_channel_id:
+            try:
+                idea_channel = self.cog.bot.get_channel(int(idea_channel_id))
+                logger.info(f"Kanal gefunden: {idea_channel}")
+                
+                if idea_channel:
+                    await idea_channel.send(embed=embed)
+                    sent_to_channel = True
+                    logger.info(f"✅ Ideen-Vorschlag erfolgreich an Kanal {idea_channel.name} gesendet")
+                else:
+                    logger.warning(f"⚠️ Kanal mit ID {idea_channel_id} wurde nicht gefunden!")
+            except ValueError as e:
+                logger.error(f"❌ Ungültige Channel-ID: {e}")
+            except discord.Forbidden as e:
+                logger.error(f"❌ Keine Berechtigung zum Schreiben in Kanal: {e}")
+            except discord.HTTPException as e:
+                logger.error(f"❌ Discord API Fehler: {e}")
+        else:
+            logger.warning("⚠️ Weder IDEA_CHANNEL_ID noch ERROR_REPORT_CHANNEL_ID in .env gesetzt")
+        
+        # Sende eine Bestätigung an den User
+        confirmation_embed = discord.Embed(
+            title="✅ Idee eingereicht",
+            description="Vielen Dank für deinen Vorschlag!" + 
+                       (" Das Entwickler-Team wird ihn prüfen." if sent_to_channel else ""),
+            color=0x2ecc71
+        )
+        
+        confirmation_embed.add_field(
+            name="Deine Idee",
+            value=self.idea_title.value,
+            inline=False
+        )
+        
+        confirmation_embed.set_footer(text="Wir freuen uns über dein Feedback!")
+        
+        await interaction.response.send_message(embed=confirmation_embed, ephemeral=True)
+
+class ErrorReportView(TimedView):
+    """Button für !fehler - ein Modal lässt sich nur aus einer Interaction öffnen, nicht aus einem Context"""
+    
+    def __init__(self, cog):
+        super().__init__(timeout=300)
+        self.cog = cog
+    
+    @discord.ui.button(label="Fehler melden", style=discord.ButtonStyle.danger, emoji="🐛")
+    async def report_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Öffne das Fehler-Meldung Modal"""
+        _ = button  # Unterdrücke unused variable warning
+        modal = ErrorReportModal(self.cog)
+        await interaction.response.send_modal(modal)
+
+class IdeaView(TimedView):
+    """Button für !ideen - ein Modal lässt sich nur aus einer Interaction öffnen, nicht aus einem Context"""
+    
+    def __init__(self, cog):
+        super().__init__(timeout=300)
+        self.cog = cog
+    
+    @discord.ui.button(label="Idee vorschlagen", style=discord.ButtonStyle.primary, emoji="💡")
+    async def idea_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        """Öffne das Ideen-Vorschlag Modal"""
+        _ = button  # Unterdrücke unused variable warning
+        modal = IdeaSuggestionModal(self.cog)
+        await interaction.response.send_modal(modal)
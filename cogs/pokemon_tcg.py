@@ -0,0 +1,953 @@
+"""
+Angebote und Wünsche für TCG-Karten (Jahr, Set, Kartennummer)
+
+Wird beim ersten /anbieten-tcg oder /wünschen-tcg importiert.
+"""
+import discord
+
+from .metrics import REGISTRY, TimedModal, TimedView
+from .tracing import TRACER
+
+
+def tcg_entry_data(card_info, set_id, card_number, user):
+    """Angebots- bzw. Wunschdaten einer TCG-Karte aus ``extract_card_info``"""
+    return {
+        'name': card_info.get("name", "Unbekannte Karte"),
+        'type': card_info.get("types", ["Unbekannt"])[0] if card_info.get("types") else "Unbekannt",
+        'hp': card_info.get("hp"),
+        'phase': "TCG-Karte",  # TCG-Karten haben keine Phase
+        'rarity': "TCG-Karte",  # Seltenheit könnte aus API extrahiert werden
+        'user': user,
+        'tcg_set_id': set_id,
+        'tcg_card_number': card_number,
+        'tcg_image_url': card_info.get("image", ""),
+        'tcg_set_symbol': card_info.get("set_symbol", ""),
+        'cardmarket_price': card_info.get("cardmarket_price"),
+        'is_tcg': True
+    }
+
+
+def suggestion_text(cards, card_number):
+    """Vorschläge ähnlicher Kartennummern des Sets ("Meintest du: ...?") oder ein leerer Text"""
+    suggestions = cards.suggestions(card_number)
+    if not suggestions:
+        return ""
+    return "Meintest du: " + ", ".join(f"`{number}`" for number in suggestions) + "?"
+
+
+class TCGSetSelect(discord.ui.Select):
+    """Dropdown für TCG Set-Auswahl"""
+    
+    def __init__(self, view, sets_data):
+        self.tcg_view = view
+        options = []
+        
+        # Erstelle Optionen für jedes Set
+        for set_data in sets_data[:25]:  # Discord erlaubt max 25 Optionen
+            set_name = set_data.get("name", "Unbekanntes Set")
+            set_id = set_data.get("id", "")
+            
+            # Prüfe ob Set ein Symbol/Logo hat
+            has_symbol = False
+            symbol_url = ""
+            if isinstance(set_data, dict):
+                symbol_url = (set_data.get("symbol", "") or 
+                             set_data.get("logo", "") or
+                             set_data.get("symbolUrl", "") or
+                             set_data.get("logoUrl", ""))
+                if not symbol_url:
+                    images = set_data.get("images", {})
+                    if isinstance(images, dict):
+                        symbol_url = (images.get("symbol", "") or 
+                                     images.get("logo", "") or
+                                     images.get("symbolUrl", "") or
+                                     images.get("logoUrl", ""))
+                if not symbol_url:
+                    icon = set_data.get("icon", {})
+                    if isinstance(icon, dict):
+                        symbol_url = icon.get("url", "") or icon.get("symbol", "") or icon.get("logo", "")
+                    elif isinstance(icon, str):
+                        symbol_url = icon
+                
+                has_symbol = bool(symbol_url)
+            
+            # Erstelle Label (max 100 Zeichen)
+            label = set_name
+            if len(label) > 100:
+                label = label[:97] + "..."
+            
+            # Erstelle Description mit Info über Symbol (falls vorhanden)
+            # Hinweis: Discord unterstützt keine Bilder in SelectOptions, nur Emojis
+            description = f"Set ID: {set_id}"
+            if has_symbol:
+                description += " | 🖼️ Symbol verfügbar"
+            if len(description) > 100:
+                description = description[:97] + "..."
+            
+            # Verwende unterschiedliche Emojis basierend auf ob Symbol vorhanden ist
+            emoji = "🖼️" if has_symbol else "📦"
+            
+            options.append(discord.SelectOption(
+                label=label,
+                value=set_id,
+                description=description,
+                emoji=emoji
+            ))
+        
+        super().__init__(
+            placeholder="Wähle ein Set aus...",
+            options=options,
+            custom_id="tcg_set_select"
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        selected_set_id = self.values[0]
+        # Finde das ausgewählte Set
+        selected_set = None
+        for set_data in self.tcg_view.sets_data:
+            if set_data.get("id") == selected_set_id:
+                selected_set = set_data
+                break
+        
+        if selected_set:
+            self.tcg_view.selected_set = selected_set
+            self.tcg_view.selected_set_id = selected_set_id
+            await self.tcg_view.show_card_number_input(interaction)
+
+class TCGYearInputView(TimedView):
+    """View mit Button für Jahr-Eingabe"""
+    
+    def __init__(self, cog, is_wish=False):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.is_wish = is_wish
+    
+    @discord.ui.button(label="Jahr eingeben", style=discord.ButtonStyle.primary, emoji="📅")
+    async def enter_year(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Öffne Modal für Jahr-Eingabe
+        modal = TCGYearModal(self.cog, self.is_wish)
+        await interaction.response.send_modal(modal)
+
+class TCGYearModal(TimedModal):
+    """Modal für Jahr-Eingabe"""
+    
+    def __init__(self, cog, is_wish=False):
+        super().__init__(title="Jahr eingeben")
+        self.cog = cog
+        self.is_wish = is_wish
+        
+        self.year_input = discord.ui.TextInput(
+            label="Erscheinungsjahr",
+            placeholder="z.B. 2023, 2022, 2021",
+            required=True,
+            max_length=4,
+            min_length=4,
+            style=discord.TextStyle.short
+        )
+        self.add_item(self.year_input)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        year_str = self.year_input.value.strip()
+        
+        # Validiere Jahr
+        try:
+            jahr = int(year_str)
+        except ValueError:
+            await interaction.response.send_message(
+                "❌ Bitte gib eine gültige Jahreszahl ein (z.B. 2023)!",
+                ephemeral=True
+            )
+            return
+        
+        # Validiere Jahr (sinnvoller Bereich: 1998-2030)
+        if jahr < 1998 or jahr > 2030:
+            await interaction.response.send_message(
+                "❌ Bitte gib ein gültiges Jahr zwischen 1998 und 2030 ein!",
+                ephemeral=True
+            )
+            return
+        
+        await interaction.response.defer()
+        
+        # Kurz nach dem Start: auf den vorgewärmten Set-Katalog warten statt selbst alle Sets abzurufen
+        if not await self.cog.warmup.wait_ready():
+            await interaction.followup.send(
+                "⏳ Die Set-Daten werden nach dem Neustart gerade geladen. Bitte versuche es in ein paar Sekunden erneut!",
+                ephemeral=True
+            )
+            return
+        
+        # Rufe Sets für das Jahr ab
+        sets_data, error_message = await self.cog.tcgdex_service.get_sets_by_year(jahr)
+        
+        if error_message or not sets_data:
+            error_text = "❌ **Fehler beim Abrufen der Sets:**\n\n"
+            if error_message:
+                error_text += f"{error_message}\n\n"
+            else:
+                error_text += f"Keine Sets für das Jahr **{jahr}** gefunden.\n\n"
+            
+            error_text += (
+                "**Mögliche Ursachen:**\n"
+                "• API-Server nicht erreichbar\n"
+                "• Ungültiges Jahr (verfügbare Jahre: 1998-2024)\n"
+                "• Netzwerkprobleme\n\n"
+                "Bitte versuche es später erneut oder wähle ein anderes Jahr."
+            )
+            
+            await interaction.followup.send(error_text, ephemeral=True)
+            return
+        
+        # Erstelle View mit Sets
+        if self.is_wish:
+            view = TCGWishView(self.cog, jahr, sets_data)
+            await view.show_set_selection(interaction)
+        else:
+            view = TCGOfferView(self.cog, jahr, sets_data)
+            await view.show_set_selection(interaction)
+
+class TCGCardNumberInputView(TimedView):
+    """View mit Button für Kartennummer-Eingabe"""
+    
+    def __init__(self, tcg_view):
+        super().__init__(timeout=300)
+        self.tcg_view = tcg_view
+    
+    @discord.ui.button(label="Kartennummer eingeben", style=discord.ButtonStyle.primary, emoji="🔢")
+    async def enter_card_number(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Öffne Modal für Kartennummer-Eingabe
+        modal = TCGCardNumberModal(self.tcg_view)
+        await interaction.response.send_modal(modal)
+
+class TCGCardNumberModal(TimedModal):
+    """Modal für Kartennummer-Eingabe"""
+    
+    def __init__(self, view):
+        super().__init__(title="Kartennummer eingeben")
+        self.view = view
+        
+        self.card_number_input = discord.ui.TextInput(
+            label="Kartennummer",
+            placeholder="z.B. 4, 025, TG01, SWSH050",
+            required=True,
+            max_length=10,
+            style=discord.TextStyle.short
+        )
+        self.add_item(self.card_number_input)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        card_number = self.card_number_input.value.strip()
+        
+        if not card_number:
+            await interaction.response.send_message(
+                "❌ Bitte gib eine Kartennummer ein!",
+                ephemeral=True
+            )
+            return
+        
+        # Zuerst antworten: ist die Kartenliste nicht im Katalog, kostet sie einen API-Aufruf
+        await interaction.response.defer(thinking=True)
+        
+        # Gegen die Kartenliste des Sets prüfen (Katalog bzw. zwischengespeichertes /sets/{id}),
+        # damit unbekannte Nummern ohne Kartenabruf mit Vorschlägen abgelehnt werden
+        cards = await self.view.cog.tcgdex_service.get_set_cards(self.view.selected_set_id)
+        if cards is not None and len(cards):
+            canonical = cards.canonical(card_number)
+            if canonical is None:
+                REGISTRY.counter("tcg_card_number_rejected_total",
+                                 "Kartennummern, die es im gewählten Set nicht gibt").inc()
+                message = (
+                    f"❌ Die Kartennummer **{card_number}** gibt es in "
+                    f"**{(self.view.selected_set or {}).get('name', self.view.selected_set_id)}** nicht.\n"
+                )
+                suggestions = suggestion_text(cards, card_number)
+                if suggestions:
+                    message += suggestions + "\n"
+                message += f"Das Set hat {len(cards)} Karten (`{cards.numbers[0]}` bis `{cards.numbers[-1]}`)."
+                await interaction.followup.send(message, ephemeral=True)
+                return
+            # Nummer so abrufen, wie sie im Set steht (z.B. "tg01" -> "TG01")
+            card_number = canonical
+        
+        # Speichere Kartennummer und rufe die Karte ab
+        self.view.card_number = card_number
+        await self.view.fetch_card_info(interaction)
+
+class TCGOfferView(TimedView):
+    """Hauptview für TCG-Angebot-Erstellung"""
+    
+    def __init__(self, cog, year, sets_data):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.year = year
+        self.sets_data = sets_data
+        self.selected_set = None
+        self.selected_set_id = None
+        self.card_number = None
+        self.card_info = None
+        
+        # Füge Set-Select hinzu
+        if sets_data:
+            self.add_item(TCGSetSelect(self, sets_data))
+    
+    @TRACER.traced()
+    async def show_set_selection(self, interaction: discord.Interaction):
+        """Zeigt die Set-Auswahl mit Symbolen"""
+        # Haupt-Embed mit Anweisungen
+        main_embed = discord.Embed(
+            title="🎴 TCG-Karte anbieten - Schritt 1/3",
+            description=f"**Jahr:** {self.year}\n\nWähle das Set aus, zu dem deine Karte gehört:",
+            color=0x3498db
+        )
+        main_embed.set_footer(text="Schritt 1 von 3: Set auswählen")
+        if self.cog.tcgdex_service.sets_stale():
+            main_embed.add_field(
+                name="⚠️ Zwischengespeicherte Daten",
+                value="Die TCGdex API ist gerade nicht erreichbar. Die Set-Liste stammt aus dem Cache und ist evtl. nicht aktuell.",
+                inline=False
+            )
+        
+        # Erstelle separate Embeds für jedes Set (max 9, da wir 1 für Haupt-Embed brauchen)
+        set_embeds = [main_embed]
+        
+        for i, set_data in enumerate(self.sets_data[:9]):  # Max 9 Sets wegen 10-Embed-Limit
+            # Versuche verschiedene Möglichkeiten für Symbol/Logo
+            symbol_url = ""
+            
+            # Direkte Felder
+            if isinstance(set_data, dict):
+                symbol_url = (set_data.get("symbol", "") or 
+                             set_data.get("logo", "") or
+                             set_data.get("symbolUrl", "") or
+                             set_data.get("logoUrl", ""))
+                
+                # Prüfe verschachtelte Strukturen (wie bei images)
+                if not symbol_url:
+                    images = set_data.get("images", {})
+                    if isinstance(images, dict):
+                        symbol_url = (images.get("symbol", "") or 
+                                     images.get("logo", "") or
+                                     images.get("symbolUrl", "") or
+                                     images.get("logoUrl", ""))
+                
+                # Prüfe icon Feld
+                if not symbol_url:
+                    icon = set_data.get("icon", {})
+                    if isinstance(icon, dict):
+                        symbol_url = icon.get("url", "") or icon.get("symbol", "") or icon.get("logo", "")
+                    elif isinstance(icon, str):
+                        symbol_url = icon
+            
+            set_name = set_data.get("name", f"Set {i+1}") if isinstance(set_data, dict) else f"Set {i+1}"
+            set_id = set_data.get("id", "") if isinstance(set_data, dict) else ""
+            
+            # Erstelle Set-Embed
+            set_embed = discord.Embed(
+                title=f"📦 {set_name}",
+                description=f"**Set-ID:** {set_id}",
+                color=0x3498db
+            )
+            
+            # Versuche Symbol-URL zu finden/konstruieren
+            final_symbol_url = ""
+            if symbol_url:
+                # Fixe Symbol-URL falls nötig (füge .webp hinzu wenn fehlt)
+                final_symbol_url = self.cog.tcgdex_service.fix_symbol_url(symbol_url)
+            else:
+                # Versuche Symbol-URL zu konstruieren wenn keine vorhanden
+                if set_id:
+                    serie_id = None
+                    if isinstance(set_data, dict):
+                        serie_info = set_data.get("serie", {})
+                        if isinstance(serie_info, dict):
+                            serie_id = serie_info.get("id")
+                    if serie_id:
+                        final_symbol_url = self.cog.tcgdex_service.construct_symbol_url(set_id, serie_id)
+            
+            # Setze Symbol als Thumbnail
+            if final_symbol_url:
+                set_embed.set_thumbnail(url=final_symbol_url)
+            
+            set_embeds.append(set_embed)
+        
+        # Sende alle Embeds zusammen
+        with TRACER.span("followup.send"):
+            await interaction.followup.send(embeds=set_embeds, view=self)
+    
+    @TRACER.traced()
+    async def show_card_number_input(self, interaction: discord.Interaction):
+        """Zeigt Nachricht mit Button für Kartennummer-Eingabe"""
+        if not self.selected_set:
+            await interaction.response.send_message(
+                "❌ Fehler: Kein Set ausgewählt!",
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="🎴 TCG-Karte anbieten - Schritt 2/3",
+            description=(
+                f"**Jahr:** {self.year}\n"
+                f"**Set:** {self.selected_set.get('name', 'Unbekannt')}\n\n"
+                f"Klicke auf den Button unten, um die Kartennummer einzugeben (findest du unten rechts auf der Karte):"
+            ),
+            color=0x3498db
+        )
+        
+        # Zeige Set-Symbol/Logo falls verfügbar (mit umfassender Suche)
+        symbol_url = ""
+        if isinstance(self.selected_set, dict):
+            symbol_url = (self.selected_set.get("symbol", "") or 
+                         self.selected_set.get("logo", "") or
+                         self.selected_set.get("symbolUrl", "") or
+                         self.selected_set.get("logoUrl", ""))
+            
+            if not symbol_url:
+                images = self.selected_set.get("images", {})
+                if isinstance(images, dict):
+                    symbol_url = (images.get("symbol", "") or 
+                                 images.get("logo", "") or
+                                 images.get("symbolUrl", "") or
+                                 images.get("logoUrl", ""))
+            
+            if not symbol_url:
+                icon = self.selected_set.get("icon", {})
+                if isinstance(icon, dict):
+                    symbol_url = icon.get("url", "") or icon.get("symbol", "") or icon.get("logo", "")
+                elif isinstance(icon, str):
+                    symbol_url = icon
+        
+        if symbol_url:
+            # Zeige Set-Symbol als Hauptbild (größer und sichtbarer)
+            embed.set_image(url=symbol_url)
+            # Füge auch Info-Feld hinzu
+            embed.add_field(
+                name="🖼️ Set-Symbol",
+                value=f"[Symbol anzeigen]({symbol_url})",
+                inline=False
+            )
+        
+        embed.set_footer(text="Schritt 2 von 3: Kartennummer eingeben")
+        
+        # Erstelle View mit Button für Kartennummer-Eingabe
+        view = TCGCardNumberInputView(self)
+        await interaction.response.edit_message(embed=embed, view=view)
+    
+    @TRACER.traced()
+    async def fetch_card_info(self, interaction: discord.Interaction):
+        """Ruft Karteninformationen von der API ab"""
+        if not self.selected_set_id or not self.card_number:
+            await interaction.followup.send(
+                "❌ Fehler: Set oder Kartennummer fehlt!",
+                ephemeral=True
+            )
+            return
+        
+        # Rufe Karte von API ab
+        response = await self.cog.tcgdex_service.get_card_response(
+            self.selected_set_id,
+            self.card_number
+        )
+        card_data = response.data
+        
+        if not card_data:
+            await interaction.followup.send(
+                f"❌ Karte nicht gefunden!\n\n"
+                f"**Set:** {self.selected_set.get('name', 'Unbekannt')}\n"
+                f"**Kartennummer:** {self.card_number}\n\n"
+                f"Bitte überprüfe Set-ID und Kartennummer.",
+                ephemeral=True
+            )
+            return
+        
+        # Extrahiere Karteninformationen
+        self.card_info = self.cog.tcgdex_service.extract_card_info(card_data, stale=response.stale)
+        
+        # Zeige Karteninfo und finalisiere Angebot
+        await self.show_card_info(interaction)
+    
+    @TRACER.traced()
+    async def show_card_info(self, interaction: discord.Interaction):
+        """Zeigt Karteninformationen und finalisiert das Angebot"""
+        if not self.card_info:
+            await interaction.followup.send(
+                "❌ Fehler beim Abrufen der Karteninformationen!",
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="🎴 TCG-Karte anbieten - Schritt 3/3",
+            description="**Karteninformationen:**",
+            color=0x2ecc71
+        )
+        
+        # Kartenname
+        embed.add_field(
+            name="📝 Name",
+            value=self.card_info.get("name", "Unbekannt"),
+            inline=True
+        )
+        
+        # HP
+        hp = self.card_info.get("hp")
+        if hp:
+            embed.add_field(
+                name="❤️ KP",
+                value=str(hp),
+                inline=True
+            )
+        
+        # Typen
+        types = self.card_info.get("types", [])
+        if types:
+            types_str = ", ".join(types)
+            embed.add_field(
+                name="🎯 Typ(en)",
+                value=types_str,
+                inline=True
+            )
+        
+        # Set-Info
+        set_name = self.card_info.get("set_name", self.selected_set.get("name", "Unbekannt"))
+        embed.add_field(
+            name="📦 Set",
+            value=set_name,
+            inline=True
+        )
+        
+        # Kartennummer
+        embed.add_field(
+            name="🔢 Nummer",
+            value=self.card_info.get("card_number", self.card_number),
+            inline=True
+        )
+        
+        # Cardmarket-Preis
+        price = self.card_info.get("cardmarket_price")
+        if price:
+            embed.add_field(
+                name="💰 Cardmarket Preis",
+                value=f"€{price:.2f}",
+                inline=True
+            )
+        else:
+            embed.add_field(
+                name="💰 Cardmarket Preis",
+                value="Nicht verfügbar",
+                inline=True
+            )
+        
+        # Kartenbild
+        image_url = self.card_info.get("image", "")
+        if image_url:
+            embed.set_image(url=image_url)
+        
+        # Set-Symbol/Logo - zeige als Thumbnail (da Kartenbild bereits Hauptbild ist)
+        card_symbol = self.card_info.get("set_symbol", "")
+        set_symbol = self.selected_set.get("symbol", "") or self.selected_set.get("logo", "")
+        symbol_url = card_symbol or set_symbol
+        if symbol_url:
+            embed.set_thumbnail(url=symbol_url)
+            # Füge auch Info-Feld hinzu
+            embed.add_field(
+                name="🖼️ Set-Symbol",
+                value=f"[Symbol anzeigen]({symbol_url})",
+                inline=True
+            )
+        
+        if self.card_info.get("stale"):
+            embed.add_field(
+                name="⚠️ Zwischengespeicherte Daten",
+                value="Die TCGdex API ist gerade nicht erreichbar. Preis und Kartendaten sind evtl. nicht aktuell.",
+                inline=False
+            )
+        
+        embed.set_footer(text="Schritt 3 von 3: Angebot wird erstellt...")
+        
+        with TRACER.span("followup.send"):
+            await interaction.followup.send(embed=embed)
+        
+        # Finalisiere Angebot
+        await self.finalize_offer(interaction)
+    
+    @TRACER.traced()
+    async def finalize_offer(self, interaction: discord.Interaction):
+        """Erstellt das TCG-Angebot im Trading-System"""
+        if not self.card_info:
+            return
+        
+        # Erstelle Angebots-Datenstruktur
+        offer_data = tcg_entry_data(self.card_info, self.selected_set_id, self.card_number, interaction.user)
+        
+        # Füge Angebot zum System hinzu
+        offer_id = await self.cog.add_offer(offer_data, interaction)
+        
+        # Bestätigungs-Embed
+        confirm_embed = discord.Embed(
+            title="✅ TCG-Karte erfolgreich angeboten!",
+            description=f"Dein Angebot wurde mit der ID **#{offer_id}** erstellt.",
+            color=0x2ecc71
+        )
+        
+        confirm_embed.add_field(
+            name="📝 Karte",
+            value=f"{offer_data['name']} ({offer_data['hp']} KP)",
+            inline=False
+        )
+        
+        if self.card_info.get("cardmarket_price"):
+            confirm_embed.add_field(
+                name="💰 Cardmarket Preis",
+                value=f"€{self.card_info.get('cardmarket_price'):.2f}",
+                inline=True
+            )
+        
+        with TRACER.span("followup.send"):
+            await interaction.followup.send(embed=confirm_embed)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button
+        embed = discord.Embed(
+            title="❌ TCG-Angebot abgebrochen",
+            description="Das Angebot wurde abgebrochen.",
+            color=0xff0000
+        )
+        
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+
+class TCGWishView(TimedView):
+    """Hauptview für TCG-Wunsch-Erstellung"""
+    
+    def __init__(self, cog, year, sets_data):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.year = year
+        self.sets_data = sets_data
+        self.selected_set = None
+        self.selected_set_id = None
+        self.card_number = None
+        self.card_info = None
+        
+        # Füge Set-Select hinzu
+        if sets_data:
+            self.add_item(TCGSetSelect(self, sets_data))
+    
+    @TRACER.traced()
+    async def show_set_selection(self, interaction: discord.Interaction):
+        """Zeigt die Set-Auswahl mit Symbolen als Multiple Embeds"""
+        # Haupt-Embed mit Anweisungen
+        main_embed = discord.Embed(
+            title="🌟 TCG-Karte wünschen - Schritt 1/3",
+            description=f"**Jahr:** {self.year}\n\nWähle das Set aus, zu dem deine gewünschte Karte gehört:",
+            color=0xffd700
+        )
+        main_embed.set_footer(text="Schritt 1 von 3: Set auswählen")
+        if self.cog.tcgdex_service.sets_stale():
+            main_embed.add_field(
+                name="⚠️ Zwischengespeicherte Daten",
+                value="Die TCGdex API ist gerade nicht erreichbar. Die Set-Liste stammt aus dem Cache und ist evtl. nicht aktuell.",
+                inline=False
+            )
+        
+        # Erstelle separate Embeds für jedes Set (max 9, da wir 1 für Haupt-Embed brauchen)
+        set_embeds = [main_embed]
+        
+        for i, set_data in enumerate(self.sets_data[:9]):  # Max 9 Sets wegen 10-Embed-Limit
+            # Versuche verschiedene Möglichkeiten für Symbol/Logo
+            symbol_url = ""
+            
+            # Direkte Felder
+            if isinstance(set_data, dict):
+                symbol_url = (set_data.get("symbol", "") or 
+                             set_data.get("logo", "") or
+                             set_data.get("symbolUrl", "") or
+                             set_data.get("logoUrl", ""))
+                
+                # Prüfe verschachtelte Strukturen (wie bei images)
+                if not symbol_url:
+                    images = set_data.get("images", {})
+                    if isinstance(images, dict):
+                        symbol_url = (images.get("symbol", "") or 
+                                     images.get("logo", "") or
+                                     images.get("symbolUrl", "") or
+                                     images.get("logoUrl", ""))
+                
+                # Prüfe icon Feld
+                if not symbol_url:
+                    icon = set_data.get("icon", {})
+                    if isinstance(icon, dict):
+                        symbol_url = icon.get("url", "") or icon.get("symbol", "") or icon.get("logo", "")
+                    elif isinstance(icon, str):
+                        symbol_url = icon
+            
+            set_name = set_data.get("name", f"Set {i+1}") if isinstance(set_data, dict) else f"Set {i+1}"
+            set_id = set_data.get("id", "") if isinstance(set_data, dict) else ""
+            
+            # Erstelle Set-Embed
+            set_embed = discord.Embed(
+                title=f"📦 {set_name}",
+                description=f"**Set-ID:** {set_id}",
+                color=0x3498db
+            )
+            
+            # Versuche Symbol-URL zu finden/konstruieren
+            final_symbol_url = ""
+            if symbol_url:
+                # Fixe Symbol-URL falls nötig (füge .webp hinzu wenn fehlt)
+                final_symbol_url = self.cog.tcgdex_service.fix_symbol_url(symbol_url)
+            else:
+                # Versuche Symbol-URL zu konstruieren wenn keine vorhanden
+                if set_id:
+                    serie_id = None
+                    if isinstance(set_data, dict):
+                        serie_info = set_data.get("serie", {})
+                        if isinstance(serie_info, dict):
+                            serie_id = serie_info.get("id")
+                    if serie_id:
+                        final_symbol_url = self.cog.tcgdex_service.construct_symbol_url(set_id, serie_id)
+            
+            # Setze Symbol als Thumbnail
+            if final_symbol_url:
+                set_embed.set_thumbnail(url=final_symbol_url)
+            
+            set_embeds.append(set_embed)
+        
+        # Sende alle Embeds zusammen
+        with TRACER.span("followup.send"):
+            await interaction.followup.send(embeds=set_embeds, view=self)
+    
+    @TRACER.traced()
+    async def show_card_number_input(self, interaction: discord.Interaction):
+        """Zeigt Nachricht mit Button für Kartennummer-Eingabe"""
+        if not self.selected_set:
+            await interaction.response.send_message(
+                "❌ Fehler: Kein Set ausgewählt!",
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="🌟 TCG-Karte wünschen - Schritt 2/3",
+            description=(
+                f"**Jahr:** {self.year}\n"
+                f"**Set:** {self.selected_set.get('name', 'Unbekannt')}\n\n"
+                f"Klicke auf den Button unten, um die Kartennummer einzugeben (findest du unten rechts auf der Karte):"
+            ),
+            color=0xffd700
+        )
+        
+        # Zeige Set-Symbol/Logo falls verfügbar (mit umfassender Suche)
+        symbol_url = ""
+        if isinstance(self.selected_set, dict):
+            symbol_url = (self.selected_set.get("symbol", "") or 
+                         self.selected_set.get("logo", "") or
+                         self.selected_set.get("symbolUrl", "") or
+                         self.selected_set.get("logoUrl", ""))
+            
+            if not symbol_url:
+                images = self.selected_set.get("images", {})
+                if isinstance(images, dict):
+                    symbol_url = (images.get("symbol", "") or 
+                                 images.get("logo", "") or
+                                 images.get("symbolUrl", "") or
+                                 images.get("logoUrl", ""))
+            
+            if not symbol_url:
+                icon = self.selected_set.get("icon", {})
+                if isinstance(icon, dict):
+                    symbol_url = icon.get("url", "") or icon.get("symbol", "") or icon.get("logo", "")
+                elif isinstance(icon, str):
+                    symbol_url = icon
+        
+        if symbol_url:
+            # Zeige Set-Symbol als Hauptbild (größer und sichtbarer)
+            embed.set_image(url=symbol_url)
+            # Füge auch Info-Feld hinzu
+            embed.add_field(
+                name="🖼️ Set-Symbol",
+                value=f"[Symbol anzeigen]({symbol_url})",
+                inline=False
+            )
+        
+        embed.set_footer(text="Schritt 2 von 3: Kartennummer eingeben")
+        
+        # Erstelle View mit Button für Kartennummer-Eingabe
+        view = TCGCardNumberInputView(self)
+        await interaction.response.edit_message(embed=embed, view=view)
+    
+    @TRACER.traced()
+    async def fetch_card_info(self, interaction: discord.Interaction):
+        """Ruft Karteninformationen von der API ab"""
+        if not self.selected_set_id or not self.card_number:
+            await interaction.followup.send(
+                "❌ Fehler: Set oder Kartennummer fehlt!",
+                ephemeral=True
+            )
+            return
+        
+        response = await self.cog.tcgdex_service.get_card_response(
+            self.selected_set_id,
+            self.card_number
+        )
+        card_data = response.data
+        
+        if not card_data:
+            await interaction.followup.send(
+                f"❌ Karte nicht gefunden!\n\n"
+                f"**Set:** {self.selected_set.get('name', 'Unbekannt')}\n"
+                f"**Kartennummer:** {self.card_number}\n\n"
+                f"Bitte überprüfe Set-ID und Kartennummer.",
+                ephemeral=True
+            )
+            return
+        
+        self.card_info = self.cog.tcgdex_service.extract_card_info(card_data, stale=response.stale)
+        await self.show_card_info(interaction)
+    
+    @TRACER.traced()
+    async def show_card_info(self, interaction: discord.Interaction):
+        """Zeigt Karteninformationen und finalisiert den Wunsch"""
+        if not self.card_info:
+            await interaction.followup.send(
+                "❌ Fehler beim Abrufen der Karteninformationen!",
+                ephemeral=True
+            )
+            return
+        
+        embed = discord.Embed(
+            title="🌟 TCG-Karte wünschen - Schritt 3/3",
+            description="**Karteninformationen:**",
+            color=0xffd700
+        )
+        
+        embed.add_field(
+            name="📝 Name",
+            value=self.card_info.get("name", "Unbekannt"),
+            inline=True
+        )
+        
+        hp = self.card_info.get("hp")
+        if hp:
+            embed.add_field(
+                name="❤️ KP",
+                value=str(hp),
+                inline=True
+            )
+        
+        types = self.card_info.get("types", [])
+        if types:
+            types_str = ", ".join(types)
+            embed.add_field(
+                name="🎯 Typ(en)",
+                value=types_str,
+                inline=True
+            )
+        
+        set_name = self.card_info.get("set_name", self.selected_set.get("name", "Unbekannt"))
+        embed.add_field(
+            name="📦 Set",
+            value=set_name,
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🔢 Nummer",
+            value=self.card_info.get("card_number", self.card_number),
+            inline=True
+        )
+        
+        price = self.card_info.get("cardmarket_price")
+        if price:
+            embed.add_field(
+                name="💰 Cardmarket Preis",
+                value=f"€{price:.2f}",
+                inline=True
+            )
+        else:
+            embed.add_field(
+                name="💰 Cardmarket Preis",
+                value="Nicht verfügbar",
+                inline=True
+            )
+        
+        image_url = self.card_info.get("image", "")
+        if image_url:
+            embed.set_image(url=image_url)
+        
+        card_symbol = self.card_info.get("set_symbol", "")
+        set_symbol = self.selected_set.get("symbol", "") or self.selected_set.get("logo", "")
+        symbol_url = card_symbol or set_symbol
+        if symbol_url:
+            embed.set_thumbnail(url=symbol_url)
+            # Füge auch Info-Feld hinzu
+            embed.add_field(
+                name="🖼️ Set-Symbol",
+                value=f"[Symbol anzeigen]({symbol_url})",
+                inline=True
+            )
+        
+        if self.card_info.get("stale"):
+            embed.add_field(
+                name="⚠️ Zwischengespeicherte Daten",
+                value="Die TCGdex API ist gerade nicht erreichbar. Preis und Kartendaten sind evtl. nicht aktuell.",
+                inline=False
+            )
+        
+        embed.set_footer(text="Schritt 3 von 3: Wunsch wird erstellt...")
+        
+        with TRACER.span("followup.send"):
+            await interaction.followup.send(embed=embed)
+        await self.finalize_wish(interaction)
+    
+    @TRACER.traced()
+    async def finalize_wish(self, interaction: discord.Interaction):
+        """Erstellt den TCG-Wunsch im Trading-System"""
+        if not self.card_info:
+            return
+        
+        wish_data = tcg_entry_data(self.card_info, self.selected_set_id, self.card_number, interaction.user)
+        
+        wish_id = await self.cog.add_wish(wish_data, interaction)
+        
+        confirm_embed = discord.Embed(
+            title="✅ TCG-Karte erfolgreich als Wunsch hinzugefügt!",
+            description=f"Dein Wunsch wurde mit der ID **#{wish_id}** erstellt.",
+            color=0xffd700
+        )
+        
+        confirm_embed.add_field(
+            name="📝 Karte",
+            value=f"{wish_data['name']} ({wish_data['hp']} KP)" if wish_data['hp'] else wish_data['name'],
+            inline=False
+        )
+        
+        if self.card_info.get("cardmarket_price"):
+            confirm_embed.add_field(
+                name="💰 Cardmarket Preis",
+                value=f"€{self.card_info.get('cardmarket_price'):.2f}",
+                inline=True
+            )
+        
+        with TRACER.span("followup.send"):
+            await interaction.followup.send(embed=confirm_embed)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_wish(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button
+        embed = discord.Embed(
+            title="❌ TCG-Wunsch abgebrochen",
+            description="Der Wunsch wurde abgebrochen.",
+            color=0xff0000
+        )
+        
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
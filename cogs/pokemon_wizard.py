@@ -0,0 +1,1215 @@
+"""
+Schrittweise Eingabe von Angeboten, Wünschen und Gegenangeboten
+
+Wird beim ersten !bieten, !wünschen oder Gegenangebot importiert.
+"""
+import discord
+
+from .market_views import CounterOfferResponseView, respond_entry_held
+from .metrics import TimedModal, TimedView
+from .tracing import TRACER
+
+class TypeSelect(discord.ui.Select):
+    """Dropdown für Pokemon-Typ Auswahl"""
+    
+    def __init__(self, view):
+        self.pokemon_view = view
+        options = [
+            discord.SelectOption(
+                label=name, 
+                value=name, 
+                emoji=emoji
+            ) for emoji, name in view.cog.pokemon_types.items()
+        ]
+        
+        super().__init__(
+            placeholder="Wähle den Pokemon-Typ...",
+            options=options,
+            custom_id="type_select"
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        # Bestimme welcher Datencontainer verwendet wird
+        if hasattr(self.pokemon_view, 'pokemon_data'):
+            self.pokemon_view.pokemon_data['type'] = self.values[0]
+        elif hasattr(self.pokemon_view, 'wish_data'):
+            self.pokemon_view.wish_data['type'] = self.values[0]
+        
+        # Gehe automatisch zum nächsten Schritt (Phase)
+        await self.pokemon_view.show_phase_selection(interaction)
+
+class PhaseSelect(discord.ui.Select):
+    """Dropdown für Pokemon-Phase Auswahl"""
+    
+    def __init__(self, view):
+        self.pokemon_view = view
+        options = [
+            discord.SelectOption(
+                label=name,
+                value=name,
+                emoji=emoji
+            ) for emoji, name in view.cog.pokemon_phases.items()
+        ]
+        
+        super().__init__(
+            placeholder="Wähle die Pokemon-Phase...",
+            options=options,
+            custom_id="phase_select"
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        # Bestimme welcher Datencontainer verwendet wird
+        if hasattr(self.pokemon_view, 'pokemon_data'):
+            self.pokemon_view.pokemon_data['phase'] = self.values[0]
+        elif hasattr(self.pokemon_view, 'wish_data'):
+            self.pokemon_view.wish_data['phase'] = self.values[0]
+        
+        # Gehe automatisch zum nächsten Schritt (Seltenheit)
+        await self.pokemon_view.show_rarity_selection(interaction)
+
+class RaritySelect(discord.ui.Select):
+    """Dropdown für Seltenheitsstufe Auswahl"""
+    
+    def __init__(self, view):
+        self.pokemon_view = view
+        options = [
+            discord.SelectOption(
+                label=name,
+                value=name,
+                emoji=emoji
+            ) for emoji, name in view.cog.rarity_levels.items()
+        ]
+        
+        super().__init__(
+            placeholder="Wähle die Seltenheitsstufe...",
+            options=options,
+            custom_id="rarity_select"
+        )
+    
+    async def callback(self, interaction: discord.Interaction):
+        # Bestimme welcher Datencontainer verwendet wird
+        if hasattr(self.pokemon_view, 'pokemon_data'):
+            self.pokemon_view.pokemon_data['rarity'] = self.values[0]
+        elif hasattr(self.pokemon_view, 'wish_data'):
+            self.pokemon_view.wish_data['rarity'] = self.values[0]
+        
+        # Finalisiere das Angebot automatisch
+        await self.pokemon_view.finalize_offer(interaction)
+
+class WishSequentialView(TimedView):
+    """View für sequenzielle Pokemon-Wunsch-Eingabe"""
+    
+    def __init__(self, cog):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.wish_data = {
+            'name': None,
+            'type': None,
+            'hp': None,
+            'phase': None,
+            'rarity': None,
+            'user': None,
+            'offer_included': False,
+            'offer_data': None
+        }
+        self.current_step = 1
+    
+    @discord.ui.button(label="Wunsch erstellen", style=discord.ButtonStyle.primary, emoji="🌟")
+    async def start_wish(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Starte mit Name-Eingabe
+        modal = PokemonNameModal(self)
+        await interaction.response.send_modal(modal)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_wish(self, interaction: discord.Interaction, button: discord.ui.Button = None):
+        if button:
+            _ = button  # Ignoriere unused argument warning
+        embed = discord.Embed(
+            title="❌ Pokemon-Wunsch abgebrochen",
+            description="Der Wunsch wurde abgebrochen.",
+            color=0xff0000
+        )
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_hp_input(self, interaction: discord.Interaction):
+        """Zeige KP-Eingabe (Schritt 2)"""
+        self.current_step = 2
+        embed = discord.Embed(
+            title="🌟 Pokemon-Wunsch erstellen - Schritt 2/5",
+            description=f"✅ **Name:** {self.wish_data['name']}\n\nJetzt gib die gewünschten KP ein:",
+            color=0xffd700
+        )
+        embed.set_footer(text="Schritt 2 von 5: KP eingeben")
+        
+        self.clear_items()
+        self.add_item(discord.ui.Button(label="❤️ KP eingeben", style=discord.ButtonStyle.primary, custom_id="hp_input"))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel"))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Behandle Button-Klicks in der Wunsch-View"""
+        if interaction.data.get("custom_id") == "hp_input":
+            modal = PokemonHPModal(self)
+            await interaction.response.send_modal(modal)
+            return False
+        elif interaction.data.get("custom_id") == "cancel":
+            embed = discord.Embed(
+                title="❌ Pokemon-Wunsch abgebrochen",
+                description="Der Wunsch wurde abgebrochen.",
+                color=0xff0000
+            )
+            
+            # Deaktiviere alle Buttons
+            for item in self.children:
+                item.disabled = True
+            
+            await interaction.response.edit_message(embed=embed, view=self)
+            return False
+        return True
+    
+    @TRACER.traced()
+    async def show_type_selection(self, interaction: discord.Interaction):
+        """Zeige Typ-Auswahl (Schritt 3)"""
+        self.current_step = 3
+        embed = discord.Embed(
+            title="🌟 Pokemon-Wunsch erstellen - Schritt 3/5",
+            description=f"✅ **Name:** {self.wish_data['name']}\n✅ **KP:** {self.wish_data['hp']}\n\nWähle den gewünschten Typ:",
+            color=0xffd700
+        )
+        embed.set_footer(text="Schritt 3 von 5: Typ auswählen")
+        
+        self.clear_items()
+        self.add_item(TypeSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_phase_selection(self, interaction: discord.Interaction):
+        """Zeige Phase-Auswahl (Schritt 4)"""
+        self.current_step = 4
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.wish_data['type']), "")
+        
+        embed = discord.Embed(
+            title="🌟 Pokemon-Wunsch erstellen - Schritt 4/5",
+            description=f"✅ **Name:** {self.wish_data['name']}\n✅ **KP:** {self.wish_data['hp']}\n✅ **Typ:** {type_emoji} {self.wish_data['type']}\n\nWähle die gewünschte Phase:",
+            color=0xffd700
+        )
+        embed.set_footer(text="Schritt 4 von 5: Phase auswählen")
+        
+        self.clear_items()
+        self.add_item(PhaseSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_rarity_selection(self, interaction: discord.Interaction):
+        """Zeige Seltenheit-Auswahl (Schritt 5)"""
+        self.current_step = 5
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.wish_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.wish_data['phase']), "")
+        
+        embed = discord.Embed(
+            title="🌟 Pokemon-Wunsch erstellen - Schritt 5/5",
+            description=f"✅ **Name:** {self.wish_data['name']}\n✅ **KP:** {self.wish_data['hp']}\n✅ **Typ:** {type_emoji} {self.wish_data['type']}\n✅ **Phase:** {phase_emoji} {self.wish_data['phase']}\n\nWähle die gewünschte Seltenheit:",
+            color=0xffd700
+        )
+        embed.set_footer(text="Schritt 5 von 5: Seltenheit auswählen")
+        
+        self.clear_items()
+        self.add_item(RaritySelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def finalize_offer(self, interaction: discord.Interaction):
+        await self.show_offer_option(interaction)
+    
+    async def show_offer_option(self, interaction: discord.Interaction):
+        """Zeigt die Option, ein Tauschangebot hinzuzufügen"""
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.wish_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.wish_data['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.wish_data['rarity']), "")
+        
+        embed = discord.Embed(
+            title="🌟 Pokemon-Wunsch fast fertig!",
+            description="Dein Wunsch-Pokemon ist vollständig definiert:",
+            color=0xffd700
+        )
+        
+        embed.add_field(
+            name="🎯 Gesuchtes Pokemon",
+            value=f"**{self.wish_data['name']}** ({self.wish_data['hp']} KP)\n"
+                  f"{type_emoji} {self.wish_data['type']} | "
+                  f"{phase_emoji} {self.wish_data['phase']} | "
+                  f"{rarity_emoji} {self.wish_data['rarity']}",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🔄 Optionaler nächster Schritt",
+            value="Möchtest du direkt ein Pokemon zum Tausch anbieten?",
+            inline=False
+        )
+        
+        # Neue View mit Optionen
+        offer_option_view = WishOfferOptionView(self.cog, self.wish_data)
+        
+        await interaction.response.edit_message(embed=embed, view=offer_option_view)
+
+class WishOfferOptionView(TimedView):
+    """View für die Wahl, ob ein Tauschangebot hinzugefügt werden soll"""
+    
+    def __init__(self, cog, wish_data):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.wish_data = wish_data
+    
+    @discord.ui.button(label="Tauschangebot hinzufügen", style=discord.ButtonStyle.primary, emoji="🎮")
+    async def add_trade_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        embed = discord.Embed(
+            title="🎮 Tauschangebot hinzufügen",
+            description="Erstelle jetzt ein Pokemon, das du im Tausch anbieten möchtest!",
+            color=0x3498db
+        )
+        
+        embed.add_field(
+            name="📋 Info",
+            value="Du wirst durch die Erstellung deines Tauschangebots geführt.\n"
+                  "Danach wird dein Wunsch mit dem Angebot zusammen veröffentlicht!",
+            inline=False
+        )
+        
+        # Erstelle eine neue sequenzielle View für das Tauschangebot
+        trade_offer_view = WishTradeOfferView(self.cog, self.wish_data, interaction.user)
+        
+        await interaction.response.edit_message(embed=embed, view=trade_offer_view)
+    
+    @discord.ui.button(label="Nur Wunsch veröffentlichen", style=discord.ButtonStyle.secondary, emoji="🌟")
+    async def publish_wish_only(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        self.wish_data['user'] = interaction.user
+        await self.cog.create_final_wish(interaction, self.wish_data)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_wish(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        embed = discord.Embed(
+            title="❌ Pokemon-Wunsch abgebrochen",
+            description="Der Wunsch wurde abgebrochen.",
+            color=0xff0000
+        )
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+
+class PokemonNameModal(TimedModal):
+    """Modal für Pokemon-Name Eingabe"""
+    
+    def __init__(self, view):
+        super().__init__(title="Schritt 1: Pokemon Name")
+        self.view = view
+        
+        self.name_input = discord.ui.TextInput(
+            label="Pokemon Name",
+            placeholder="z.B. Pikachu, Charizard, Glurak...",
+            required=True,
+            max_length=50
+        )
+        self.add_item(self.name_input)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        # Bestimme welcher Datencontainer verwendet wird
+        if hasattr(self.view, 'pokemon_data'):
+            self.view.pokemon_data['name'] = self.name_input.value
+            self.view.pokemon_data['user'] = interaction.user
+        elif hasattr(self.view, 'wish_data'):
+            self.view.wish_data['name'] = self.name_input.value
+            self.view.wish_data['user'] = interaction.user
+        
+        # Gehe automatisch zum nächsten Schritt (KP)
+        await self.view.show_hp_input(interaction)
+
+class PokemonHPModal(TimedModal):
+    """Modal für Pokemon-KP Eingabe"""
+    
+    def __init__(self, view):
+        super().__init__(title="Schritt 2: Pokemon KP")
+        self.view = view
+        
+        self.hp_input = discord.ui.TextInput(
+            label="KP (Kraftpunkte)",
+            placeholder="z.B. 60, 120, 250...",
+            required=True,
+            max_length=4
+        )
+        self.add_item(self.hp_input)
+    
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            hp_value = int(self.hp_input.value)
+            if hp_value <= 0:
+                raise ValueError("KP müssen größer als 0 sein")
+            
+            # Bestimme welcher Datencontainer verwendet wird
+            if hasattr(self.view, 'pokemon_data'):
+                self.view.pokemon_data['hp'] = hp_value
+            elif hasattr(self.view, 'wish_data'):
+                self.view.wish_data['hp'] = hp_value
+            
+            # Gehe automatisch zum nächsten Schritt (Typ)
+            await self.view.show_type_selection(interaction)
+            
+        except ValueError as e:
+            if "invalid literal" in str(e):
+                await interaction.response.send_message("❌ KP müssen eine gültige Zahl sein!", ephemeral=True)
+            else:
+                await interaction.response.send_message(f"❌ {str(e)}", ephemeral=True)
+
+
+# Neue sequenzielle View-Klasse
+class PokemonSequentialView(TimedView):
+    """View für sequenzielle Pokemon-Eingabe"""
+    
+    def __init__(self, cog):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.pokemon_data = {
+            'name': None,
+            'type': None,
+            'hp': None,
+            'phase': None,
+            'rarity': None,
+            'user': None
+        }
+        self.current_step = 1
+    
+    @discord.ui.button(label="Los geht's!", style=discord.ButtonStyle.primary, emoji="🚀")
+    async def start_process(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Starte mit Name-Eingabe
+        modal = PokemonNameModal(self)
+        await interaction.response.send_modal(modal)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_offer(self, interaction: discord.Interaction, button: discord.ui.Button = None):
+        if button:
+            _ = button  # Ignoriere unused argument warning
+        embed = discord.Embed(
+            title="❌ Pokemon-Angebot abgebrochen",
+            description="Das Angebot wurde abgebrochen.",
+            color=0xff0000
+        )
+        
+        # Deaktiviere alle Buttons
+        for item in self.children:
+            item.disabled = True
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_hp_input(self, interaction: discord.Interaction):
+        """Zeige KP-Eingabe (Schritt 2)"""
+        self.current_step = 2
+        embed = discord.Embed(
+            title="🎮 Pokemon-Angebot erstellen - Schritt 2/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n\nJetzt gib die KP deines Pokemon ein:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 2 von 5: KP eingeben")
+        
+        # Erstelle View mit KP-Button
+        self.clear_items()
+        self.add_item(discord.ui.Button(label="❤️ KP eingeben", style=discord.ButtonStyle.primary, custom_id="hp_input"))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel"))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        """Behandle Button-Klicks in der sequenziellen View"""
+        if interaction.data.get("custom_id") == "hp_input":
+            modal = PokemonHPModal(self)
+            await interaction.response.send_modal(modal)
+            return False
+        elif interaction.data.get("custom_id") == "cancel":
+            embed = discord.Embed(
+                title="❌ Pokemon-Angebot abgebrochen",
+                description="Das Angebot wurde abgebrochen.",
+                color=0xff0000
+            )
+            
+            # Deaktiviere alle Buttons
+            for item in self.children:
+                item.disabled = True
+            
+            await interaction.response.edit_message(embed=embed, view=self)
+            return False
+        return True
+    
+    @TRACER.traced()
+    async def show_type_selection(self, interaction: discord.Interaction):
+        """Zeige Typ-Auswahl (Schritt 3)"""
+        self.current_step = 3
+        embed = discord.Embed(
+            title="🎮 Pokemon-Angebot erstellen - Schritt 3/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n\nWähle den Typ deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 3 von 5: Typ auswählen")
+        
+        # Erstelle neue View mit Type-Select
+        self.clear_items()
+        self.add_item(TypeSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_phase_selection(self, interaction: discord.Interaction):
+        """Zeige Phase-Auswahl (Schritt 4)"""
+        self.current_step = 4
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        
+        embed = discord.Embed(
+            title="🎮 Pokemon-Angebot erstellen - Schritt 4/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n✅ **Typ:** {type_emoji} {self.pokemon_data['type']}\n\nWähle die Phase deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 4 von 5: Phase auswählen")
+        
+        # Erstelle neue View mit Phase-Select
+        self.clear_items()
+        self.add_item(PhaseSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_rarity_selection(self, interaction: discord.Interaction):
+        """Zeige Seltenheit-Auswahl (Schritt 5)"""
+        self.current_step = 5
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.pokemon_data['phase']), "")
+        
+        embed = discord.Embed(
+            title="🎮 Pokemon-Angebot erstellen - Schritt 5/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n✅ **Typ:** {type_emoji} {self.pokemon_data['type']}\n✅ **Phase:** {phase_emoji} {self.pokemon_data['phase']}\n\nWähle die Seltenheit deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 5 von 5: Seltenheit auswählen")
+        
+        # Erstelle neue View mit Rarity-Select
+        self.clear_items()
+        self.add_item(RaritySelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def finalize_offer(self, interaction: discord.Interaction):
+        """Finalisiere das Angebot"""
+        # Prüfe ob dies ein Angebot für einen Wunsch ist
+        if hasattr(self, 'target_wish') and hasattr(self, 'responding_user'):
+            await self.create_wish_counter_offer(interaction)
+        else:
+            await self.create_final_offer(interaction)
+    
+    @TRACER.traced()
+    async def create_final_offer(self, interaction: discord.Interaction):
+        """Erstellt das finale Pokemon-Angebot"""
+        
+        # Speichere das Angebot mit zusätzlichen Metadaten (vergibt die Angebots-ID)
+        offer_data = self.pokemon_data.copy()
+        offer_id = await self.cog.add_offer(offer_data, interaction)
+        
+        # Hole die entsprechenden Emojis
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.pokemon_data['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.pokemon_data['rarity']), "")
+        
+        embed = discord.Embed(
+            title="🎯 Neues Pokemon-Angebot!",
+            description=f"**{self.pokemon_data['user'].display_name}** bietet ein Pokemon zum Tausch an:",
+            color=0x00ff00
+        )
+        
+        embed.add_field(
+            name="📛 Pokemon",
+            value=f"**{self.pokemon_data['name']}**",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="❤️ KP",
+            value=f"**{self.pokemon_data['hp']}**",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🏷️ Typ",
+            value=f"{type_emoji} **{self.pokemon_data['type']}**",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="🔄 Phase",
+            value=f"{phase_emoji} **{self.pokemon_data['phase']}**",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="💎 Seltenheit",
+            value=f"{rarity_emoji} **{self.pokemon_data['rarity']}**",
+            inline=True
+        )
+        
+        embed.add_field(
+            name="👤 Anbieter",
+            value=self.pokemon_data['user'].mention,
+            inline=True
+        )
+        
+        embed.set_thumbnail(url=self.pokemon_data['user'].display_avatar.url)
+        embed.set_footer(text=f"Angebots-ID: #{offer_id} | Interessiert? Verwende !angebote oder den Button!")
+        
+        # Erstelle neue View für das finale Angebot
+        final_view = FinalOfferView(offer_data)
+        
+        await interaction.response.edit_message(embed=embed, view=final_view)
+    
+    @TRACER.traced()
+    async def create_wish_counter_offer(self, interaction: discord.Interaction):
+        """Erstellt ein Gegenangebot für einen Wunsch"""
+        
+        # Reserviert den Wunsch, solange das Angebot auf Antwort wartet
+        held_version = await self.cog.hold_entry(self.target_wish, self.responding_user.id)
+        if not held_version:
+            await respond_entry_held(interaction)
+            return
+        
+        # Hole die entsprechenden Emojis für das angebotene Pokemon
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.pokemon_data['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.pokemon_data['rarity']), "")
+        
+        # Hole die entsprechenden Emojis für das gewünschte Pokemon
+        orig_type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.target_wish['type']), "")
+        orig_phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.target_wish['phase']), "")
+        orig_rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.target_wish['rarity']), "")
+        
+        embed = discord.Embed(
+            title="✅ Gegenangebot für Wunsch erstellt!",
+            description=f"Dein Angebot für **{self.target_wish['user'].display_name}**s Wunsch wurde erstellt!",
+            color=0x00ff00
+        )
+        
+        embed.add_field(
+            name="🎯 Gewünschtes Pokemon",
+            value=f"**{self.target_wish['name']}** ({self.target_wish['hp']} KP)\n"
+                  f"{orig_type_emoji} {self.target_wish['type']} | "
+                  f"{orig_phase_emoji} {self.target_wish['phase']} | "
+                  f"{orig_rarity_emoji} {self.target_wish['rarity']}",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🎮 Dein Angebot",
+            value=f"**{self.pokemon_data['name']}** ({self.pokemon_data['hp']} KP)\n"
+                  f"{type_emoji} {self.pokemon_data['type']} | "
+                  f"{phase_emoji} {self.pokemon_data['phase']} | "
+                  f"{rarity_emoji} {self.pokemon_data['rarity']}",
+            inline=False
+        )
+        
+        embed.set_footer(text="Angebot wird an den Wünschenden gesendet!")
+        
+        # Sende das Angebot an den Wünschenden
+        try:
+            await interaction.response.edit_message(embed=embed, view=None)
+            
+            dm_embed = discord.Embed(
+                title="🎁 Angebot für deinen Wunsch erhalten!",
+                description=f"**{self.responding_user.display_name}** möchte dir ein Pokemon für deinen Wunsch anbieten!",
+                color=0x3498db
+            )
+            
+            dm_embed.add_field(
+                name="🎯 Dein Wunsch",
+                value=f"**{self.target_wish['name']}** ({self.target_wish['hp']} KP)\n"
+                      f"{orig_type_emoji} {self.target_wish['type']} | "
+                      f"{orig_phase_emoji} {self.target_wish['phase']} | "
+                      f"{orig_rarity_emoji} {self.target_wish['rarity']}",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name=f"🎮 Angebot von {self.responding_user.display_name}",
+                value=f"**{self.pokemon_data['name']}** ({self.pokemon_data['hp']} KP)\n"
+                      f"{type_emoji} {self.pokemon_data['type']} | "
+                      f"{phase_emoji} {self.pokemon_data['phase']} | "
+                      f"{rarity_emoji} {self.pokemon_data['rarity']}",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name="🔄 Entscheidung treffen",
+                value="Wähle eine Option:",
+                inline=False
+            )
+            
+            # Erstelle die interaktive View mit Annehmen/Ablehnen Buttons (für Wünsche)
+            response_view = CounterOfferResponseView(self.target_wish, self.pokemon_data, self.responding_user,
+                                                     held_version)
+            
+            await self.target_wish['user'].send(embed=dm_embed, view=response_view)
+            
+        except discord.Forbidden:
+            # Ohne Nachricht keine Antwort: Reservierung sofort aufheben
+            await self.cog.release_entry(self.target_wish, self.responding_user.id)
+            await interaction.followup.send(
+                f"❌ Ich konnte {self.target_wish['user'].display_name} keine private Nachricht senden. "
+                f"Kontaktiere sie direkt: {self.target_wish['user'].mention}",
+                ephemeral=True
+            )
+            return
+        except Exception:
+            # Ohne zugestellte Nachricht wartet niemand auf eine Antwort: nicht bis zum Ablauf reserviert lassen
+            await self.cog.release_entry(self.target_wish, self.responding_user.id)
+            raise
+        
+        # Bestätigung an den Absender
+        await interaction.followup.send(
+            f"✅ Dein Angebot wurde erfolgreich an **{self.target_wish['user'].display_name}** gesendet!",
+            ephemeral=True
+        )
+
+class CounterOfferSequentialView(TimedView):
+    """View für sequenzielle Gegenangebot-Eingabe"""
+    
+    def __init__(self, cog, target_offer, responding_user):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.target_offer = target_offer
+        self.responding_user = responding_user
+        self.pokemon_data = {
+            'name': None,
+            'type': None,
+            'hp': None,
+            'phase': None,
+            'rarity': None,
+            'user': responding_user
+        }
+        self.current_step = 1
+    
+    @discord.ui.button(label="🚀 Gegenangebot starten", style=discord.ButtonStyle.primary, emoji="🚀")
+    async def start_counter_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Starte mit Name-Eingabe
+        modal = PokemonNameModal(self)
+        await interaction.response.send_modal(modal)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_counter_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Gehe zurück zur Angebote-Liste
+        await self.cog.show_offers_list(interaction, is_refresh=True)
+    
+    # Alle Methoden von PokemonSequentialView übernehmen
+    @TRACER.traced()
+    async def show_hp_input(self, interaction: discord.Interaction):
+        self.current_step = 2
+        embed = discord.Embed(
+            title="🎮 Gegenangebot erstellen - Schritt 2/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n\nJetzt gib die KP deines Pokemon ein:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 2 von 5: KP eingeben")
+        
+        self.clear_items()
+        self.add_item(discord.ui.Button(label="❤️ KP eingeben", style=discord.ButtonStyle.primary, custom_id="hp_input"))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel"))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.data.get("custom_id") == "hp_input":
+            modal = PokemonHPModal(self)
+            await interaction.response.send_modal(modal)
+            return False
+        elif interaction.data.get("custom_id") == "cancel":
+            await self.cog.show_offers_list(interaction, is_refresh=True)
+            return False
+        return True
+    
+    @TRACER.traced()
+    async def show_type_selection(self, interaction: discord.Interaction):
+        self.current_step = 3
+        embed = discord.Embed(
+            title="🎮 Gegenangebot erstellen - Schritt 3/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n\nWähle den Typ deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 3 von 5: Typ auswählen")
+        
+        self.clear_items()
+        self.add_item(TypeSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_phase_selection(self, interaction: discord.Interaction):
+        self.current_step = 4
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        
+        embed = discord.Embed(
+            title="🎮 Gegenangebot erstellen - Schritt 4/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n✅ **Typ:** {type_emoji} {self.pokemon_data['type']}\n\nWähle die Phase deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 4 von 5: Phase auswählen")
+        
+        self.clear_items()
+        self.add_item(PhaseSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_rarity_selection(self, interaction: discord.Interaction):
+        self.current_step = 5
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.pokemon_data['phase']), "")
+        
+        embed = discord.Embed(
+            title="🎮 Gegenangebot erstellen - Schritt 5/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n✅ **Typ:** {type_emoji} {self.pokemon_data['type']}\n✅ **Phase:** {phase_emoji} {self.pokemon_data['phase']}\n\nWähle die Seltenheit deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 5 von 5: Seltenheit auswählen")
+        
+        self.clear_items()
+        self.add_item(RaritySelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def finalize_offer(self, interaction: discord.Interaction):
+        await self.create_counter_offer_message(interaction)
+    
+    @TRACER.traced()
+    async def create_counter_offer_message(self, interaction: discord.Interaction):
+        """Erstellt die finale Gegenangebot-Nachricht"""
+        
+        # Reserviert das Angebot, solange das Gegenangebot auf Antwort wartet
+        held_version = await self.cog.hold_entry(self.target_offer, self.responding_user.id)
+        if not held_version:
+            await respond_entry_held(interaction)
+            return
+        
+        # Hole die entsprechenden Emojis
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.pokemon_data['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.pokemon_data['rarity']), "")
+        
+        # Originales Angebot Emojis
+        orig_type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.target_offer['type']), "")
+        orig_phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.target_offer['phase']), "")
+        orig_rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.target_offer['rarity']), "")
+        
+        embed = discord.Embed(
+            title="🔄 Gegenangebot erstellt!",
+            description=f"**{self.responding_user.display_name}** möchte mit **{self.target_offer['user'].display_name}** tauschen:",
+            color=0x00ff00
+        )
+        
+        # Originales Angebot
+        embed.add_field(
+            name="🎯 Gewünschtes Pokemon",
+            value=f"**{self.target_offer['name']}** ({self.target_offer['hp']} KP)\n"
+                  f"{orig_type_emoji} {self.target_offer['type']} | "
+                  f"{orig_phase_emoji} {self.target_offer['phase']} | "
+                  f"{orig_rarity_emoji} {self.target_offer['rarity']}",
+            inline=False
+        )
+        
+        # Gegenangebot
+        embed.add_field(
+            name="🎮 Angebotenes Pokemon",
+            value=f"**{self.pokemon_data['name']}** ({self.pokemon_data['hp']} KP)\n"
+                  f"{type_emoji} {self.pokemon_data['type']} | "
+                  f"{phase_emoji} {self.pokemon_data['phase']} | "
+                  f"{rarity_emoji} {self.pokemon_data['rarity']}",
+            inline=False
+        )
+        
+        embed.set_footer(text="Gegenangebot wird an den ursprünglichen Anbieter gesendet!")
+        
+        # Sende das Gegenangebot an den ursprünglichen Anbieter
+        try:
+            await interaction.response.edit_message(embed=embed, view=None)
+            
+            dm_embed = discord.Embed(
+                title="🔄 Neues Gegenangebot erhalten!",
+                description=f"**{self.responding_user.display_name}** möchte mit dir tauschen!",
+                color=0x3498db
+            )
+            
+            dm_embed.add_field(
+                name="🎯 Dein Pokemon",
+                value=f"**{self.target_offer['name']}** ({self.target_offer['hp']} KP)\n"
+                      f"{orig_type_emoji} {self.target_offer['type']} | "
+                      f"{orig_phase_emoji} {self.target_offer['phase']} | "
+                      f"{orig_rarity_emoji} {self.target_offer['rarity']}",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name=f"🎮 Angebot von {self.responding_user.display_name}",
+                value=f"**{self.pokemon_data['name']}** ({self.pokemon_data['hp']} KP)\n"
+                      f"{type_emoji} {self.pokemon_data['type']} | "
+                      f"{phase_emoji} {self.pokemon_data['phase']} | "
+                      f"{rarity_emoji} {self.pokemon_data['rarity']}",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name="🔄 Entscheidung treffen",
+                value="Wähle eine Option:",
+                inline=False
+            )
+            
+            # Erstelle die interaktive View mit Annehmen/Ablehnen Buttons
+            response_view = CounterOfferResponseView(self.target_offer, self.pokemon_data, self.responding_user,
+                                                     held_version)
+            
+            await self.target_offer['user'].send(embed=dm_embed, view=response_view)
+            
+        except discord.Forbidden:
+            await self.cog.release_entry(self.target_offer, self.responding_user.id)
+            await interaction.followup.send(
+                f"❌ Konnte das Gegenangebot nicht an {self.target_offer['user'].display_name} senden. "
+                f"Kontaktiere sie direkt: {self.target_offer['user'].mention}",
+                ephemeral=True
+            )
+            return
+        except Exception:
+            # Ohne zugestellte Nachricht wartet niemand auf eine Antwort: nicht bis zum Ablauf reserviert lassen
+            await self.cog.release_entry(self.target_offer, self.responding_user.id)
+            raise
+        
+        # Bestätigung an den Absender
+        await interaction.followup.send(
+            f"✅ Dein Gegenangebot wurde erfolgreich an **{self.target_offer['user'].display_name}** gesendet!",
+            ephemeral=True
+        )
+    
+    async def on_timeout(self):
+        """Wird aufgerufen wenn die View timeout erreicht"""
+        for item in self.children:
+            item.disabled = True
+
+class FinalOfferView(TimedView):
+    """View für das finale Pokemon-Angebot"""
+    
+    def __init__(self, pokemon_data):
+        super().__init__(timeout=3600)  # 1 Stunde für finale Angebote
+        self.pokemon_data = pokemon_data
+    
+    @discord.ui.button(label="Interesse zeigen", style=discord.ButtonStyle.primary, emoji="💬")
+    async def show_interest(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        if interaction.user.id == self.pokemon_data['user'].id:
+            await interaction.response.send_message(
+                "❌ Du kannst nicht Interesse an deinem eigenen Angebot zeigen!", 
+                ephemeral=True
+            )
+            return
+        
+        # Sende private Nachricht an den Anbieter
+        try:
+            dm_embed = discord.Embed(
+                title="🔔 Jemand ist interessiert an deinem Pokemon!",
+                description=f"**{interaction.user.display_name}** hat Interesse an deinem **{self.pokemon_data['name']}** gezeigt!",
+                color=0x00ff00
+            )
+            dm_embed.add_field(
+                name="Kontakt",
+                value=f"Schreibe {interaction.user.mention} eine private Nachricht um den Tausch zu besprechen!",
+                inline=False
+            )
+            
+            await self.pokemon_data['user'].send(embed=dm_embed)
+            
+            await interaction.response.send_message(
+                f"✅ Ich habe {self.pokemon_data['user'].display_name} über dein Interesse informiert! "
+                f"Sie werden sich bei dir melden.", 
+                ephemeral=True
+            )
+            
+        except discord.Forbidden:
+            await interaction.response.send_message(
+                f"❌ Ich konnte {self.pokemon_data['user'].display_name} keine private Nachricht senden. "
+                f"Kontaktiere sie direkt: {self.pokemon_data['user'].mention}",
+                ephemeral=True
+            )
+    
+    @discord.ui.button(label="Details", style=discord.ButtonStyle.secondary, emoji="📊")
+    async def show_details(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        details_embed = discord.Embed(
+            title=f"📊 Details zu {self.pokemon_data['name']}",
+            color=0x3498db
+        )
+        
+        details_embed.add_field(name="Name", value=self.pokemon_data['name'], inline=True)
+        details_embed.add_field(name="KP", value=self.pokemon_data['hp'], inline=True)
+        details_embed.add_field(name="Typ", value=self.pokemon_data['type'], inline=True)
+        details_embed.add_field(name="Phase", value=self.pokemon_data['phase'], inline=True)
+        details_embed.add_field(name="Seltenheit", value=self.pokemon_data['rarity'], inline=True)
+        details_embed.add_field(name="Anbieter", value=self.pokemon_data['user'].display_name, inline=True)
+        
+        await interaction.response.send_message(embed=details_embed, ephemeral=True)
+
+class WishTradeOfferView(TimedView):
+    """View für das Tauschangebot zu einem Wunsch"""
+    
+    def __init__(self, cog, wish_data, user):
+        super().__init__(timeout=300)
+        self.cog = cog
+        self.wish_data = wish_data
+        self.user = user
+        self.pokemon_data = {
+            'name': None,
+            'type': None,
+            'hp': None,
+            'phase': None,
+            'rarity': None,
+            'user': user
+        }
+        self.current_step = 1
+    
+    @discord.ui.button(label="🚀 Tauschangebot erstellen", style=discord.ButtonStyle.primary, emoji="🚀")
+    async def start_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Starte mit Name-Eingabe
+        modal = PokemonNameModal(self)
+        await interaction.response.send_modal(modal)
+    
+    @discord.ui.button(label="Abbrechen", style=discord.ButtonStyle.secondary, emoji="❌")
+    async def cancel_offer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        # Gehe zurück zur Wunsch-Option
+        offer_option_view = WishOfferOptionView(self.cog, self.wish_data)
+        
+        # Erstelle das ursprüngliche Embed neu
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.wish_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.wish_data['phase']), "")
+        rarity_emoji = next((emoji for emoji, name in self.cog.rarity_levels.items() if name == self.wish_data['rarity']), "")
+        
+        embed = discord.Embed(
+            title="🌟 Pokemon-Wunsch fast fertig!",
+            description="Dein Wunsch-Pokemon ist vollständig definiert:",
+            color=0xffd700
+        )
+        
+        embed.add_field(
+            name="🎯 Gesuchtes Pokemon",
+            value=f"**{self.wish_data['name']}** ({self.wish_data['hp']} KP)\n"
+                  f"{type_emoji} {self.wish_data['type']} | "
+                  f"{phase_emoji} {self.wish_data['phase']} | "
+                  f"{rarity_emoji} {self.wish_data['rarity']}",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="🔄 Optionaler nächster Schritt",
+            value="Möchtest du direkt ein Pokemon zum Tausch anbieten?",
+            inline=False
+        )
+        
+        await interaction.response.edit_message(embed=embed, view=offer_option_view)
+    
+    # Alle Methoden von PokemonSequentialView übernehmen
+    @TRACER.traced()
+    async def show_hp_input(self, interaction: discord.Interaction):
+        self.current_step = 2
+        embed = discord.Embed(
+            title="🎮 Tauschangebot erstellen - Schritt 2/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n\nJetzt gib die KP deines Pokemon ein:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 2 von 5: KP eingeben")
+        
+        self.clear_items()
+        self.add_item(discord.ui.Button(label="❤️ KP eingeben", style=discord.ButtonStyle.primary, custom_id="hp_input"))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel"))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.data.get("custom_id") == "hp_input":
+            modal = PokemonHPModal(self)
+            await interaction.response.send_modal(modal)
+            return False
+        elif interaction.data.get("custom_id") == "cancel":
+            await self.cancel_offer(interaction, None)
+            return False
+        return True
+    
+    @TRACER.traced()
+    async def show_type_selection(self, interaction: discord.Interaction):
+        self.current_step = 3
+        embed = discord.Embed(
+            title="🎮 Tauschangebot erstellen - Schritt 3/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n\nWähle den Typ deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 3 von 5: Typ auswählen")
+        
+        self.clear_items()
+        self.add_item(TypeSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_phase_selection(self, interaction: discord.Interaction):
+        self.current_step = 4
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        
+        embed = discord.Embed(
+            title="🎮 Tauschangebot erstellen - Schritt 4/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n✅ **Typ:** {type_emoji} {self.pokemon_data['type']}\n\nWähle die Phase deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 4 von 5: Phase auswählen")
+        
+        self.clear_items()
+        self.add_item(PhaseSelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def show_rarity_selection(self, interaction: discord.Interaction):
+        self.current_step = 5
+        type_emoji = next((emoji for emoji, name in self.cog.pokemon_types.items() if name == self.pokemon_data['type']), "")
+        phase_emoji = next((emoji for emoji, name in self.cog.pokemon_phases.items() if name == self.pokemon_data['phase']), "")
+        
+        embed = discord.Embed(
+            title="🎮 Tauschangebot erstellen - Schritt 5/5",
+            description=f"✅ **Name:** {self.pokemon_data['name']}\n✅ **KP:** {self.pokemon_data['hp']}\n✅ **Typ:** {type_emoji} {self.pokemon_data['type']}\n✅ **Phase:** {phase_emoji} {self.pokemon_data['phase']}\n\nWähle die Seltenheit deines Pokemon:",
+            color=0x3498db
+        )
+        embed.set_footer(text="Schritt 5 von 5: Seltenheit auswählen")
+        
+        self.clear_items()
+        self.add_item(RaritySelect(self))
+        self.add_item(discord.ui.Button(label="❌ Abbrechen", style=discord.ButtonStyle.secondary, custom_id="cancel", row=1))
+        
+        await interaction.response.edit_message(embed=embed, view=self)
+    
+    @TRACER.traced()
+    async def finalize_offer(self, interaction: discord.Interaction):
+        # Füge das Tauschangebot zum Wunsch hinzu
+        self.wish_data['offer_included'] = True
+        self.wish_data['offer_data'] = self.pokemon_data
+        self.wish_data['user'] = interaction.user
+        
+        await self.cog.create_final_wish(interaction, self.wish_data)
+
+class FinalWishView(TimedView):
+    """View für das finale Wunsch-Angebot"""
+    
+    def __init__(self, wish_data):
+        super().__init__(timeout=3600)  # 1 Stunde für finale Wünsche
+        self.wish_data = wish_data
+    
+    @discord.ui.button(label="💬 Kontakt aufnehmen", style=discord.ButtonStyle.primary, emoji="💬")
+    async def contact_wisher(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        if interaction.user.id == self.wish_data['user'].id:
+            await interaction.response.send_message(
+                "❌ Du kannst nicht deinen eigenen Wunsch kontaktieren!", 
+                ephemeral=True
+            )
+            return
+        
+        # Sende private Nachricht an den Wünschenden
+        try:
+            dm_embed = discord.Embed(
+                title="🔔 Jemand ist interessiert an deinem Wunsch!",
+                description=f"**{interaction.user.display_name}** hat Interesse an deinem Pokemon-Wunsch gezeigt!",
+                color=0x00ff00
+            )
+            
+            dm_embed.add_field(
+                name="🎯 Dein Wunsch",
+                value=f"**{self.wish_data['name']}** ({self.wish_data['hp']} KP)",
+                inline=False
+            )
+            
+            dm_embed.add_field(
+                name="Kontakt",
+                value=f"Schreibe {interaction.user.mention} eine private Nachricht um den Tausch zu besprechen!",
+                inline=False
+            )
+            
+            await self.wish_data['user'].send(embed=dm_embed)
+            
+            await interaction.response.send_message(
+                f"✅ Ich habe {self.wish_data['user'].display_name} über dein Interesse informiert! "
+                f"Sie werden sich bei dir melden.", 
+                ephemeral=True
+            )
+            
+        except discord.Forbidden:
+            await interaction.response.send_message(
+                f"❌ Ich konnte {self.wish_data['user'].display_name} keine private Nachricht senden. "
+                f"Kontaktiere sie direkt: {self.wish_data['user'].mention}",
+                ephemeral=True
+            )
+    
+    @discord.ui.button(label="📊 Details", style=discord.ButtonStyle.secondary, emoji="📊")
+    async def show_details(self, interaction: discord.Interaction, button: discord.ui.Button):
+        _ = button  # Ignoriere unused argument warning
+        
+        details_embed = discord.Embed(
+            title=f"📊 Details zu Wunsch #{self.wish_data['wish_id']}",
+            color=0xffd700
+        )
+        
+        details_embed.add_field(name="Gesuchtes Pokemon", value=self.wish_data['name'], inline=True)
+        details_embed.add_field(name="KP", value=self.wish_data['hp'], inline=True)
+        details_embed.add_field(name="Typ", value=self.wish_data['type'], inline=True)
+        details_embed.add_field(name="Phase", value=self.wish_data['phase'], inline=True)
+        details_embed.add_field(name="Seltenheit", value=self.wish_data['rarity'], inline=True)
+        details_embed.add_field(name="Wünschender", value=self.wish_data['user'].display_name, inline=True)
+        
+        if self.wish_data.get('offer_included', False) and self.wish_data.get('offer_data'):
+            offer_data = self.wish_data['offer_data']
+            details_embed.add_field(
+                name="Angebotenes Pokemon",
+                value=f"{offer_data['name']} ({offer_data['hp']} KP) - {offer_data['type']} | {offer_data['phase']} | {offer_data['rarity']}",
+                inline=False
+            )
+        
+        await interaction.response.send_message(embed=details_embed, ephemeral=True)
@@ -0,0 +1,329 @@
+"""
+Massenangebote und Sammlungsimport für TCG-Karten aus einer eingefügten Liste oder CSV-Datei
+
+Eine Zeile pro Karte: ``set_id,nummer[,anzahl]`` (Trenner auch ``;``, Tab
+oder Leerzeichen; eine Kopfzeile und Zeilen mit ``#`` werden übersprungen).
+
+Die Eingabe wird zeilenweise gelesen (ohne alle Zeilen vorab zu sammeln),
+jede neue Karte wird beim Lesen sofort als Abruf eingeplant.
+Gleiche Karten werden nur einmal abgerufen, höchstens ``concurrency``
+gleichzeitig über TCGdexService (und damit über dessen Cache). Ist der
+Set-Katalog bereits geladen, fallen unbekannte Sets ohne API-Aufruf durch.
+Jede Nummer wird wie im Einzel-Modal gegen die Kartenliste des Sets geprüft
+(``get_set_cards``, einmal pro Set): abgerufen wird nur die Nummer, wie sie
+im Set steht ("007" -> "7", "tg01" -> "TG01"); unbekannte Nummern scheitern
+ohne Kartenabruf und mit Vorschlägen.
+Gespeichert werden alle Angebote gemeinsam (``MarketBook.add_many``).
+
+Der Sammlungsimport liest dieselben Zeilen (``anzahl`` zählt dort nicht),
+ruft aber keine einzelnen Karten ab: pro Set genügt die Kartenliste
+(``get_set_cards``), um Nummern in Bits der Sammlung zu übersetzen.
+
+Wird beim ersten /anbieten-tcg-liste bzw. /sammlung-import importiert.
+"""
+import asyncio
+import io
+import re
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import discord
+
+from .metrics import REGISTRY, TimedModal
+from .pokemon_tcg import suggestion_text, tcg_entry_data
+from .tcgdex_service import card_number_key
+from .tracing import TRACER
+
+# Obergrenzen pro Aufruf
+MAX_BULK_OFFERS = 500
+MAX_QUANTITY = 50
+MAX_FILE_BYTES = 256 * 1024
+
+_SEPARATORS = re.compile(r"[,;\t ]+")
+_HEADER_FIELDS = {"set_id", "set", "setid"}
+
+
+class BulkLine(NamedTuple):
+    line_no: int
+    set_id: str
+    number: str
+    quantity: int
+
+
+class BulkFailure(NamedTuple):
+    line_no: int
+    text: str
+    reason: str
+
+
+class ResolvedCard(NamedTuple):
+    # Karteninformationen (extract_card_info) oder None mit Grund in ``reason``
+    card_info: Optional[Dict[str, Any]]
+    # Nummer, wie sie im Set steht
+    number: str
+    reason: str
+
+
+class BulkResult(NamedTuple):
+    # Angebotsdaten, noch ohne Guild und ID
+    offers: List[Dict[str, Any]]
+    failures: List[BulkFailure]
+    # Verschiedene angefragte Karten
+    cards: int
+
+
+def parse_bulk_lines(lines: Iterable[str]) -> Iterator[Union[BulkLine, BulkFailure]]:
+    """Liest Zeilen einzeln und liefert je Kartenzeile eine BulkLine oder einen BulkFailure"""
+    seen_content = False
+    for line_no, raw in enumerate(lines, start=1):
+        text = raw.strip().lstrip("\ufeff")
+        if not text or text.startswith("#"):
+            continue
+        fields = [field for field in _SEPARATORS.split(text) if field]
+        # Kopfzeile: erste Zeile mit Inhalt, auch nach Leer- oder Kommentarzeilen
+        first, seen_content = not seen_content, True
+        if first and fields[0].lower() in _HEADER_FIELDS:
+            continue
+        if len(fields) not in (2, 3):
+            yield BulkFailure(line_no, text, "Format: set_id,nummer[,anzahl]")
+            continue
+        set_id, number = fields[0], fields[1].lstrip("#")
+        quantity = fields[2] if len(fields) == 3 else "1"
+        if not quantity.isdigit() or not 1 <= int(quantity) <= MAX_QUANTITY:
+            yield BulkFailure(line_no, text, f"Anzahl muss zwischen 1 und {MAX_QUANTITY} liegen")
+            continue
+        if not number:
+            yield BulkFailure(line_no, text, "Kartennummer fehlt")
+            continue
+        yield BulkLine(line_no, set_id, number, int(quantity))
+
+
+def lines_from_bytes(data: bytes) -> Iterator[str]:
+    """Zeilen einer hochgeladenen Datei (UTF-8, mit oder ohne BOM)"""
+    return io.TextIOWrapper(io.BytesIO(data), encoding="utf-8-sig", errors="replace", newline=None)
+
+
+def unknown_number_reason(cards: Any, number: str) -> str:
+    """Fehlergrund für eine Nummer, die es im Set nicht gibt, mit denselben Vorschlägen wie das Modal"""
+    suggestions = suggestion_text(cards, number)
+    return f"Nummer gibt es im Set nicht. {suggestions}" if suggestions else "Nummer gibt es im Set nicht"
+
+
+class BulkResolver:
+    """Löst Karten mit begrenzter Parallelität auf, jede Karte nur einmal"""
+
+    def __init__(self, service: Any, concurrency: int = 16):
+        self.service = service
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._cards: Dict[Tuple[str, str], "asyncio.Task[ResolvedCard]"] = {}
+        self._set_cards: Dict[str, "asyncio.Task[Any]"] = {}
+        catalog = service.catalog
+        self._known_sets = {s.get("id") for s in catalog.sets} if catalog is not None and catalog.complete else None
+
+    def __len__(self) -> int:
+        return len(self._cards)
+
+    def known_set(self, set_id: str) -> bool:
+        return self._known_sets is None or set_id in self._known_sets
+
+    def request(self, set_id: str, number: str) -> "asyncio.Task[ResolvedCard]":
+        """Plant den Abruf einer Karte ein (oder liefert den schon geplanten, auch für "007" statt "7")"""
+        key = (set_id, card_number_key(number))
+        task = self._cards.get(key)
+        if task is None:
+            task = self._cards[key] = asyncio.create_task(self._resolve(set_id, number))
+        return task
+
+    def _card_list(self, set_id: str) -> "asyncio.Task[Any]":
+        task = self._set_cards.get(set_id)
+        if task is None:
+            task = self._set_cards[set_id] = asyncio.create_task(self._load_card_list(set_id))
+        return task
+
+    async def _load_card_list(self, set_id: str) -> Any:
+        async with self._semaphore:
+            return await self.service.get_set_cards(set_id)
+
+    async def _resolve(self, set_id: str, number: str) -> ResolvedCard:
+        try:
+            cards = await self._card_list(set_id)
+        except Exception:
+            # Ohne Kartenliste wie bisher direkt nach der eingegebenen Nummer fragen
+            cards = None
+        if cards is not None and len(cards):
+            canonical = cards.canonical(number)
+            if canonical is None:
+                return ResolvedCard(None, number, unknown_number_reason(cards, number))
+            number = canonical
+        async with self._semaphore:
+            card = await self.service.get_card(set_id, number)
+        if not card:
+            return ResolvedCard(None, number, "Karte nicht gefunden")
+        return ResolvedCard(self.service.extract_card_info(card), number, "")
+
+
+async def resolve_bulk_offers(service: Any, lines: Iterable[str], user: Any,
+                              concurrency: int = 16) -> BulkResult:
+    """Liest die Liste, löst alle Karten auf und baut die Angebotsdaten (``anzahl`` Angebote pro Zeile)"""
+    resolver = BulkResolver(service, concurrency)
+    failures: List[BulkFailure] = []
+    pending: List[Tuple[BulkLine, "asyncio.Task[ResolvedCard]"]] = []
+    planned = 0
+    for parsed in parse_bulk_lines(lines):
+        if isinstance(parsed, BulkFailure):
+            failures.append(parsed)
+        elif planned + parsed.quantity > MAX_BULK_OFFERS:
+            failures.append(BulkFailure(parsed.line_no, f"{parsed.set_id},{parsed.number}",
+                                        f"Mehr als {MAX_BULK_OFFERS} Angebote auf einmal"))
+        elif not resolver.known_set(parsed.set_id):
+            failures.append(BulkFailure(parsed.line_no, f"{parsed.set_id},{parsed.number}", "Unbekanntes Set"))
+        else:
+            planned += parsed.quantity
+            pending.append((parsed, resolver.request(parsed.set_id, parsed.number)))
+
+    await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+    offers: List[Dict[str, Any]] = []
+    for line, task in pending:
+        resolved = ResolvedCard(None, line.number, "Karte nicht gefunden") if task.exception() else task.result()
+        if not resolved.card_info:
+            failures.append(BulkFailure(line.line_no, f"{line.set_id},{line.number}", resolved.reason))
+            continue
+        offers.extend(tcg_entry_data(resolved.card_info, line.set_id, resolved.number, user)
+                      for _ in range(line.quantity))
+    failures.sort()
+    return BulkResult(offers, failures, len(resolver))
+
+
+def _failure_lines(failures: List[BulkFailure]) -> str:
+    lines: List[str] = []
+    for failure in failures:
+        line = f"Zeile {failure.line_no}: `{failure.text[:40]}` - {failure.reason}"
+        # Feldwerte sind auf 1024 Zeichen begrenzt
+        if sum(len(l) + 1 for l in lines) + len(line) > 950:
+            lines.append(f"… und {len(failures) - len(lines)} weitere")
+            break
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def build_bulk_summary(result: BulkResult, offer_ids: List[int]) -> discord.Embed:
+    """Ein Embed für den ganzen Aufruf: angelegte Angebote und alle Fehlschläge"""
+    embed = discord.Embed(
+        title="✅ TCG-Karten angeboten" if offer_ids else "❌ Keine TCG-Karten angeboten",
+        description=f"**{len(offer_ids)}** Angebote aus **{result.cards}** verschiedenen Karten erstellt.",
+        color=0x2ecc71 if offer_ids and not result.failures else 0xff9900 if offer_ids else 0xff0000
+    )
+    if offer_ids:
+        embed.add_field(name="🆔 Angebots-IDs", value=f"#{offer_ids[0]} bis #{offer_ids[-1]}", inline=True)
+        total = sum(offer.get('cardmarket_price') or 0 for offer in result.offers)
+        if total:
+            embed.add_field(name="💰 Cardmarket gesamt", value=f"€{total:.2f}", inline=True)
+    if result.failures:
+        embed.add_field(name=f"⚠️ Nicht übernommen ({len(result.failures)})",
+                        value=_failure_lines(result.failures), inline=False)
+    embed.set_footer(text="Format: set_id,nummer[,anzahl] - eine Karte pro Zeile")
+    return embed
+
+
+@TRACER.traced()
+async def create_bulk_offers(cog: Any, interaction: discord.Interaction, lines: Iterable[str]) -> List[int]:
+    """Legt die Angebote einer Liste an und sendet die Zusammenfassung (Interaktion ist bereits deferred)"""
+    result = await resolve_bulk_offers(cog.tcgdex_service, lines, interaction.user)
+    offer_ids = await cog.add_offers(result.offers, interaction) if result.offers else []
+    REGISTRY.counter("market_bulk_offers_total", "Über Massenangebote erstellte Angebote").inc(len(offer_ids))
+    with TRACER.span("followup.send"):
+        await interaction.followup.send(embed=build_bulk_summary(result, offer_ids))
+    return offer_ids
+
+
+async def resolve_collection_lines(service: Any, lines: Iterable[str],
+                                   concurrency: int = 8) -> Tuple[Dict[str, int], Dict[str, Any], List[BulkFailure]]:
+    """
+    Übersetzt Kartenzeilen in Bitsets pro Set
+
+    Returns:
+        Tuple von (set_id -> Bitset, set_id -> SetCards, Fehlschläge)
+    """
+    by_set: Dict[str, List[BulkLine]] = {}
+    failures: List[BulkFailure] = []
+    for parsed in parse_bulk_lines(lines):
+        if isinstance(parsed, BulkFailure):
+            failures.append(parsed)
+        else:
+            by_set.setdefault(parsed.set_id, []).append(parsed)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def set_cards(set_id: str) -> Any:
+        async with semaphore:
+            return await service.get_set_cards(set_id)
+
+    layouts = await asyncio.gather(*(set_cards(set_id) for set_id in by_set), return_exceptions=True)
+    bits_by_set: Dict[str, int] = {}
+    cards_by_set: Dict[str, Any] = {}
+    for (set_id, set_lines), cards in zip(by_set.items(), layouts):
+        if cards is None or isinstance(cards, BaseException):
+            failures.extend(BulkFailure(line.line_no, f"{set_id},{line.number}", "Unbekanntes Set") for line in set_lines)
+            continue
+        cards_by_set[set_id] = cards
+        bits = 0
+        for line in set_lines:
+            position = cards.position(line.number)
+            if position is None:
+                failures.append(BulkFailure(line.line_no, f"{set_id},{line.number}",
+                                            unknown_number_reason(cards, line.number)))
+            else:
+                bits |= 1 << position
+        bits_by_set[set_id] = bits
+    failures.sort()
+    return bits_by_set, cards_by_set, failures
+
+
+@TRACER.traced()
+async def import_collection(cog: Any, interaction: discord.Interaction, lines: Iterable[str]) -> Dict[str, int]:
+    """Übernimmt die Karten einer Liste in die Sammlung und sendet die Zusammenfassung (bereits deferred)"""
+    bits_by_set, cards_by_set, failures = await resolve_collection_lines(cog.tcgdex_service, lines)
+    cog.collection.add_many(interaction.user.id, bits_by_set)
+    imported = sum(bits.bit_count() for bits in bits_by_set.values())
+
+    embed = discord.Embed(
+        title="📚 Sammlung aktualisiert" if imported else "❌ Keine Karten übernommen",
+        description=f"**{imported}** Karten aus **{len(bits_by_set)}** Sets übernommen.",
+        color=0x2ecc71 if imported and not failures else 0xff9900 if imported else 0xff0000
+    )
+    progress = []
+    for set_id in sorted(bits_by_set):
+        owned, total = cog.collection.completion(interaction.user.id, cards_by_set[set_id])
+        progress.append(f"**{set_id}**: {owned}/{total} ({owned * 100 // max(total, 1)}%)")
+    if progress:
+        embed.add_field(name="📈 Vollständigkeit", value="\n".join(progress[:15]), inline=False)
+    if failures:
+        embed.add_field(name=f"⚠️ Nicht übernommen ({len(failures)})", value=_failure_lines(failures), inline=False)
+    embed.set_footer(text="Format: set_id,nummer pro Zeile - /sammlung zeigt den Stand")
+    with TRACER.span("followup.send"):
+        await interaction.followup.send(embed=embed)
+    return bits_by_set
+
+
+class TCGBulkModal(TimedModal):
+    """Modal zum Einfügen einer Kartenliste (Massenangebot oder Sammlungsimport)"""
+
+    def __init__(self, cog,
+                 submit: Optional[Callable[[Any, discord.Interaction, Iterable[str]], Awaitable[Any]]] = None,
+                 title: str = "TCG-Karten als Liste anbieten"):
+        super().__init__(title=title)
+        self.cog = cog
+        self.submit = submit or create_bulk_offers
+
+        self.cards_input = discord.ui.TextInput(
+            label="Karten (set_id,nummer[,anzahl] pro Zeile)",
+            placeholder="sv04.5,25\nswsh3,136,3\nbase1,4",
+            required=True,
+            max_length=4000,
+            style=discord.TextStyle.paragraph
+        )
+        self.add_item(self.cards_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        await interaction.response.defer(thinking=True)
+        await self.submit(self.cog, interaction, io.StringIO(self.cards_input.value))
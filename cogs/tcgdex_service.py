@@ -4,68 +4,699 @@ Service-Klasse für Interaktionen mit der TCGdex REST API
 """
 import aiohttp
 import asyncio
+import difflib
+import json
 import logging
-from typing import Optional, Dict, List, Any
+import os
+import random
+import re
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Any, Callable, Set, Tuple
+
+from .metrics import REGISTRY
+from .tracing import TRACER
+from .tcgdex_transport import RawResponse, Transport, accept_encoding_header, transport_from_env
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ist optional
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+
+def select_json_loads(fast: bool = True) -> Callable[[bytes], Any]:
+    """
+    Wählt den JSON-Decoder für API-Antworten
+    
+    Args:
+        fast: orjson verwenden, falls installiert
+    
+    Returns:
+        Funktion, die rohe Bytes in Python-Objekte dekodiert
+    """
+    if fast and orjson is not None:
+        return orjson.loads
+    return json.loads
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    if value.lower() == "none":
+        return None
+    return int(value)
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class TransportProfile:
+    """
+    Verbindungs-Einstellungen für die aiohttp Session
+    
+    Felder mit ``None`` übernehmen die aiohttp-Standardwerte.
+    """
+    limit: Optional[int] = 20
+    limit_per_host: Optional[int] = 10  # get_sets_by_year lädt in 10er-Chunks
+    ttl_dns_cache: Optional[int] = 300
+    keepalive_timeout: Optional[float] = 75.0
+    compression: bool = True
+    fast_json: bool = True
+    
+    @classmethod
+    def untuned(cls) -> "TransportProfile":
+        """Profil mit aiohttp-Standardverhalten (Vergleichsbasis für Benchmarks)"""
+        return cls(
+            limit=None,
+            limit_per_host=None,
+            ttl_dns_cache=None,
+            keepalive_timeout=None,
+            compression=False,
+            fast_json=False
+        )
+    
+    @classmethod
+    def from_env(cls) -> "TransportProfile":
+        """
+        Liest das Profil aus Umgebungsvariablen
+        
+        TCGDEX_POOL_LIMIT, TCGDEX_POOL_LIMIT_PER_HOST, TCGDEX_DNS_TTL,
+        TCGDEX_KEEPALIVE, TCGDEX_COMPRESSION, TCGDEX_FAST_JSON
+        """
+        default = cls()
+        keepalive = os.getenv("TCGDEX_KEEPALIVE")
+        return cls(
+            limit=_env_int("TCGDEX_POOL_LIMIT", default.limit),
+            limit_per_host=_env_int("TCGDEX_POOL_LIMIT_PER_HOST", default.limit_per_host),
+            ttl_dns_cache=_env_int("TCGDEX_DNS_TTL", default.ttl_dns_cache),
+            keepalive_timeout=float(keepalive) if keepalive else default.keepalive_timeout,
+            compression=_env_bool("TCGDEX_COMPRESSION", default.compression),
+            fast_json=_env_bool("TCGDEX_FAST_JSON", default.fast_json)
+        )
+    
+    def connector_kwargs(self) -> Dict[str, Any]:
+        """Argumente für aiohttp.TCPConnector (nur explizit gesetzte Werte)"""
+        kwargs: Dict[str, Any] = {}
+        if self.limit is not None:
+            kwargs["limit"] = self.limit
+        if self.limit_per_host is not None:
+            kwargs["limit_per_host"] = self.limit_per_host
+        if self.ttl_dns_cache is not None:
+            kwargs["ttl_dns_cache"] = self.ttl_dns_cache
+        if self.keepalive_timeout is not None:
+            kwargs["keepalive_timeout"] = self.keepalive_timeout
+        return kwargs
+
+
+class TransportStats:
+    """Zähler für Verbindungswiederverwendung und übertragene Bytes"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+        self.bytes_received = 0  # dekodierte Body-Bytes
+        self.bytes_on_wire = 0  # laut Content-Length (komprimiert, falls gzip/br)
+    
+    @property
+    def reuse_rate(self) -> float:
+        """Anteil der Requests, die eine bestehende Verbindung genutzt haben"""
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0.0
+    
+    def record_response(self, body_size: int, content_length: Optional[int]) -> None:
+        self.requests += 1
+        self.bytes_received += body_size
+        self.bytes_on_wire += content_length if content_length is not None else body_size
+    
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """TraceConfig, die neue und wiederverwendete Verbindungen zählt"""
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_connection_create_end(session, context, params):
+            self.connections_created += 1
+        
+        async def on_connection_reuseconn(session, context, params):
+            self.connections_reused += 1
+        
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "reuse_rate": round(self.reuse_rate, 4),
+            "bytes_received": self.bytes_received,
+            "bytes_on_wire": self.bytes_on_wire
+        }
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Wiederholungsstrategie für idempotente GET-Requests
+    
+    Exponentielles Backoff mit "full jitter": die Wartezeit vor Versuch n
+    ist zufällig zwischen 0 und min(max_delay, base_delay * 2**n).
+    """
+    attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 2.0
+    
+    RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+    
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Circuit Breaker für einen API-Endpunkt
+    
+    Nach ``failure_threshold`` aufeinanderfolgenden Fehlschlägen öffnet der
+    Breaker und lässt für ``reset_timeout`` Sekunden keine Requests durch.
+    Danach wird ein einzelner Probe-Request erlaubt (half-open).
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+    
+    def allow_request(self) -> bool:
+        """Prüft ob ein Request durchgelassen wird"""
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+    
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probe_in_flight = False
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Circuit Breaker geöffnet nach %d Fehlschlägen", self.failures)
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+
+class CacheEntry:
+    """Zwischengespeicherte API-Antwort"""
+    
+    __slots__ = ("data", "stored_at", "hits")
+    
+    def __init__(self, data: Any, stored_at: float, hits: int = 0):
+        self.data = data
+        self.stored_at = stored_at
+        self.hits = hits
+
+
+class ResponseCache:
+    """LRU-Speicher für die zuletzt erfolgreichen API-Antworten pro Endpunkt"""
+    
+    def __init__(self, max_entries: int = 4096, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, endpoint: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(endpoint)
+        if entry is not None:
+            self._entries.move_to_end(endpoint)
+        return entry
+    
+    def put(self, endpoint: str, data: Any) -> None:
+        previous = self._entries.get(endpoint)
+        # Zugriffszähler bleibt erhalten, damit heiße Keys heiß bleiben
+        self._entries[endpoint] = CacheEntry(data, self._clock(), previous.hits if previous else 0)
+        self._entries.move_to_end(endpoint)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def age(self, entry: CacheEntry) -> float:
+        return self._clock() - entry.stored_at
+
+
+class CacheStats:
+    """Trefferquoten des Response-Caches"""
+    
+    FAST_THRESHOLD = 0.001  # Sekunden
+    
+    def __init__(self):
+        self.requests = 0
+        self.hits = 0  # frische Treffer
+        self.revalidations = 0  # abgelaufen, sofort geliefert und im Hintergrund erneuert
+        self.misses = 0
+        self.fast_hits = 0  # aus dem Cache in unter 1 ms beantwortet
+        self.refreshes_started = 0
+        self.refreshes_deduplicated = 0
+    
+    def record_hit(self, elapsed: float, revalidating: bool) -> None:
+        self.requests += 1
+        if revalidating:
+            self.revalidations += 1
+        else:
+            self.hits += 1
+        if elapsed < self.FAST_THRESHOLD:
+            self.fast_hits += 1
+    
+    def record_miss(self) -> None:
+        self.requests += 1
+        self.misses += 1
+    
+    @property
+    def hit_rate(self) -> float:
+        return (self.hits + self.revalidations) / self.requests if self.requests else 0.0
+    
+    @property
+    def fast_fraction(self) -> float:
+        """Anteil aller Requests, die in unter 1 ms aus dem Cache kamen"""
+        return self.fast_hits / self.requests if self.requests else 0.0
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hits": self.hits,
+            "revalidations": self.revalidations,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "fast_fraction": round(self.fast_fraction, 4),
+            "refreshes_started": self.refreshes_started,
+            "refreshes_deduplicated": self.refreshes_deduplicated
+        }
+
+
+class TCGdexResponse:
+    """Ergebnis eines API-Aufrufs inklusive Herkunft"""
+    
+    __slots__ = ("data", "status", "stale", "age")
+    
+    def __init__(self, data: Any, status: Optional[int], stale: bool = False, age: float = 0.0):
+        self.data = data
+        self.status = status
+        self.stale = stale
+        self.age = age
+
+
+def route_key(endpoint: str) -> str:
+    """Normalisiert einen Endpunkt auf seine Route (z.B. /cards/sv4-1 -> /cards/{id})"""
+    parts = endpoint.strip("/").split("/")
+    if len(parts) >= 2:
+        return f"/{parts[0]}/{{id}}"
+    return f"/{parts[0]}"
+
+
+@dataclass
+class SetCatalog:
+    """Alle Set-Details mit Jahresindex und Artentabelle"""
+    sets: List[Dict[str, Any]]
+    # Erscheinungsjahr -> Sets, neueste zuerst
+    by_year: Dict[int, List[Dict[str, Any]]]
+    # Kartenname (kleingeschrieben) -> Karten-IDs über alle Sets
+    species: Dict[str, List[str]]
+    loaded_at: float
+    # False, wenn einzelne Set-Details nicht geladen werden konnten
+    complete: bool = True
+    # True, wenn die Set-Liste oder Set-Details aus dem Cache nach einem API-Fehler stammen
+    stale: bool = False
+
+
+def build_set_catalog(detailed_sets: List[Dict[str, Any]], loaded_at: float, complete: bool = True,
+                      stale: bool = False) -> SetCatalog:
+    """Baut Jahresindex und Artentabelle aus den Set-Details (/sets/{id})"""
+    by_year: Dict[int, List[Dict[str, Any]]] = {}
+    species: Dict[str, List[str]] = {}
+    for detailed_set in detailed_sets:
+        # Extrahiere Jahr aus releaseDate (Format: "yyyy-mm-dd")
+        year_part = str(detailed_set.get("releaseDate") or "").split("-")[0]
+        if year_part.isdigit():
+            by_year.setdefault(int(year_part), []).append(detailed_set)
+        else:
+            logger.debug("Set ohne gültiges releaseDate: %s", detailed_set.get("name", "Unbekannt"))
+        for card in detailed_set.get("cards") or []:
+            if isinstance(card, dict) and card.get("name") and card.get("id"):
+                species.setdefault(card["name"].lower(), []).append(card["id"])
+    for sets in by_year.values():
+        sets.sort(key=lambda x: x.get("releaseDate", ""), reverse=True)
+    return SetCatalog(detailed_sets, by_year, species, loaded_at, complete, stale)
+
+
+_LEADING_ZEROS = re.compile(r"^0+(?=\d)")
+
+
+def card_number_key(number: Any) -> str:
+    """Vergleichsschlüssel einer Kartennummer (ohne Groß-/Kleinschreibung, "007" gleich "7", "001a" gleich "1a")"""
+    return _LEADING_ZEROS.sub("", str(number).strip().casefold())
+
+
+@dataclass
+class SetCards:
+    """
+    Kartenliste eines Sets in Set-Reihenfolge
+    
+    Die Position einer Karte ist zugleich ihr Bit in Bitsets über das Set
+    (Sammlungen, angebotene Nummern): Bit i gehört zu ``numbers[i]``.
+    """
+    set_id: str
+    # localId wie von der API geliefert (z.B. "25", "TG01", "001a")
+    numbers: List[str]
+    names: List[str]
+    # card_number_key -> Position
+    positions: Dict[str, int]
+    
+    def __len__(self) -> int:
+        return len(self.numbers)
+    
+    @property
+    def mask(self) -> int:
+        """Bitset mit allen Karten des Sets"""
+        return (1 << len(self.numbers)) - 1
+    
+    def position(self, number: Any) -> Optional[int]:
+        return self.positions.get(card_number_key(number))
+    
+    def canonical(self, number: Any) -> Optional[str]:
+        """Kartennummer so, wie sie im Set steht (z.B. "tg01" -> "TG01"), None wenn unbekannt"""
+        position = self.positions.get(card_number_key(number))
+        return None if position is None else self.numbers[position]
+    
+    def suggestions(self, number: Any, limit: int = 5) -> List[str]:
+        """Ähnlichste Kartennummern des Sets für Tippfehler (z.B. "TG1" statt "TG01")"""
+        keys = difflib.get_close_matches(card_number_key(number), list(self.positions), n=limit, cutoff=0.5)
+        return [self.numbers[self.positions[key]] for key in keys]
+    
+    def bits(self, numbers: Any) -> Tuple[int, List[str]]:
+        """Bitset zu Kartennummern und die Nummern, die es im Set nicht gibt"""
+        bits = 0
+        unknown = []
+        for number in numbers:
+            position = self.positions.get(card_number_key(number))
+            if position is None:
+                unknown.append(number)
+            else:
+                bits |= 1 << position
+        return bits, unknown
+    
+    def numbers_of(self, bits: int) -> List[str]:
+        """Kartennummern der gesetzten Bits in Set-Reihenfolge"""
+        numbers = []
+        while bits:
+            lowest = bits & -bits
+            numbers.append(self.numbers[lowest.bit_length() - 1])
+            bits ^= lowest
+        return numbers
+
+
+def build_set_cards(set_data: Dict[str, Any]) -> SetCards:
+    """Baut die Kartenliste aus den Set-Details (/sets/{id})"""
+    numbers, names, positions = [], [], {}
+    for card in set_data.get("cards") or []:
+        if not isinstance(card, dict) or card.get("localId") in (None, ""):
+            continue
+        number = str(card["localId"])
+        positions.setdefault(card_number_key(number), len(numbers))
+        numbers.append(number)
+        names.append(card.get("name", ""))
+    return SetCards(str(set_data.get("id", "")), numbers, names, positions)
+
+
 class TCGdexService:
     """Service-Klasse für TCGdex API-Requests"""
     
     BASE_URL = "https://api.tcgdex.net/v2/de"
     ASSETS_BASE_URL = "https://assets.tcgdex.net/univ/"
     TIMEOUT = 10  # Sekunden
+    CARD_ACCESS_KEEP = 2000  # so viele Karten behält die Abrufstatistik mindestens
+    CATALOG_RETRY_INTERVAL = 60  # so lange gilt ein unvollständiger Set-Katalog als frisch
     
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
+    # Frische pro Route in Sekunden; Routen ohne Eintrag werden nur als
+    # Fallback bei API-Fehlern aus dem Cache bedient
+    CACHE_TTL = {
+        "/sets": 3600,
+        "/sets/{id}": 6 * 3600,
+        "/cards/{id}": 3600,  # Preise ändern sich
+    }
+    CACHE_MAX_STALE = 24 * 3600  # so lange nach Ablauf wird noch sofort geliefert
+    REFRESH_AHEAD_RATIO = 0.8  # heiße Keys ab 80% der TTL vorab erneuern
+    HOT_KEY_HITS = 3
     
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Lazy initialization des aiohttp Sessions"""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT)
-            )
-        return self.session
+    def __init__(self, transport_profile: Optional[TransportProfile] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 breaker_threshold: int = 5, breaker_reset_timeout: float = 30.0,
+                 cache_ttl: Optional[Dict[str, float]] = None,
+                 base_url: Optional[str] = None,
+                 transport: Optional[Transport] = None):
+        # Überschreibbar für lokale Ersatzserver (Tests, Benchmarks, Lasttests)
+        base_url = base_url or os.getenv("TCGDEX_BASE_URL")
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.transport_profile = transport_profile or TransportProfile.from_env()
+        self.transport_stats = TransportStats()
+        self.transport = transport or transport_from_env(self.transport_profile, self.transport_stats, self.TIMEOUT)
+        self._json_loads = select_json_loads(self.transport_profile.fast_json)
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.breaker_threshold = breaker_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.cache = ResponseCache()
+        self.cache_ttl = dict(self.CACHE_TTL if cache_ttl is None else cache_ttl)
+        self.cache_stats = CacheStats()
+        self.stale_served = 0
+        # Endpunkte, deren letzte Antwort aus dem Cache nach einem API-Fehler kam
+        self._stale_endpoints: Set[str] = set()
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+        self.catalog: Optional[SetCatalog] = None
+        self._catalog_lock = asyncio.Lock()
+        # Abrufe pro Karte, Grundlage für das Vorwärmen beliebter Karten (siehe tcgdex_warmup);
+        # begrenzt auf höchstens 2 * CARD_ACCESS_KEEP Karten (siehe _prune_card_access)
+        self.card_access: Counter = Counter()
+        # set_id -> (Set-Details, daraus gebaute Kartenliste); neu gebaut, wenn die Details wechseln
+        self._set_cards: Dict[str, Tuple[Dict[str, Any], SetCards]] = {}
     
     async def close(self):
-        """Schließt die aiohttp Session"""
-        if self.session and not self.session.closed:
-            await self.session.close()
+        """Schließt den Transport und bricht laufende Hintergrund-Refreshes ab"""
+        for task in list(self._refresh_tasks.values()):
+            task.cancel()
+        self._refresh_tasks.clear()
+        await self.transport.close()
     
-    async def _request(self, endpoint: str) -> Optional[Dict[str, Any]]:
+    def _breaker_for(self, endpoint: str) -> CircuitBreaker:
+        key = route_key(endpoint)
+        breaker = self.breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(self.breaker_threshold, self.breaker_reset_timeout)
+            self.breakers[key] = breaker
+        return breaker
+    
+    async def _get_once(self, endpoint: str, url: str) -> Tuple[int, Any, Optional[float]]:
         """
-        Führt einen GET-Request zur TCGdex API aus
+        Ein einzelner GET-Request ohne Wiederholung
+        
+        Returns:
+            Tuple von (HTTP-Status, dekodiertes JSON oder None, Retry-After in Sekunden)
+        """
+        response = await self.transport.get(endpoint, url)
+        if response.status == 200:
+            return response.status, self._json_loads(response.body), None
+        return response.status, None, response.retry_after
+    
+    async def _fetch(self, endpoint: str) -> TCGdexResponse:
+        """
+        Führt einen GET-Request mit Retry, Circuit Breaker und Stale-Fallback aus
+        
+        Netzwerkfehler, Timeouts, 429 und 5xx werden mit Backoff wiederholt.
+        Schlägt der Request endgültig fehl oder ist der Breaker offen, wird die
+        zuletzt erfolgreiche Antwort für diesen Endpunkt als ``stale`` geliefert.
         
         Args:
             endpoint: API-Endpunkt (z.B. "/sets" oder "/cards/base1-4")
         
         Returns:
-            JSON-Response als Dict oder None bei Fehler
+            TCGdexResponse (``data`` ist None bei Fehler ohne Cache-Eintrag)
         """
         url = f"{self.BASE_URL}{endpoint}"
+        breaker = self._breaker_for(endpoint)
         
-        try:
-            session = await self._get_session()
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data
-                elif response.status == 404:
-                    logger.warning("Resource not found: %s", url)
-                    return None
-                else:
-                    logger.error("API request failed: %s - Status %s", url, response.status)
-                    return None
-        except aiohttp.ClientError as e:
-            logger.error("Network error during API request to %s: %s", url, e)
-            return None
-        except asyncio.TimeoutError:
-            logger.error("Timeout during API request to %s", url)
-            return None
-        except Exception as e:  # pylint: disable=broad-except
-            logger.error("Unexpected error during API request to %s: %s", url, e)
-            return None
+        if not breaker.allow_request():
+            logger.warning("Circuit Breaker offen für %s - überspringe Request", route_key(endpoint))
+            return self._stale_or_none(endpoint, None)
+        
+        status: Optional[int] = None
+        attempts = max(1, self.retry_policy.attempts)
+        for attempt in range(attempts):
+            retry_after = None
+            started = time.perf_counter()
+            try:
+                with TRACER.span("TCGdexService._get_once", attempt=attempt + 1) as span:
+                    status, data, retry_after = await self._get_once(endpoint, url)
+                    span.set("status", status)
+            except aiohttp.ClientError as e:
+                status = None
+                logger.error("Network error during API request to %s: %s", url, e)
+            except asyncio.TimeoutError:
+                status = None
+                logger.error("Timeout during API request to %s", url)
+            except Exception as e:  # pylint: disable=broad-except
+                # z.B. ungültiges JSON - eine Wiederholung hilft hier nicht
+                logger.error("Unexpected error during API request to %s: %s", url, e)
+                self._observe_attempt(endpoint, started, "error")
+                breaker.record_failure()
+                return self._stale_or_none(endpoint, None)
+            self._observe_attempt(endpoint, started, status if status is not None else "error")
+            
+            if status == 200:
+                breaker.record_success()
+                self.cache.put(endpoint, data)
+                return TCGdexResponse(data, status)
+            if status == 404:
+                # Die API ist erreichbar, die Ressource existiert nur nicht
+                breaker.record_success()
+                logger.warning("Resource not found: %s", url)
+                return TCGdexResponse(None, status)
+            if status is not None and status not in self.retry_policy.RETRYABLE_STATUS:
+                breaker.record_success()
+                logger.error("API request failed: %s - Status %s", url, status)
+                return TCGdexResponse(None, status)
+            
+            if attempt + 1 < attempts:
+                delay = self.retry_policy.delay(attempt, retry_after)
+                logger.info("Wiederhole Request %s in %.2fs (Versuch %d/%d, Status %s)",
+                            url, delay, attempt + 2, attempts, status)
+                await asyncio.sleep(delay)
+        
+        logger.error("API request failed after %d attempts: %s - Status %s", attempts, url, status)
+        breaker.record_failure()
+        return self._stale_or_none(endpoint, status)
+    
+    def _observe_attempt(self, endpoint: str, started: float, status: Any) -> None:
+        """Erfasst Dauer und Ergebnis eines einzelnen API-Versuchs pro Route"""
+        route = route_key(endpoint)
+        REGISTRY.histogram(
+            "tcgdex_api_request_seconds", "Dauer einzelner TCGdex-API-Requests", route=route
+        ).observe(time.perf_counter() - started)
+        REGISTRY.counter(
+            "tcgdex_api_responses_total", "TCGdex-API-Antworten nach Status", route=route, status=status
+        ).inc()
+    
+    def _stale_or_none(self, endpoint: str, status: Optional[int]) -> TCGdexResponse:
+        """Liefert die letzte bekannte Antwort als stale oder eine leere Antwort"""
+        entry = self.cache.get(endpoint)
+        if entry is None:
+            return TCGdexResponse(None, status)
+        self.stale_served += 1
+        age = self.cache.age(entry)
+        logger.warning("Liefere zwischengespeicherte Daten für %s (Alter: %.0fs)", endpoint, age)
+        return TCGdexResponse(entry.data, status, stale=True, age=age)
+    
+    async def _request(self, endpoint: str) -> Any:
+        """JSON-Antwort von ``_request_response`` ohne Herkunft (None bei Fehler)"""
+        return (await self._request_response(endpoint)).data
+    
+    async def _request_response(self, endpoint: str) -> TCGdexResponse:
+        """
+        Führt einen GET-Request zur TCGdex API aus
+        
+        Frische Cache-Einträge werden direkt geliefert. Abgelaufene Einträge
+        (innerhalb von CACHE_MAX_STALE) ebenfalls, dabei wird genau ein
+        Hintergrund-Refresh pro Key gestartet (stale-while-revalidate).
+        
+        Args:
+            endpoint: API-Endpunkt (z.B. "/sets" oder "/cards/base1-4")
+        
+        Returns:
+            TCGdexResponse; ``stale`` ist True für Antworten aus dem Cache nach
+            einem API-Fehler (auch für Listen wie /sets), ``data`` None bei Fehler
+        """
+        started = time.perf_counter()
+        route = route_key(endpoint)
+        with TRACER.span("TCGdexService._request", route=route, endpoint=endpoint) as span:
+            ttl = self.cache_ttl.get(route)
+            if ttl is not None:
+                entry = self.cache.get(endpoint)
+                if entry is not None:
+                    entry.hits += 1
+                    age = self.cache.age(entry)
+                    if age < ttl:
+                        if entry.hits >= self.HOT_KEY_HITS and age >= ttl * self.REFRESH_AHEAD_RATIO:
+                            self._schedule_refresh(endpoint)
+                        self.cache_stats.record_hit(time.perf_counter() - started, revalidating=False)
+                        span.set("cache", "hit")
+                        self._stale_endpoints.discard(endpoint)
+                        return TCGdexResponse(entry.data, 200, age=age)
+                    if age < ttl + self.CACHE_MAX_STALE:
+                        self._schedule_refresh(endpoint)
+                        self.cache_stats.record_hit(time.perf_counter() - started, revalidating=True)
+                        span.set("cache", "revalidate")
+                        self._stale_endpoints.discard(endpoint)
+                        return TCGdexResponse(entry.data, 200, age=age)
+            
+            self.cache_stats.record_miss()
+            span.set("cache", "miss")
+            response = await self._fetch(endpoint)
+            span.set("status", response.status)
+            if response.stale:
+                span.set("stale", True)
+                self._stale_endpoints.add(endpoint)
+            else:
+                self._stale_endpoints.discard(endpoint)
+            return response
+    
+    def _schedule_refresh(self, endpoint: str) -> None:
+        """Startet einen Hintergrund-Refresh, höchstens einen pro Key gleichzeitig"""
+        if endpoint in self._refresh_tasks:
+            self.cache_stats.refreshes_deduplicated += 1
+            return
+        self.cache_stats.refreshes_started += 1
+        task = asyncio.create_task(self._fetch(endpoint))
+        self._refresh_tasks[endpoint] = task
+        task.add_done_callback(lambda _: self._refresh_tasks.pop(endpoint, None))
     
+    def served_stale(self, endpoint: str) -> bool:
+        """True, wenn die letzte Antwort für ``endpoint`` aus dem Cache nach einem API-Fehler kam"""
+        return endpoint in self._stale_endpoints
+    
+    def sets_stale(self) -> bool:
+        """True, wenn der Set-Katalog (und damit die Set-Auswahl) aus dem Cache nach API-Fehlern stammt"""
+        return self.catalog is not None and self.catalog.stale
+    
+    @REGISTRY.timed("tcgdex_call_seconds", "Dauer von TCGdexService-Aufrufen inkl. Cache", method="get_all_sets")
+    @TRACER.traced()
     async def get_all_sets(self) -> tuple[List[Dict[str, Any]], Optional[str]]:
         """
         Ruft alle Sets ab
@@ -84,31 +715,45 @@ class TCGdexService:
             logger.warning("Unerwartetes Datenformat von API: %s", type(data))
             return [], f"Unerwartetes Datenformat von API: {type(data).__name__}"
     
-    async def get_sets_by_year(self, year: int) -> tuple[List[Dict[str, Any]], Optional[str]]:
+    def _catalog_fresh(self) -> bool:
+        ttl = self.cache_ttl.get("/sets/{id}")
+        if self.catalog is None or ttl is None:
+            return False
+        if not self.catalog.complete or self.catalog.stale:
+            # Fehlende oder veraltete Sets nachladen, aber nicht bei jedem Aufruf (ein dauerhaft kaputtes Set)
+            ttl = min(ttl, self.CATALOG_RETRY_INTERVAL)
+        return time.monotonic() - self.catalog.loaded_at < ttl
+    
+    async def get_set_catalog(self) -> tuple[Optional[SetCatalog], Optional[str]]:
         """
-        Filtert Sets nach Erscheinungsjahr
+        Liefert den Set-Katalog (alle Set-Details mit Jahresindex und Artentabelle)
         
-        Der /sets Endpunkt gibt keine releaseDate zurück, daher müssen wir
-        für jedes Set den detaillierten Endpunkt /sets/{set_id} aufrufen.
-        
-        Args:
-            year: Das Jahr, nach dem gefiltert werden soll (z.B. 2023)
+        Der /sets Endpunkt gibt keine releaseDate zurück, daher wird für jedes
+        Set der detaillierte Endpunkt /sets/{set_id} aufgerufen. Das passiert
+        nur, wenn der Katalog fehlt oder älter als die TTL der Set-Details ist
+        (unvollständig: älter als CATALOG_RETRY_INTERVAL), und für gleichzeitige
+        Aufrufer nur einmal.
         
         Returns:
-            Tuple von (Liste von Sets aus dem angegebenen Jahr, Error-Message falls vorhanden)
+            Tuple von (Katalog oder None, Error-Message falls vorhanden)
         """
+        if self._catalog_fresh():
+            return self.catalog, None
+        async with self._catalog_lock:
+            if self._catalog_fresh():
+                return self.catalog, None
+            return await self._load_set_catalog()
+    
+    async def _load_set_catalog(self) -> tuple[Optional[SetCatalog], Optional[str]]:
         all_sets, error = await self.get_all_sets()
         
         if error:
-            return [], error
+            return None, error
         
         if len(all_sets) == 0:
-            return [], "Es wurden keine Sets von der API zurückgegeben"
-        
-        logger.info("Gefundene Sets gesamt: %d, Filtere nach Jahr: %d", len(all_sets), year)
+            return None, "Es wurden keine Sets von der API zurückgegeben"
         
-        # Rufe für jedes Set die detaillierten Informationen ab
-        # (da /sets keine releaseDate enthält, brauchen wir /sets/{id})
+        logger.info("Lade Set-Katalog: %d Sets", len(all_sets))
         
         async def fetch_set_details(set_brief: Dict[str, Any]) -> Optional[Dict[str, Any]]:
             """Holt detaillierte Set-Informationen mit releaseDate"""
@@ -120,67 +765,57 @@ class TCGdexService:
             return detailed_set
         
         # Rufe Set-Details parallel ab (max 10 gleichzeitig für Performance)
-        filtered_sets = []
-        available_years = set()
-        
-        # Teile Sets in Chunks für Batch-Processing
+        detailed = []
+        complete = True
         chunk_size = 10
         for i in range(0, len(all_sets), chunk_size):
             chunk = all_sets[i:i + chunk_size]
             
-            # Rufe Set-Details parallel ab
             tasks = [fetch_set_details(set_brief) for set_brief in chunk]
             detailed_sets = await asyncio.gather(*tasks, return_exceptions=True)
             
             for detailed_set in detailed_sets:
-                # Skip Fehler oder None
-                if detailed_set is None or isinstance(detailed_set, Exception):
-                    continue
-                
-                # Debug: Log Set-Struktur für erste 3 Sets, um zu sehen was die API zurückgibt
-                if len(filtered_sets) < 3 and isinstance(detailed_set, dict):
-                    set_id_debug = detailed_set.get("id", "unknown")
-                    logger.debug("Set-Daten für %s: keys=%s", 
-                               set_id_debug, 
-                               list(detailed_set.keys()))
-                    logger.debug("  - symbol: %s", detailed_set.get("symbol", "NOT_FOUND"))
-                    logger.debug("  - logo: %s", detailed_set.get("logo", "NOT_FOUND"))
-                
-                release_date = detailed_set.get("releaseDate", "")
-                
-                if not release_date:
-                    continue
-                
-                # Extrahiere Jahr aus releaseDate (Format: "yyyy-mm-dd")
-                try:
-                    release_date_str = str(release_date)
-                    year_part = release_date_str.split("-")[0]
-                    
-                    # Sammle verfügbare Jahre für Fehlermeldung
-                    if year_part.isdigit():
-                        available_years.add(year_part)
-                    
-                    # Prüfe ob das extrahierte Jahr mit dem gesuchten Jahr übereinstimmt
-                    if year_part.isdigit() and int(year_part) == year:
-                        filtered_sets.append(detailed_set)
-                        logger.debug("Set gefunden: %s (Release: %s)", detailed_set.get("name", "Unbekannt"), release_date)
-                except (AttributeError, IndexError, ValueError) as e:
-                    logger.debug("Set übersprungen (ungültiges releaseDate): %s - %s", detailed_set.get("name", "Unbekannt"), e)
+                # Fehler oder None: Katalog gilt als unvollständig und wird beim nächsten Aufruf ergänzt
+                if not isinstance(detailed_set, dict):
+                    complete = False
                     continue
+                detailed.append(detailed_set)
+        
+        stale = self.served_stale("/sets") or any(self.served_stale(f"/sets/{s.get('id')}") for s in detailed)
+        self.catalog = build_set_catalog(detailed, time.monotonic(), complete, stale)
+        logger.info("Set-Katalog geladen: %d Sets, %d Jahre, %d Kartennamen%s%s",
+                    len(detailed), len(self.catalog.by_year), len(self.catalog.species),
+                    "" if complete else " (unvollständig)", " (aus dem Cache)" if stale else "")
+        return self.catalog, None
+    
+    @REGISTRY.timed("tcgdex_call_seconds", "Dauer von TCGdexService-Aufrufen inkl. Cache", method="get_sets_by_year")
+    @TRACER.traced()
+    async def get_sets_by_year(self, year: int) -> tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Filtert Sets nach Erscheinungsjahr (über den Jahresindex des Set-Katalogs)
+        
+        Args:
+            year: Das Jahr, nach dem gefiltert werden soll (z.B. 2023)
+        
+        Returns:
+            Tuple von (Liste von Sets aus dem angegebenen Jahr, Error-Message falls vorhanden)
+        """
+        catalog, error = await self.get_set_catalog()
+        
+        if error:
+            return [], error
+        
+        filtered_sets = catalog.by_year.get(year, [])
         
         if len(filtered_sets) == 0:
-            years_str = ", ".join(sorted(available_years)) if available_years else "keine Daten verfügbar"
+            years_str = ", ".join(str(y) for y in sorted(catalog.by_year)) if catalog.by_year else "keine Daten verfügbar"
             return [], f"Keine Sets für das Jahr **{year}** gefunden. Verfügbare Jahre (Beispiele): {years_str}"
         
-        # Sortiere nach Release-Datum (neueste zuerst)
-        filtered_sets.sort(
-            key=lambda x: x.get("releaseDate", ""),
-            reverse=True
-        )
-        
         logger.info("Gefilterte Sets für Jahr %d: %d", year, len(filtered_sets))
-        return filtered_sets, None
+        return list(filtered_sets), None
     
+    @REGISTRY.timed("tcgdex_call_seconds", "Dauer von TCGdexService-Aufrufen inkl. Cache", method="get_set")
+    @TRACER.traced()
     async def get_set(self, set_id: str) -> Optional[Dict[str, Any]]:
         """
         Ruft Details eines spezifischen Sets ab
@@ -209,6 +844,27 @@ class TCGdexService:
         
         return set_data
     
+    async def get_set_cards(self, set_id: str) -> Optional[SetCards]:
+        """
+        Kartenliste eines Sets aus dem geladenen Katalog, sonst aus den
+        (zwischengespeicherten) Set-Details; None, wenn das Set unbekannt ist
+        """
+        set_data = None
+        if self.catalog is not None:
+            set_data = next((s for s in self.catalog.sets if s.get("id") == set_id), None)
+        if set_data is None:
+            set_data = await self.get_set(set_id)
+        if not isinstance(set_data, dict):
+            return None
+        cached = self._set_cards.get(set_id)
+        if cached is not None and cached[0] is set_data:
+            return cached[1]
+        cards = build_set_cards(set_data)
+        self._set_cards[set_id] = (set_data, cards)
+        return cards
+    
+    @REGISTRY.timed("tcgdex_call_seconds", "Dauer von TCGdexService-Aufrufen inkl. Cache", method="get_card")
+    @TRACER.traced()
     async def get_card(self, set_id: str, card_number: str) -> Optional[Dict[str, Any]]:
         """
         Ruft Details einer spezifischen Karte ab
@@ -220,15 +876,34 @@ class TCGdexService:
         Returns:
             Karten-Daten oder None wenn nicht gefunden
         """
+        return (await self.get_card_response(set_id, card_number)).data
+    
+    async def get_card_response(self, set_id: str, card_number: str) -> TCGdexResponse:
+        """Wie ``get_card``, mit Herkunft (``stale`` nach API-Fehler)"""
         card_id = f"{set_id}-{card_number}"
-        return await self._request(f"/cards/{card_id}")
+        self.card_access[card_id] += 1
+        if len(self.card_access) > 2 * self.CARD_ACCESS_KEEP:
+            self._prune_card_access()
+        return await self._request_response(f"/cards/{card_id}")
+    
+    def _prune_card_access(self) -> None:
+        """
+        Behält die CARD_ACCESS_KEEP meistabgerufenen Karten und halbiert ihre Zähler
+        
+        Durch das Halbieren verdrängen neu beliebte Karten alte Spitzenreiter,
+        statt gegen deren über die ganze Laufzeit gesammelte Zähler anzulaufen.
+        """
+        kept = {card_id: count // 2 for card_id, count in self.card_access.most_common(self.CARD_ACCESS_KEEP)}
+        self.card_access.clear()
+        self.card_access.update({card_id: count for card_id, count in kept.items() if count > 0})
     
-    def extract_card_info(self, card_data: Dict[str, Any]) -> Dict[str, Any]:
+    def extract_card_info(self, card_data: Dict[str, Any], stale: bool = False) -> Dict[str, Any]:
         """
         Extrahiert relevante Informationen aus den Karten-Daten
         
         Args:
             card_data: Die rohen Karten-Daten von der API
+            stale: Ob die Daten aus dem Cache nach einem API-Fehler stammen (TCGdexResponse.stale)
         
         Returns:
             Dict mit extrahierten Informationen:
@@ -240,6 +915,7 @@ class TCGdexService:
             - card_number: Kartennummer
             - image: URL zum Kartenbild
             - cardmarket_price: Cardmarket Durchschnittspreis
+            - stale: True falls die Daten aus dem Cache nach API-Fehler stammen
         """
         if not card_data:
             return {}
@@ -340,7 +1016,8 @@ class TCGdexService:
             "set_symbol": set_symbol,
             "card_number": str(card_number),
             "image": image_url,
-            "cardmarket_price": cardmarket_price
+            "cardmarket_price": cardmarket_price,
+            "stale": stale
         }
     
     def construct_symbol_url(self, set_id: str, serie_id: str, image_format: str = "webp") -> str:
@@ -0,0 +1,368 @@
+"""
+Transporte für TCGdexService
+Live-HTTP, In-Memory-Cache, Aufzeichnen und Abspielen von API-Antworten
+
+Der Service spricht nur über ``Transport.get(endpoint, url)``; Retry,
+Circuit Breaker und Antwort-Cache bleiben im Service. Aufgezeichnete
+Antworten landen in einem einzelnen Archiv mit Offset-Index am Dateiende.
+Der Index hat feste Eintragsgröße und ist nach Key-Hash sortiert, so dass
+beim Öffnen nur der Trailer gelesen wird; Lookups sind eine Binärsuche
+in der gemappten Datei und Bodies werden erst bei Bedarf entpackt.
+
+Archivformat (Big Endian):
+    Header:   b"TCGA" + Version (1 Byte)
+    Records:  status (h, 0 = Transportfehler), flags (B, Bit 0 = zlib),
+              retry_after (f, NaN = keiner), elapsed (f), key_len (H),
+              body_len (I), key (UTF-8), body
+    Index:    pro Eintrag key_hash (8s), offset (Q); stabil nach Hash sortiert
+    Trailer:  index_offset (Q), entry_count (I), b"TCGA"
+"""
+import abc
+import asyncio
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+import aiohttp
+
+try:
+    import brotli  # noqa: F401 - aiohttp dekodiert "br" nur mit installiertem brotli
+    _BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        _BROTLI_AVAILABLE = True
+    except ImportError:
+        _BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_MAGIC = b"TCGA"
+ARCHIVE_VERSION = 1
+_RECORD = struct.Struct(">hBffHI")
+_INDEX_ENTRY = struct.Struct(">8sQ")
+_TRAILER = struct.Struct(">QI4s")
+_FLAG_ZLIB = 0x01
+_COMPRESS_MIN_BYTES = 256
+
+
+def _key_hash(key: bytes) -> bytes:
+    return hashlib.blake2b(key, digest_size=8).digest()
+
+
+def accept_encoding_header() -> str:
+    """Accept-Encoding passend zu den installierten Dekomprimierern"""
+    return "gzip, deflate, br" if _BROTLI_AVAILABLE else "gzip, deflate"
+
+
+class RawResponse:
+    """Unverarbeitete Antwort eines Transports"""
+
+    __slots__ = ("status", "body", "retry_after")
+
+    def __init__(self, status: int, body: Optional[bytes] = None, retry_after: Optional[float] = None):
+        self.status = status
+        self.body = body
+        self.retry_after = retry_after
+
+
+class Transport(abc.ABC):
+    """Basisklasse: liefert für einen Endpunkt eine RawResponse"""
+
+    @abc.abstractmethod
+    async def get(self, endpoint: str, url: str) -> RawResponse:
+        """Antwort für ``endpoint`` (Schlüssel für Cache und Archiv) unter ``url``"""
+
+    async def close(self) -> None:
+        pass
+
+
+class LiveTransport(Transport):
+    """HTTP über eine gemeinsam genutzte aiohttp-Session"""
+
+    def __init__(self, profile, stats, timeout: float = 10):
+        self.profile = profile
+        self.stats = stats
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Erstellt die Session gemäß Transport-Profil"""
+        profile = self.profile
+        # Ohne Angabe schickt aiohttp selbst "gzip, deflate"; ohne Kompression also ausdrücklich "identity"
+        headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": accept_encoding_header() if profile.compression else "identity"
+        }
+
+        connector_kwargs = profile.connector_kwargs()
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(**connector_kwargs) if connector_kwargs else None,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=headers,
+            trace_configs=[self.stats.trace_config()]
+        )
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Lazy initialization der aiohttp Session"""
+        if self.session is None or self.session.closed:
+            self.session = self._create_session()
+        return self.session
+
+    async def get(self, endpoint: str, url: str) -> RawResponse:
+        session = await self._get_session()
+        async with session.get(url) as response:
+            if response.status == 200:
+                body = await response.read()
+                self.stats.record_response(len(body), response.content_length)
+                return RawResponse(200, body)
+            retry_after = response.headers.get("Retry-After")
+            try:
+                retry_after_seconds = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after_seconds = None
+            return RawResponse(response.status, None, retry_after_seconds)
+
+    async def close(self) -> None:
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+
+class CachedTransport(Transport):
+    """Merkt sich erfolgreiche Antworten ohne Ablauf (für Tests und Benchmarks)"""
+
+    def __init__(self, inner: Transport):
+        self.inner = inner
+        self._bodies: Dict[str, bytes] = {}
+
+    async def get(self, endpoint: str, url: str) -> RawResponse:
+        body = self._bodies.get(endpoint)
+        if body is not None:
+            return RawResponse(200, body)
+        response = await self.inner.get(endpoint, url)
+        if response.status == 200 and response.body is not None:
+            self._bodies[endpoint] = response.body
+        return response
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class ArchiveWriter:
+    """Schreibt Antworten fortlaufend in ein Archiv; der Index folgt beim Schließen"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION]))
+        self._index: List[Tuple[bytes, int]] = []
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def append(self, key: str, status: int, body: Optional[bytes] = None,
+               retry_after: Optional[float] = None, elapsed: float = 0.0) -> None:
+        body = body or b""
+        key_bytes = key.encode("utf-8")
+        flags = 0
+        if len(body) >= _COMPRESS_MIN_BYTES:
+            compressed = zlib.compress(body, 6)
+            if len(compressed) < len(body):
+                body, flags = compressed, _FLAG_ZLIB
+        offset = self._file.tell()
+        self._file.write(_RECORD.pack(
+            status, flags, math.nan if retry_after is None else retry_after, elapsed,
+            len(key_bytes), len(body)
+        ))
+        self._file.write(key_bytes)
+        self._file.write(body)
+        self._index.append((_key_hash(key_bytes), offset))
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        # sort() ist stabil: gleiche Keys bleiben in Aufnahme-Reihenfolge
+        self._index.sort(key=lambda entry: entry[0])
+        self._file.write(b"".join(_INDEX_ENTRY.pack(key_hash, offset) for key_hash, offset in self._index))
+        self._file.write(_TRAILER.pack(index_offset, len(self._index), ARCHIVE_MAGIC))
+        self._file.close()
+
+
+class _HashColumn:
+    """Sequenz-Sicht auf die Hash-Spalte des Index (für bisect)"""
+
+    __slots__ = ("_map", "_offset", "_count")
+
+    def __init__(self, archive_map: mmap.mmap, offset: int, count: int):
+        self._map = archive_map
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> bytes:
+        start = self._offset + position * _INDEX_ENTRY.size
+        return self._map[start:start + 8]
+
+
+class ArchiveReader:
+    """
+    Liest ein Archiv über mmap
+
+    Beim Öffnen wird nur der Trailer gelesen. Mehrere Antworten für denselben
+    Key werden in Aufnahme-Reihenfolge geliefert, danach wiederholt sich die
+    letzte.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} ist kein TCGdex-Archiv")
+        index_offset, count, magic = _TRAILER.unpack_from(self._map, len(self._map) - _TRAILER.size)
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{path} ist unvollständig (Archiv wurde nicht geschlossen)")
+        self._index_offset = index_offset
+        self._count = count
+        self._hashes = _HashColumn(self._map, index_offset, count)
+        self._offsets: Dict[str, List[int]] = {}
+        self._cursor: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return bool(self._lookup(key))
+
+    def _lookup(self, key: str) -> List[int]:
+        """Record-Offsets für ``key`` (Binärsuche, Ergebnis wird gemerkt)"""
+        offsets = self._offsets.get(key)
+        if offsets is not None:
+            return offsets
+        key_bytes = key.encode("utf-8")
+        key_hash = _key_hash(key_bytes)
+        offsets = []
+        position = bisect_left(self._hashes, key_hash)
+        while position < self._count and self._hashes[position] == key_hash:
+            _, offset = _INDEX_ENTRY.unpack_from(self._map, self._index_offset + position * _INDEX_ENTRY.size)
+            key_len = _RECORD.unpack_from(self._map, offset)[4]
+            start = offset + _RECORD.size
+            if self._map[start:start + key_len] == key_bytes:  # Hash-Kollisionen ausschließen
+                offsets.append(offset)
+            position += 1
+        self._offsets[key] = offsets
+        return offsets
+
+    def read(self, key: str) -> Optional[tuple]:
+        """
+        Nächste Antwort für ``key``
+
+        Returns:
+            Tuple von (status, body, retry_after, elapsed) oder None
+        """
+        offsets = self._lookup(key)
+        if not offsets:
+            return None
+        position = self._cursor.get(key, 0)
+        self._cursor[key] = min(position + 1, len(offsets) - 1)
+
+        offset = offsets[position]
+        status, flags, retry_after, elapsed, key_len, body_len = _RECORD.unpack_from(self._map, offset)
+        start = offset + _RECORD.size + key_len
+        body = self._map[start:start + body_len]
+        if flags & _FLAG_ZLIB:
+            body = zlib.decompress(body)
+        return status, body, None if math.isnan(retry_after) else retry_after, elapsed
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+
+class RecordingTransport(Transport):
+    """Leitet an einen inneren Transport weiter und zeichnet jede Antwort auf"""
+
+    def __init__(self, inner: Transport, path: str):
+        self.inner = inner
+        self.writer = ArchiveWriter(path)
+
+    async def get(self, endpoint: str, url: str) -> RawResponse:
+        started = time.perf_counter()
+        try:
+            response = await self.inner.get(endpoint, url)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.writer.append(endpoint, 0, elapsed=time.perf_counter() - started)
+            raise
+        self.writer.append(endpoint, response.status, response.body, response.retry_after,
+                           time.perf_counter() - started)
+        return response
+
+    async def close(self) -> None:
+        self.writer.close()
+        logger.info("📼 %d TCGdex-Antworten aufgezeichnet: %s", len(self.writer), self.writer.path)
+        await self.inner.close()
+
+
+class ReplayTransport(Transport):
+    """
+    Spielt ein Archiv deterministisch ab
+
+    Args:
+        path: Archiv aus RecordingTransport
+        realtime: Aufgezeichnete Latenz nachbilden statt sofort zu antworten
+        missing_status: Status für Endpunkte, die nicht im Archiv sind
+    """
+
+    def __init__(self, path: str, realtime: bool = False, missing_status: int = 404):
+        self.path = path
+        self.realtime = realtime
+        self.missing_status = missing_status
+        self._reader: Optional[ArchiveReader] = None
+
+    @property
+    def reader(self) -> ArchiveReader:
+        if self._reader is None:
+            self._reader = ArchiveReader(self.path)
+        return self._reader
+
+    async def get(self, endpoint: str, url: str) -> RawResponse:
+        entry = self.reader.read(endpoint)
+        if entry is None:
+            return RawResponse(self.missing_status)
+        status, body, retry_after, elapsed = entry
+        if self.realtime and elapsed:
+            await asyncio.sleep(elapsed)
+        if status == 0:
+            raise aiohttp.ClientConnectionError(f"Aufgezeichneter Transportfehler für {endpoint}")
+        return RawResponse(status, body if status == 200 else None, retry_after)
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+
+def transport_from_env(profile, stats, timeout: float) -> Transport:
+    """
+    Wählt den Transport über Umgebungsvariablen:
+    TCGDEX_REPLAY=<archiv> spielt ab, TCGDEX_RECORD=<archiv> zeichnet den
+    Live-Verkehr auf, sonst Live-HTTP.
+    """
+    replay_path = os.getenv("TCGDEX_REPLAY")
+    if replay_path:
+        return ReplayTransport(replay_path)
+    live = LiveTransport(profile, stats, timeout)
+    record_path = os.getenv("TCGDEX_RECORD")
+    if record_path:
+        return RecordingTransport(live, record_path)
+    return live
@@ -0,0 +1,181 @@
+"""
+Vorwärmen der TCGdex-Daten nach dem Start
+
+Läuft aus setup_hook im Hintergrund (der Gateway-Login wartet nicht darauf)
+und lädt den Set-Katalog samt Jahresindex und Artentabelle sowie die zuletzt
+beliebtesten Karten in den Cache. Welche Karten beliebt sind, wird über die
+Abrufe pro Karte (TCGdexService.card_access) zwischen Neustarts in einer
+JSON-Datei gehalten.
+
+Befehle, die warme Daten brauchen, warten mit ``wait_ready`` höchstens eine
+begrenzte Zeit, statt parallel einen eigenen kalten Abruf zu starten.
+
+Konfiguration über Umgebungsvariablen:
+    TCGDEX_WARMUP=0            Vorwärmen abschalten
+    TCGDEX_ACCESS_STATS=<pfad> Abrufstatistik (Standard: .tcgdex_access.json)
+    TCGDEX_WARMUP_CARDS=50     Anzahl vorgewärmter Karten
+    TCGDEX_WARMUP_WAIT=5       maximale Wartezeit von Befehlen in Sekunden
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+from .metrics import REGISTRY
+from .tcgdex_service import TCGdexService, _env_bool, _env_int
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+WARMING = "warming"
+READY = "ready"
+DEGRADED = "degraded"  # fertig, aber der Set-Katalog konnte nicht geladen werden
+DISABLED = "disabled"
+
+
+def load_card_access(path: str) -> Counter:
+    """Liest die gespeicherten Abrufe pro Karte; fehlende oder kaputte Dateien ergeben eine leere Statistik"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return Counter()
+    except (OSError, ValueError) as e:
+        logger.warning("Abrufstatistik %s unlesbar, starte ohne: %s", path, e)
+        return Counter()
+    if not isinstance(data, dict):
+        return Counter()
+    return Counter({card_id: count for card_id, count in data.items() if isinstance(count, int) and count > 0})
+
+
+def save_card_access(path: str, card_access: Counter, keep: int = 1000) -> None:
+    """Speichert die ``keep`` meistabgerufenen Karten (atomar)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(dict(card_access.most_common(keep)), f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class TCGdexWarmup:
+    """Vorwärmen von Set-Katalog und beliebten Karten mit Bereitschaftsstatus"""
+
+    def __init__(self, service: TCGdexService, stats_path: Optional[str] = None,
+                 popular_cards: int = 50, wait_timeout: float = 5.0, enabled: bool = True):
+        self.service = service
+        self.stats_path = stats_path
+        self.popular_cards = popular_cards
+        self.wait_timeout = wait_timeout
+        self.state = PENDING if enabled else DISABLED
+        # Ergebnis pro Schritt, z.B. {"catalog": "ok", "popular_cards": "48/50"}
+        self.steps: Dict[str, str] = {}
+        self.duration: Optional[float] = None
+        self._done = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        REGISTRY.gauge("tcgdex_warmup_ready", "1, sobald das Vorwärmen abgeschlossen ist",
+                       function=lambda: 1.0 if self.state in (READY, DEGRADED) else 0.0)
+
+    @property
+    def warming(self) -> bool:
+        return self.state == WARMING
+
+    def start(self) -> Optional[asyncio.Task]:
+        """Startet das Vorwärmen im Hintergrund (höchstens einmal)"""
+        if self.state != PENDING:
+            return self._task
+        self.state = WARMING
+        self._task = asyncio.create_task(self._run())
+        return self._task
+
+    async def _run(self) -> None:
+        started = time.perf_counter()
+        try:
+            if self.stats_path:
+                self.service.card_access.update(load_card_access(self.stats_path))
+
+            catalog, error = await self.service.get_set_catalog()
+            if error:
+                logger.warning("Set-Katalog beim Vorwärmen nicht geladen: %s", error)
+                self.steps["catalog"] = "failed"
+            else:
+                self.steps["catalog"] = f"{len(catalog.sets)} Sets"
+                self.steps["year_index"] = f"{len(catalog.by_year)} Jahre"
+                self.steps["species"] = f"{len(catalog.species)} Namen"
+
+            await self._warm_popular_cards()
+            self.state = READY if catalog is not None else DEGRADED
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Vorwärmen fehlgeschlagen: %s", e)
+            self.state = DEGRADED
+        finally:
+            self.duration = time.perf_counter() - started
+            REGISTRY.gauge("tcgdex_warmup_seconds", "Dauer des Vorwärmens nach dem Start").set(self.duration)
+            self._done.set()
+        logger.info("🔥 TCGdex vorgewärmt in %.1fs (%s): %s", self.duration, self.state, self.steps)
+
+    async def _warm_popular_cards(self) -> None:
+        popular = [card_id for card_id, _ in self.service.card_access.most_common(self.popular_cards)]
+        if not popular:
+            return
+        semaphore = asyncio.Semaphore(10)
+
+        async def warm(card_id: str) -> bool:
+            set_id, _, card_number = card_id.rpartition("-")
+            async with semaphore:
+                # Vorwärmen zählt nicht als Abruf
+                card = await self.service.get_card(set_id, card_number)
+                self.service.card_access[card_id] -= 1
+            return card is not None
+
+        loaded = await asyncio.gather(*(warm(card_id) for card_id in popular), return_exceptions=True)
+        self.steps["popular_cards"] = f"{sum(1 for ok in loaded if ok is True)}/{len(popular)}"
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wartet höchstens ``timeout`` Sekunden (Standard: wait_timeout) auf das Ende des Vorwärmens
+
+        Returns:
+            False, wenn das Vorwärmen danach noch läuft, sonst True (auch wenn es
+            abgeschaltet ist oder nie gestartet wurde)
+        """
+        if self.state != WARMING:
+            return True
+        try:
+            await asyncio.wait_for(self._done.wait(), self.wait_timeout if timeout is None else timeout)
+        except asyncio.TimeoutError:
+            REGISTRY.counter("tcgdex_warmup_wait_timeouts_total", "Befehle, die vergeblich auf das Vorwärmen warteten").inc()
+            return False
+        return True
+
+    def save_stats(self) -> None:
+        """Schreibt die Abrufstatistik, sofern ein Pfad gesetzt ist und Abrufe vorliegen"""
+        if not self.stats_path or not +self.service.card_access:
+            return
+        try:
+            save_card_access(self.stats_path, +self.service.card_access)
+        except OSError as e:
+            logger.warning("Abrufstatistik %s nicht gespeichert: %s", self.stats_path, e)
+
+    async def close(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self.save_stats()
+
+
+def warmup_from_env(service: TCGdexService) -> TCGdexWarmup:
+    """Erstellt das Vorwärmen aus den Umgebungsvariablen (siehe Moduldocstring)"""
+    return TCGdexWarmup(
+        service,
+        stats_path=os.getenv("TCGDEX_ACCESS_STATS", ".tcgdex_access.json") or None,
+        popular_cards=_env_int("TCGDEX_WARMUP_CARDS", 50),
+        wait_timeout=float(os.getenv("TCGDEX_WARMUP_WAIT", "5")),
+        enabled=_env_bool("TCGDEX_WARMUP", True)
+    )
@@ -0,0 +1,250 @@
+"""
+Tracing
+Leichtgewichtige Spans für Interaktions-Flows mit lokalem Export
+
+Ein Trace fasst alle Schritte eines Flows zusammen (z.B. /anbieten-tcg vom
+Slash-Command über Jahr-Modal und Set-Auswahl bis zur Bestätigung). Views
+und Modals merken sich beim Erstellen den aktiven Span, damit spätere
+Interaktionen im selben Trace als Kinder des auslösenden Schritts landen.
+
+Die Sampling-Entscheidung wird deterministisch aus der Trace-ID abgeleitet,
+so dass alle Interaktionen eines Flows gemeinsam aufgezeichnet oder
+verworfen werden.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import secrets
+import time
+import zlib
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_SAMPLING_RESOLUTION = 10_000
+
+
+class Span:
+    """Ein gemessener Abschnitt innerhalb eines Traces"""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start", "duration",
+                 "attributes", "error", "sampled", "_started")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool):
+        self.name = name
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.span_id = secrets.token_hex(4) if sampled else ""
+        self.start = time.time()
+        self.duration: Optional[float] = None
+        self.attributes: Dict[str, Any] = {}
+        self.error: Optional[str] = None
+        self._started = time.perf_counter()
+
+    def set(self, key: str, value: Any) -> None:
+        """Setzt ein Attribut (ohne Wirkung bei nicht gesampelten Spans)"""
+        if self.sampled:
+            self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration * 1000, 3) if self.duration is not None else None,
+            "attributes": self.attributes,
+            "error": self.error
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("tradebot_current_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Der im aktuellen Kontext aktive Span (oder None)"""
+    return _current_span.get()
+
+
+class RingBufferExporter:
+    """Hält die letzten ``capacity`` Spans im Speicher"""
+
+    def __init__(self, capacity: int = 2000):
+        self.spans: Deque[Dict[str, Any]] = deque(maxlen=capacity)
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span.to_dict())
+
+    def trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Alle gepufferten Spans eines Traces, nach Startzeit sortiert"""
+        return sorted((s for s in self.spans if s["trace_id"] == trace_id), key=lambda s: s["start"])
+
+    def recent_roots(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Die zuletzt beendeten Wurzel-Spans (ein Eintrag pro Interaktion)"""
+        roots = [s for s in self.spans if s["parent_id"] is None]
+        return roots[-limit:][::-1]
+
+    def dump(self) -> str:
+        """Alle gepufferten Spans als JSONL"""
+        return "".join(json.dumps(s, ensure_ascii=False) + "\n" for s in self.spans)
+
+
+class JsonlFileExporter:
+    """Schreibt Spans als JSONL in eine rotierende Datei"""
+
+    def __init__(self, path: str, max_bytes: int = 5_000_000, backups: int = 3):
+        self._handler = logging.handlers.RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+
+    def export(self, span: Span) -> None:
+        record = logging.LogRecord(
+            "tracing", logging.INFO, __file__, 0,
+            json.dumps(span.to_dict(), ensure_ascii=False), None, None
+        )
+        self._handler.handle(record)
+
+    def close(self) -> None:
+        self._handler.close()
+
+
+class _SpanScope:
+    """Kontextmanager für Tracer.span (nutzbar in sync und async Code)"""
+
+    __slots__ = ("tracer", "name", "trace_id", "parent_id", "attributes", "span", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: Optional[Any],
+                 parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.span = self.tracer._new_span(self.name, self.trace_id, self.parent_id, self.attributes)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self.token)
+        self.tracer.end(self.span, exc)
+
+
+class Tracer:
+    """Erzeugt Spans und reicht gesampelte Spans an die Exporter weiter"""
+
+    def __init__(self, sample_rate: float = 1.0, buffer_size: int = 2000,
+                 file_exporter: Optional[JsonlFileExporter] = None):
+        self.sample_rate = sample_rate
+        self.buffer = RingBufferExporter(buffer_size)
+        self.exporters: List[Any] = [self.buffer]
+        if file_exporter is not None:
+            self.exporters.append(file_exporter)
+
+    @classmethod
+    def from_env(cls) -> "Tracer":
+        """
+        Konfiguration über Umgebungsvariablen:
+        TRACE_SAMPLE_RATE (0.0-1.0), TRACE_BUFFER_SIZE, TRACE_FILE,
+        TRACE_FILE_MAX_BYTES, TRACE_FILE_BACKUPS
+        """
+        file_exporter = None
+        path = os.getenv("TRACE_FILE", "")
+        if path:
+            file_exporter = JsonlFileExporter(
+                path,
+                max_bytes=int(os.getenv("TRACE_FILE_MAX_BYTES", "5000000")),
+                backups=int(os.getenv("TRACE_FILE_BACKUPS", "3"))
+            )
+        return cls(
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "0.1")),
+            buffer_size=int(os.getenv("TRACE_BUFFER_SIZE", "2000")),
+            file_exporter=file_exporter
+        )
+
+    def is_sampled(self, trace_id: str) -> bool:
+        """Deterministische Sampling-Entscheidung pro Trace-ID"""
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+        bucket = zlib.crc32(trace_id.encode()) % _SAMPLING_RESOLUTION
+        return bucket < self.sample_rate * _SAMPLING_RESOLUTION
+
+    def _new_span(self, name: str, trace_id: Optional[Any], parent_id: Optional[str],
+                  attributes: Dict[str, Any]) -> Span:
+        parent = _current_span.get()
+        if trace_id is None:
+            trace_id = parent.trace_id if parent is not None else secrets.token_hex(8)
+        else:
+            trace_id = str(trace_id)
+        if parent is not None and parent.trace_id == trace_id:
+            sampled = parent.sampled
+            if parent_id is None:
+                parent_id = parent.span_id
+        else:
+            sampled = self.is_sampled(trace_id)
+        span = Span(name, trace_id, parent_id or None, sampled)
+        if sampled and attributes:
+            span.attributes.update(attributes)
+        return span
+
+    def span(self, name: str, trace_id: Optional[Any] = None,
+             parent_id: Optional[str] = None, **attributes: Any) -> _SpanScope:
+        """
+        Kontextmanager für einen Span
+
+        Ohne ``trace_id`` wird der Trace des aktiven Spans fortgesetzt, sonst
+        ein neuer begonnen.
+        """
+        return _SpanScope(self, name, trace_id, parent_id, attributes)
+
+    def begin(self, name: str, trace_id: Optional[Any] = None, **attributes: Any) -> Span:
+        """
+        Startet einen Span und aktiviert ihn für den restlichen Task
+
+        Für Hooks, bei denen Start und Ende in getrennten Callbacks liegen
+        (z.B. before_invoke/after_invoke). Beenden mit ``end``.
+        """
+        span = self._new_span(name, trace_id, None, attributes)
+        _current_span.set(span)
+        return span
+
+    def end(self, span: Span, error: Optional[BaseException] = None) -> None:
+        span.duration = time.perf_counter() - span._started
+        if not span.sampled:
+            return
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:  # pylint: disable=broad-except
+                logger.debug("Span-Export fehlgeschlagen: %s", e)
+
+    def traced(self, name: Optional[str] = None) -> Callable:
+        """Decorator, der eine Coroutine-Funktion in einen Span hüllt"""
+
+        def decorator(func: Callable) -> Callable:
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(span_name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+# Prozessweiter Tracer
+TRACER = Tracer.from_env()
@@ -0,0 +1,272 @@
+"""
+Tauschbuch: angenommene Tausche und Reputation pro Nutzer
+
+Jeder angenommene Tausch wird als Zeile an die Tabelle ``trades`` angehängt
+(nie geändert). In derselben Transaktion werden die Aggregate pro Nutzer in
+``reputation`` fortgeschrieben (Anzahl Tausche, verschiedene Partner, letzter
+Tausch) - O(1) pro Eintrag, ohne die Historie erneut zu lesen.
+
+Die Aggregate liegen zusätzlich im Speicher, damit Angebots-Embeds die
+Reputation ohne eigene Abfrage anzeigen können. Mehrere Prozesse können sich
+eine Datei teilen (z.B. MARKET_DB bei MARKET_BACKEND=sqlite): ``refresh()``
+erkennt neue Zeilen über ``PRAGMA data_version`` und liest nur die
+Aggregate der betroffenen Nutzer nach.
+
+Kompaktierung löscht Zeilen, die älter als die Aufbewahrungsfrist sind; die
+Aggregate bleiben davon unberührt.
+
+Konfiguration über Umgebungsvariablen:
+    TRADE_LEDGER=<pfad>               Datei (Standard: MARKET_DB bei MARKET_BACKEND=sqlite, sonst trades.db)
+    TRADE_LEDGER_RETENTION_DAYS=365   Aufbewahrung der Einzelzeilen
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id INTEGER,
+    kind TEXT NOT NULL,
+    source_id INTEGER,
+    owner_id INTEGER NOT NULL,
+    partner_id INTEGER NOT NULL,
+    given TEXT NOT NULL,
+    received TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_created_at ON trades (created_at);
+CREATE TABLE IF NOT EXISTS trade_partners (
+    user_id INTEGER NOT NULL,
+    partner_id INTEGER NOT NULL,
+    PRIMARY KEY (user_id, partner_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS reputation (
+    user_id INTEGER PRIMARY KEY,
+    trades INTEGER NOT NULL,
+    partners INTEGER NOT NULL,
+    last_trade_at REAL NOT NULL
+)
+"""
+
+COMPACT_INTERVAL = 24 * 3600
+
+
+@dataclass
+class Reputation:
+    """Aggregate eines Nutzers aus dem Tauschbuch"""
+    trades: int = 0
+    partners: int = 0
+    last_trade_at: Optional[float] = None
+
+    def badge(self) -> str:
+        """Kurzform für Embeds"""
+        if not self.trades:
+            return "🆕 noch keine Tausche"
+        return f"🤝 {self.trades} Tausch{'e' if self.trades != 1 else ''} mit {self.partners} Partner{'n' if self.partners != 1 else ''}"
+
+
+class TradeLedger:
+    """Append-only Tauschbuch in SQLite mit Reputation pro Nutzer"""
+
+    def __init__(self, path: str, retention_days: float = 365, poll_interval: float = 5.0,
+                 busy_timeout: float = 5.0):
+        self.path = path
+        self.retention = retention_days * 86400
+        self.poll_interval = poll_interval
+        self.busy_timeout = busy_timeout
+        self.db: Optional[sqlite3.Connection] = None
+        self._reputation: Dict[int, Reputation] = {}
+        self._last_id = 0
+        self._data_version = 0
+        self._compacted_at = 0.0
+        self._poll_task: Optional[asyncio.Task] = None
+
+    # ---------- Lebenszyklus ----------
+
+    def open(self) -> None:
+        """Öffnet die Datei, legt das Schema an und lädt die Aggregate"""
+        if self.db is not None:
+            return
+        self.db = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        with self.transaction() as db:
+            for statement in _SCHEMA.split(";"):
+                if statement.strip():
+                    db.execute(statement)
+            self._last_id = db.execute("SELECT COALESCE(MAX(id), 0) FROM trades").fetchone()[0]
+            self._reputation = {
+                user_id: Reputation(trades, partners, last_trade_at)
+                for user_id, trades, partners, last_trade_at in db.execute("SELECT * FROM reputation")
+            }
+        self._data_version = self._read_data_version()
+
+    async def start(self) -> None:
+        """Öffnet das Tauschbuch, kompaktiert und gleicht im Hintergrund mit anderen Prozessen ab"""
+        self.open()
+        self.compact()
+        if self.poll_interval and self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                self.refresh()
+                if time.time() - self._compacted_at >= COMPACT_INTERVAL:
+                    self.compact()
+            except sqlite3.Error as e:
+                logger.warning("Abgleich des Tauschbuchs %s fehlgeschlagen: %s", self.path, e)
+
+    async def close(self) -> None:
+        if self._poll_task:
+            self._poll_task.cancel()
+            try:
+                await self._poll_task
+            except asyncio.CancelledError:
+                pass
+            self._poll_task = None
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Schreibtransaktion mit sofortiger Sperre (wartet bis busy_timeout)"""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    # ---------- Schreiben ----------
+
+    def record(self, kind: str, guild_id: Optional[int], owner_id: int, partner_id: int,
+               given: str, received: str, source_id: Optional[int] = None) -> Optional[int]:
+        """
+        Hängt einen angenommenen Tausch an und schreibt die Reputation beider Seiten fort
+
+        Args:
+            kind: "offer" (Gegenangebot auf Angebot), "wish" (Gegenangebot auf Wunsch)
+                oder "wish_offer" (Tauschangebot eines Wunsches angenommen)
+            owner_id: Nutzer, dessen Angebot/Wunsch angenommen wurde
+            partner_id: Nutzer auf der anderen Seite
+            given, received: Pokemon aus Sicht des Owners
+
+        Returns:
+            ID des Eintrags oder None, wenn das Tauschbuch nicht geöffnet ist
+        """
+        if self.db is None:
+            logger.warning("Tauschbuch nicht geöffnet, Tausch %s %s <-> %s nicht erfasst", kind, owner_id, partner_id)
+            return None
+        now = time.time()
+        try:
+            trade_id = self._append(kind, guild_id, owner_id, partner_id, given, received, source_id, now)
+        except sqlite3.Error as e:
+            logger.error("Tausch %s %s <-> %s nicht erfasst: %s", kind, owner_id, partner_id, e)
+            return None
+        REGISTRY.counter("market_trades_total", "Angenommene Tausche", kind=kind).inc()
+        # Übernimmt den eigenen Eintrag und ggf. dazwischen geschriebene anderer Prozesse
+        self.refresh(force=True)
+        return trade_id
+
+    def _append(self, kind: str, guild_id: Optional[int], owner_id: int, partner_id: int,
+                given: str, received: str, source_id: Optional[int], now: float) -> int:
+        with self.transaction() as db:
+            trade_id = db.execute(
+                "INSERT INTO trades (guild_id, kind, source_id, owner_id, partner_id, given, received, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (guild_id, kind, source_id, owner_id, partner_id, given, received, now)
+            ).lastrowid
+            for user_id, other_id in ((owner_id, partner_id), (partner_id, owner_id)):
+                new_partner = db.execute(
+                    "INSERT OR IGNORE INTO trade_partners (user_id, partner_id) VALUES (?, ?)", (user_id, other_id)
+                ).rowcount
+                db.execute(
+                    "INSERT INTO reputation (user_id, trades, partners, last_trade_at) VALUES (?, 1, ?, ?) "
+                    "ON CONFLICT (user_id) DO UPDATE SET trades = trades + 1, "
+                    "partners = partners + excluded.partners, last_trade_at = excluded.last_trade_at",
+                    (user_id, new_partner, now)
+                )
+        return trade_id
+
+    # ---------- Lesen ----------
+
+    def reputation(self, user_id: int) -> Reputation:
+        """Reputation aus dem Speicher (ohne Datenbankabfrage)"""
+        return self._reputation.get(user_id) or Reputation()
+
+    def _read_data_version(self) -> int:
+        return self.db.execute("PRAGMA data_version").fetchone()[0]
+
+    def refresh(self, force: bool = False) -> List[int]:
+        """Liest die Aggregate der Nutzer neuer Einträge nach und gibt deren IDs zurück"""
+        if self.db is None:
+            return []
+        version = self._read_data_version()
+        if version == self._data_version and not force:
+            return []
+        self._data_version = version
+        rows = self.db.execute(
+            "SELECT id, owner_id, partner_id FROM trades WHERE id > ? ORDER BY id", (self._last_id,)
+        ).fetchall()
+        if not rows:
+            return []
+        self._last_id = rows[-1][0]
+        users = sorted({user_id for _, owner_id, partner_id in rows for user_id in (owner_id, partner_id)})
+        placeholders = ",".join("?" * len(users))
+        for user_id, trades, partners, last_trade_at in self.db.execute(
+                f"SELECT * FROM reputation WHERE user_id IN ({placeholders})", users):
+            self._reputation[user_id] = Reputation(trades, partners, last_trade_at)
+        return users
+
+    def history(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """Letzte Tausche eines Nutzers (neueste zuerst)"""
+        if self.db is None:
+            return []
+        rows = self.db.execute(
+            "SELECT id, guild_id, kind, owner_id, partner_id, given, received, created_at FROM trades "
+            "WHERE owner_id = ? OR partner_id = ? ORDER BY id DESC LIMIT ?",
+            (user_id, user_id, limit)
+        ).fetchall()
+        keys = ("id", "guild_id", "kind", "owner_id", "partner_id", "given", "received", "created_at")
+        return [dict(zip(keys, row)) for row in rows]
+
+    # ---------- Kompaktierung ----------
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Löscht Einzelzeilen außerhalb der Aufbewahrungsfrist; die Aggregate bleiben erhalten"""
+        if self.db is None:
+            return 0
+        now = time.time() if now is None else now
+        with self.transaction() as db:
+            deleted = db.execute("DELETE FROM trades WHERE created_at < ?", (now - self.retention,)).rowcount
+        if deleted:
+            # Platz aus dem WAL in die Datenbank übernehmen
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            logger.info("Tauschbuch kompaktiert: %d alte Einträge entfernt", deleted)
+        self._compacted_at = now
+        return deleted
+
+
+def trade_ledger_from_env() -> TradeLedger:
+    """Erstellt das Tauschbuch aus den Umgebungsvariablen (siehe Moduldocstring)"""
+    default = "trades.db"
+    if os.getenv("MARKET_BACKEND", "memory").strip().lower() == "sqlite":
+        default = os.getenv("MARKET_DB", "market.db")
+    return TradeLedger(
+        os.getenv("TRADE_LEDGER", default),
+        retention_days=float(os.getenv("TRADE_LEDGER_RETENTION_DAYS", "365"))
+    )
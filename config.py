@@ -1,4 +1,5 @@
 import os
+from typing import List, Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -27,9 +28,75 @@ class Config:
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     
+    # Metriken (Prometheus-Endpunkt, standardmäßig aus). Bei mehreren Bot-Prozessen
+    # (Sharding) braucht jeder Prozess seinen eigenen METRICS_PORT, z.B. 9108, 9109, ...
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    
+    # Lean-Gateway: keine Presences, kein Member-Cache (siehe cogs/gateway.py)
+    LEAN_GATEWAY = os.getenv('LEAN_GATEWAY', 'false').strip().lower() in ('1', 'true', 'yes')
+    
+    # Slash-Command-Sync: zuletzt synchronisierte Hashes; FORCE_COMMAND_SYNC=1 erzwingt einen Sync
+    COMMAND_SYNC_STATE = os.getenv('COMMAND_SYNC_STATE', '.command_sync.json')
+    FORCE_COMMAND_SYNC = os.getenv('FORCE_COMMAND_SYNC', 'false').strip().lower() in ('1', 'true', 'yes')
+    
+    # Sharding: SHARD_COUNT=auto (Anzahl von Discord) oder feste Anzahl, leer = ohne Sharding.
+    # SHARD_IDS beschränkt diesen Prozess auf einzelne Shards, z.B. "0-3" oder "4,5,6,7".
+    SHARD_COUNT = os.getenv('SHARD_COUNT', '').strip().lower()
+    SHARD_IDS = os.getenv('SHARD_IDS', '').strip()
+    
+    @classmethod
+    def sharded(cls) -> bool:
+        return bool(cls.SHARD_COUNT or cls.SHARD_IDS)
+    
+    @classmethod
+    def shard_count(cls) -> Optional[int]:
+        """Feste Shard-Anzahl oder None (automatisch bzw. ohne Sharding)"""
+        if cls.SHARD_COUNT in ('', 'auto'):
+            return None
+        if not cls.SHARD_COUNT.isdigit() or int(cls.SHARD_COUNT) < 1:
+            raise ValueError(f"SHARD_COUNT must be 'auto' or a positive number, not {cls.SHARD_COUNT!r}!")
+        return int(cls.SHARD_COUNT)
+    
+    @classmethod
+    def shard_ids(cls) -> Optional[List[int]]:
+        return parse_shard_ids(cls.SHARD_IDS)
+    
+    @classmethod
+    def validate_sharding(cls):
+        """Prüft SHARD_COUNT/SHARD_IDS; läuft schon beim Erstellen des Bots (vor validate)"""
+        if not cls.sharded():
+            return True
+        count = cls.shard_count()
+        ids = cls.shard_ids()
+        if ids is not None and count is None:
+            raise ValueError("SHARD_IDS requires a fixed SHARD_COUNT!")
+        if ids is not None and any(shard_id >= count for shard_id in ids):
+            raise ValueError(f"SHARD_IDS must be smaller than SHARD_COUNT ({count})!")
+        return True
+    
     @classmethod
     def validate(cls):
         """Validate required configuration"""
         if not cls.DISCORD_TOKEN:
             raise ValueError("DISCORD_TOKEN is required!")
-        return True
+        return cls.validate_sharding()
+
+
+def parse_shard_ids(value: str) -> Optional[List[int]]:
+    """Liest Shard-IDs wie "0-3,8,10-11"; leer bedeutet alle Shards (None)"""
+    if not value:
+        return None
+    shard_ids = set()
+    for part in value.split(','):
+        part = part.strip()
+        if '-' in part:
+            start, end = (x.strip() for x in part.split('-', 1))
+            if not start.isdigit() or not end.isdigit() or int(end) < int(start):
+                raise ValueError(f"Invalid shard range: {part}")
+            shard_ids.update(range(int(start), int(end) + 1))
+        elif part:
+            if not part.isdigit():
+                raise ValueError(f"Invalid shard ID: {part}")
+            shard_ids.add(int(part))
+    return sorted(shard_ids)
@@ -0,0 +1,278 @@
+"""
+Ersatzobjekte für Discord (Member, Guild, Channel, Interaction, Context)
+
+Damit lässt sich die Logik des Pokemon-Cogs ohne Discord-Verbindung ausführen,
+z.B. in Tests und im Lastgenerator (benchmarks/load.py). Alle Antworten werden
+aufgezeichnet statt gesendet; optional wird jeder API-Aufruf um eine feste
+Latenz verzögert, um die Round-Trips zu Discord nachzubilden. Dazu kommen
+Anhänge und Markteinträge, wie sie mehrere Tests brauchen.
+"""
+import asyncio
+import itertools
+from collections import deque
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Any, Deque, Dict, List, Optional
+
+import discord
+
+# Fortlaufende IDs im Snowflake-Bereich, damit sie wie echte IDs aussehen
+_snowflakes = itertools.count(1_100_000_000_000_000_000)
+
+
+def next_snowflake() -> int:
+    return next(_snowflakes)
+
+
+async def _api_delay(latency: float) -> None:
+    if latency > 0:
+        await asyncio.sleep(latency)
+
+
+class FakeMessage:
+    """Gesendete Nachricht mit Inhalt, Embed und View"""
+
+    def __init__(self, channel: Optional["FakeChannel"] = None, content: Optional[str] = None,
+                 embed: Optional[discord.Embed] = None, view: Optional[discord.ui.View] = None,
+                 latency: float = 0.0):
+        self.id = next_snowflake()
+        self.channel = channel
+        self.content = content
+        self.embed = embed
+        self.view = view
+        self.deleted = False
+        self.latency = latency
+
+    async def edit(self, *, content: Optional[str] = None, embed: Optional[discord.Embed] = None,
+                   view: Optional[discord.ui.View] = None, **kwargs) -> "FakeMessage":
+        await _api_delay(self.latency)
+        self.content = content if content is not None else self.content
+        self.embed = embed if embed is not None else self.embed
+        self.view = view
+        return self
+
+    async def delete(self) -> None:
+        await _api_delay(self.latency)
+        self.deleted = True
+
+
+class FakeMember:
+    """Server-Mitglied; Direktnachrichten landen in ``inbox``"""
+
+    def __init__(self, name: str, user_id: Optional[int] = None, latency: float = 0.0,
+                 inbox_size: int = 100, dms_closed: bool = False):
+        self.id = user_id or next_snowflake()
+        self.name = name
+        self.display_name = name
+        self.global_name = name
+        self.mention = f"<@{self.id}>"
+        self.bot = False
+        self.status = discord.Status.online
+        self.display_avatar = SimpleNamespace(url=f"https://cdn.example/avatars/{self.id}.png")
+        self.inbox: Deque[FakeMessage] = deque(maxlen=inbox_size)
+        self.dms_closed = dms_closed
+        self.latency = latency
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   view: Optional[discord.ui.View] = None, **kwargs) -> FakeMessage:
+        await _api_delay(self.latency)
+        if self.dms_closed:
+            raise discord.Forbidden(SimpleNamespace(status=403, reason="Forbidden"), "DMs geschlossen")
+        message = FakeMessage(None, content, embed, view, self.latency)
+        self.inbox.append(message)
+        return message
+
+    def __repr__(self) -> str:
+        return f"<FakeMember {self.name} id={self.id}>"
+
+
+class FakeAttachment:
+    """Hochgeladene Datei; ``read`` liefert den kodierten Text"""
+
+    def __init__(self, text: str, encoding: str = "utf-8"):
+        self.data = text.encode(encoding)
+        self.size = len(self.data)
+
+    async def read(self) -> bytes:
+        return self.data
+
+
+def pokemon_offer(guild_id: Optional[int], name: str = "Pikachu", **fields: Any) -> Dict[str, Any]:
+    """Markteintrag für ein Pokemon von "Rocko"; ``fields`` ergänzen oder überschreiben Felder"""
+    return {'name': name, 'hp': 60, 'type': "Elektro", 'phase': "Basis", 'rarity': "Häufig",
+            'user': FakeMember("Rocko"), 'guild_id': guild_id, **fields}
+
+
+def tcg_offer(number: str, guild_id: Optional[int] = 1, set_id: str = "sv1",
+              user: Optional[FakeMember] = None) -> Dict[str, Any]:
+    """Markteintrag für eine TCG-Karte mit Set-ID und Kartennummer"""
+    return {'name': f"Karte {number}", 'guild_id': guild_id, 'is_tcg': True, 'user': user,
+            'tcg_set_id': set_id, 'tcg_card_number': number}
+
+
+class FakeGuild:
+    """Server mit Mitgliedern"""
+
+    def __init__(self, name: str, guild_id: Optional[int] = None):
+        self.id = guild_id or next_snowflake()
+        self.name = name
+        self._members: Dict[int, FakeMember] = {}
+        self.chunk_requests = 0
+        self.approximate_presence_count: Optional[int] = None
+
+    @property
+    def members(self) -> List[FakeMember]:
+        return list(self._members.values())
+
+    @property
+    def member_count(self) -> int:
+        return len(self._members)
+
+    def add_member(self, member: FakeMember) -> None:
+        self._members[member.id] = member
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+    async def chunk(self, *, cache: bool = True) -> List[FakeMember]:
+        """Mitgliederliste wie per Gateway-Chunking"""
+        self.chunk_requests += 1
+        return self.members
+
+
+class FakeChannel:
+    """Textkanal; gesendete Nachrichten werden begrenzt aufbewahrt"""
+
+    def __init__(self, guild: FakeGuild, name: str = "tausch", latency: float = 0.0, history: int = 100):
+        self.id = next_snowflake()
+        self.name = name
+        self.guild = guild
+        self.mention = f"<#{self.id}>"
+        self.messages: Deque[FakeMessage] = deque(maxlen=history)
+        self.latency = latency
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   view: Optional[discord.ui.View] = None, **kwargs) -> FakeMessage:
+        await _api_delay(self.latency)
+        message = FakeMessage(self, content, embed, view, self.latency)
+        self.messages.append(message)
+        return message
+
+
+class FakeClient:
+    """Bot-Ersatz, über den Views ihr Cog finden (``interaction.client.get_cog``)"""
+
+    def __init__(self):
+        self.cogs: Dict[str, Any] = {}
+        self.guilds: Dict[int, FakeGuild] = {}
+        self.user = FakeMember("Tradebot", latency=0.0)
+        self.user.bot = True
+
+    def add_cog(self, cog: Any) -> None:
+        self.cogs[type(cog).__name__] = cog
+
+    def get_cog(self, name: str) -> Optional[Any]:
+        return self.cogs.get(name)
+
+    async def fetch_guild(self, guild_id: int, *, with_counts: bool = True) -> FakeGuild:
+        return self.guilds[guild_id]
+
+
+class FakeInteractionResponse:
+    """Antwortseite einer Interaktion; erlaubt wie Discord genau eine Antwort"""
+
+    def __init__(self, interaction: "FakeInteraction", latency: float = 0.0):
+        self._interaction = interaction
+        self._done = False
+        self.latency = latency
+        self.kind: Optional[str] = None
+        self.content: Optional[str] = None
+        self.embed: Optional[discord.Embed] = None
+        self.view: Optional[discord.ui.View] = None
+        self.modal: Optional[discord.ui.Modal] = None
+        self.ephemeral = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, kind: str) -> None:
+        if self._done:
+            raise discord.InteractionResponded(self._interaction)
+        self._done = True
+        self.kind = kind
+        await _api_delay(self.latency)
+
+    async def send_message(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                           view: Optional[discord.ui.View] = None, ephemeral: bool = False, **kwargs) -> None:
+        await self._respond("send_message")
+        self.content, self.embed, self.view, self.ephemeral = content, embed, view, ephemeral
+
+    async def edit_message(self, *, content: Optional[str] = None, embed: Optional[discord.Embed] = None,
+                           view: Optional[discord.ui.View] = None, **kwargs) -> None:
+        await self._respond("edit_message")
+        self.content, self.embed, self.view = content, embed, view
+
+    async def send_modal(self, modal: discord.ui.Modal) -> None:
+        await self._respond("send_modal")
+        self.modal = modal
+
+    async def defer(self, *, ephemeral: bool = False, thinking: bool = False) -> None:
+        await self._respond("defer")
+        self.ephemeral = ephemeral
+
+
+class FakeFollowup:
+    """Webhook für Folgenachrichten einer Interaktion"""
+
+    def __init__(self, latency: float = 0.0):
+        self.messages: List[FakeMessage] = []
+        self.latency = latency
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   view: Optional[discord.ui.View] = None, ephemeral: bool = False, **kwargs) -> FakeMessage:
+        await _api_delay(self.latency)
+        message = FakeMessage(None, content, embed, view, self.latency)
+        self.messages.append(message)
+        return message
+
+
+class FakeInteraction:
+    """Interaktion eines Mitglieds in einem Kanal (Slash-Befehl, Button, Select, Modal)"""
+
+    def __init__(self, client: FakeClient, user: FakeMember, channel: Optional[FakeChannel] = None,
+                 values: Optional[List[str]] = None, latency: float = 0.0):
+        self.id = next_snowflake()
+        self.client = client
+        self.user = user
+        self.channel = channel
+        self.guild = channel.guild if channel else None
+        self.guild_id = self.guild.id if self.guild else None
+        self.channel_id = channel.id if channel else None
+        self.created_at = datetime.now(timezone.utc)
+        self.data: Dict[str, Any] = {"values": values or []}
+        self.extras: Dict[str, Any] = {}
+        self.message: Optional[FakeMessage] = None
+        self.response = FakeInteractionResponse(self, latency)
+        self.followup = FakeFollowup(latency)
+
+    async def original_response(self) -> FakeMessage:
+        return FakeMessage(self.channel, self.response.content, self.response.embed, self.response.view)
+
+
+class FakeContext:
+    """Kontext eines Präfix-Befehls (``!angebote`` usw.)"""
+
+    def __init__(self, client: FakeClient, author: FakeMember, channel: FakeChannel, content: str = ""):
+        self.bot = client
+        self.author = author
+        self.channel = channel
+        self.guild = channel.guild
+        self.message = FakeMessage(channel, content, latency=channel.latency)
+        self.message.author = author
+        self.sent: List[FakeMessage] = []
+
+    async def send(self, content: Optional[str] = None, *, embed: Optional[discord.Embed] = None,
+                   view: Optional[discord.ui.View] = None, **kwargs) -> FakeMessage:
+        message = await self.channel.send(content, embed=embed, view=view)
+        self.sent.append(message)
+        return message
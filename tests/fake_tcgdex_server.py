@@ -0,0 +1,339 @@
+"""
+Lokaler TCGdex-Ersatzserver für Tests, Benchmarks und Lasttests
+
+Liefert /v2/{lang}/sets, /sets/{id} und /cards/{id} aus einem
+deterministisch erzeugten Korpus, der die Struktur der echten API-Antworten
+nachbildet. Über ``FaultInjection`` lassen sich Latenzverteilungen, 404,
+5xx, 429 (mit Retry-After) und hängende Requests einstellen; ``script``
+erzwingt feste Status-Folgen pro Route.
+
+Standalone (z.B. für den Bot mit TCGDEX_BASE_URL):
+    python -m tests.fake_tcgdex_server --port 8765 --latency lognormal:0.08:0.6 --server-error-rate 0.05
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from aiohttp import web
+
+LatencyDistribution = Callable[[random.Random], float]
+
+SERIES = [
+    ("base", "Base", 1999),
+    ("ex", "EX", 2003),
+    ("dp", "Diamant & Perl", 2007),
+    ("bw", "Schwarz & Weiß", 2011),
+    ("xy", "XY", 2014),
+    ("sm", "Sonne & Mond", 2017),
+    ("swsh", "Schwert & Schild", 2020),
+    ("sv", "Karmesin & Purpur", 2023),
+]
+TYPES = ["Feuer", "Wasser", "Pflanze", "Elektro", "Psycho", "Kampf", "Unlicht", "Metall", "Drache", "Farblos"]
+NAMES = ["Pikachu", "Glurak", "Turtok", "Bisaflor", "Mewtu", "Relaxo", "Lucario", "Knakrack", "Rayquaza", "Evoli"]
+RARITIES = ["Häufig", "Nicht so häufig", "Selten", "Doppelselten", "Illustrationskarte"]
+
+
+def build_corpus(sets_per_serie: int = 12, cards_per_set: int = 60,
+                 seed: int = 1) -> Dict[str, Any]:
+    """
+    Erzeugt Set- und Kartendaten im Format der TCGdex API
+
+    Returns:
+        Dict mit ``sets`` (Kurzliste wie /sets), ``set_details`` (id -> /sets/{id})
+        und ``cards`` (id -> /cards/{id})
+    """
+    rng = random.Random(seed)
+    sets: List[Dict[str, Any]] = []
+    set_details: Dict[str, Dict[str, Any]] = {}
+    cards: Dict[str, Dict[str, Any]] = {}
+
+    for serie_id, serie_name, first_year in SERIES:
+        for index in range(1, sets_per_serie + 1):
+            set_id = f"{serie_id}{index}"
+            year = first_year + (index - 1) // 4
+            set_brief = {
+                "id": set_id,
+                "name": f"{serie_name} Erweiterung {index}",
+                "logo": f"https://assets.tcgdex.net/de/{serie_id}/{set_id}/logo",
+                "symbol": f"https://assets.tcgdex.net/univ/{serie_id}/{set_id}/symbol",
+                "cardCount": {"official": cards_per_set, "total": cards_per_set}
+            }
+            sets.append(set_brief)
+
+            card_briefs = []
+            for number in range(1, cards_per_set + 1):
+                card_id = f"{set_id}-{number}"
+                card_briefs.append({
+                    "id": card_id,
+                    "localId": str(number),
+                    "name": rng.choice(NAMES),
+                    "image": f"https://assets.tcgdex.net/de/{serie_id}/{set_id}/{number}"
+                })
+                cards[card_id] = {
+                    "id": card_id,
+                    "localId": str(number),
+                    "number": str(number),
+                    "name": card_briefs[-1]["name"],
+                    "category": "Pokemon",
+                    "hp": str(rng.choice(range(30, 340, 10))) if rng.random() > 0.05 else "None",
+                    "types": [rng.choice(TYPES)],
+                    "rarity": rng.choice(RARITIES),
+                    "image": card_briefs[-1]["image"],
+                    "illustrator": "Fixture",
+                    "set": {
+                        "id": set_id,
+                        "name": set_brief["name"],
+                        "logo": set_brief["logo"],
+                        "symbol": set_brief["symbol"],
+                        "serie": {"id": serie_id, "name": serie_name},
+                        "cardCount": set_brief["cardCount"]
+                    },
+                    "attacks": [
+                        {"name": "Tackle", "cost": ["Farblos"], "damage": rng.choice([10, 20, 30])},
+                        {"name": "Spezialangriff", "cost": ["Farblos", "Farblos"], "damage": rng.choice([50, 90, 120])}
+                    ],
+                    "pricing": {
+                        "cardmarket": {
+                            "avg": round(rng.uniform(0.05, 80), 2) if rng.random() > 0.3 else None,
+                            "trend": round(rng.uniform(0.05, 80), 2),
+                            "unit": "EUR"
+                        },
+                        "tcgplayer": {
+                            "normal": {"marketPrice": round(rng.uniform(0.05, 80), 2)}
+                        }
+                    }
+                }
+
+            set_details[set_id] = {
+                **set_brief,
+                "releaseDate": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+                "serie": {"id": serie_id, "name": serie_name},
+                "cards": card_briefs
+            }
+
+    return {"sets": sets, "set_details": set_details, "cards": cards}
+
+
+# ============= Latenzverteilungen =============
+
+def no_latency() -> LatencyDistribution:
+    return lambda rng: 0.0
+
+
+def fixed(seconds: float) -> LatencyDistribution:
+    return lambda rng: seconds
+
+
+def uniform(low: float, high: float) -> LatencyDistribution:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float) -> LatencyDistribution:
+    """Rechtsschiefe Verteilung wie bei echten APIs (Median plus lange Tail)"""
+    mu = math.log(median)
+    return lambda rng: rng.lognormvariate(mu, sigma)
+
+
+def with_spikes(base: LatencyDistribution, probability: float, extra: float) -> LatencyDistribution:
+    """Fügt mit ``probability`` zusätzlich ``extra`` Sekunden hinzu (z.B. GC-Pausen, kalte Caches)"""
+    return lambda rng: base(rng) + (extra if rng.random() < probability else 0.0)
+
+
+def parse_latency(spec: str) -> LatencyDistribution:
+    """
+    Parst eine Latenz-Angabe in Sekunden:
+    "0.05", "uniform:0.01:0.1", "lognormal:0.08:0.6"
+    """
+    kind, _, rest = spec.partition(":")
+    if not rest:
+        return fixed(float(kind))
+    values = [float(part) for part in rest.split(":")]
+    if kind == "uniform":
+        return uniform(*values)
+    if kind == "lognormal":
+        return lognormal(*values)
+    raise ValueError(f"Unbekannte Latenzverteilung: {spec}")
+
+
+@dataclass
+class FaultInjection:
+    """
+    Fehlerprofil des Ersatzservers (Raten zwischen 0 und 1)
+
+    Die Raten werden pro Request in dieser Reihenfolge gewürfelt:
+    Timeout, 429, 5xx, 404. Ein Timeout hält den Request ``timeout_seconds``
+    offen, so dass der Client in sein eigenes Timeout läuft.
+    """
+    latency: LatencyDistribution = field(default_factory=no_latency)
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 30.0
+    rate_limit_rate: float = 0.0
+    retry_after: Optional[float] = 1.0
+    server_error_rate: float = 0.0
+    server_error_statuses: tuple = (500, 502, 503, 504)
+    not_found_rate: float = 0.0
+    requests_per_second: Optional[float] = None  # echtes Rate-Limit (Token-Bucket), sonst 429
+
+
+class FakeTCGdexServer:
+    """aiohttp-Server, der den Korpus unter /v2/{lang}/... ausliefert"""
+
+    def __init__(self, corpus: Optional[Dict[str, Any]] = None, latency: float = 0.0,
+                 faults: Optional[FaultInjection] = None, seed: int = 1):
+        self.corpus = corpus if corpus is not None else build_corpus()
+        self.faults = faults or FaultInjection(latency=fixed(latency) if latency else no_latency())
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.statuses: Counter = Counter()
+        self.paths: Counter = Counter()
+        self._scripts: Dict[str, Deque[int]] = {}
+        self._bucket_tokens = 0.0
+        self._bucket_updated = time.monotonic()
+        self._stopping: Optional[asyncio.Event] = None
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    def script(self, route: str, statuses: Iterable[int]) -> None:
+        """
+        Erzwingt eine Folge von Status-Codes für eine Route
+
+        Args:
+            route: "/sets", "/sets/{id}" oder "/cards/{id}"
+            statuses: Status pro Request; danach greift wieder das Fehlerprofil
+        """
+        self._scripts.setdefault(route, deque()).extend(statuses)
+
+    def _rate_limited(self) -> bool:
+        rate = self.faults.requests_per_second
+        if not rate:
+            return False
+        now = time.monotonic()
+        self._bucket_tokens = min(rate, self._bucket_tokens + (now - self._bucket_updated) * rate)
+        self._bucket_updated = now
+        if self._bucket_tokens >= 1:
+            self._bucket_tokens -= 1
+            return False
+        return True
+
+    def _pick_status(self, route: str) -> int:
+        script = self._scripts.get(route)
+        if script:
+            return script.popleft()
+        faults = self.faults
+        roll = self.rng.random
+        if faults.timeout_rate and roll() < faults.timeout_rate:
+            return 0  # Timeout
+        if self._rate_limited() or (faults.rate_limit_rate and roll() < faults.rate_limit_rate):
+            return 429
+        if faults.server_error_rate and roll() < faults.server_error_rate:
+            return self.rng.choice(faults.server_error_statuses)
+        if faults.not_found_rate and roll() < faults.not_found_rate:
+            return 404
+        return 200
+
+    async def _respond(self, request: web.Request, route: str, payload: Optional[Any]) -> web.Response:
+        self.requests += 1
+        self.paths[route] += 1
+        status = self._pick_status(route)
+        if status == 200 and payload is None:
+            status = 404
+        self.statuses[status or "timeout"] += 1
+        delay = self.faults.latency(self.rng)
+        if status == 0:
+            delay = max(delay, self.faults.timeout_seconds)
+        if delay:
+            try:
+                # Beim Stoppen nicht auf hängende Requests warten
+                await asyncio.wait_for(self._stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+        if status == 200:
+            return web.Response(body=json.dumps(payload).encode("utf-8"), content_type="application/json")
+        if status == 429:
+            headers = {"Retry-After": str(self.faults.retry_after)} if self.faults.retry_after is not None else None
+            return web.json_response({"error": "rate limited"}, status=429, headers=headers)
+        if status == 404:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response({"error": "injected failure"}, status=status or 504)
+
+    async def _handle_sets(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "/sets", self.corpus["sets"])
+
+    async def _handle_set(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "/sets/{id}",
+                                   self.corpus["set_details"].get(request.match_info["set_id"]))
+
+    async def _handle_card(self, request: web.Request) -> web.Response:
+        return await self._respond(request, "/cards/{id}",
+                                   self.corpus["cards"].get(request.match_info["card_id"]))
+
+    async def start(self, lang: str = "de", host: str = "127.0.0.1", port: int = 0) -> str:
+        self._stopping = asyncio.Event()
+        app = web.Application()
+        app.router.add_get("/v2/{lang}/sets", self._handle_sets)
+        app.router.add_get("/v2/{lang}/sets/{set_id}", self._handle_set)
+        app.router.add_get("/v2/{lang}/cards/{card_id}", self._handle_card)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{port}/v2/{lang}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._stopping is not None:
+            self._stopping.set()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeTCGdexServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    faults = FaultInjection(
+        latency=parse_latency(args.latency),
+        timeout_rate=args.timeout_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        not_found_rate=args.not_found_rate,
+        requests_per_second=args.requests_per_second
+    )
+    server = FakeTCGdexServer(faults=faults, seed=args.seed)
+    base_url = await server.start(host=args.host, port=args.port)
+    print(f"TCGdex-Ersatzserver läuft: TCGDEX_BASE_URL={base_url}")
+    try:
+        while True:
+            await asyncio.sleep(60)
+            print(f"Requests: {server.requests} | Status: {dict(server.statuses)}")
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", default="0", help='z.B. "0.05", "uniform:0.01:0.1", "lognormal:0.08:0.6"')
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--requests-per-second", type=float, default=None)
+    parser.add_argument("--server-error-rate", type=float, default=0.0)
+    parser.add_argument("--not-found-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    try:
+        asyncio.run(_serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
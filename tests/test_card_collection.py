@@ -0,0 +1,104 @@
+"""
+Tests für Sammlungen als Bitsets pro Set
+"""
+from benchmarks.load import LoadSimulation
+from cogs.card_collection import CardCollection
+from cogs.tcgdex_service import TCGdexService, build_set_cards
+from tests.discord_fakes import FakeAttachment
+from tests.fake_tcgdex_server import FakeTCGdexServer
+
+SET_DATA = {"id": "swsh12", "cards": [
+    {"localId": "001", "name": "Bisasam"}, {"localId": "002", "name": "Bisaknosp"},
+    {"localId": "TG01", "name": "Flamara"}, {"localId": "001a", "name": "Bisasam"},
+]}
+
+
+class TestSetCards:
+    """Tests für die Kartenliste eines Sets als Bitposition"""
+
+    def test_positions_accept_alphanumeric_numbers(self):
+        """Nummern werden ohne führende Nullen und Groß-/Kleinschreibung gefunden"""
+        cards = build_set_cards(SET_DATA)
+        bits, unknown = cards.bits(["1", "tg01", "001A", "999"])
+
+        assert len(cards) == 4 and cards.mask == 0b1111
+        assert bits == 0b1101 and unknown == ["999"]
+        assert cards.numbers_of(bits) == ["001", "TG01", "001a"]
+
+
+class TestCardCollection:
+    """Tests für Besitz, Vollständigkeit und Abgleich zwischen Nutzern"""
+
+    def test_completion_missing_and_wanted_cards(self, tmp_path):
+        """Vollständigkeit und fehlende Karten sind Bitoperationen; gespeichert wird ein Bit pro Karte"""
+        cards = build_set_cards(SET_DATA)
+        collection = CardCollection(str(tmp_path / "collection.db"))
+        collection.open()
+        collection.update(1, "swsh12", add=0b0111)
+        collection.update(1, "swsh12", remove=0b0010)
+        collection.add_many(2, {"swsh12": 0b1000, "sv1": 0b1})
+
+        assert collection.completion(1, cards) == (2, 4)
+        assert cards.numbers_of(collection.missing(1, cards)) == ["002", "001a"]
+        # Nutzer 1 hat 001 und TG01, Nutzer 2 sammelt swsh12 und sv1
+        assert collection.wanted_from(1, 2) == {"swsh12": 0b0101}
+        assert collection.wanted_from(2, 1) == {"swsh12": 0b1000}
+        blob = collection.db.execute("SELECT bits FROM collections WHERE user_id = 1").fetchone()[0]
+        assert blob == b"\x05"
+
+        other = CardCollection(str(tmp_path / "collection.db"))
+        other.open()
+        other.update(1, "swsh12", remove=0b0101)
+        assert collection.sets(1) == {}
+        assert collection.sets(2) == {"swsh12": 0b1000, "sv1": 0b1}
+
+    def test_refresh_reads_only_changed_rows(self, tmp_path):
+        """Änderungen anderer Prozesse werden über das Änderungsprotokoll zeilenweise übernommen"""
+        path = str(tmp_path / "collection.db")
+        collection = CardCollection(path)
+        collection.open()
+        collection.add_many(1, {f"sv{i}": 0b1 for i in range(1, 11)})
+        other = CardCollection(path)
+        other.open()
+        other.update(1, "sv3", add=0b10)
+        other.update(2, "sv1", add=0b1)
+        # Nochmals dieselben Bits: keine Änderung, kein Protokolleintrag
+        other.update(2, "sv1", add=0b1)
+
+        assert collection.refresh() == 2
+        assert collection.refresh() == 0
+        assert collection.owned(1, "sv3") == 0b11 and collection.owned(2, "sv1") == 0b1
+        assert collection.db.execute("SELECT COUNT(*) FROM collection_changes").fetchone()[0] == 12
+
+        # Gekürztes Protokoll: komplett neu laden
+        other.update(3, "sv1", add=0b1)
+        other.update(4, "sv1", add=0b1)
+        other.db.execute("DELETE FROM collection_changes WHERE seq <= 13")
+        assert collection.refresh() == 4
+        assert collection.owned(3, "sv1") == 0b1 and collection.owned(1, "sv10") == 0b1
+
+    async def test_import_reuses_card_list_path(self):
+        """Der Import liest das CSV-Format der Massenangebote und ruft pro Set nur die Kartenliste ab"""
+        async with FakeTCGdexServer() as server:
+            simulation = LoadSimulation(users=1, seed=1)
+            (member,) = simulation.members
+            cog = simulation.cog
+            await cog.tcgdex_service.close()
+            cog.tcgdex_service = TCGdexService(base_url=server.base_url)
+            interaction = simulation.interaction(member)
+            try:
+                await cog.sammlung_import.callback(
+                    cog, interaction, FakeAttachment("set_id,number\nsv1,1\nsv1,2,4\nsv2,60\nsv1,61\nunbekannt,1")
+                )
+                embed = await cog.build_collection_embed(member, "sv1")
+            finally:
+                await cog.tcgdex_service.close()
+
+        (summary,) = interaction.followup.messages
+        assert summary.embed.description == "**3** Karten aus **2** Sets übernommen."
+        assert "Zeile 5: `sv1,61` - Nummer gibt es im Set nicht" in summary.embed.fields[-1].value
+        assert "Zeile 6: `unbekannt,1` - Unbekanntes Set" in summary.embed.fields[-1].value
+        assert embed.title == "📚 sv1: 2/60 Karten (3%)"
+        assert embed.fields[0].value.startswith("3, 4, 5")
+        # Keine einzelnen Karten, nur /sets/{id} für sv1, sv2 und das unbekannte Set
+        assert server.requests == 3
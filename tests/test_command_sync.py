@@ -0,0 +1,71 @@
+"""
+Tests für den hash-basierten Slash-Command-Sync
+"""
+from unittest.mock import AsyncMock
+
+import discord
+import pytest
+from discord import app_commands
+
+from cogs.command_sync import CommandSyncState, command_tree_hash, sync_command_tree
+
+
+@pytest.fixture
+def tree():
+    client = discord.Client(intents=discord.Intents.none())
+    tree = app_commands.CommandTree(client)
+
+    @tree.command(name="anbieten-tcg", description="Biete eine Karte an")
+    async def offer(interaction: discord.Interaction):
+        pass
+
+    @tree.command(name="wuenschen-tcg", description="Wünsche dir eine Karte", guild=discord.Object(id=42))
+    async def wish(interaction: discord.Interaction, jahr: int):
+        pass
+
+    tree.sync = AsyncMock(return_value=[])
+    return tree
+
+
+class TestCommandSync:
+    """Tests für Hash und Sync-Entscheidung"""
+
+    def test_hash_is_stable_and_tracks_signatures(self, tree):
+        """Gleiche Commands ergeben denselben Hash, geänderte Beschreibungen nicht"""
+        before = command_tree_hash(tree)
+        assert command_tree_hash(tree) == before
+        assert command_tree_hash(tree, discord.Object(id=42)) != before
+
+        tree.get_command("anbieten-tcg").description = "Neue Beschreibung"
+        assert command_tree_hash(tree) != before
+
+    async def test_sync_only_changed_scopes(self, tree, tmp_path):
+        """Routine-Neustarts synchronisieren nichts, Änderungen nur ihren Bereich"""
+        path = str(tmp_path / "sync.json")
+
+        first = await sync_command_tree(tree, 1, CommandSyncState(path))
+        assert first == {"global": "synced", "42": "synced"}
+        assert tree.sync.await_count == 2
+
+        # Neustart mit frisch geladenem Zustand: keine API-Aufrufe
+        second = await sync_command_tree(tree, 1, CommandSyncState(path))
+        assert second == {"global": "skipped", "42": "skipped"}
+        assert tree.sync.await_count == 2
+
+        tree.get_command("wuenschen-tcg", guild=discord.Object(id=42)).description = "Geändert"
+        third = await sync_command_tree(tree, 1, CommandSyncState(path))
+        assert third == {"global": "skipped", "42": "synced"}
+        tree.sync.assert_awaited_with(guild=discord.Object(id=42))
+
+        # Andere Anwendung (z.B. Test-Bot) hat ihren eigenen Zustand
+        assert (await sync_command_tree(tree, 2, CommandSyncState(path)))["global"] == "synced"
+
+    async def test_failed_sync_is_retried(self, tree, tmp_path):
+        """Ein fehlgeschlagener Sync speichert keinen Hash"""
+        path = str(tmp_path / "sync.json")
+        response = type("Response", (), {"status": 429, "reason": "Too Many Requests"})()
+        tree.sync.side_effect = discord.HTTPException(response, "rate limited")
+        assert (await sync_command_tree(tree, 1, CommandSyncState(path), guild_ids=[]))["global"] == "failed"
+
+        tree.sync.side_effect = None
+        assert (await sync_command_tree(tree, 1, CommandSyncState(path), guild_ids=[]))["global"] == "synced"
@@ -0,0 +1,46 @@
+"""
+Tests für die Konfiguration
+"""
+import pytest
+
+from config import Config, parse_shard_ids
+
+
+class TestShardConfig:
+    """Tests für die Sharding-Einstellungen"""
+
+    def test_parse_shard_ids(self):
+        """Einzelne IDs und Bereiche werden sortiert und ohne Duplikate gelesen"""
+        assert parse_shard_ids("") is None
+        assert parse_shard_ids("4-7") == [4, 5, 6, 7]
+        assert parse_shard_ids("8, 0-2,2") == [0, 1, 2, 8]
+        with pytest.raises(ValueError):
+            parse_shard_ids("3-1")
+
+    def test_validate_shard_ranges(self, monkeypatch):
+        """SHARD_IDS braucht eine feste SHARD_COUNT und muss darunter liegen"""
+        monkeypatch.setattr(Config, "DISCORD_TOKEN", "token")
+        monkeypatch.setattr(Config, "SHARD_COUNT", "auto")
+        monkeypatch.setattr(Config, "SHARD_IDS", "0-3")
+        with pytest.raises(ValueError):
+            Config.validate()
+
+        monkeypatch.setattr(Config, "SHARD_COUNT", "4")
+        assert Config.validate() is True
+        assert Config.shard_ids() == [0, 1, 2, 3]
+
+        monkeypatch.setattr(Config, "SHARD_IDS", "2-5")
+        with pytest.raises(ValueError):
+            Config.validate()
+
+    def test_invalid_values_raise_value_error(self, monkeypatch):
+        """Ungültige Werte ergeben einen ValueError mit Meldung statt eines Fehlers beim Import"""
+        for value in ("0-", "-3", "a", "1-b"):
+            with pytest.raises(ValueError, match="Invalid shard"):
+                parse_shard_ids(value)
+
+        monkeypatch.setattr(Config, "SHARD_IDS", "")
+        for value in ("vier", "0", "-1"):
+            monkeypatch.setattr(Config, "SHARD_COUNT", value)
+            with pytest.raises(ValueError, match="SHARD_COUNT"):
+                Config.validate_sharding()
@@ -0,0 +1,109 @@
+"""
+Tests für Sperren pro Eintrag und konkurrierende Annahmen
+"""
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from benchmarks.load import LoadSimulation
+from cogs.entry_locks import StripedLocks
+from cogs.market_state import MarketBook
+from cogs.market_views import CounterOfferResponseView, WishWithOfferResponseView
+
+
+class TestStripedLocks:
+    """Tests für die Verteilung der Sperren und Compare-and-Swap"""
+
+    def test_same_key_same_lock_and_bounded_size(self):
+        """Gleiche Schlüssel teilen sich eine Sperre, die Anzahl bleibt fest"""
+        locks = StripedLocks(stripes=8)
+        assert locks.lock(("offers", 1)) is locks.lock(("offers", 1))
+        assert len({id(locks.lock(("offers", i))) for i in range(1000)}) <= 8
+
+    def test_remove_compares_version(self):
+        """Mit veralteter Version wird nichts entfernt"""
+        book = MarketBook('offers', 'offer_id')
+        entry_id = book.add({'name': "Pikachu", 'guild_id': 1})
+        assert book.get(entry_id)['version'] == 1
+        assert not book.remove(entry_id, version=2)
+        assert book.remove(entry_id, version=1)
+        assert not book.remove(entry_id, version=1)
+
+
+class TestConcurrentAccepts:
+    """Stresstests: gleichzeitige Annahmen desselben Eintrags"""
+
+    async def test_thousands_of_counter_offers_accepted_at_once(self):
+        """Von 2000 gleichzeitig angenommenen Gegenangeboten gewinnt genau eines"""
+        simulation = LoadSimulation(users=2001, seed=7, api_latency=0.0002)
+        owner, *bidders = simulation.members
+        await simulation.create_offer(owner)
+        offer = next(iter(simulation.cog.market.offers))
+
+        views = [CounterOfferResponseView(offer, simulation.pokemon(bidder), bidder) for bidder in bidders]
+        interactions = [simulation.interaction(owner) for _ in views]
+        await asyncio.gather(*(
+            simulation.press(view, view.accept_counter_offer, interaction)
+            for view, interaction in zip(views, interactions)
+        ))
+
+        kinds = [interaction.response.kind for interaction in interactions]
+        assert kinds.count("edit_message") == 1
+        assert kinds.count("send_message") == len(bidders) - 1
+        assert all(i.response.ephemeral for i in interactions if i.response.kind == "send_message")
+        assert sum(len(bidder.inbox) for bidder in bidders) == 1
+        assert simulation.cog.ledger.reputation(owner.id).trades == 1
+        assert len(simulation.cog.market.offers) == 0
+
+    async def test_double_click_on_wish_trade_offer(self):
+        """Mehrfaches Klicken auf "Tauschangebot annehmen" benachrichtigt den Wünschenden nur einmal"""
+        simulation = LoadSimulation(users=2, seed=3, api_latency=0.001)
+        wisher, responder = simulation.members
+        wish = simulation.pokemon(wisher)
+        wish.update(offer_included=True, offer_data=simulation.pokemon(wisher))
+        await simulation.cog.create_final_wish(simulation.interaction(wisher), wish)
+        target_wish = next(iter(simulation.cog.market.wishes))
+        inbox_before = len(wisher.inbox)
+
+        view = WishWithOfferResponseView(target_wish, responder)
+        interactions = [simulation.interaction(responder) for _ in range(500)]
+        await asyncio.gather(*(simulation.press(view, view.accept_trade_offer, i) for i in interactions))
+
+        assert [i.response.kind for i in interactions].count("edit_message") == 1
+        assert len(wisher.inbox) == inbox_before + 1
+        assert simulation.cog.ledger.reputation(responder.id).trades == 1
+
+    async def test_accept_compares_the_version_the_view_was_built_from(self):
+        """Hat sich das Angebot seit dem Erstellen der View geändert, wird es nicht vergeben"""
+        simulation = LoadSimulation(users=2, seed=5)
+        owner, bidder = simulation.members
+        await simulation.create_offer(owner)
+        offer = next(iter(simulation.cog.market.offers))
+        view = CounterOfferResponseView(offer, simulation.pokemon(bidder), bidder)
+        simulation.cog.market.offers.update(offer['offer_id'], {'hp': 999})
+
+        interaction = simulation.interaction(owner)
+        await simulation.press(view, view.accept_counter_offer, interaction)
+
+        assert interaction.response.kind == "send_message" and interaction.response.ephemeral
+        assert len(simulation.cog.market.offers) == 1
+        assert simulation.cog.ledger.reputation(owner.id).trades == 0
+
+    async def test_trade_is_recorded_when_the_confirmation_fails(self):
+        """Scheitert das Bearbeiten der DM, ist der Tausch trotzdem gebucht und der Partner benachrichtigt"""
+        simulation = LoadSimulation(users=2, seed=6)
+        owner, bidder = simulation.members
+        await simulation.create_offer(owner)
+        offer = next(iter(simulation.cog.market.offers))
+        view = CounterOfferResponseView(offer, simulation.pokemon(bidder), bidder)
+        interaction = simulation.interaction(owner)
+
+        async def edit_message(**kwargs):
+            raise discord.HTTPException(SimpleNamespace(status=500, reason="Server Error"), "kaputt")
+        interaction.response.edit_message = edit_message
+        await simulation.press(view, view.accept_counter_offer, interaction)
+
+        assert len(simulation.cog.market.offers) == 0
+        assert simulation.cog.ledger.reputation(owner.id).trades == 1
+        assert len(bidder.inbox) == 1
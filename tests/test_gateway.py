@@ -0,0 +1,126 @@
+"""
+Tests für Gateway-Einstellungen und Mitglieder-Snapshots
+"""
+import discord
+
+from cogs.gateway import MemberSnapshotCache, gateway_options
+from cogs.member_directory import GuildDirectory
+from tests.discord_fakes import FakeClient, FakeGuild, FakeMember
+
+
+def _guild_with_members(client, count):
+    guild = FakeGuild("Tauschbörse")
+    client.guilds[guild.id] = guild
+    for i in range(count):
+        member = FakeMember(f"trainer{i:03d}")
+        member.status = discord.Status.offline if i % 4 == 0 else discord.Status.online
+        guild.add_member(member)
+    bot = FakeMember("Tradebot")
+    bot.bot = True
+    guild.add_member(bot)
+    return guild
+
+
+class TestGatewayOptions:
+    """Tests für Intents und Member-Cache je Modus"""
+
+    def test_lean_mode_drops_presences_and_member_cache(self):
+        """Lean: keine Presences, kein Member-Cache, kein Chunking beim Start"""
+        full, lean = gateway_options(False), gateway_options(True)
+
+        assert full['intents'].presences and full['chunk_guilds_at_startup']
+        assert full['member_cache_flags'].joined
+        assert not lean['intents'].presences and not lean['chunk_guilds_at_startup']
+        assert lean['member_cache_flags'].value == discord.MemberCacheFlags.none().value
+        assert lean['intents'].members  # nötig für Chunking bei Bedarf
+
+
+class TestMemberSnapshotCache:
+    """Tests für !user-Snapshots im vollen und im Lean-Modus"""
+
+    async def test_full_mode_reads_cache_with_status(self):
+        """Voller Modus: Status aus dem Cache, ohne Chunking"""
+        client = FakeClient()
+        guild = _guild_with_members(client, 20)
+        snapshot = await MemberSnapshotCache(client).get(guild)
+
+        assert (snapshot.humans, snapshot.bots, snapshot.online_humans) == (20, 1, 15)
+        assert [name for name, _, _ in snapshot.page_humans][:2] == ["trainer000", "trainer001"]
+        assert len(snapshot.page_humans) == 15
+        assert guild.chunk_requests == 0
+
+    async def test_lean_mode_chunks_once_within_ttl(self):
+        """Lean: einmal bei Bedarf laden, danach bis zum Ablauf aus dem Snapshot"""
+        client = FakeClient()
+        guild = _guild_with_members(client, 20)
+        guild.approximate_presence_count = 16
+        cache = MemberSnapshotCache(client, lean=True, ttl=60)
+
+        first = await cache.get(guild)
+        second = await cache.get(guild)
+        assert first == second and guild.chunk_requests == 1
+        assert first.online_humans is None and first.approximate_online == 16
+        assert all(status is None for _, _, status in first.page_humans)
+
+        # Weitere Seiten kommen aus derselben Zusammenfassung
+        last = await cache.get(guild, page=2)
+        assert guild.chunk_requests == 1
+        assert [name for name, _, _ in last.page_humans] == [f"trainer{i:03d}" for i in range(15, 20)]
+
+        cache.ttl = 0
+        await cache.get(guild)
+        assert guild.chunk_requests == 2
+
+    async def test_lean_mode_drops_expired_guilds(self):
+        """Abgelaufene Zusammenfassungen anderer Guilds werden beim nächsten Abruf verworfen"""
+        client = FakeClient()
+        guilds = [_guild_with_members(client, 3) for _ in range(3)]
+        cache = MemberSnapshotCache(client, lean=True, ttl=60)
+        for guild in guilds:
+            await cache.get(guild)
+        assert len(cache._summaries) == 3
+
+        cache.ttl = 0
+        await cache.get(guilds[0])
+        assert list(cache._summaries) == [guilds[0].id]
+
+
+class TestMemberDirectory:
+    """Tests für das inkrementell gepflegte Mitgliederverzeichnis"""
+
+    def test_events_keep_order_and_counters(self):
+        """Beitritt, Austritt, Umbenennung und Statuswechsel ohne Neusortierung"""
+        client = FakeClient()
+        guild = _guild_with_members(client, 8)
+        directory = GuildDirectory(guild.members)
+        assert (directory.humans, directory.bots, directory.online_humans) == (8, 1, 6)
+
+        newcomer = FakeMember("aaron")
+        directory.add(newcomer)
+        renamed = guild.members[3]
+        renamed.name = "zora"
+        directory.update(renamed)
+        gone = guild.members[1]
+        directory.remove(gone.id)
+        newcomer.status = discord.Status.offline
+        directory.update(newcomer)
+
+        names = [entry.name for entry in directory.page(0, 20)]
+        assert names == ["aaron", "trainer000", "trainer002", "trainer004", "trainer005",
+                         "trainer006", "trainer007", "zora"]
+        assert [entry.name for entry in directory.page(2, 2)] == ["trainer002", "trainer004"]
+        assert (directory.humans, directory.bots, directory.online_humans) == (8, 1, 5)
+
+    async def test_snapshot_pages_follow_directory(self):
+        """Voller Modus: Seiten kommen aus dem Verzeichnis, das Events aktuell halten"""
+        client = FakeClient()
+        guild = _guild_with_members(client, 20)
+        cache = MemberSnapshotCache(client, listed=15)
+
+        first = await cache.get(guild)
+        cache.directory.add(guild.id, FakeMember("trainer999"))
+        cache.directory.remove(guild.id, guild.members[0].id)
+        second = await cache.get(guild, page=2)
+
+        assert (first.pages, second.page, second.humans) == (2, 2, 20)
+        assert [name for name, _, _ in second.page_humans] == [f"trainer{i:03d}" for i in range(16, 20)] + ["trainer999"]
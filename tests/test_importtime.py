@@ -0,0 +1,38 @@
+"""
+Tests für den Importzeit-Bericht
+"""
+from benchmarks.importtime import check_budget, measure, parse_importtime, summarize
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+2024-01-01 12:00:00 - bot - INFO - Logausgabe dazwischen
+import time:       100 |        100 |     cogs
+import time:      2000 |       2100 |   cogs.metrics
+import time:      5000 |       7100 | bot
+import time:       300 |        300 |   aiohttp.web
+"""
+
+
+class TestImportTimeReport:
+    """Tests für Auswertung und Budget"""
+
+    def test_parse_and_summarize(self):
+        """Zeilen werden gelesen, summiert und nach Paketen gruppiert"""
+        entries = parse_importtime(SAMPLE.splitlines())
+        assert [(e.module, e.depth) for e in entries] == [
+            ("cogs", 2), ("cogs.metrics", 1), ("bot", 0), ("aiohttp.web", 1)
+        ]
+
+        report = summarize(entries, top=2)
+        assert report["total_ms"] == 7.4
+        assert [m["module"] for m in report["top_modules"]] == ["bot", "cogs.metrics"]
+        assert report["packages_ms"] == {"bot": 5.0, "cogs": 2.1}
+        assert report["eager_lazy_modules"] == ["aiohttp.web"]
+
+        problems = check_budget(report, budget_ms=5)
+        assert len(problems) == 2
+
+    def test_startup_does_not_import_lazy_modules(self):
+        """bot.py und die Extensions laden Assistenten, TCG, Feedback und aiohttp.web nicht beim Start"""
+        report = summarize(measure())
+        assert report["modules"] > 0
+        assert report["eager_lazy_modules"] == []
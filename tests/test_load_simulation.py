@@ -0,0 +1,61 @@
+"""
+Tests für die Discord-Ersatzobjekte und den Lastgenerator
+"""
+import discord
+import pytest
+
+from benchmarks.load import LoadSimulation
+from cogs.market_views import CounterOfferResponseView
+from tests.discord_fakes import FakeChannel, FakeClient, FakeGuild, FakeInteraction, FakeMember
+
+
+class TestDiscordFakes:
+    """Tests für die Ersatzobjekte"""
+
+    async def test_interaction_allows_single_response(self):
+        """Wie bei Discord ist nur eine Antwort pro Interaktion möglich"""
+        channel = FakeChannel(FakeGuild("Server"))
+        interaction = FakeInteraction(FakeClient(), FakeMember("Ash"), channel)
+        await interaction.response.send_message("Hallo", ephemeral=True)
+
+        assert interaction.response.is_done()
+        assert interaction.guild_id == channel.guild.id
+        with pytest.raises(discord.InteractionResponded):
+            await interaction.response.edit_message(content="Nochmal")
+
+    async def test_closed_dms_raise_forbidden(self):
+        """Mitglieder mit geschlossenen DMs verhalten sich wie bei Discord"""
+        with pytest.raises(discord.Forbidden):
+            await FakeMember("Misty", dms_closed=True).send("Hallo")
+
+
+class TestLoadSimulation:
+    """Tests für die simulierten Nutzeraktionen gegen den echten Cog"""
+
+    async def test_counter_offer_and_accept_complete_a_trade(self):
+        """Angebot, Gegenangebot per Liste und Annahme per DM entfernen das Angebot und landen im Tauschbuch"""
+        simulation = LoadSimulation(users=2, seed=3)
+        owner, bidder = simulation.members
+
+        await simulation.create_offer(owner)
+        await simulation.list_offers(bidder)
+        await simulation.counter_offer(bidder)
+
+        assert isinstance(owner.inbox[-1].view, CounterOfferResponseView)
+        await simulation.accept(owner)
+        assert simulation.trades == 1
+        assert len(simulation.cog.market.offers) == 0
+        assert simulation.cog.ledger.reputation(owner.id).trades == 1
+        assert simulation.cog.ledger.history(bidder.id)[0]["kind"] == "offer"
+
+    async def test_run_reports_all_operations(self):
+        """Ein kurzer Lauf liefert Messwerte pro Aktion ohne Fehler"""
+        simulation = LoadSimulation(users=30, guilds=2, seed=5)
+        report = await simulation.run(actions=8)
+
+        assert report["completed"] > 0
+        assert set(report["operations"]) == set(simulation.actions)
+        assert all(op["errors"] == 0 for op in report["operations"].values()), report["error_samples"]
+        assert report["operations"]["create_offer"]["count"] > 0
+        assert report["event_loop_lag"]["samples"] >= 0
+        assert report["market"]["active_offers"] == len(simulation.cog.market.offers)
@@ -0,0 +1,121 @@
+"""
+Tests für Reservierungen während offener Gegenangebote
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+import pytest
+
+from benchmarks.load import LoadSimulation
+from cogs.market_holds import HoldScheduler, is_held
+from cogs.market_journal import JournaledMarketState
+from cogs.market_state import MarketState, SqliteMarketState
+from cogs.market_views import OfferSelect
+
+
+class TestHoldScheduler:
+    """Tests für Reservieren, Freigeben und die gemeinsame Ablaufsteuerung"""
+
+    def test_hold_blocks_others_and_expiry_releases(self):
+        """Ein reservierter Eintrag ist für andere gesperrt, bis er abläuft; veraltete Vormerkungen zählen nicht"""
+        market = MarketState()
+        holds = HoldScheduler(market, hold_seconds=60)
+        entry_id = market.offers.add({'name': "Pikachu", 'guild_id': 1})
+
+        assert holds.hold('offers', entry_id, holder_id=7) == 2
+        assert is_held(market.offers.get(entry_id))
+        assert holds.hold('offers', entry_id, holder_id=8) is None
+        assert not holds.release('offers', entry_id, holder_id=8)
+        assert holds.release('offers', entry_id, holder_id=7)
+        assert holds.hold('offers', entry_id, holder_id=8) == 4
+
+        # Die erste Vormerkung ist veraltet und wird übersprungen
+        assert holds.release_expired(now=time.time() + 3600) == 1
+        assert not is_held(market.offers.get(entry_id))
+        assert len(holds) == 0
+
+    async def test_background_task_releases_earliest_hold(self):
+        """Die Hintergrundaufgabe wacht für eine früher ablaufende Reservierung auf"""
+        market = MarketState()
+        holds = HoldScheduler(market, hold_seconds=3600)
+        late = market.offers.add({'name': "Mew", 'guild_id': 1})
+        soon = market.wishes.add({'name': "Evoli", 'guild_id': 1})
+        await holds.start()
+        holds.hold('offers', late, holder_id=1)
+        await asyncio.sleep(0)
+
+        holds.hold_seconds = 0.01
+        holds.hold('wishes', soon, holder_id=2)
+        await asyncio.sleep(0.1)
+        await holds.close()
+
+        assert market.wishes.get(soon)['held_until'] is None
+        assert is_held(market.offers.get(late))
+
+    async def test_holds_survive_restart(self, tmp_path):
+        """Reservierungen werden als versionierte Änderung gespeichert und nach dem Neustart neu eingeplant"""
+        directory = str(tmp_path / "journal")
+        journal = JournaledMarketState(directory)
+        sqlite = SqliteMarketState(str(tmp_path / "market.db"), poll_interval=0)
+        for market in (journal, sqlite):
+            entry_id = market.offers.add({'name': "Pikachu", 'guild_id': 1})
+            assert HoldScheduler(market).hold('offers', entry_id, holder_id=7) == 2
+        await journal.close()
+
+        other = SqliteMarketState(str(tmp_path / "market.db"), poll_interval=0)
+        for market in (JournaledMarketState(directory), other):
+            offer = market.offers.get(1)
+            assert offer['version'] == 2 and offer['held_by'] == 7 and is_held(offer)
+            holds = HoldScheduler(market)
+            assert holds.reschedule() == 1
+            assert holds.release_expired(now=offer['held_until']) == 1
+            assert market.offers.get(1)['held_until'] is None
+            await market.close()
+        # Die Änderung des anderen Prozesses erreicht auch den ersten
+        assert sqlite.offers.get(1)['held_until'] is None
+        await sqlite.close()
+
+
+class TestHeldEntriesInTheMarket:
+    """Tests für reservierte Einträge in Listen und beim Annehmen"""
+
+    async def test_counter_offer_holds_offer_until_rejected(self):
+        """Während ein Gegenangebot wartet, fehlt das Angebot in der Liste; Ablehnen gibt es wieder frei"""
+        simulation = LoadSimulation(users=3, seed=3)
+        owner, bidder, latecomer = simulation.members
+        await simulation.create_offer(owner)
+        await simulation.list_offers(bidder)
+        await simulation.list_offers(latecomer)
+        await simulation.counter_offer(bidder)
+
+        _, view = simulation.cog.build_offers_list(simulation.member_channel[owner.id].guild.id)
+        assert view is None
+        # Eine ältere Liste zeigt das Angebot noch, Auswählen wird abgewiesen
+        stale_list = simulation.list_views[latecomer.id]
+        select = next(child for child in stale_list.children if isinstance(child, OfferSelect))
+        interaction = simulation.interaction(latecomer, values=[select.options[0].value])
+        await simulation.press(stale_list, select, interaction)
+        assert interaction.response.ephemeral and interaction.response.view is None
+
+        response_view = owner.inbox[-1].view
+        await simulation.press(response_view, response_view.reject_counter_offer, simulation.interaction(owner))
+        _, view = simulation.cog.build_offers_list(simulation.member_channel[owner.id].guild.id)
+        assert view is not None and len(simulation.cog.market.offers) == 1
+
+    async def test_failed_dm_releases_the_hold(self):
+        """Scheitert die Nachricht an den Anbieter mit einem beliebigen Fehler, ist das Angebot sofort wieder frei"""
+        simulation = LoadSimulation(users=2, seed=4)
+        owner, bidder = simulation.members
+        await simulation.create_offer(owner)
+        await simulation.list_offers(bidder)
+
+        async def send(*args, **kwargs):
+            raise discord.HTTPException(SimpleNamespace(status=500, reason="Server Error"), "kaputt")
+        owner.send = send
+        with pytest.raises(discord.HTTPException):
+            await simulation.counter_offer(bidder)
+
+        (offer,) = simulation.cog.market.offers
+        assert not is_held(offer) and offer['held_by'] is None
@@ -0,0 +1,116 @@
+"""
+Tests für das Ereignisjournal des Marktzustands
+"""
+import asyncio
+import os
+import time
+from datetime import datetime, timezone
+
+from cogs import market_journal
+from cogs.market_journal import JournaledMarketState
+from cogs.market_state import StoredUser
+from cogs.market_trends import OFFERED, MarketTrends
+from tests.discord_fakes import pokemon_offer
+
+CREATED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+class TestJournaledMarketState:
+    """Tests für Anhängen, Snapshots und Wiederherstellung"""
+
+    async def test_restart_replays_journal(self, tmp_path):
+        """Nach dem Neustart sind Einträge, Entfernungen, verworfene Guilds und ID-Zähler wiederhergestellt"""
+        directory = str(tmp_path / "journal")
+        state = JournaledMarketState(directory)
+        trends = MarketTrends()
+        trends.attach(state)
+        first = state.offers.add(pokemon_offer(1, created_at=CREATED))
+        removed = state.offers.add(pokemon_offer(1, "Evoli"))
+        state.offers.add(pokemon_offer(2, "Mew"))
+        state.wishes.add({'name': "Glumanda", 'guild_id': None})
+        state.offers.remove(removed)
+        state.drop_guild(2)
+        await state.close()
+
+        restored = JournaledMarketState(directory)
+        offer = restored.offers.get(first)
+        assert list(restored.offers.for_guild(1)) == [first]
+        assert restored.offers.for_guild(2) == {}
+        assert list(restored.wishes.for_guild(None)) == [1]
+        assert isinstance(offer['user'], StoredUser) and offer['user'].name == "Rocko"
+        assert offer['created_at'] == CREATED
+        assert restored.offers.add(pokemon_offer(1)) == 4
+        # Listener werden nach dem Festhalten weiter benachrichtigt
+        assert [trend.name for trend in trends.top(1, OFFERED, "24h")] == ["Evoli", "Pikachu"]
+        await restored.close()
+
+    async def test_snapshot_prunes_segments_and_tail_is_replayed(self, tmp_path):
+        """Ein Snapshot ersetzt alte Segmente; danach geschriebene Ereignisse kommen aus dem Journal"""
+        directory = str(tmp_path / "journal")
+        state = JournaledMarketState(directory, segment_bytes=512)
+        ids = [state.offers.add(pokemon_offer(1, f"Pokemon {i}")) for i in range(20)]
+        assert len(state.journal.segments()) > 1
+        for entry_id in ids[:15]:
+            state.offers.remove(entry_id)
+        state.snapshot()
+        state.offers.remove(ids[15])
+        state.offers.add(pokemon_offer(1, "Mew"))
+        await state.close()
+
+        assert len(state.journal.snapshots()) == 1
+        assert len(state.journal.segments()) == 1
+        restored = JournaledMarketState(directory)
+        assert [entry['name'] for entry in restored.offers.for_guild(1).values()] == \
+            ["Pokemon 16", "Pokemon 17", "Pokemon 18", "Pokemon 19", "Mew"]
+        assert restored.offers.counter == 21
+        await restored.close()
+
+    async def test_torn_tail_is_truncated(self, tmp_path):
+        """Ein beim Absturz abgerissener letzter Datensatz wird verworfen, weitere Ereignisse bleiben lesbar"""
+        directory = str(tmp_path / "journal")
+        state = JournaledMarketState(directory)
+        state.offers.add(pokemon_offer(1))
+        state.offers.add(pokemon_offer(1, "Evoli"))
+        await state.close()
+        _, path = state.journal.segments()[-1]
+        with open(path, "r+b") as f:
+            f.truncate(os.path.getsize(path) - 3)
+
+        restored = JournaledMarketState(directory)
+        assert [entry['name'] for entry in restored.offers.for_guild(1).values()] == ["Pikachu"]
+        restored.offers.add(pokemon_offer(1, "Mew"))
+        await restored.close()
+
+        again = JournaledMarketState(directory)
+        assert [entry['name'] for entry in again.offers.for_guild(1).values()] == ["Pikachu", "Mew"]
+        await again.close()
+
+    async def test_slow_fsync_does_not_block_the_event_loop(self, tmp_path, monkeypatch):
+        """fsync und Snapshot laufen im Worker-Thread; der Event-Loop bleibt währenddessen reaktionsfähig"""
+        real_fsync = os.fsync
+
+        def slow_fsync(fd):
+            time.sleep(0.2)
+            real_fsync(fd)
+        monkeypatch.setattr(market_journal.os, "fsync", slow_fsync)
+
+        directory = str(tmp_path / "journal")
+        state = JournaledMarketState(directory, fsync_interval=0.01, snapshot_every=3)
+        await state.start()
+        for i in range(3):
+            state.offers.add(pokemon_offer(1, f"Pokemon {i}"))
+
+        worst = 0.0
+        deadline = time.perf_counter() + 1.0
+        while time.perf_counter() < deadline and not state.journal.snapshots():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - started)
+        state.offers.add(pokemon_offer(1, "Mew"))
+        await state.close()
+
+        assert worst < 0.1
+        assert len(state.journal.snapshots()) == 1 and state._since_snapshot == 1
+        restored = JournaledMarketState(directory)
+        assert len(restored.offers) == 4
+        await restored.close()
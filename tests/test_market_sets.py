@@ -0,0 +1,95 @@
+"""
+Tests für angebotene TCG-Kartennummern pro Guild und Set
+"""
+import time
+
+from benchmarks.load import LoadSimulation
+from cogs.market_holds import HoldScheduler
+from cogs.market_sets import OfferedCards
+from cogs.market_state import MarketState
+from cogs.tcgdex_service import TCGdexService, build_set_cards
+from tests.discord_fakes import tcg_offer
+from tests.fake_tcgdex_server import FakeTCGdexServer
+
+CARDS = build_set_cards({"id": "sv1", "cards": [{"localId": str(n), "name": f"Karte {n}"} for n in range(1, 61)]})
+
+
+class TestOfferedCards:
+    """Tests für den Index der angebotenen Nummern"""
+
+    def test_index_follows_market_changes(self):
+        """Vorhandene und neue Angebote zählen, reservierte und entfernte nicht, andere Guilds getrennt"""
+        market = MarketState()
+        first = market.offers.add(tcg_offer("001"))
+        index = OfferedCards()
+        index.attach(market)
+        second = market.offers.add(tcg_offer("1"))
+        other = market.offers.add(tcg_offer("3"))
+        market.offers.add(tcg_offer("5", guild_id=2))
+        market.offers.add({'name': "Pikachu", 'guild_id': 1})
+
+        assert CARDS.numbers_of(index.offered(1, CARDS)) == ["1", "3"]
+        assert index.offer_ids(1, "sv1", "01") == {first, second}
+
+        holds = HoldScheduler(market)
+        holds.hold('offers', other, holder_id=9)
+        market.offers.remove(first)
+        assert CARDS.numbers_of(index.offered(1, CARDS)) == ["1"]
+        holds.release('offers', other)
+        market.offers.remove(second)
+        assert CARDS.numbers_of(index.offered(1, CARDS)) == ["3"]
+
+        market.drop_guild(1)
+        assert index.offered(1, CARDS) == 0
+        assert CARDS.numbers_of(index.offered(2, CARDS)) == ["5"]
+
+    def test_query_takes_microseconds(self):
+        """Die Abfrage ist ein Wörterbuchzugriff und ein UND, unabhängig von der Zahl der Angebote"""
+        market = MarketState()
+        index = OfferedCards()
+        index.attach(market)
+        market.offers.add_many([tcg_offer(str(1 + i % 60), guild_id=i % 20) for i in range(5000)])
+        missing = CARDS.mask & ~0b1
+        index.offered(3, CARDS)
+
+        started = time.perf_counter()
+        for _ in range(10000):
+            matches = missing & index.offered(3, CARDS)
+        elapsed = (time.perf_counter() - started) / 10000
+
+        # Guild 3 hat die Angebote i = 3, 23, 43, ... also die Nummern 4, 24 und 44
+        assert CARDS.numbers_of(matches) == ["4", "24", "44"]
+        assert elapsed < 50e-6
+
+
+class TestCollectCommand:
+    """Tests für /sammeln gegen den lokalen TCGdex-Ersatzserver"""
+
+    async def test_matches_offers_and_wishes_for_the_rest(self):
+        """Angebotene fehlende Karten mit IDs; Wünsche nur für die übrigen und nicht doppelt"""
+        async with FakeTCGdexServer() as server:
+            simulation = LoadSimulation(users=2, seed=2)
+            collector, trader = simulation.members
+            cog = simulation.cog
+            await cog.tcgdex_service.close()
+            cog.tcgdex_service = TCGdexService(base_url=server.base_url)
+            guild_id = simulation.member_channel[collector.id].guild.id
+            cog.collection.update(collector.id, "sv1", add=(1 << 58) - 1)
+            offer_ids = cog.market.offers.add_many([tcg_offer(n, guild_id, user=trader) for n in ("2", "59", "59")])
+            try:
+                interaction = simulation.interaction(collector)
+                await cog.sammeln.callback(cog, interaction, "sv1", True)
+                again = simulation.interaction(collector)
+                await cog.sammeln.callback(cog, again, "sv1", True)
+            finally:
+                await cog.tcgdex_service.close()
+
+        (embed,) = [message.embed for message in interaction.followup.messages]
+        assert embed.title == "🎯 sv1: 1 fehlende Karten werden angeboten"
+        assert embed.fields[0].value == f"**59**: #{offer_ids[1]}, #{offer_ids[2]}"
+        assert embed.fields[1].value.startswith("**1** Wünsche")
+        (wish,) = cog.market.wishes.for_guild(guild_id).values()
+        assert wish['tcg_card_number'] == "60" and wish['user'] is collector and wish['is_tcg']
+        (repeated,) = [message.embed for message in again.followup.messages]
+        assert len(repeated.fields) == 1 and len(cog.market.wishes) == 1
+        assert server.requests == 1
@@ -0,0 +1,224 @@
+"""
+Tests für den nach Guild partitionierten Marktzustand
+"""
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+
+from cogs.market_sets import OfferedCards
+from cogs.market_state import MarketBook, MarketState, SqliteMarketState, StoredUser
+from cogs.market_trends import OFFERED, MarketTrends, Trend
+from cogs.pokemon import Pokemon
+from tests.discord_fakes import FakeChannel, FakeClient, FakeGuild, FakeInteraction, FakeMember, pokemon_offer
+
+
+class TestMarketBook:
+    """Tests für Partitionen, IDs und das Verwerfen von Guilds"""
+
+    def test_entries_are_partitioned_by_guild(self):
+        """Jede Guild sieht nur ihre Einträge, IDs sind prozessweit eindeutig"""
+        book = MarketBook('offers', 'offer_id')
+        first = book.add(pokemon_offer(1))
+        second = book.add(pokemon_offer(2))
+        third = book.add(pokemon_offer(1, "Evoli"))
+
+        assert (first, second, third) == (1, 2, 3)
+        assert list(book.for_guild(1)) == [1, 3]
+        assert book.get(3)['offer_id'] == 3 and book.get(3)['name'] == "Evoli"
+        assert book.for_guild(99) == {}
+        assert book.guild_counts() == {1: 2, 2: 1}
+
+    def test_remove_and_drop_guild(self):
+        """Entfernte Einträge und verworfene Partitionen verschwinden vollständig"""
+        state = MarketState()
+        offer_id = state.offers.add(pokemon_offer(1))
+        state.offers.add(pokemon_offer(2))
+        state.wishes.add(pokemon_offer(2))
+
+        assert state.offers.remove(offer_id) is True
+        assert state.offers.remove(offer_id) is False
+        assert state.offers.guild_counts() == {2: 1}
+
+        state.drop_guild(2)
+        assert len(state.offers) == 0 and len(state.wishes) == 0
+        assert state.count_for_guilds([1, 2]) == {'offers': 0, 'wishes': 0}
+
+
+class TestPokemonMarket:
+    """Tests für die Anbindung des Cogs an den Marktzustand"""
+
+    async def test_lists_only_show_own_guild(self):
+        """Angebote landen in der Partition ihrer Guild und nur dort in der Liste"""
+        cog = Pokemon(MagicMock())
+        client = FakeClient()
+        home, other = FakeChannel(FakeGuild("Heim")), FakeChannel(FakeGuild("Fremd"))
+
+        offer_id = await cog.add_offer(pokemon_offer(None), FakeInteraction(client, FakeMember("Ash"), home))
+        await cog.add_wish(pokemon_offer(None, "Mew"), FakeInteraction(client, FakeMember("Misty"), other))
+
+        assert cog.market.offers.get(offer_id)['guild_id'] == home.guild.id
+        _, view = cog.build_offers_list(home.guild.id)
+        assert list(view.offers) == [offer_id]
+        assert cog.build_offers_list(other.guild.id)[1] is None
+        assert cog.build_wishes_list(home.guild.id)[1] is None
+
+        await cog.on_guild_remove(other.guild)
+        assert len(cog.market.wishes) == 0
+
+
+def _add_offers_in_process(path, guild_id, count):
+    """Läuft in einem eigenen Prozess und legt ``count`` Angebote an"""
+    state = SqliteMarketState(path, poll_interval=0)
+    ids = [state.offers.add({'name': f"Pokemon {i}", 'guild_id': guild_id}) for i in range(count)]
+    state.db.close()
+    return ids
+
+
+class TestSqliteMarketState:
+    """Tests für das geteilte SQLite-Backend mehrerer Prozesse"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "market.db")
+
+    async def test_changes_are_visible_across_instances(self, path):
+        """Einträge eines Prozesses erscheinen beim anderen, Caches werden invalidiert"""
+        members = {}
+
+        def resolve(snapshot):
+            return members.get(snapshot['id']) or StoredUser(snapshot)
+
+        first = SqliteMarketState(path, resolve, poll_interval=0)
+        second = SqliteMarketState(path, resolve, poll_interval=0)
+        changes = []
+        second.subscribe(lambda *change: changes.append(change))
+        try:
+            ash = FakeMember("Ash")
+            members[ash.id] = ash
+            assert second.offers.for_guild(1) == {}  # Cache der Guild ist jetzt leer befüllt
+
+            created = datetime(2026, 1, 1, tzinfo=timezone.utc)
+            offer_id = first.offers.add({**pokemon_offer(1), 'user': ash, 'created_at': created})
+            other_id = second.offers.add(pokemon_offer(2))
+            assert other_id != offer_id
+
+            offers = second.offers.for_guild(1)
+            assert list(offers) == [offer_id]
+            assert offers[offer_id]['user'] is ash
+            assert offers[offer_id]['created_at'] == created
+            # Eigene Änderungen sofort, fremde beim nächsten Abgleich
+            assert changes == [('offers', 2, other_id, 'add'), ('offers', 1, offer_id, 'add')]
+
+            assert second.offers.remove(offer_id) is True
+            assert first.offers.remove(offer_id) is False
+            assert first.offers.for_guild(1) == {}
+            assert first.count_for_guilds([1, 2]) == {'offers': 1, 'wishes': 0}
+        finally:
+            await first.close()
+            await second.close()
+
+    async def test_unknown_users_are_restored_as_snapshot(self, path):
+        """Nutzer, die der lesende Prozess nicht kennt, behalten Name und Erwähnung"""
+        writer = SqliteMarketState(path, poll_interval=0)
+        reader = SqliteMarketState(path, poll_interval=0)
+        try:
+            misty = FakeMember("Misty")
+            wish_id = writer.wishes.add({**pokemon_offer(5), 'user': misty, 'offer_data': {**pokemon_offer(5), 'user': misty}})
+            wish = reader.wishes.get(wish_id)
+            assert isinstance(wish['user'], StoredUser)
+            assert (wish['user'].id, wish['user'].display_name, wish['user'].mention) == (misty.id, "Misty", misty.mention)
+            assert wish['offer_data']['user'].id == misty.id
+        finally:
+            await writer.close()
+            await reader.close()
+
+    async def test_truncated_log_resets_listeners(self, path):
+        """Fehlen Änderungen im gekürzten Protokoll, bauen Index und Trends aus dem Bestand neu auf"""
+        writer = SqliteMarketState(path, poll_interval=0)
+        reader = SqliteMarketState(path, poll_interval=0)
+        offered, trends, changes = OfferedCards(), MarketTrends(), []
+        offered.attach(reader)
+        trends.attach(reader)
+        reader.subscribe(lambda *change: changes.append(change))
+        try:
+            kept = writer.offers.add({'name': "Pikachu", 'guild_id': 1, 'is_tcg': True,
+                                      'tcg_set_id': "sv1", 'tcg_card_number': "7"})
+            reader.refresh()
+            gone = writer.offers.add({'name': "Mew", 'guild_id': 1, 'is_tcg': True,
+                                      'tcg_set_id': "sv1", 'tcg_card_number': "8"})
+            writer.offers.remove(gone)
+            writer.offers.add({'name': "Evoli", 'guild_id': 1, 'is_tcg': True,
+                               'tcg_set_id': "sv1", 'tcg_card_number': "9"})
+            writer.db.execute("DELETE FROM market_changes WHERE seq <= 3")
+            changes.clear()
+
+            assert reader.refresh() == [('offers', None, 0, 'reset'), ('wishes', None, 0, 'reset')]
+            assert changes == [('offers', None, 0, 'reset'), ('wishes', None, 0, 'reset')]
+            assert offered.offer_ids(1, "sv1", "7") == {kept}
+            assert offered.offer_ids(1, "sv1", "8") == set() and len(offered.offer_ids(1, "sv1", "9")) == 1
+            assert trends.top(1, OFFERED, "24h") == [Trend("Evoli", 1, 0), Trend("Pikachu", 1, 0)]
+            assert reader.refresh() == []
+        finally:
+            await writer.close()
+            await reader.close()
+
+    def test_ids_are_unique_across_processes(self, path):
+        """Gleichzeitig schreibende Prozesse erhalten nie dieselbe ID"""
+        SqliteMarketState(path, poll_interval=0).db.close()
+        with ProcessPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(_add_offers_in_process, [path] * 4, range(4), [50] * 4))
+
+        ids = [entry_id for chunk in results for entry_id in chunk]
+        assert len(set(ids)) == 200
+        state = SqliteMarketState(path, poll_interval=0)
+        assert len(state.offers) == 200
+        assert state.offers.guild_counts() == {0: 50, 1: 50, 2: 50, 3: 50}
+        state.db.close()
+
+    async def test_locked_writes_retry_without_blocking_the_loop(self, path):
+        """Ist die Datei gesperrt, wartet ``call`` asynchron statt im Event-Loop auf die Sperre"""
+        state = SqliteMarketState(path, poll_interval=0, busy_timeout=2.0)
+        blocker = sqlite3.connect(path, isolation_level=None)
+        blocker.execute("BEGIN IMMEDIATE")
+        ticks = []
+
+        async def tick():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def unlock():
+            await asyncio.sleep(0.2)
+            blocker.execute("COMMIT")
+
+        ticker = asyncio.create_task(tick())
+        try:
+            _, offer_id = await asyncio.gather(unlock(), state.call(state.offers.add, pokemon_offer(1)))
+        finally:
+            ticker.cancel()
+            blocker.close()
+            await state.close()
+
+        assert offer_id == 1
+        # Der Loop lief während der Sperre weiter, ohne Lücke von der Länge der Sperre
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+
+    async def test_reads_use_the_cache_while_polling(self, path):
+        """Mit laufendem Abgleich im Hintergrund gleichen Lesezugriffe nicht selbst ab"""
+        writer = SqliteMarketState(path, poll_interval=0)
+        reader = SqliteMarketState(path, poll_interval=0.05)
+        await reader.start()
+        try:
+            assert reader.offers.for_guild(1) == {}
+            offer_id = writer.offers.add(pokemon_offer(1))
+            assert reader.offers.for_guild(1) == {}
+            await asyncio.sleep(0.2)
+            assert list(reader.offers.for_guild(1)) == [offer_id]
+        finally:
+            await writer.close()
+            await reader.close()
@@ -0,0 +1,56 @@
+"""
+Tests für die Trends (Heavy Hitters) aus neuen Angeboten und Wünschen
+"""
+from cogs.market_state import MarketState
+from cogs.market_trends import OFFERED, WANTED, MarketTrends, SlidingHeavyHitters, SpaceSaving, Trend
+
+HOUR = 3600
+
+
+class TestHeavyHitters:
+    """Tests für Space-Saving und gleitende Zeitfenster"""
+
+    def test_space_saving_keeps_frequent_names_in_fixed_size(self):
+        """Seltene Namen werden verdrängt, häufige bleiben mit Fehlerschranke erhalten"""
+        counter = SpaceSaving(capacity=3)
+        for name in ["Pikachu"] * 5 + ["Evoli"] * 3 + ["Mew", "Glumanda", "Schiggy"]:
+            counter.add(name)
+
+        assert len(counter) == 3
+        assert counter.counters["pikachu"][:2] == [5, 0]
+        assert counter.counters["schiggy"] == [3, 2, "Schiggy"]
+
+    def test_sliding_window_forgets_expired_slices(self):
+        """Einträge älter als das Fenster fallen heraus, Schreibweisen werden zusammengefasst"""
+        hitters = SlidingHeavyHitters(window=24 * HOUR, slices=24)
+        hitters.add("Pikachu", now=0)
+        hitters.add("pikachu", now=5 * HOUR)
+        hitters.add("Evoli", now=20 * HOUR)
+
+        assert hitters.top(5, now=20 * HOUR) == [Trend("Pikachu", 2, 0), Trend("Evoli", 1, 0)]
+        assert hitters.top(5, now=26 * HOUR) == [Trend("Evoli", 1, 0), Trend("pikachu", 1, 0)]
+        assert hitters.top(5, now=50 * HOUR) == []
+
+
+class TestMarketTrends:
+    """Tests für die Anbindung an den Marktzustand"""
+
+    def test_market_events_feed_trends_per_guild(self):
+        """Neue Angebote und Wünsche zählen pro Guild, Wünsche mit Tauschangebot zählen beide Seiten"""
+        market = MarketState()
+        trends = MarketTrends()
+        trends.attach(market)
+
+        market.offers.add({'name': "Pikachu", 'guild_id': 1})
+        market.offers.add({'name': "Pikachu ", 'guild_id': 2})
+        wish_id = market.wishes.add({'name': "Mew", 'guild_id': 1, 'offer_included': True,
+                                     'offer_data': {'name': "Pikachu"}})
+        market.wishes.remove(wish_id)
+
+        assert trends.top(1, OFFERED, "24h") == [Trend("Pikachu", 2, 0)]
+        assert trends.top(1, WANTED, "30d") == [Trend("Mew", 1, 0)]
+        assert trends.top(2, OFFERED, "7d") == [Trend("Pikachu", 1, 0)]
+
+        market.offers.drop_guild(1)
+        assert trends.top(1, OFFERED, "24h") == []
+        assert trends.top(99, WANTED, "24h") == []
@@ -0,0 +1,117 @@
+"""
+Tests für die Metriken (Registry, Prometheus-Export, View-Instrumentierung)
+"""
+import aiohttp
+import discord
+import pytest
+from unittest.mock import MagicMock
+
+from cogs.metrics import REGISTRY, MetricsRegistry, MetricsServer, TimedView
+
+
+class TestMetricsRegistry:
+    """Tests für Counter, Histogramme, Gauges und den Export"""
+
+    def test_same_labels_return_same_metric(self):
+        """Gleicher Name und gleiche Labels liefern dasselbe Objekt"""
+        registry = MetricsRegistry()
+        first = registry.counter("requests_total", route="/sets")
+        first.inc()
+        assert registry.counter("requests_total", route="/sets") is first
+        assert registry.counter("requests_total", route="/cards/{id}") is not first
+
+        with pytest.raises(ValueError):
+            registry.histogram("requests_total")
+
+    def test_histogram_export_is_cumulative(self):
+        """Buckets werden kumulativ mit +Inf, _sum und _count exportiert"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latenz", buckets=(0.1, 1.0), route="/sets")
+        for value in (0.05, 0.5, 0.7, 5.0):
+            histogram.observe(value)
+
+        text = registry.render_prometheus()
+        assert "# TYPE latency_seconds histogram" in text
+        assert 'latency_seconds_bucket{route="/sets",le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{route="/sets",le="1"} 3' in text
+        assert 'latency_seconds_bucket{route="/sets",le="+Inf"} 4' in text
+        assert 'latency_seconds_count{route="/sets"} 4' in text
+        assert 'latency_seconds_sum{route="/sets"} 6.25' in text
+
+    def test_quantile_interpolates_within_bucket(self):
+        """Quantile werden innerhalb des passenden Buckets interpoliert"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", buckets=(0.1, 0.2))
+        assert histogram.quantile(0.5) == 0.0
+
+        for _ in range(10):
+            histogram.observe(0.15)
+        assert 0.1 < histogram.quantile(0.5) <= 0.2
+        assert histogram.quantile(0.5) < histogram.quantile(0.95)
+
+    def test_gauge_function_and_label_escaping(self):
+        """Gauges lesen ihre Funktion beim Export, Label-Werte werden escaped"""
+        registry = MetricsRegistry()
+        values = []
+        registry.gauge("queue_size", function=lambda: len(values), queue='a"b')
+        values.extend([1, 2, 3])
+
+        assert 'queue_size{queue="a\\"b"} 3' in registry.render_prometheus()
+
+    async def test_timed_decorator_records_failures(self):
+        """Der Decorator misst auch Aufrufe, die eine Exception werfen"""
+        registry = MetricsRegistry()
+
+        @registry.timed("call_seconds", method="broken")
+        async def broken():
+            raise RuntimeError("kaputt")
+
+        with pytest.raises(RuntimeError):
+            await broken()
+        assert registry.histogram("call_seconds", method="broken").count == 1
+
+    async def test_server_serves_prometheus_text(self):
+        """Der Endpunkt liefert den Export unter /metrics"""
+        registry = MetricsRegistry()
+        registry.counter("pings_total").inc(2)
+        server = MetricsServer(registry, "127.0.0.1", 0)
+        await server.start()
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                    assert response.status == 200
+                    assert response.headers["Content-Type"] == "text/plain; version=0.0.4; charset=utf-8"
+                    assert "pings_total 2" in await response.text()
+        finally:
+            await server.stop()
+
+
+class TestTimedView:
+    """Tests für die Instrumentierung von View-Callbacks"""
+
+    async def test_callback_duration_and_errors_recorded(self):
+        """Callbacks werden gemessen, Fehler zusätzlich gezählt"""
+
+        class ProbeView(TimedView):
+            @discord.ui.button(label="Ok")
+            async def confirm(self, interaction, button):
+                pass
+
+            @discord.ui.button(label="Fehler")
+            async def explode(self, interaction, button):
+                raise RuntimeError("kaputt")
+
+        view = ProbeView()
+        interaction = MagicMock()
+        await view._scheduled_task(view.confirm, interaction)
+        await view._scheduled_task(view.explode, interaction)
+
+        assert REGISTRY.histogram(
+            "discord_view_callback_seconds", view="ProbeView", item="confirm"
+        ).count == 1
+        assert REGISTRY.histogram(
+            "discord_view_callback_seconds", view="ProbeView", item="explode"
+        ).count == 1
+        assert REGISTRY.counter(
+            "discord_view_callback_errors_total", view="ProbeView", item="explode"
+        ).value == 1
@@ -0,0 +1,106 @@
+"""
+Tests für Massenangebote von TCG-Karten
+"""
+import time
+
+from benchmarks.load import LoadSimulation
+from cogs.market_state import SqliteMarketState
+from cogs.tcg_bulk import MAX_BULK_OFFERS, BulkFailure, BulkLine, parse_bulk_lines
+from cogs.tcgdex_service import TCGdexService
+from tests.discord_fakes import FakeAttachment
+from tests.fake_tcgdex_server import FakeTCGdexServer
+
+
+class TestBulkParsing:
+    """Tests für das zeilenweise Lesen der Kartenliste"""
+
+    def test_parse_lines_with_header_separators_and_errors(self):
+        """Kopfzeile, Kommentare und Leerzeilen entfallen, Fehler behalten ihre Zeilennummer"""
+        lines = ["set_id,number,qty", "sv1,25", "", "# Doppelte", "swsh3;136;3", "base1 #4",
+                 "sv1", "sv2,7,0", "sv2\t8\t2"]
+        assert list(parse_bulk_lines(lines)) == [
+            BulkLine(2, "sv1", "25", 1),
+            BulkLine(5, "swsh3", "136", 3),
+            BulkLine(6, "base1", "4", 1),
+            BulkFailure(7, "sv1", "Format: set_id,nummer[,anzahl]"),
+            BulkFailure(8, "sv2,7,0", "Anzahl muss zwischen 1 und 50 liegen"),
+            BulkLine(9, "sv2", "8", 2),
+        ]
+        # Kopfzeile nach Kommentar und Leerzeile, eine spätere gilt nicht als Kopfzeile
+        lines = ["# Export", "", "Set_ID;Number", "sv1;25", "set_id,number"]
+        assert list(parse_bulk_lines(lines)) == [
+            BulkLine(4, "sv1", "25", 1),
+            BulkLine(5, "set_id", "number", 1),
+        ]
+
+    async def test_add_many_uses_one_transaction(self, tmp_path):
+        """Mehrere Angebote landen gemeinsam in der geteilten Datenbank und im Änderungsprotokoll"""
+        state = SqliteMarketState(str(tmp_path / "market.db"), poll_interval=0)
+        ids = state.offers.add_many([{'name': f"Karte {i}", 'guild_id': 1} for i in range(3)])
+        other = SqliteMarketState(str(tmp_path / "market.db"), poll_interval=0)
+
+        assert ids == [1, 2, 3]
+        assert [entry['name'] for entry in other.offers.for_guild(1).values()] == ["Karte 0", "Karte 1", "Karte 2"]
+        assert state.db.execute("SELECT COUNT(*) FROM market_changes").fetchone()[0] == 3
+        await state.close()
+        await other.close()
+
+
+class TestBulkListing:
+    """Tests für /anbieten-tcg-liste gegen den lokalen TCGdex-Ersatzserver"""
+
+    async def test_five_hundred_cards_in_one_summary(self):
+        """Knapp 500 Angebote aus einer CSV: gleiche Karten nur einmal abgerufen, Fehlschläge in einem Embed"""
+        async with FakeTCGdexServer(latency=0.005) as server:
+            simulation = LoadSimulation(users=1, seed=1)
+            (member,) = simulation.members
+            await simulation.cog.tcgdex_service.close()
+            simulation.cog.tcgdex_service = TCGdexService(base_url=server.base_url)
+            rows = ["set_id,number,qty", "sv1,999"] + [f"sv{1 + i % 8},{1 + i // 8},2" for i in range(249)]
+            rows += ["sv1,1,2", "kaputt"]
+            interaction = simulation.interaction(member)
+
+            started = time.perf_counter()
+            try:
+                await simulation.cog.anbieten_tcg_liste.callback(
+                    simulation.cog, interaction, FakeAttachment("\n".join(rows), "utf-8-sig")
+                )
+            finally:
+                await simulation.cog.tcgdex_service.close()
+            elapsed = time.perf_counter() - started
+
+        assert interaction.response.kind == "defer"
+        (summary,) = interaction.followup.messages
+        assert summary.embed.description == "**498** Angebote aus **250** verschiedenen Karten erstellt."
+        failures = summary.embed.fields[-1].value.split("\n")
+        assert failures == [
+            "Zeile 2: `sv1,999` - Nummer gibt es im Set nicht. Meintest du: `9`?",
+            f"Zeile 252: `sv1,1` - Mehr als {MAX_BULK_OFFERS} Angebote auf einmal",
+            "Zeile 253: `kaputt` - Format: set_id,nummer[,anzahl]",
+        ]
+        assert len(simulation.cog.market.offers) == 498
+        # Jede Karte einmal plus eine Kartenliste pro Set; die Zeile über dem Limit und
+        # die unbekannte Nummer werden gar nicht erst abgerufen
+        assert server.requests == 249 + 8
+        assert elapsed < 3
+
+    async def test_numbers_are_checked_against_the_card_list(self):
+        """Schreibweisen derselben Nummer teilen einen Abruf; gespeichert wird die Nummer aus dem Set"""
+        async with FakeTCGdexServer() as server:
+            simulation = LoadSimulation(users=1, seed=1)
+            (member,) = simulation.members
+            await simulation.cog.tcgdex_service.close()
+            simulation.cog.tcgdex_service = TCGdexService(base_url=server.base_url)
+            interaction = simulation.interaction(member)
+            try:
+                await simulation.cog.anbieten_tcg_liste.callback(
+                    simulation.cog, interaction, FakeAttachment("sv1,007\nsv1,7\nsv1,61", "utf-8-sig")
+                )
+            finally:
+                await simulation.cog.tcgdex_service.close()
+
+        (summary,) = interaction.followup.messages
+        assert [offer['tcg_card_number'] for offer in simulation.cog.market.offers] == ["7", "7"]
+        assert summary.embed.fields[-1].value.startswith("Zeile 3: `sv1,61` - Nummer gibt es im Set nicht. Meintest du:")
+        # Eine Kartenliste und eine Karte
+        assert server.requests == 2
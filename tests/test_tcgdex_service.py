@@ -5,7 +5,21 @@ import pytest
 import asyncio
 from unittest.mock import AsyncMock, patch
 import aiohttp
-from cogs.tcgdex_service import TCGdexService
+from aiohttp import web
+from tests.fake_tcgdex_server import FakeTCGdexServer, FaultInjection, parse_latency
+from cogs.tcgdex_service import (
+    TCGdexService, TransportProfile, TransportStats, select_json_loads,
+    RetryPolicy, CircuitBreaker, ResponseCache, route_key, TCGdexResponse
+)
+
+
+async def start_local_api(app):
+    """Startet eine aiohttp-App auf einem freien Port und liefert (runner, base_url)"""
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    return runner, f"http://127.0.0.1:{runner.addresses[0][1]}/v2/de"
 
 
 class TestTCGdexService:
@@ -724,3 +738,501 @@ class TestTCGdexService:
         
         await service.close()
 
+
+class TestTransportProfile:
+    """Tests für Transport-Profil, JSON-Decoder und Transport-Statistiken"""
+    
+    @pytest.fixture
+    async def local_api(self):
+        """Lokaler Server mit einem komprimierbaren /sets/{id} Endpunkt"""
+        async def handle_set(request):
+            payload = {"id": request.match_info["set_id"], "cards": [{"localId": str(i)} for i in range(50)]}
+            response = web.json_response(payload)
+            response.enable_compression()
+            return response
+        
+        app = web.Application()
+        app.router.add_get("/v2/de/sets/{set_id}", handle_set)
+        runner, base_url = await start_local_api(app)
+        yield base_url
+        await runner.cleanup()
+    
+    def test_from_env_overrides_defaults(self, monkeypatch):
+        """Umgebungsvariablen überschreiben die Standardwerte"""
+        monkeypatch.setenv("TCGDEX_POOL_LIMIT", "50")
+        monkeypatch.setenv("TCGDEX_DNS_TTL", "none")
+        monkeypatch.setenv("TCGDEX_FAST_JSON", "false")
+        
+        profile = TransportProfile.from_env()
+        
+        assert profile.limit == 50
+        assert profile.ttl_dns_cache is None
+        assert profile.fast_json is False
+        assert profile.limit_per_host == TransportProfile().limit_per_host
+    
+    def test_untuned_profile_uses_aiohttp_defaults(self):
+        """Das untuned-Profil setzt keine Connector-Argumente"""
+        assert TransportProfile.untuned().connector_kwargs() == {}
+        assert TransportProfile().connector_kwargs()["limit_per_host"] == 10
+    
+    def test_json_decoder_fallback(self):
+        """Ohne fast_json wird der stdlib-Decoder verwendet"""
+        import json
+        assert select_json_loads(fast=False) is json.loads
+        assert select_json_loads(fast=True)(b'{"a": 1}') == {"a": 1}
+    
+    def test_reuse_rate(self):
+        """Wiederverwendungsrate bezieht sich auf alle Verbindungs-Events"""
+        stats = TransportStats()
+        assert stats.reuse_rate == 0.0
+        stats.connections_created = 1
+        stats.connections_reused = 3
+        assert stats.reuse_rate == 0.75
+    
+    @pytest.mark.asyncio
+    async def test_request_records_transport_stats(self, local_api):
+        """Requests gegen den lokalen Server füllen die Statistiken"""
+        service = TCGdexService(transport_profile=TransportProfile(), cache_ttl={})
+        service.BASE_URL = local_api
+        try:
+            for _ in range(3):
+                data = await service._request("/sets/sv4")
+                assert data["id"] == "sv4"
+        finally:
+            await service.close()
+        
+        stats = service.transport_stats
+        assert stats.requests == 3
+        assert stats.connections_created == 1
+        assert stats.connections_reused == 2
+        assert stats.bytes_received > stats.bytes_on_wire  # gzip-komprimiert übertragen
+    
+    @pytest.mark.asyncio
+    async def test_untuned_profile_requests_uncompressed_bodies(self, local_api):
+        """Ohne Kompression wird "identity" angefragt und unkomprimiert übertragen"""
+        service = TCGdexService(transport_profile=TransportProfile.untuned(), cache_ttl={})
+        service.BASE_URL = local_api
+        try:
+            assert (await service._request("/sets/sv4"))["id"] == "sv4"
+        finally:
+            await service.close()
+        
+        stats = service.transport_stats
+        assert stats.bytes_received == stats.bytes_on_wire
+
+
+class TestResilience:
+    """Tests für Retry, Circuit Breaker und Stale-Fallback"""
+    
+    @pytest.fixture
+    async def flaky_api(self):
+        """Server, dessen Antworten pro Request aus einer Liste von Status-Codes kommen"""
+        state = {"script": [], "calls": 0}
+        
+        async def handle_card(request):
+            state["calls"] += 1
+            status = state["script"].pop(0) if state["script"] else 200
+            if status != 200:
+                return web.Response(status=status)
+            return web.json_response({"id": request.match_info["card_id"], "name": "Pikachu"})
+        
+        app = web.Application()
+        app.router.add_get("/v2/de/cards/{card_id}", handle_card)
+        runner, base_url = await start_local_api(app)
+        yield base_url, state
+        await runner.cleanup()
+    
+    @pytest.fixture
+    def service(self):
+        """Service ohne Wartezeiten zwischen den Versuchen"""
+        return TCGdexService(
+            transport_profile=TransportProfile(),
+            retry_policy=RetryPolicy(attempts=3, base_delay=0, max_delay=0),
+            breaker_threshold=2,
+            breaker_reset_timeout=60,
+            cache_ttl={}  # Cache nur als Fallback bei Fehlern
+        )
+    
+    def test_route_key(self):
+        """Endpunkte werden auf ihre Route normalisiert"""
+        assert route_key("/sets") == "/sets"
+        assert route_key("/sets/sv4") == "/sets/{id}"
+        assert route_key("/cards/sv4-25") == "/cards/{id}"
+    
+    def test_circuit_breaker_transitions(self):
+        """Breaker öffnet nach Schwellwert und lässt nach Timeout eine Probe durch"""
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        
+        breaker.record_failure()
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+        
+        now[0] = 10.0
+        assert breaker.allow_request()  # Probe
+        assert not breaker.allow_request()  # nur eine Probe gleichzeitig
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+    
+    def test_retry_delay_is_bounded(self):
+        """Jitter-Backoff bleibt innerhalb von max_delay und respektiert Retry-After"""
+        policy = RetryPolicy(attempts=5, base_delay=0.5, max_delay=1.0)
+        assert all(0 <= policy.delay(attempt) <= 1.0 for attempt in range(10))
+        assert policy.delay(0, retry_after=0.3) == 0.3
+        assert policy.delay(0, retry_after=30) == 1.0
+    
+    @pytest.mark.asyncio
+    async def test_retries_transient_errors(self, service, flaky_api):
+        """503 und 429 werden wiederholt bis der Request erfolgreich ist"""
+        base_url, state = flaky_api
+        service.BASE_URL = base_url
+        state["script"] = [503, 429]
+        try:
+            card = await service.get_card("sv4", "25")
+        finally:
+            await service.close()
+        
+        assert card["name"] == "Pikachu"
+        assert state["calls"] == 3
+        assert not service.served_stale("/cards/sv4-25")
+    
+    @pytest.mark.asyncio
+    async def test_404_is_not_retried(self, service, flaky_api):
+        """404 ist endgültig und zählt nicht als Ausfall"""
+        base_url, state = flaky_api
+        service.BASE_URL = base_url
+        state["script"] = [404]
+        try:
+            assert await service.get_card("sv4", "999") is None
+        finally:
+            await service.close()
+        
+        assert state["calls"] == 1
+        assert service.breakers["/cards/{id}"].failures == 0
+    
+    @pytest.mark.asyncio
+    async def test_serves_stale_and_opens_breaker(self, service, flaky_api):
+        """Bei Ausfall wird die letzte Antwort als stale geliefert, danach fail-fast"""
+        base_url, state = flaky_api
+        service.BASE_URL = base_url
+        try:
+            fresh = await service.get_card_response("sv4", "25")
+            assert not fresh.stale
+            
+            state["script"] = [500] * 6
+            stale = await service.get_card_response("sv4", "25")
+            assert stale.stale
+            assert stale.data["name"] == "Pikachu"
+            assert "_stale" not in stale.data
+            assert state["calls"] == 4
+            
+            await service.get_card("sv4", "25")  # zweiter Ausfall öffnet den Breaker
+            assert service.breakers["/cards/{id}"].state == CircuitBreaker.OPEN
+            calls_before = state["calls"]
+            
+            stale_again = await service.get_card_response("sv4", "25")
+            assert stale_again.stale
+            assert state["calls"] == calls_before  # kein Request bei offenem Breaker
+            assert service.extract_card_info(stale_again.data, stale=stale_again.stale)["stale"] is True
+            assert await service.get_card("sv4", "1") is None  # ohne Cache kein Ergebnis
+        finally:
+            await service.close()
+
+
+class TestStaleWhileRevalidate:
+    """Tests für TTL-Cache mit Hintergrund-Erneuerung"""
+    
+    @pytest.fixture
+    def clock(self):
+        return [1000.0]
+    
+    @pytest.fixture
+    def service(self, clock):
+        """Service mit steuerbarer Uhr und gemocktem _fetch"""
+        service = TCGdexService(cache_ttl={"/cards/{id}": 100})
+        service.cache = ResponseCache(clock=lambda: clock[0])
+        return service
+    
+    def _mock_fetch(self, service, gate=None):
+        """Ersetzt _fetch durch eine Funktion, die Aufrufe zählt und den Cache füllt"""
+        from cogs.tcgdex_service import TCGdexResponse
+        calls = []
+        
+        async def fake_fetch(endpoint):
+            calls.append(endpoint)
+            if gate is not None:
+                await gate.wait()
+            data = {"id": endpoint, "version": len(calls)}
+            service.cache.put(endpoint, data)
+            return TCGdexResponse(data, 200)
+        
+        service._fetch = fake_fetch
+        return calls
+    
+    @pytest.mark.asyncio
+    async def test_fresh_hit_skips_api(self, service):
+        """Innerhalb der TTL wird nur einmal abgefragt"""
+        calls = self._mock_fetch(service)
+        first = await service._request("/cards/sv4-1")
+        second = await service._request("/cards/sv4-1")
+        
+        assert first is second
+        assert calls == ["/cards/sv4-1"]
+        assert service.cache_stats.hits == 1
+        assert service.cache_stats.misses == 1
+        assert service.cache_stats.fast_fraction == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_expired_key_served_immediately_with_single_refresh(self, service, clock):
+        """Abgelaufene Keys werden sofort geliefert und genau einmal erneuert"""
+        gate = asyncio.Event()
+        calls = self._mock_fetch(service, gate)
+        gate.set()
+        await service._request("/cards/sv4-1")
+        gate.clear()
+        
+        clock[0] += 150  # TTL abgelaufen
+        results = await asyncio.gather(*(service._request("/cards/sv4-1") for _ in range(5)))
+        
+        assert all(result["version"] == 1 for result in results)
+        assert service.cache_stats.revalidations == 5
+        assert service.cache_stats.refreshes_started == 1
+        assert service.cache_stats.refreshes_deduplicated == 4
+        
+        gate.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert calls == ["/cards/sv4-1", "/cards/sv4-1"]
+        assert (await service._request("/cards/sv4-1"))["version"] == 2
+        await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_hot_key_refreshed_before_expiry(self, service, clock):
+        """Häufig genutzte Keys werden ab REFRESH_AHEAD_RATIO vorab erneuert"""
+        calls = self._mock_fetch(service)
+        await service._request("/cards/sv4-1")
+        await service._request("/cards/sv4-2")
+        for _ in range(service.HOT_KEY_HITS):
+            await service._request("/cards/sv4-1")
+        
+        clock[0] += 90  # noch frisch, aber > 80% der TTL
+        await service._request("/cards/sv4-1")
+        await service._request("/cards/sv4-2")
+        await asyncio.sleep(0)
+        
+        assert calls.count("/cards/sv4-1") == 2  # heißer Key vorab erneuert
+        assert calls.count("/cards/sv4-2") == 1  # kalter Key wartet bis zum Ablauf
+        await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_too_old_entries_are_fetched_synchronously(self, service, clock):
+        """Nach CACHE_MAX_STALE wird wieder synchron abgefragt"""
+        calls = self._mock_fetch(service)
+        await service._request("/cards/sv4-1")
+        clock[0] += 100 + service.CACHE_MAX_STALE
+        
+        result = await service._request("/cards/sv4-1")
+        
+        assert result["version"] == 2
+        assert len(calls) == 2
+        assert service.cache_stats.misses == 2
+
+
+class TestFakeServer:
+    """Tests gegen den lokalen TCGdex-Ersatzserver (ohne Netzwerk)"""
+    
+    @pytest.fixture
+    def fast_retry(self):
+        return RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+    
+    @pytest.mark.asyncio
+    async def test_get_sets_by_year_offline(self):
+        """get_sets_by_year funktioniert end-to-end gegen den Ersatzserver"""
+        async with FakeTCGdexServer() as server:
+            service = TCGdexService(base_url=server.base_url)
+            try:
+                sets, error = await service.get_sets_by_year(2023)
+                card = await service.get_card(sets[0]["id"], "1")
+            finally:
+                await service.close()
+        
+        assert error is None
+        assert sets and all(s["releaseDate"].startswith("2023") for s in sets)
+        assert card["id"] == f"{sets[0]['id']}-1"
+        # 1x /sets + 1x pro Set-Detail + 1x Karte
+        assert server.requests == 1 + len(server.corpus["sets"]) + 1
+    
+    @pytest.mark.asyncio
+    async def test_base_url_from_env(self, monkeypatch):
+        """TCGDEX_BASE_URL überschreibt die API-Adresse"""
+        monkeypatch.setenv("TCGDEX_BASE_URL", "http://127.0.0.1:8765/v2/de/")
+        assert TCGdexService().BASE_URL == "http://127.0.0.1:8765/v2/de"
+        assert TCGdexService(base_url="http://localhost/v2/en").BASE_URL == "http://localhost/v2/en"
+        monkeypatch.delenv("TCGDEX_BASE_URL")
+        assert TCGdexService().BASE_URL == "https://api.tcgdex.net/v2/de"
+    
+    @pytest.mark.asyncio
+    async def test_scripted_failures_are_retried(self, fast_retry):
+        """Geskriptete 5xx/429 werden pro Route ausgespielt und vom Service wiederholt"""
+        async with FakeTCGdexServer() as server:
+            server.script("/cards/{id}", [502, 429])
+            service = TCGdexService(base_url=server.base_url, retry_policy=fast_retry, cache_ttl={})
+            try:
+                card = await service.get_card("sv1", "1")
+            finally:
+                await service.close()
+        
+        assert card["id"] == "sv1-1"
+        assert server.statuses == {502: 1, 429: 1, 200: 1}
+    
+    @pytest.mark.asyncio
+    async def test_injected_not_found_and_timeouts(self, fast_retry):
+        """404-Rate und hängende Requests werden wie bei der echten API behandelt"""
+        faults = FaultInjection(not_found_rate=1.0)
+        async with FakeTCGdexServer(faults=faults) as server:
+            service = TCGdexService(base_url=server.base_url, retry_policy=fast_retry, cache_ttl={})
+            service.transport.timeout = 0.2
+            try:
+                assert await service.get_card("sv1", "1") is None
+                assert server.statuses[404] == 1  # 404 wird nicht wiederholt
+                
+                server.faults = FaultInjection(timeout_rate=1.0, timeout_seconds=5)
+                assert await service.get_card("sv1", "2") is None
+                assert server.statuses["timeout"] == 3
+            finally:
+                await service.close()
+    
+    def test_latency_distributions(self):
+        """Latenz-Angaben werden geparst und sind mit Seed reproduzierbar"""
+        import random
+        assert parse_latency("0.05")(random.Random(1)) == 0.05
+        assert 0.01 <= parse_latency("uniform:0.01:0.02")(random.Random(1)) <= 0.02
+        
+        samples = [parse_latency("lognormal:0.08:0.6")(random.Random(seed)) for seed in range(500)]
+        samples.sort()
+        assert 0.06 < samples[250] < 0.1  # Median nahe 80 ms
+        assert samples[-1] > 0.2  # lange Tail
+        with pytest.raises(ValueError):
+            parse_latency("pareto:1:2")
+
+
+class TestCardNumberValidation:
+    """Tests für die Prüfung der Kartennummer gegen die Kartenliste des Sets"""
+    
+    async def _submit(self, simulation, view, number):
+        from cogs.pokemon_tcg import TCGCardNumberModal
+        modal = TCGCardNumberModal(view)
+        modal.card_number_input._value = number
+        interaction = simulation.interaction(simulation.members[0])
+        await modal.on_submit(interaction)
+        return interaction
+    
+    @pytest.mark.asyncio
+    async def test_unknown_numbers_get_suggestions_without_api_call(self):
+        """Alphanumerische Nummern werden angenommen, unbekannte ohne Kartenabruf mit Vorschlägen abgelehnt"""
+        from benchmarks.load import LoadSimulation
+        from cogs.pokemon_tcg import TCGOfferView
+        async with FakeTCGdexServer() as server:
+            details = server.corpus["set_details"]["sv1"]
+            details["cards"].append({"id": "sv1-TG01", "localId": "TG01", "name": "Pikachu"})
+            server.corpus["cards"]["sv1-TG01"] = {**server.corpus["cards"]["sv1-1"], "id": "sv1-TG01", "localId": "TG01"}
+            simulation = LoadSimulation(users=1, seed=1)
+            cog = simulation.cog
+            await cog.tcgdex_service.close()
+            cog.tcgdex_service = TCGdexService(base_url=server.base_url)
+            try:
+                year = int(details["releaseDate"][:4])
+                sets, _ = await cog.tcgdex_service.get_sets_by_year(year)
+                view = TCGOfferView(cog, year, sets)
+                view.selected_set_id = "sv1"
+                view.selected_set = next(s for s in sets if s["id"] == "sv1")
+                loaded = server.requests
+                
+                unknown = await self._submit(simulation, view, "61")
+                typo = await self._submit(simulation, view, "tg1")
+                assert server.requests == loaded
+                padded = await self._submit(simulation, view, "007")
+                assert view.card_number == "7"
+                alphanumeric = await self._submit(simulation, view, "tg01")
+            finally:
+                await cog.tcgdex_service.close()
+        
+        assert unknown.response.kind == typo.response.kind == "defer"
+        (rejected,) = unknown.followup.messages
+        assert "**61** gibt es in" in rejected.content
+        assert "Das Set hat 61 Karten (`1` bis `TG01`)" in rejected.content
+        assert "Meintest du: `TG01`" in typo.followup.messages[0].content
+        assert padded.response.kind == alphanumeric.response.kind == "defer"
+        assert view.card_number == "TG01" and view.card_info["name"] == server.corpus["cards"]["sv1-1"]["name"]
+        # Nur die beiden bekannten Nummern wurden abgerufen
+        assert server.requests == loaded + 2
+
+
+class TestCardAccess:
+    """Tests für die begrenzte Abrufstatistik pro Karte"""
+    
+    @pytest.mark.asyncio
+    async def test_card_access_is_bounded_and_ages(self):
+        """Die Statistik wächst nicht mit jeder Karte; beim Kürzen bleiben die beliebtesten mit halbierten Zählern"""
+        service = TCGdexService()
+        service.CARD_ACCESS_KEEP = 3
+        service._request = AsyncMock(return_value=None)
+        for _ in range(8):
+            await service.get_card("sv1", "1")
+        for _ in range(4):
+            await service.get_card("sv1", "2")
+        for number in range(3, 10):
+            await service.get_card("sv1", str(number))
+        await service.close()
+        
+        assert len(service.card_access) <= 2 * service.CARD_ACCESS_KEEP
+        assert [card_id for card_id, _ in service.card_access.most_common(2)] == ["sv1-1", "sv1-2"]
+        assert service.card_access["sv1-1"] < 8
+
+
+class TestSetCatalog:
+    """Tests für die Frische des Set-Katalogs"""
+    
+    @pytest.mark.asyncio
+    async def test_incomplete_catalog_is_retried_after_a_short_interval(self):
+        """Ein dauerhaft fehlerhaftes Set baut den Katalog nicht bei jedem Aufruf neu"""
+        service = TCGdexService()
+        service.get_all_sets = AsyncMock(return_value=([{"id": "sv1"}, {"id": "kaputt"}], None))
+        service.get_set = AsyncMock(side_effect=lambda set_id: {"id": set_id, "releaseDate": "2023-03-31"}
+                                    if set_id == "sv1" else None)
+        try:
+            for _ in range(3):
+                catalog, error = await service.get_set_catalog()
+            assert error is None and not catalog.complete
+            assert service.get_all_sets.await_count == 1
+            
+            service.catalog.loaded_at -= service.CATALOG_RETRY_INTERVAL
+            await service.get_set_catalog()
+            assert service.get_all_sets.await_count == 2
+        finally:
+            await service.close()
+    
+    @pytest.mark.asyncio
+    async def test_stale_set_list_marks_the_catalog(self):
+        """Eine Set-Liste aus dem Cache nach API-Fehler kennzeichnet den Katalog, die Liste bleibt unverändert"""
+        sets = [{"id": "sv1"}]
+        responses = {
+            "/sets": TCGdexResponse(sets, None, stale=True),
+            "/sets/sv1": TCGdexResponse({"id": "sv1", "releaseDate": "2023-03-31"}, 200),
+        }
+        service = TCGdexService()
+        service._fetch = AsyncMock(side_effect=lambda endpoint: responses[endpoint])
+        try:
+            catalog, error = await service.get_set_catalog()
+            assert error is None and catalog.complete and catalog.stale
+            assert service.sets_stale() and service.served_stale("/sets")
+            assert sets == [{"id": "sv1"}]
+            
+            responses["/sets"] = TCGdexResponse(sets, 200)
+            service.catalog.loaded_at -= service.CATALOG_RETRY_INTERVAL
+            await service.get_set_catalog()
+            assert not service.sets_stale() and not service.served_stale("/sets")
+        finally:
+            await service.close()
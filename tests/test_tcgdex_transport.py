@@ -0,0 +1,143 @@
+"""
+Tests für die TCGdex-Transporte (Cache, Aufzeichnen, Abspielen, Archivformat)
+"""
+import aiohttp
+import pytest
+
+from cogs.tcgdex_service import RetryPolicy, TCGdexService, TransportProfile, TransportStats
+from cogs.tcgdex_transport import (
+    ArchiveReader, ArchiveWriter, CachedTransport, LiveTransport,
+    RecordingTransport, ReplayTransport, Transport
+)
+from tests.fake_tcgdex_server import FakeTCGdexServer
+
+
+class FailingTransport(Transport):
+    """Transport, der bei jedem Aufruf einen Verbindungsfehler wirft"""
+
+    async def get(self, endpoint, url):
+        raise aiohttp.ClientConnectionError("offline")
+
+
+class TestArchive:
+    """Tests für das Archivformat"""
+
+    def test_roundtrip_and_order(self, tmp_path):
+        """Antworten kommen pro Key in Aufnahme-Reihenfolge, danach bleibt die letzte"""
+        path = str(tmp_path / "api.tcga")
+        writer = ArchiveWriter(path)
+        large = b'{"cards": [' + b'{"name": "Pikachu"},' * 200 + b'{}]}'
+        writer.append("/sets/sv4", 503, retry_after=1.5, elapsed=0.2)
+        writer.append("/sets/sv4", 200, large, elapsed=0.05)
+        writer.append("/cards/sv4-1", 200, b'{"id": "sv4-1"}')
+        writer.close()
+
+        reader = ArchiveReader(path)
+        try:
+            assert len(reader) == 3
+            assert "/sets/sv4" in reader and "/sets/sv5" not in reader
+            status, body, retry_after, elapsed = reader.read("/sets/sv4")
+            assert (status, body, retry_after) == (503, b"", 1.5)
+            assert reader.read("/sets/sv4")[1] == large
+            assert reader.read("/sets/sv4")[0] == 200  # letzte Antwort wiederholt sich
+            assert reader.read("/cards/sv4-1")[1] == b'{"id": "sv4-1"}'
+            assert reader.read("/cards/unknown") is None
+        finally:
+            reader.close()
+
+        # Große Bodies werden komprimiert abgelegt
+        assert (tmp_path / "api.tcga").stat().st_size < len(large)
+
+    def test_unclosed_archive_is_rejected(self, tmp_path):
+        """Ein Archiv ohne Index (Aufnahme abgebrochen) wird erkannt"""
+        path = str(tmp_path / "broken.tcga")
+        writer = ArchiveWriter(path)
+        writer.append("/sets", 200, b"[]")
+        writer._file.flush()
+
+        with pytest.raises(ValueError):
+            ArchiveReader(path)
+        writer.close()
+
+
+class TestTransportInterface:
+    """Tests für die abstrakte Basisklasse"""
+
+    def test_missing_get_fails_on_instantiation(self):
+        """Ein Transport ohne ``get`` scheitert beim Erzeugen, nicht erst beim ersten Abruf"""
+        class Incomplete(Transport):
+            async def close(self):
+                pass
+
+        with pytest.raises(TypeError):
+            Incomplete()
+        assert isinstance(FailingTransport(), Transport)
+
+
+class TestRecordReplay:
+    """Tests für Aufzeichnen und deterministisches Abspielen"""
+
+    @pytest.fixture
+    def fast_retry(self):
+        return RetryPolicy(attempts=2, base_delay=0, max_delay=0)
+
+    async def test_replay_reproduces_recorded_session(self, tmp_path, fast_retry):
+        """Eine aufgezeichnete Sitzung liefert beim Abspielen dieselben Ergebnisse ohne Server"""
+        path = str(tmp_path / "session.tcga")
+        async with FakeTCGdexServer() as server:
+            server.script("/cards/{id}", [503])
+            recorder = RecordingTransport(LiveTransport(TransportProfile(), TransportStats()), path)
+            service = TCGdexService(base_url=server.base_url, retry_policy=fast_retry,
+                                    cache_ttl={}, transport=recorder)
+            try:
+                recorded_sets, _ = await service.get_sets_by_year(2023)
+                recorded_card = await service.get_card("sv1", "1")
+            finally:
+                await service.close()
+            live_requests = server.requests
+
+        replay = ReplayTransport(path)
+        service = TCGdexService(retry_policy=fast_retry, cache_ttl={}, transport=replay)
+        try:
+            replayed_sets, error = await service.get_sets_by_year(2023)
+            replayed_card = await service.get_card("sv1", "1")
+            missing = await service.get_card("sv1", "999")
+        finally:
+            await service.close()
+
+        assert error is None
+        assert [s["id"] for s in replayed_sets] == [s["id"] for s in recorded_sets]
+        assert replayed_card == recorded_card
+        assert missing is None
+        reader = ArchiveReader(path)
+        assert len(reader) == live_requests  # inkl. des 503
+        reader.close()
+
+    async def test_transport_errors_are_recorded(self, tmp_path, fast_retry):
+        """Verbindungsfehler werden aufgezeichnet und beim Abspielen erneut geworfen"""
+        path = str(tmp_path / "errors.tcga")
+        recorder = RecordingTransport(FailingTransport(), path)
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await recorder.get("/sets", "http://offline/sets")
+        await recorder.close()
+
+        replay = ReplayTransport(path)
+        with pytest.raises(aiohttp.ClientConnectionError):
+            await replay.get("/sets", "http://offline/sets")
+        await replay.close()
+
+    async def test_cached_transport_hits_server_once(self):
+        """Der Cache-Transport fragt erfolgreiche Endpunkte nur einmal ab"""
+        async with FakeTCGdexServer() as server:
+            service = TCGdexService(
+                base_url=server.base_url, cache_ttl={},
+                transport=CachedTransport(LiveTransport(TransportProfile(), TransportStats()))
+            )
+            try:
+                first = await service.get_card("sv1", "1")
+                second = await service.get_card("sv1", "1")
+            finally:
+                await service.close()
+
+        assert first == second
+        assert server.requests == 1
@@ -0,0 +1,78 @@
+"""
+Tests für Set-Katalog und Vorwärmen der TCGdex-Daten
+"""
+import asyncio
+import json
+
+from cogs.tcgdex_service import TCGdexService
+from cogs.tcgdex_warmup import DISABLED, READY, TCGdexWarmup, load_card_access
+from tests.fake_tcgdex_server import FakeTCGdexServer
+
+
+class TestSetCatalog:
+    """Tests für den Set-Katalog im Service"""
+
+    async def test_concurrent_year_queries_share_one_catalog_load(self):
+        """Gleichzeitige Abfragen lösen nur einen Abruf aller Sets aus, spätere keinen mehr"""
+        async with FakeTCGdexServer() as server:
+            service = TCGdexService(base_url=server.base_url)
+            try:
+                results = await asyncio.gather(*(service.get_sets_by_year(year) for year in (2022, 2023, 2023)))
+                requests = server.requests
+                sets, error = await service.get_sets_by_year(2024)
+            finally:
+                await service.close()
+
+        assert all(error is None for _, error in results)
+        assert requests == 1 + len(server.corpus["sets"])
+        assert server.requests == requests
+        assert error is None and sets == service.catalog.by_year[2024]
+        name = next(iter(server.corpus["cards"].values()))["name"]
+        assert service.catalog.species[name.lower()]
+
+
+class TestTCGdexWarmup:
+    """Tests für das Vorwärmen nach dem Start"""
+
+    async def test_warmup_loads_catalog_and_popular_cards(self, tmp_path):
+        """Katalog und die beliebtesten Karten aus der Statistik liegen danach im Cache"""
+        stats_path = tmp_path / "access.json"
+        stats_path.write_text(json.dumps({"sv1-1": 9, "sv1-2": 4, "kaputt": "x"}), encoding="utf-8")
+
+        async with FakeTCGdexServer() as server:
+            service = TCGdexService(base_url=server.base_url)
+            warmup = TCGdexWarmup(service, stats_path=str(stats_path), popular_cards=2)
+            try:
+                assert await warmup.wait_ready(0)  # nicht gestartet: nichts zu warten
+                warmup.start()
+                assert await warmup.wait_ready(10)
+                requests = server.requests
+                await service.get_sets_by_year(2023)
+                await service.get_card("sv1", "1")
+            finally:
+                await warmup.close()
+                await service.close()
+
+        assert warmup.state == READY
+        assert warmup.steps["popular_cards"] == "2/2"
+        assert server.paths["/cards/{id}"] == 2
+        assert server.requests == requests  # alles aus dem vorgewärmten Cache
+        # Vorwärmen zählt nicht als Abruf, der echte Abruf schon
+        assert load_card_access(str(stats_path)) == {"sv1-1": 10, "sv1-2": 4}
+
+    async def test_wait_ready_is_bounded(self):
+        """Läuft das Vorwärmen noch, geben wartende Befehle nach der Frist auf"""
+        async with FakeTCGdexServer(latency=0.2) as server:
+            service = TCGdexService(base_url=server.base_url)
+            warmup = TCGdexWarmup(service)
+            try:
+                warmup.start()
+                assert not await warmup.wait_ready(0.01)
+                assert warmup.warming
+            finally:
+                await warmup.close()
+                await service.close()
+
+        assert await TCGdexWarmup(service, enabled=False).wait_ready(0)
+        assert TCGdexWarmup(service, enabled=False).start() is None
+        assert TCGdexWarmup(service, enabled=False).state == DISABLED
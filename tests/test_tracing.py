@@ -0,0 +1,108 @@
+"""
+Tests für das Tracing (Spans, Sampling, Exporter, View-Verknüpfung)
+"""
+import json
+
+import discord
+import pytest
+from unittest.mock import MagicMock
+
+from cogs.metrics import TimedView
+from cogs.tracing import TRACER, JsonlFileExporter, Tracer
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    """Globaler Tracer mit vollem Sampling und leerem Puffer"""
+    monkeypatch.setattr(TRACER, "sample_rate", 1.0)
+    TRACER.buffer.spans.clear()
+    yield TRACER
+    TRACER.buffer.spans.clear()
+
+
+class TestTracer:
+    """Tests für Spans und Sampling"""
+
+    async def test_nested_spans_are_linked(self):
+        """Kind-Spans übernehmen Trace-ID und verweisen auf den Eltern-Span"""
+        tracer = Tracer(sample_rate=1.0)
+
+        @tracer.traced("fetch")
+        async def fetch():
+            pass
+
+        with tracer.span("flow", trace_id=42, user_id=7) as root:
+            await fetch()
+
+        spans = tracer.buffer.trace("42")
+        assert [s["name"] for s in spans] == ["flow", "fetch"]
+        assert spans[0]["parent_id"] is None
+        assert spans[0]["attributes"] == {"user_id": 7}
+        assert spans[1]["parent_id"] == root.span_id
+        assert tracer.buffer.recent_roots() == [spans[0]]
+
+    def test_sampling_is_per_trace(self):
+        """Nicht gesampelte Traces exportieren auch keine Kind-Spans"""
+        tracer = Tracer(sample_rate=0.0)
+        with tracer.span("flow", trace_id=1):
+            with tracer.span("step") as step:
+                step.set("ignored", True)
+        assert len(tracer.buffer.spans) == 0
+
+        tracer.sample_rate = 0.5
+        decisions = {tracer.is_sampled(str(i)) for i in range(200)}
+        assert decisions == {True, False}
+        assert tracer.is_sampled("123") == tracer.is_sampled("123")
+
+    async def test_error_is_recorded(self):
+        """Exceptions werden am Span vermerkt und weitergereicht"""
+        tracer = Tracer(sample_rate=1.0)
+
+        @tracer.traced()
+        async def broken():
+            raise RuntimeError("kaputt")
+
+        with pytest.raises(RuntimeError):
+            await broken()
+        assert tracer.buffer.spans[0]["error"] == "RuntimeError: kaputt"
+
+    def test_file_exporter_writes_jsonl(self, tmp_path):
+        """Der Datei-Exporter schreibt eine JSON-Zeile pro Span und rotiert"""
+        path = tmp_path / "traces.jsonl"
+        exporter = JsonlFileExporter(str(path), max_bytes=400, backups=1)
+        tracer = Tracer(sample_rate=1.0, file_exporter=exporter)
+        for i in range(10):
+            with tracer.span("step", trace_id=i):
+                pass
+        exporter.close()
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert lines and all(json.loads(line)["name"] == "step" for line in lines)
+        assert (tmp_path / "traces.jsonl.1").exists()
+
+
+class TestViewTracing:
+    """Tests für die Verknüpfung von Interaktionen eines Flows"""
+
+    async def test_view_callbacks_join_creating_trace(self, tracer):
+        """Eine View setzt den Trace fort, in dem sie erstellt wurde"""
+
+        class StepView(TimedView):
+            @discord.ui.button(label="Weiter")
+            async def next_step(self, interaction, button):
+                with TRACER.span("render"):
+                    pass
+
+        with tracer.span("/anbieten-tcg", trace_id=1001) as command_span:
+            view = StepView()
+
+        interaction = MagicMock()
+        interaction.id = 2002
+        await view._scheduled_task(view.next_step, interaction)
+
+        spans = tracer.buffer.trace("1001")
+        names = [s["name"] for s in spans]
+        assert names == ["/anbieten-tcg", "StepView.next_step", "render"]
+        assert spans[1]["parent_id"] == command_span.span_id
+        assert spans[1]["attributes"]["interaction_id"] == 2002
+        assert spans[2]["parent_id"] == spans[1]["span_id"]
@@ -0,0 +1,66 @@
+"""
+Tests für das Tauschbuch und die Reputation pro Nutzer
+"""
+import time
+
+from cogs.trade_ledger import Reputation, TradeLedger
+
+
+class TestTradeLedger:
+    """Tests für Einträge, Aggregate, Abgleich und Kompaktierung"""
+
+    def test_record_updates_reputation_of_both_sides(self, tmp_path):
+        """Jeder Tausch zählt für beide Seiten, Partner nur einmal"""
+        ledger = TradeLedger(str(tmp_path / "trades.db"), poll_interval=0)
+        assert ledger.record("offer", 1, 10, 20, "Pikachu", "Evoli") is None  # nicht geöffnet
+        ledger.open()
+        try:
+            first = ledger.record("offer", 1, 10, 20, "Pikachu", "Evoli", source_id=7)
+            ledger.record("wish", 1, 20, 10, "Glumanda", "Schiggy")
+            ledger.record("wish_offer", 2, 10, 30, "Bisasam", "Mew")
+            history = ledger.history(10)
+        finally:
+            ledger.db.close()
+
+        assert first == 1
+        assert (ledger.reputation(10).trades, ledger.reputation(10).partners) == (3, 2)
+        assert (ledger.reputation(20).trades, ledger.reputation(20).partners) == (2, 1)
+        assert ledger.reputation(99) == Reputation()
+        assert [entry["kind"] for entry in history] == ["wish_offer", "wish", "offer"]
+        assert ledger.reputation(10).badge() == "🤝 3 Tausche mit 2 Partnern"
+        assert Reputation().badge() == "🆕 noch keine Tausche"
+
+    def test_other_process_sees_new_trades_after_refresh(self, tmp_path):
+        """Eine zweite Verbindung auf dieselbe Datei liest nur die Aggregate betroffener Nutzer nach"""
+        path = str(tmp_path / "trades.db")
+        writer, reader = TradeLedger(path, poll_interval=0), TradeLedger(path, poll_interval=0)
+        writer.open()
+        reader.open()
+        try:
+            assert reader.refresh() == []
+            writer.record("offer", 1, 10, 20, "Pikachu", "Evoli")
+            assert reader.refresh() == [10, 20]
+            assert reader.refresh() == []
+        finally:
+            writer.db.close()
+            reader.db.close()
+
+        assert reader.reputation(20).trades == 1
+
+    async def test_compact_drops_old_rows_but_keeps_aggregates(self, tmp_path):
+        """Kompaktierung kürzt nur die Einzelzeilen, neue IDs laufen weiter"""
+        path = str(tmp_path / "trades.db")
+        ledger = TradeLedger(path, retention_days=30, poll_interval=0)
+        await ledger.start()
+        try:
+            ledger.record("offer", 1, 10, 20, "Pikachu", "Evoli")
+            assert ledger.compact(now=time.time() + 31 * 86400) == 1
+            assert ledger.history(10) == []
+            assert ledger.record("offer", 1, 10, 20, "Mew", "Mewtu") == 2
+        finally:
+            await ledger.close()
+
+        reopened = TradeLedger(path, poll_interval=0)
+        reopened.open()
+        reopened.db.close()
+        assert (reopened.reputation(10).trades, reopened.reputation(10).partners) == (2, 1)